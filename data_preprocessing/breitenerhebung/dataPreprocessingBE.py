@@ -679,13 +679,9 @@ building_data['lighting_utilisation_factor'] = 0.45
 # Wartungsfaktor der Fensterflächen (lighting_maintenance_factor) 
 ##############################################################################
 # See Szokolay (1980): Environmental Science Handbook for Architects and Builders, p. 109
-def set_lighting_maintenance_factor(row):
-    if row['hk_geb'] == 'Produktions-, Werkstatt-, Lager- oder Betriebsgebäude':
-        lighting_maintenance_factor = 0.8
-    else:
-        lighting_maintenance_factor = 0.9
-    return lighting_maintenance_factor
-building_data['lighting_maintenance_factor'] = building_data.apply(set_lighting_maintenance_factor, axis = 1)    
+def set_lighting_maintenance_factor(building_data):
+    return np.where(building_data['hk_geb'] == 'Produktions-, Werkstatt-, Lager- oder Betriebsgebäude', 0.8, 0.9)
+building_data['lighting_maintenance_factor'] = set_lighting_maintenance_factor(building_data)
 
 
 # Aussenwandkonstruktion (aw_construction)
@@ -755,18 +751,13 @@ building_data['k_1'] =  0.7
 building_data['k_3'] =  0.85
 
 # tau_D65SNA [See DIN V 18599-4:2018-09, p.40]
-def assign_tau_D65SNA(row):
-    if row['Fen_glasart_1'] == '1-S-Glas':
-        tau_D65SNA = 0.9
-    elif row['Fen_glasart_1'] == '2-S-Glas':
-        tau_D65SNA = 0.82  
-    elif row['Fen_glasart_1'] == '3-S-Glas':
-        tau_D65SNA = 0.75
-    else: # PH-Glas --> Mean WDG 3-fach
-        tau_D65SNA = 0.705
-    return tau_D65SNA
+def assign_tau_D65SNA(building_data):
+    conditions = [building_data['Fen_glasart_1'] == '1-S-Glas',
+                  building_data['Fen_glasart_1'] == '2-S-Glas',
+                  building_data['Fen_glasart_1'] == '3-S-Glas']
+    return np.select(conditions, [0.9, 0.82, 0.75], default = 0.705)        # else: PH-Glas --> Mean WDG 3-fach
         
-building_data['tau_D65SNA'] = building_data.apply(assign_tau_D65SNA, axis = 1)   
+building_data['tau_D65SNA'] = assign_tau_D65SNA(building_data)
     
 building_data['glass_light_transmittance'] = building_data['k_1'] * building_data['lighting_maintenance_factor'] * building_data['k_3'] * building_data['tau_D65SNA']
 
@@ -798,14 +789,11 @@ building_data['u_base'] = building_data['scr_gebaeude_id'].map(be_data_original.
 ##############################################################################
 
 # Find corresponding case according to DIN V 4108-6:2003-06
-def fall_temp_adj_base(row):
-    if row['n_UG'] == 0:                                                           # If there's no basement, Case 12
-        return_value = 12                                                                       
-    else:
-        return_value = 16                                                          # Case 16, not heated
-    return return_value
+def fall_temp_adj_base(building_data):
+    # If there's no basement, Case 12, else Case 16, not heated
+    return np.where(building_data['n_UG'] == 0, 12, 16)
 
-building_data['case_temp_adj_base'] = building_data.apply(fall_temp_adj_base, axis = 1)   
+building_data['case_temp_adj_base'] = fall_temp_adj_base(building_data)
 
 arrays_fx = [['<5', '<5', '5 bis 10', '5 bis 10',  '>10', '>10'], ['<=1', '>1', '<=1', '>1', '<=1', '>1']]
 tuples_fx = list(zip(*arrays_fx))
@@ -827,38 +815,28 @@ building_data['building_length_w'] = building_data['geb_f_flaeche_w_iwu'] / buil
 
 building_data['B_raw'] = (2 * building_data[['building_length_n', 'building_length_s']].values.max(1)) + (2 * building_data[['building_length_o', 'building_length_w']].values.max(1))
 
-def clean_B(row):
-    if row['B_raw'] < 5:
-        value = '<5'
-    elif 5 <= row['B_raw'] <= 10:
-        value = '5 bis 10'   
-    else:
-        value = '>10'
-    return value    
-building_data['B'] = building_data.apply(clean_B, axis = 1) 
+def clean_B(building_data):
+    # NaN --> '>10'
+    conditions = [building_data['B_raw'] < 5,
+                  building_data['B_raw'] <= 10]
+    return np.select(conditions, ['<5', '5 bis 10'], default = '>10')
+building_data['B'] = clean_B(building_data)
 
 building_data['R_raw'] = 1 / building_data['u_base']
-def clean_R(row):
-    if row['R_raw'] <= 1:
-        value = '<=1'
-    else:
-        value = '>1'
-    return value  
-building_data['R'] = building_data.apply(clean_R, axis = 1)
+def clean_R(building_data):
+    # NaN --> '>1'
+    return np.where(building_data['R_raw'] <= 1, '<=1', '>1')
+building_data['R'] = clean_R(building_data)
 
 building_data = pd.merge(building_data, fx, left_on = ['B', 'R', 'case_temp_adj_base'], right_on = ['B', 'R', 'case_temp_adj'], how = 'left' )
 
 
 # Temperaturanpassungsfaktor unterirdische Außenwandflächen (temp_adj_walls_ug)
 ##############################################################################
-def case_temp_adj_walls_ug(row):
-    if row['n_UG'] > 0:
-        return_value = 11
-    else: 
-        return_value = 0
-    return return_value
+def case_temp_adj_walls_ug(building_data):
+    return np.where(building_data['n_UG'] > 0, 11, 0)
  
-building_data['case_temp_adj_walls_ug'] = building_data.apply(case_temp_adj_walls_ug, axis = 1)  
+building_data['case_temp_adj_walls_ug'] = case_temp_adj_walls_ug(building_data)
    
 building_data = pd.merge(building_data, fx, left_on = ['B', 'R', 'case_temp_adj_walls_ug'], right_on = ['B', 'R', 'case_temp_adj'], how = 'left' )
 building_data = building_data.drop(['case_temp_adj_x', 'case_temp_adj_y', 'n_UG'], axis = 1)     
@@ -903,19 +881,13 @@ building_data.replace(cleanup_rlt_encode, inplace = True)
 # 'Bestehndes Gebäude mit offensichtlichen Undichtheiten': 10
 
 # DIN V 18599-2: 2018-09 n50 values for building <= 1500 m3
-def assign_n_50_standard_av(row):
-    if row['bak_grob'] == 3:
-        if row['qH1'] == 'Ja, zentrale Anlage(n) vorhanden':
-            n_50_standard_av = 1
-        else:
-            n_50_standard_av = 2
-    elif row['bak_grob'] == 2:
-        n_50_standard_av = 4
-    else:
-        n_50_standard_av = 6
-    return n_50_standard_av  
+def assign_n_50_standard_av(building_data):
+    conditions = [(building_data['bak_grob'] == 3) & (building_data['qH1'] == 'Ja, zentrale Anlage(n) vorhanden'),
+                  building_data['bak_grob'] == 3,
+                  building_data['bak_grob'] == 2]
+    return np.select(conditions, [1, 2, 4], default = 6)
    
-building_data['n_50_standard_av'] = building_data.apply(assign_n_50_standard_av, axis = 1)  
+building_data['n_50_standard_av'] = assign_n_50_standard_av(building_data)
       
 # building_data['standard av-verhältnis'] = 0.9
 building_data['standard_av_verhaeltnis'] = 0.9
@@ -939,24 +911,19 @@ building_data['ach_inf'] = building_data['n_50'] * 0.07
 # DIN V 18599-2:2018-09, S. 62: 6.3.2.2 Bestimmung des Fensterluftwechsels
 # Soweit in der Gebäudezone Öffnungen (z. B. öffenbare Fenster oder Außenluftdurchlässe) zur Außenluft vorhanden sind, 
 # ist unabhängig von Infiltrations- und Anlagenluftwechsel ein Mindestwert von nwin,min = 0,1 h−1 für den Fensterluftwechsel anzusetzen.
-def calc_ach_win(row):
-    if row['qH1'] in ('Nein, Fensterlüftung', 'Nein, nur dezentrale Anlage(n) vorhanden', 'Weiß nicht'):
-        ach_win = max(0.1, (row['ach_min'] - row['ach_inf']))
-    else:
-        ach_win = 0.1
-    return ach_win  
-building_data['ach_win'] = building_data.apply(calc_ach_win, axis = 1) 
+# np.fmax: 0.1 if ach_min is NaN (typ_18599 not in DIN V 18599-10)
+def calc_ach_win(building_data):
+    window_ventilation = building_data['qH1'].isin(['Nein, Fensterlüftung', 'Nein, nur dezentrale Anlage(n) vorhanden', 'Weiß nicht'])
+    return np.where(window_ventilation, np.fmax(0.1, building_data['ach_min'] - building_data['ach_inf']), 0.1)
+building_data['ach_win'] = calc_ach_win(building_data)
 
 
 # Luftwechselrate RLT (ach_vent)
 ##############################################################################
-def calc_ach_vent(row):
-    if row['qH1'] == 'Ja, zentrale Anlage(n) vorhanden':
-        ach_vent = max(0.1, (row['ach_min'] - row['ach_inf']))
-    else:
-        ach_vent = 0.1
-    return ach_vent  
-building_data['ach_vent'] = building_data.apply(calc_ach_vent, axis = 1) 
+def calc_ach_vent(building_data):
+    central_ventilation = building_data['qH1'] == 'Ja, zentrale Anlage(n) vorhanden'
+    return np.where(central_ventilation, np.fmax(0.1, building_data['ach_min'] - building_data['ach_inf']), 0.1)
+building_data['ach_vent'] = calc_ach_vent(building_data)
 
 
 # Wirkungsgrad der Wärmerückgewinnungseinheit RLT (heat_recovery_efficiency)
@@ -972,13 +939,12 @@ building_data.replace(cleanup_rlt_funkt_encode, inplace = True)
 
 # Die Wäremrückgewinnung wird mit 70% im groben mittleren Bereich der üblichen Rückgewinnungsgrade von Plattenwäremtauschern angenommen. 
 # Xu, Qi; Riffat, Saffa; Zhang, Shihao (2019): Review of Heat Recovery Technologies for Building Applications. In Energies 12 (7), p. 1285. DOI: 10.3390/en12071285.
-def find_heat_recovery_efficiency(row):
-    if row['qH3'] in ('Wärmerückgewinnung'):
-            heat_recovery_efficiency = 0.7
-    else:
-        heat_recovery_efficiency = 0
-    return heat_recovery_efficiency  
-building_data['heat_recovery_efficiency'] = building_data.apply(find_heat_recovery_efficiency, axis = 1) 
+def find_heat_recovery_efficiency(building_data):
+    heat_recovery = building_data['qH3'] == 'Wärmerückgewinnung'
+    if not heat_recovery.any():
+        return np.zeros(len(building_data), dtype = int)                            # 0 (Integer) if no building has heat recovery
+    return np.where(heat_recovery, 0.7, 0)
+building_data['heat_recovery_efficiency'] = find_heat_recovery_efficiency(building_data)
 
 
 # Old Version of determination of Heat Recovery
@@ -1117,14 +1083,10 @@ building_data['night_flushing_flow'] = building_data['scr_gebaeude_id'].map(be_d
 # 4: Nein
 
 # Der Luftwechsel wird mit 2 1/h auf das minimum eines erhöhten Nachtluftwechsels nach DIN 4108-2 gesetzt
-def night_flushing_flow(row):
-    if row['night_flushing_flow'] == 4:
-        flow_rate = 0
-    else: 
-        flow_rate = 2
-    return flow_rate
-
-building_data['night_flushing_flow'] = building_data.apply(night_flushing_flow, axis = 1)     
+def night_flushing_flow(building_data):
+    return np.where(building_data['night_flushing_flow'] == 4, 0, 2)
+
+building_data['night_flushing_flow'] = night_flushing_flow(building_data)
 
 
 # Max. Heizlast (max_heating_energy_per_floor_area)
@@ -435,30 +435,22 @@ data_final['wall_area_ug'] = data_final['wall_area_ug_heated_south'] + data_fina
 ##############################################################################
 data_final['dachform'] = data_final['scr_gebaeude_id'].map(data_te.set_index('pr_var_name')['b_attic_cond'])
 
-def teilbeheizungsfaktor_dach(row):
-    if row['dachform'] == 'Steildach (mit beheiztem Dachgeschoss)':
-        teilbeheizungsfaktor_dach = 1
-    elif row['dachform'] == 'Steildach (mit teilweise beheiztem Dachgeschoss)':
-        teilbeheizungsfaktor_dach = 0.5   
-    else:   # 'Flachdach / flachgeneigtes Dach' oder 'oberste Geschossdecke zu unbeheiztem Dachgeschoss'
-        teilbeheizungsfaktor_dach = 0
-            
-    return teilbeheizungsfaktor_dach
-
-data_final['teilbeheizungsfaktor_dach'] = data_final.apply(teilbeheizungsfaktor_dach, axis = 1)   
+def teilbeheizungsfaktor_dach(data_final):
+    # Sonst 'Flachdach / flachgeneigtes Dach' oder 'oberste Geschossdecke zu unbeheiztem Dachgeschoss'
+    conditions = [data_final['dachform'] == 'Steildach (mit beheiztem Dachgeschoss)',
+                  data_final['dachform'] == 'Steildach (mit teilweise beheiztem Dachgeschoss)']
+    return np.select(conditions, [1, 0.5], default = 0)
+
+data_final['teilbeheizungsfaktor_dach'] = teilbeheizungsfaktor_dach(data_final)
   
 
-def calc_roof_area(row):
-    if row['dachform'] == 'Steildach (mit beheiztem Dachgeschoss)':
-        roof_area = row['teilbeheizungsfaktor_dach'] * row['base_area'] * 1.51 + ((1 - row['teilbeheizungsfaktor_dach']) * row['base_area'])
-    elif row['dachform'] == 'Steildach (mit teilweise beheiztem Dachgeschoss)': 
-        roof_area = row['teilbeheizungsfaktor_dach'] * row['base_area'] * 1.51 + ((1 - row['teilbeheizungsfaktor_dach']) * row['base_area'])
-    else:
-        roof_area = row['teilbeheizungsfaktor_dach'] * row['base_area'] * 1.0 + ((1 - row['teilbeheizungsfaktor_dach']) * row['base_area'])
-        
-    return roof_area
+def calc_roof_area(data_final):
+    # Beheizter Anteil des Steildachs mit Faktor 1.51, sonst 1.0
+    steildach = data_final['dachform'].isin(['Steildach (mit beheiztem Dachgeschoss)', 'Steildach (mit teilweise beheiztem Dachgeschoss)'])
+    faktor_dach = np.where(steildach, 1.51, 1.0)
+    return data_final['teilbeheizungsfaktor_dach'] * data_final['base_area'] * faktor_dach + ((1 - data_final['teilbeheizungsfaktor_dach']) * data_final['base_area'])
 
-data_final['roof_area'] = data_final.apply(calc_roof_area, axis = 1) 
+data_final['roof_area'] = calc_roof_area(data_final)
     
 # max_occupancy aus TE und BE ################################################
 ##############################################################################
@@ -488,6 +480,17 @@ max_occupancy_sum['max_occupancy_te'] = max_occupancy_sum.sum(axis = 1)
 # data_final['max_occupancy'] = data_final['scr_gebaeude_id'].map(max_occupancy_sum.set_index('scr_gebaeude_id')['max_occupancy_te'])
 
 
+# Spalten je Himmelsrichtung ################################################
+##############################################################################
+# Spalten '<stubname>_<Himmelsrichtung>' (z. B. u_g_south, u_g_east, ...) im long format: eine Zeile je Gebäude und Himmelsrichtung 
+# mit den Spalten scr_gebaeude_id, direction und stubnames. Zuordnungen aus den Normtabellen erfolgen damit für alle Himmelsrichtungen 
+# in einem merge, das Ergebnis wird mit pivot(index = 'scr_gebaeude_id', columns = 'direction') wieder je Himmelsrichtung zugeordnet
+def directions_long(data, stubnames):
+    columns = ['{}_{}'.format(stubname, i) for stubname in stubnames for i in directions]
+    return pd.wide_to_long(data[['scr_gebaeude_id'] + columns], stubnames = stubnames, i = 'scr_gebaeude_id', j = 'direction', 
+                           sep = '_', suffix = '(?:' + '|'.join(directions) + ')').reset_index()
+
+
 # u_windows aus TE ###########################################################
 ##############################################################################
 # Glastyp nach Himmelsrichtung aus TE (z. B. WSV2: U= 1, 2)
@@ -533,11 +536,11 @@ u_rahmen = pd.DataFrame(([np.inf, np.inf],
 u_rahmen = u_rahmen.unstack().reset_index().rename(columns = {'level_1': 'rahmenart', 0: 'u_rahmen'})
 
 # U-Wert der Rahmen:
+rahmen = directions_long(data_final, ['rahmenart', 'rahmenart_einbau95'])
+rahmen = pd.merge(rahmen, u_rahmen, left_on = ['rahmenart_einbau95', 'rahmenart'], right_on = ['bak_rahmen', 'rahmenart'], how = 'left')
+rahmen = rahmen.pivot(index = 'scr_gebaeude_id', columns = 'direction', values = 'u_rahmen')
 for i in directions:
-    data_final = pd.merge(data_final, u_rahmen, left_on = ['rahmenart_einbau95_{}'.format(i), 'rahmenart_{}'.format(i)], right_on = ['bak_rahmen', 'rahmenart'], how = 'left')
-    data_final = data_final.rename(columns = {'u_rahmen': 'u_rahmen_{}'.format(i)})   
-    data_final.drop(['bak_rahmen', 'rahmenart'], axis = 1, inplace = True)  
-    data_final['u_rahmen_{}'.format(i)] = data_final['u_rahmen_{}'.format(i)].replace(np.nan, 0)
+    data_final['u_rahmen_{}'.format(i)] = data_final['scr_gebaeude_id'].map(rahmen[i]).replace(np.nan, 0)
 
 # Zur Ermittlung des U-Werts der Fenster:
 # u_windows = U_g * f_glas + u_rahmen(1 - f_glas) + win_l * frame_psi 
@@ -617,30 +620,29 @@ subset_cleanup_verglasung_g_verglasung = cleanup_verglasung_sonnenschutz[['Vergl
 
 ##############################################################################
 # Ermittle Gesamtenergiedurchlassgrad g der Verglasung in alle Himmelsrichtungen
-for i in directions:
-    mapping_g_verglasung = (pd.merge_asof(data_final.sort_values('u_g_{}'.format(i)), 
+# g-Wert des nächstgrößeren U_g-Werts (forward), wenn es keinen gibt, des nächstkleineren U_g-Werts
+verglasung = directions_long(data_final, ['Verglasungstyp', 'u_g']).sort_values('u_g')
+mapping_g_verglasung = (pd.merge_asof(verglasung, 
                         subset_cleanup_verglasung_g_verglasung.sort_values('U_g'), 
-                        left_on='u_g_{}'.format(i), 
-                        left_by='Verglasungstyp_{}'.format(i), 
-                        right_on='U_g', 
-                        right_by='Verglasungstyp').set_index('scr_gebaeude_id'))
-    
-    data_final = (pd.merge_asof(data_final.sort_values('u_g_{}'.format(i)), 
-                        subset_cleanup_verglasung_g_verglasung.sort_values('U_g'), 
-                        left_on='u_g_{}'.format(i), 
-                        left_by='Verglasungstyp_{}'.format(i), 
-                        right_on='U_g', 
-                        right_by='Verglasungstyp',
-                        direction = 'forward')
-                        .set_index('scr_gebaeude_id')
-                        .combine_first(mapping_g_verglasung)
-                        .sort_index()
-                        .reset_index()
-                        )
-    data_final.rename({'g': 'g_verglasung_{}'.format(i)}, axis=1, inplace=True)
-    data_final.drop(['Verglasungstyp', 'U_g'], axis = 1, inplace = True)
-    
-    data_final['g_verglasung_{}'.format(i)] = data_final['g_verglasung_{}'.format(i)].replace(np.nan, 0) 
+                        left_on = 'u_g', 
+                        right_on = 'U_g', 
+                        by = 'Verglasungstyp')
+                        .pivot(index = 'scr_gebaeude_id', columns = 'direction', values = 'g'))
+
+g_verglasung = (pd.merge_asof(verglasung, 
+                subset_cleanup_verglasung_g_verglasung.sort_values('U_g'), 
+                left_on = 'u_g', 
+                right_on = 'U_g', 
+                by = 'Verglasungstyp',
+                direction = 'forward')
+                .pivot(index = 'scr_gebaeude_id', columns = 'direction', values = 'g')
+                .combine_first(mapping_g_verglasung))
+
+for i in directions:
+    data_final['g_verglasung_{}'.format(i)] = data_final['scr_gebaeude_id'].map(g_verglasung[i]).replace(np.nan, 0)
+
+# Gebäude ab hier nach scr_gebaeude_id sortiert
+data_final = data_final.sort_values('scr_gebaeude_id').reset_index(drop = True)
 
 
 # Flächengewichtes Mittel
@@ -674,30 +676,30 @@ subset_cleanup_verglasung_g_sonnenschutz = subset_cleanup_verglasung_g_sonnensch
 subset_cleanup_verglasung_g_sonnenschutz = subset_cleanup_verglasung_g_sonnenschutz.stack().reset_index().rename(columns = {'level_2':'Sonnenschutztyp', 0:'g_faktor'})
 
 # Ermittle Energiedurchlassgrad bei aktiviertem Sonnenschutz je Himmelsrichtung
+# Der nächstgrößere U_g-Wert (forward) wird für alle Himmelsrichtungen mit dem U_g-Wert der Südfassade (u_g_south) gesucht
+sonnenschutz = directions_long(data_final, ['Verglasungstyp', 'b_blind_type', 'u_g'])
+sonnenschutz['u_g_south'] = sonnenschutz['scr_gebaeude_id'].map(data_final.set_index('scr_gebaeude_id')['u_g_south'])
+
+mapping_g_sonnenschutz = (pd.merge_asof(sonnenschutz.sort_values('u_g'), 
+                            subset_cleanup_verglasung_g_sonnenschutz.sort_values('U_g'), 
+                            left_on = 'u_g', 
+                            left_by = ['Verglasungstyp', 'b_blind_type'], 
+                            right_on = 'U_g', 
+                            right_by = ['Verglasungstyp', 'Sonnenschutztyp'])
+                            .pivot(index = 'scr_gebaeude_id', columns = 'direction', values = 'g_faktor'))
+
+g_sonnenschutz = (pd.merge_asof(sonnenschutz.sort_values('u_g_south'), 
+                    subset_cleanup_verglasung_g_sonnenschutz.sort_values('U_g'), 
+                    left_on = 'u_g_south', 
+                    left_by = ['Verglasungstyp', 'b_blind_type'], 
+                    right_on = 'U_g', 
+                    right_by = ['Verglasungstyp', 'Sonnenschutztyp'],
+                    direction = 'forward')
+                    .pivot(index = 'scr_gebaeude_id', columns = 'direction', values = 'g_faktor')
+                    .combine_first(mapping_g_sonnenschutz))
+
 for i in directions:
-    mapping_g_sonnenschutz = (pd.merge_asof(data_final.sort_values('u_g_{}'.format(i)), 
-                                subset_cleanup_verglasung_g_sonnenschutz.sort_values('U_g'), 
-                                left_on='u_g_{}'.format(i), 
-                                left_by=['Verglasungstyp_{}'.format(i), 'b_blind_type_{}'.format(i)], 
-                                right_on='U_g', 
-                                right_by=['Verglasungstyp', 'Sonnenschutztyp']).set_index('scr_gebaeude_id'))
-    
-    data_final = (pd.merge_asof(data_final.sort_values('u_g_south'), 
-                        subset_cleanup_verglasung_g_sonnenschutz.sort_values('U_g'), 
-                        left_on='u_g_south', 
-                        left_by=['Verglasungstyp_{}'.format(i), 'b_blind_type_{}'.format(i)], 
-                        right_on='U_g', 
-                        right_by=['Verglasungstyp', 'Sonnenschutztyp'],
-                        direction = 'forward')
-                        .set_index('scr_gebaeude_id')
-                        .combine_first(mapping_g_sonnenschutz)
-                        .sort_index()
-                        .reset_index()
-                        )
-    data_final.rename({'g_faktor': 'g_sonnenschutz_{}'.format(i)}, axis=1, inplace=True)
-    data_final.drop(['Sonnenschutztyp', 'U_g', 'Verglasungstyp'], axis = 1, inplace = True)
-    
-    data_final['g_sonnenschutz_{}'.format(i)] = data_final['g_sonnenschutz_{}'.format(i)].replace(np.nan, 0)
+    data_final['g_sonnenschutz_{}'.format(i)] = data_final['scr_gebaeude_id'].map(g_sonnenschutz[i]).replace(np.nan, 0)
 
 # Flächengewichtes Mittel hier vermutl. nicht sinnvoll
 # Bsp.: Gebäude mit Fenstern an allen 4 Fassaden, aber Sonnenschutz an nur 3 Fassaden
@@ -727,13 +729,9 @@ data_final['glass_solar_shading_transmittance'] = np.where(data_final['glass_sol
 ##############################################################################
 # See Szokolay (1980): Environmental Science Handbook for Architects and Builders, p. 109
 # Assumption
-def set_lighting_maintenance_factor(row):
-    if row['hk_geb'] == 'Produktions-, Werkstatt-, Lager- oder Betriebsgebäude':
-        lighting_maintenance_factor = 0.8
-    else:
-        lighting_maintenance_factor = 0.9
-    return lighting_maintenance_factor
-data_final['lighting_maintenance_factor'] = data_final.apply(set_lighting_maintenance_factor, axis = 1)  
+def set_lighting_maintenance_factor(data_final):
+    return np.where(data_final['hk_geb'] == 'Produktions-, Werkstatt-, Lager- oder Betriebsgebäude', 0.8, 0.9)
+data_final['lighting_maintenance_factor'] = set_lighting_maintenance_factor(data_final)
 
 subset_glass_light_transmittance = data_final[['scr_gebaeude_id', 'Verglasungstyp_south', 'u_g_south', 'g_verglasung_south',
                                                'Verglasungstyp_east', 'u_g_east', 'g_verglasung_east',
@@ -762,23 +760,21 @@ cleanup_glass_light_transmittance = pd.DataFrame({
            
 cleanup_glass_light_transmittance.sort_values(by=['Verglasungstyp', 'U_g', 'g']).reset_index(drop=True)   
 
+# tau_D65SNA aller Fenster: erste Zeile von cleanup_glass_light_transmittance des Verglasungstyps mit U_g >= u_g und g >= g_verglasung,
+# wenn es keine gibt, letzte Zeile des Verglasungstyps, 0 ohne Verglasungstyp ('nan')
+fenster = directions_long(subset_glass_light_transmittance, ['Verglasungstyp', 'u_g', 'g_verglasung'])
+tau_D65SNA = pd.merge(fenster, cleanup_glass_light_transmittance.reset_index(), on = 'Verglasungstyp')
+tau_D65SNA = tau_D65SNA[(tau_D65SNA['U_g'] >= tau_D65SNA['u_g']) & (tau_D65SNA['g'] >= tau_D65SNA['g_verglasung'])]
+tau_D65SNA = tau_D65SNA.sort_values('index', kind = 'stable').drop_duplicates(['scr_gebaeude_id', 'direction'])
+fenster = pd.merge(fenster, tau_D65SNA[['scr_gebaeude_id', 'direction', 'tau_D65SNA']], on = ['scr_gebaeude_id', 'direction'], how = 'left')
+
+tau_D65SNA_last = cleanup_glass_light_transmittance.drop_duplicates('Verglasungstyp', keep = 'last').set_index('Verglasungstyp')['tau_D65SNA']
+fenster['tau_D65SNA'] = np.select([fenster['Verglasungstyp'] == 'nan', fenster['tau_D65SNA'].notnull()],
+                                  [0, fenster['tau_D65SNA']], default = fenster['Verglasungstyp'].map(tau_D65SNA_last))
+tau_D65SNA = fenster.pivot(index = 'scr_gebaeude_id', columns = 'direction', values = 'tau_D65SNA')
+
 for i in directions:
-    def find_tau_D65SNA(row):   
-        tau_D65SNA = cleanup_glass_light_transmittance[
-                            (cleanup_glass_light_transmittance['Verglasungstyp'] == row['Verglasungstyp_{}'.format(i)]) & 
-                            (cleanup_glass_light_transmittance['U_g'] >= row['u_g_{}'.format(i)]) & 
-                            (cleanup_glass_light_transmittance['g'] >= row['g_verglasung_{}'.format(i)])]
-        if row['Verglasungstyp_{}'.format(i)] == 'nan':
-            tau_D65SNA = 0
-        elif len(tau_D65SNA) == 0:
-            tau_D65SNA = cleanup_glass_light_transmittance[cleanup_glass_light_transmittance['Verglasungstyp'] == row['Verglasungstyp_{}'.format(i)]].iloc[-1,3]
-        else:
-            tau_D65SNA = tau_D65SNA.iloc[0,3]
-        return tau_D65SNA
-
-
-    subset_glass_light_transmittance['tau_D65SNA_{}'.format(i)] = subset_glass_light_transmittance.apply(find_tau_D65SNA, axis = 1)
-    
+    subset_glass_light_transmittance['tau_D65SNA_{}'.format(i)] = subset_glass_light_transmittance['scr_gebaeude_id'].map(tau_D65SNA[i])
     subset_glass_light_transmittance['glass_light_transmittance_{}'.format(i)] = subset_glass_light_transmittance['k_1'] * subset_glass_light_transmittance['lighting_maintenance_factor'] * subset_glass_light_transmittance['k_3'] * subset_glass_light_transmittance['tau_D65SNA_{}'.format(i)]
     data_final['glass_light_transmittance_{}'.format(i)] = data_final['scr_gebaeude_id'].map(subset_glass_light_transmittance.set_index('scr_gebaeude_id')['glass_light_transmittance_{}'.format(i)])
 
@@ -963,30 +959,22 @@ data_final['außenwand_material'] = data_final['scr_gebaeude_id'].map(data_te.se
 data_final['außenwand_dämmstärke'] = data_final['scr_gebaeude_id'].map(data_te.set_index('pr_var_name')['b_wall_ins'])
 data_final['außenwand_dämmanteil'] = data_final['scr_gebaeude_id'].map(data_te.set_index('pr_var_name')['b_wall_ins_part'])
 
-def create_bak(row):
-    if row['baujahr'] <= 1918:
-        auspraegung = 'bak_vor_1918' 
-    elif 1919 <= row['baujahr'] <= 1948:
-        auspraegung = 'bak_1919_1948' 
-    elif 1949 <= row['baujahr'] <= 1957:
-        auspraegung = 'bak_1949_1957' 
-    elif 1958 <= row['baujahr'] <= 1968:
-        auspraegung = 'bak_1958_1968' 
-    elif 1969 <= row['baujahr'] <= 1978:
-        auspraegung = 'bak_1969_1978' 
-    elif 1979 <= row['baujahr'] <= 1983:
-        auspraegung = 'bak_1979_1983' 
-    elif 1984 <= row['baujahr'] <= 1994:
-        auspraegung = 'bak_1984_1994' 
-    elif 1995 <= row['baujahr'] <= 2001:
-        auspraegung = 'bak_1995_2001'    
-    elif 2002 <= row['baujahr'] <= 2006:
-        auspraegung = 'bak_2002_2006' 
-    else:
-        auspraegung = 'bak_ab_2007'
-    return auspraegung    
+def create_bak(data_final):
+    # Ohne Angabe oder außerhalb der Klassen: 'bak_ab_2007'
+    conditions = [data_final['baujahr'] <= 1918,
+                  data_final['baujahr'].between(1919, 1948),
+                  data_final['baujahr'].between(1949, 1957),
+                  data_final['baujahr'].between(1958, 1968),
+                  data_final['baujahr'].between(1969, 1978),
+                  data_final['baujahr'].between(1979, 1983),
+                  data_final['baujahr'].between(1984, 1994),
+                  data_final['baujahr'].between(1995, 2001),
+                  data_final['baujahr'].between(2002, 2006)]
+    auspraegungen = ['bak_vor_1918', 'bak_1919_1948', 'bak_1949_1957', 'bak_1958_1968', 'bak_1969_1978', 
+                     'bak_1979_1983', 'bak_1984_1994', 'bak_1995_2001', 'bak_2002_2006']
+    return np.select(conditions, auspraegungen, default = 'bak_ab_2007')
         
-data_final['bak'] = data_final.apply(create_bak, axis = 1)        
+data_final['bak'] = create_bak(data_final)
 
 # Wert für bak_1949_1957/Plattenbau = 2: eigene Annahme, da ein Gebäude davon betroffen (NW7410711_1_00)
 außenwand_u_bak = pd.DataFrame({'baujahr': 
@@ -1009,14 +997,11 @@ data_final = pd.merge(data_final, außenwand_u_bak, left_on = ['außenwand_mater
 data_final = data_final.drop(['b_wall_fabric', 'baujahr_y'], axis = 1)  
 
 # Korrigiere U-Wert falls Dämmung vorhanden
-def adjust_u_walls(row):
-    if row['außenwand_dämmstärke'] != 0:
-        value = row['außenwand_U0']*(1-row['außenwand_dämmanteil'])+row['außenwand_dämmanteil']*1/(1/row['außenwand_U0']+row['außenwand_dämmstärke']/100/0.04)
-    else:     
-        value = row['außenwand_U0']
-    return value
-
-data_final['u_walls'] = data_final.apply(adjust_u_walls, axis = 1)     
+def adjust_u_walls(data_final):
+    u_gedämmt = data_final['außenwand_U0']*(1-data_final['außenwand_dämmanteil'])+data_final['außenwand_dämmanteil']*1/(1/data_final['außenwand_U0']+data_final['außenwand_dämmstärke']/100/0.04)
+    return np.where(data_final['außenwand_dämmstärke'] != 0, u_gedämmt, data_final['außenwand_U0'])
+
+data_final['u_walls'] = adjust_u_walls(data_final)
     
                                  
 # u_roof #####################################################################
@@ -1037,14 +1022,11 @@ data_final = pd.merge(data_final, dach_u_bak, left_on = ['dach_material','bak'],
 data_final = data_final.drop(['b_roof_fabric', 'baujahr'], axis = 1)  
 
 # Korrigiere U-Wert falls Dämmung vorhanden
-def adjust_u_roof(row):
-    if row['dach_dämmstärke'] != 0:
-        value = row['dach_U0']*(1-row['dach_dämmanteil'])+row['dach_dämmanteil']*1/(1/row['dach_U0']+row['dach_dämmstärke']/100/0.04)
-    else:     
-        value = row['dach_U0']
-    return value
+def adjust_u_roof(data_final):
+    u_gedämmt = data_final['dach_U0']*(1-data_final['dach_dämmanteil'])+data_final['dach_dämmanteil']*1/(1/data_final['dach_U0']+data_final['dach_dämmstärke']/100/0.04)
+    return np.where(data_final['dach_dämmstärke'] != 0, u_gedämmt, data_final['dach_U0'])
 
-data_final['u_roof'] = data_final.apply(adjust_u_roof, axis = 1) 
+data_final['u_roof'] = adjust_u_roof(data_final)
 
 
 # u_base #####################################################################
@@ -1072,14 +1054,11 @@ data_final = pd.merge(data_final, keller_u_bak, left_on = ['keller_material','ba
 data_final = data_final.drop(['b_floor_fabric', 'baujahr'], axis = 1)  
 
 # Korrigiere U-Wert falls Dämmung vorhanden
-def adjust_u_floor(row):
-    if row['keller_dämmstärke'] != 0:
-        value = row['keller_U0']*(1-row['keller_dämmanteil'])+row['keller_dämmanteil']*1/(1/row['keller_U0']+row['keller_dämmstärke']/100/0.04)
-    else:     
-        value = row['keller_U0']
-    return value
-
-data_final['u_base'] = data_final.apply(adjust_u_floor, axis = 1) 
+def adjust_u_floor(data_final):
+    u_gedämmt = data_final['keller_U0']*(1-data_final['keller_dämmanteil'])+data_final['keller_dämmanteil']*1/(1/data_final['keller_U0']+data_final['keller_dämmstärke']/100/0.04)
+    return np.where(data_final['keller_dämmstärke'] != 0, u_gedämmt, data_final['keller_U0'])
+
+data_final['u_base'] = adjust_u_floor(data_final)
  
 data_final = data_final.rename(columns = {'baujahr_x': 'baujahr'})
 
@@ -1089,16 +1068,12 @@ data_final = data_final.rename(columns = {'baujahr_x': 'baujahr'})
 ##############################################################################
 # Möglichkeiten
 
-def fall_temp_adj_base(row):
-    if row['anzahl_geschosse_unterirdisch'] == 0:                                                           # Wenn kein Keller, dann Mögl. 1), Fall 12
-        return_value = 12
-    elif (row['anzahl_geschosse_unterirdisch'] > 0) & (row['anzahl_geschosse_beheizt_unterirdisch'] == 0):  # Wenn Keller, aber unbeheizt, Mögl. 2), Fall 15/16
-        return_value = 16                                                                             
-    else:
-        return_value = 10                                                                                   # Ansonsten muss Keller voll-/teilbeheizt sein, dann Mögl. 3), 4), also Fall 10
-    return return_value
+def fall_temp_adj_base(data_final):
+    conditions = [data_final['anzahl_geschosse_unterirdisch'] == 0,                                                                # Wenn kein Keller, dann Mögl. 1), Fall 12
+                  (data_final['anzahl_geschosse_unterirdisch'] > 0) & (data_final['anzahl_geschosse_beheizt_unterirdisch'] == 0)]  # Wenn Keller, aber unbeheizt, Mögl. 2), Fall 15/16
+    return np.select(conditions, [12, 16], default = 10)                                                                          # Ansonsten muss Keller voll-/teilbeheizt sein, dann Mögl. 3), 4), also Fall 10
 
-data_final['fall_temp_adj_base'] = data_final.apply(fall_temp_adj_base, axis = 1)   
+data_final['fall_temp_adj_base'] = fall_temp_adj_base(data_final)
 
 
 arrays_fx = [['<5', '<5', '5 bis 10', '5 bis 10',  '>10', '>10'],
@@ -1118,24 +1093,18 @@ fx['fall_temp_adj'] = fx['fall_temp_adj'].astype(int)
 
 data_final['B_raw'] = (2 * data_final['building_width']) + (2 * data_final['building_depth'])
 
-def clean_B(row):
-    if row['B_raw'] < 5:
-        value = '<5'
-    elif 5 <= row['B_raw'] <= 10:
-        value = '5 bis 10'   
-    else:
-        value = '>10'
-    return value    
-data_final['B'] = data_final.apply(clean_B, axis = 1) 
+def clean_B(data_final):
+    # NaN --> '>10'
+    conditions = [data_final['B_raw'] < 5,
+                  data_final['B_raw'] <= 10]
+    return np.select(conditions, ['<5', '5 bis 10'], default = '>10')
+data_final['B'] = clean_B(data_final)
 
 data_final['R_raw'] = 1 / data_final['u_base']
-def clean_R(row):
-    if row['R_raw'] <= 1:
-        value = '<=1'
-    else:
-        value = '>1'
-    return value  
-data_final['R'] = data_final.apply(clean_R, axis = 1)
+def clean_R(data_final):
+    # NaN --> '>1'
+    return np.where(data_final['R_raw'] <= 1, '<=1', '>1')
+data_final['R'] = clean_R(data_final)
 
 
 data_final = pd.merge(data_final, fx, left_on = ['B', 'R', 'fall_temp_adj_base'], right_on = ['B', 'R', 'fall_temp_adj'], how = 'left' )
@@ -1143,14 +1112,10 @@ data_final = pd.merge(data_final, fx, left_on = ['B', 'R', 'fall_temp_adj_base']
 
 # temp_adj_walls_ug ##########################################################
 ##############################################################################
-def fall_temp_adj_walls_ug(row):
-    if row['anzahl_geschosse_beheizt_unterirdisch'] > 0:
-        return_value = 11
-    else: 
-        return_value = 0
-    return return_value
+def fall_temp_adj_walls_ug(data_final):
+    return np.where(data_final['anzahl_geschosse_beheizt_unterirdisch'] > 0, 11, 0)
  
-data_final['fall_temp_adj_walls_ug'] = data_final.apply(fall_temp_adj_walls_ug, axis = 1)  
+data_final['fall_temp_adj_walls_ug'] = fall_temp_adj_walls_ug(data_final)
    
 data_final = pd.merge(data_final, fx, left_on = ['B', 'R', 'fall_temp_adj_walls_ug'], right_on = ['B', 'R', 'fall_temp_adj'], how = 'left' )
 data_final = data_final.drop(['fall_temp_adj_x', 'fall_temp_adj_y'], axis = 1)     
@@ -1222,20 +1187,11 @@ heating_supply_system = heating_supply_system.replace('solar', np.nan)
 # Ersetze 'no' mit np.nan
 heating_supply_system = heating_supply_system.replace('no', np.nan)
     
-def h_type_1_only(row):
-    if ((pd.isnull(row['h_type_1']) == False) and 
-            (pd.isnull(row['h_type_2']) == True) and
-            (pd.isnull(row['h_type_3']) == True) and
-            (pd.isnull(row['h_type_4']) == True) and
-            (pd.isnull(row['h_type_5']) == True) and
-            (pd.isnull(row['h_type_6']) == True) and
-            (pd.isnull(row['h_type_7']) == True)):
-        value = row['h_type_1'] 
-    else: 
-        value = np.nan
-    return value    
-
-heating_supply_system['h_type_1_only'] = heating_supply_system.apply(h_type_1_only, axis = 1) 
+def h_type_1_only(heating_supply_system):
+    weitere_h_types_leer = heating_supply_system[['h_type_' + str(x) for x in range(2, 8)]].isnull().all(axis = 1)
+    return heating_supply_system['h_type_1'].where(heating_supply_system['h_type_1'].notnull() & weitere_h_types_leer)
+
+heating_supply_system['h_type_1_only'] = h_type_1_only(heating_supply_system)
 
 # Heating supply systems die genau einen Wärmeerzeuger haben
 heating_supply_system_only_one = heating_supply_system.loc[heating_supply_system['h_type_1_only'].notnull()]
@@ -1575,38 +1531,26 @@ data_final['rlt_flow_ach_sum'] = data_final['rlt_flow_ach_sum'].replace(np.nan,
 #                                                        ach_vent = NVS_zu [in 1/h]
 # (ach_min < ach_inf) & (AnzahlRLT > 0) & (keine Angabe NVS): Luftwechsel durch Infiltration übersteigt Mindestluftwechsel, ach_vent negativ, ach_vent = ach_vent_adj = 0 
     
-def calc_ach_inf_win(row):   
-    if (row['ach_min'] > row['ach_inf']):
-        if row['anzahl_rlt_anlagen'] == 0:
-            ach_inf_win = row['ach_min']                       # Infl wird durch Fensterlüftung gedeckt
-        elif ((row['anzahl_rlt_anlagen'] > 0) & (row['rlt_flow_ach_mean'] > 0) & (row['rlt_flow_ach_mean'] < (row['ach_min'] - row['ach_inf']))):    
-            ach_inf_win = row['ach_min'] - row['rlt_flow_ach_mean']    # RLT kann min nicht decken, Rest durch Fenster
-        else:
-            ach_inf_win = row['ach_inf']
-    else:
-        ach_inf_win = row['ach_inf']
+def calc_ach_inf_win(data_final):
+    ach_min_groesser = data_final['ach_min'] > data_final['ach_inf']
+    conditions = [ach_min_groesser & (data_final['anzahl_rlt_anlagen'] == 0),                                # Infl wird durch Fensterlüftung gedeckt
+                  ach_min_groesser & (data_final['anzahl_rlt_anlagen'] > 0) & (data_final['rlt_flow_ach_mean'] > 0) & 
+                      (data_final['rlt_flow_ach_mean'] < (data_final['ach_min'] - data_final['ach_inf']))]  # RLT kann min nicht decken, Rest durch Fenster
+    return np.select(conditions, [data_final['ach_min'], data_final['ach_min'] - data_final['rlt_flow_ach_mean']], default = data_final['ach_inf'])
         
-    return ach_inf_win
-        
-data_final['ach_inf_win'] = data_final.apply(calc_ach_inf_win, axis = 1) 
+data_final['ach_inf_win'] = calc_ach_inf_win(data_final)
 data_final['ach_win'] = data_final['ach_inf_win'] - data_final['ach_inf']
   
-def calc_ach_vent(row):
-    if (row['ach_min'] > row['ach_inf']):
-        if row['anzahl_rlt_anlagen'] == 0:
-            ach_vent = 0
-        elif ((row['anzahl_rlt_anlagen'] > 0) & (row['rlt_flow_ach_mean'] > 0)):    
-            ach_vent = row['rlt_flow_ach_mean']
-        else: # anzahl_rlt_anlagen > 0 & rlt_flow_ach_mean = 0
-            ach_vent = row['ach_min'] - row['ach_inf']
-    elif ((row['ach_min'] < row['ach_inf']) & (row['rlt_flow_ach_mean'] > 0)): 
-        ach_vent = row['rlt_flow_ach_mean']
-    else: 
-        ach_vent = 0
-        
-    return ach_vent    
-
-data_final['ach_vent'] = data_final.apply(calc_ach_vent, axis = 1) 
+def calc_ach_vent(data_final):
+    ach_min_groesser = data_final['ach_min'] > data_final['ach_inf']
+    conditions = [ach_min_groesser & (data_final['anzahl_rlt_anlagen'] == 0),
+                  ach_min_groesser & (data_final['anzahl_rlt_anlagen'] > 0) & (data_final['rlt_flow_ach_mean'] > 0),
+                  ach_min_groesser,                                                                                # anzahl_rlt_anlagen > 0 & rlt_flow_ach_mean = 0
+                  (data_final['ach_min'] < data_final['ach_inf']) & (data_final['rlt_flow_ach_mean'] > 0)]
+    choices = [0, data_final['rlt_flow_ach_mean'], data_final['ach_min'] - data_final['ach_inf'], data_final['rlt_flow_ach_mean']]
+    return np.select(conditions, choices, default = 0)
+
+data_final['ach_vent'] = calc_ach_vent(data_final)
 
 
 # night_flushing_flow ########################################################
@@ -0,0 +1,253 @@
+"""
+Module with the temporal aggregation of the hourly results of a building
+
+Most evaluations only need the annual summary and daily or monthly sums or the peak loads, not the 8760 hours of
+all variables. The granularity of the results of simulation.simulate_building() is set in the SimulationContext:
+    hourly: 8760 rows, one per hour (as before)
+    daily: 365 rows, the sum of each day [Wh] (mean of the temperatures [°C])
+    monthly: 12 rows, the sum of each month [Wh] (mean of the temperatures [°C])
+    peaks: one row per variable with the maximum and minimum [W, °C], their hours (0 - 8759) and the full load hours
+           (annual sum / maximum [h], a measure of the load duration curve)
+    annual_only: no time series, only the annual summary
+
+The results are aggregated while the building is simulated: the results of each month are added to an accumulator of
+the granularity (see create_accumulator()), which keeps only the values of the granularity, e.g. 12 sums per variable
+for 'monthly'. Only the hourly granularity keeps the 8760 values of each variable. The aggregated results have a fixed
+size independent of the number of hours, so they are much smaller to keep in memory, to send from the worker
+processes, to cache and to save.
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import numpy as np
+import pandas as pd
+
+from building_stock import HOURLY_RESULTS
+
+GRANULARITIES = ('hourly', 'daily', 'monthly', 'peaks', 'annual_only')
+
+# Variables that are averaged instead of summed
+MEAN_VARIABLES = ('IndoorAirTemperature', 'OutsideTemperature')
+
+# Hour of the day, not aggregated
+TIME_VARIABLES = ('Daytime',)
+
+DAYS_PER_MONTH = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+HOURS = 8760
+
+# First hour of each day and of each month of the year (8760 hours, no leap year)
+DAY_STARTS = np.arange(0, 8760, 24)
+MONTH_STARTS = np.cumsum([0] + DAYS_PER_MONTH[:-1]) * 24
+
+
+def check_granularity(granularity):
+    """
+    Raises ValueError if granularity is not one of GRANULARITIES
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError('Unknown granularity ' + str(granularity) + ', use one of ' + ', '.join(GRANULARITIES))
+
+
+class AnnualAccumulator(object):
+    """
+    Annual sums of the results of a building, which are added in blocks of consecutive hours (e.g. one month) while the
+    building is simulated. Accumulator of 'annual_only' and base class of the other accumulators.
+
+    Methods:
+        add: Adds the results of a block of hours
+        sums: Annual sum of each variable
+        frame: Results in the granularity
+
+    :param variables: Variables of the results (TIME_VARIABLES are not aggregated)
+    :type variables: list of str
+    """
+
+    def __init__(self, variables=HOURLY_RESULTS):
+
+        self.variables = [variable for variable in variables if variable not in TIME_VARIABLES]
+        self.totals = np.zeros(len(self.variables))
+
+    def add(self, start, block):
+        """
+        Adds the results of a block of hours
+
+        :param start: First hour of the block (0 - 8759)
+        :type start: int
+        :param block: Results of the hours of the block, same number of values of each variable
+        :type block: dict of array_like
+        """
+        values = np.array([np.asarray(block[variable], dtype=float) for variable in self.variables])
+        sums = values.sum(axis=1)
+        self.totals += sums
+        self.add_values(start, values, sums)
+
+    def add_values(self, start, values, sums):
+        """
+        Adds the values (variables x hours) and their sums of a block, nothing besides the annual sums
+        """
+        pass
+
+    def sums(self):
+        """
+        Returns the annual sum of each variable [Wh]
+
+        :rtype: dict
+        """
+        return dict(zip(self.variables, self.totals))
+
+    def frame(self):
+        """
+        Returns the results in the granularity, None as there is no time series besides the annual sums
+        """
+        return None
+
+
+class PeriodAccumulator(AnnualAccumulator):
+    """
+    Sum (mean of MEAN_VARIABLES) of each period, e.g. of each day or month
+
+    :param starts: First hour of each period
+    :type starts: np.ndarray
+    :param index: Columns of the periods in the results, e.g. {'month': np.arange(1, 13)}
+    :type index: dict of np.ndarray
+    :param variables: Variables of the results
+    :type variables: list of str
+    """
+
+    def __init__(self, starts, index, variables=HOURLY_RESULTS):
+
+        super().__init__(variables)
+        self.starts = np.asarray(starts)
+        self.index = index
+        self.period_sums = np.zeros((len(self.variables), len(self.starts)))
+
+    def add_values(self, start, values, sums):
+        # Periods of the hours of the block and the first hour of each of them in the block
+        end = start + values.shape[1]
+        first = np.searchsorted(self.starts, start, side='right') - 1
+        last = np.searchsorted(self.starts, end, side='left')
+        offsets = np.maximum(self.starts[first:last], start) - start
+        self.period_sums[:, first:last] += np.add.reduceat(values, offsets, axis=1)
+
+    def frame(self):
+        hours = np.diff(np.append(self.starts, HOURS))
+        periods = dict(self.index)
+        for variable, sums in zip(self.variables, self.period_sums):
+            periods[variable] = sums / hours if variable in MEAN_VARIABLES else sums
+        return pd.DataFrame(periods)
+
+
+class PeakAccumulator(AnnualAccumulator):
+    """
+    Maximum, minimum, their hours (first hour of equal values) and the full load hours (annual sum / maximum) of each
+    variable
+    """
+
+    def __init__(self, variables=HOURLY_RESULTS):
+
+        super().__init__(variables)
+        self.maximum = np.full(len(self.variables), -np.inf)
+        self.minimum = np.full(len(self.variables), np.inf)
+        self.hour_of_max = np.zeros(len(self.variables), dtype=int)
+        self.hour_of_min = np.zeros(len(self.variables), dtype=int)
+
+    def add_values(self, start, values, sums):
+        rows = np.arange(len(self.variables))
+        hour_of_max = np.argmax(values, axis=1)
+        hour_of_min = np.argmin(values, axis=1)
+        larger = values[rows, hour_of_max] > self.maximum
+        smaller = values[rows, hour_of_min] < self.minimum
+        self.maximum[larger] = values[rows, hour_of_max][larger]
+        self.hour_of_max[larger] = start + hour_of_max[larger]
+        self.minimum[smaller] = values[rows, hour_of_min][smaller]
+        self.hour_of_min[smaller] = start + hour_of_min[smaller]
+
+    def frame(self):
+        full_load_hours = [np.nan if variable in MEAN_VARIABLES or maximum <= 0 else total / maximum
+                           for variable, maximum, total in zip(self.variables, self.maximum, self.totals)]
+        return pd.DataFrame({'variable': self.variables, 'max': self.maximum, 'hour_of_max': self.hour_of_max,
+                             'min': self.minimum, 'hour_of_min': self.hour_of_min,
+                             'full_load_hours': full_load_hours})
+
+
+class HourlyAccumulator(AnnualAccumulator):
+    """
+    Values of all hours of each variable (also of TIME_VARIABLES), the blocks must be added in the order of the hours
+    """
+
+    def __init__(self, variables=HOURLY_RESULTS):
+
+        self.variables = list(variables)
+        # Blocks of each variable
+        self.blocks = {variable: [] for variable in self.variables}
+
+    def add(self, start, block):
+        for variable in self.variables:
+            self.blocks[variable].append(np.asarray(block[variable]))
+
+    @property
+    def hourly(self):
+        """
+        Values of all hours of each variable, int if all values of a variable are int (e.g. 0 without cooling)
+
+        :rtype: dict of np.ndarray
+        """
+        return {variable: np.concatenate(blocks) for variable, blocks in self.blocks.items()}
+
+    def sums(self):
+        hourly = self.hourly
+        return {variable: hourly[variable].sum() for variable in self.variables if variable not in TIME_VARIABLES}
+
+    def frame(self):
+        return pd.DataFrame(self.hourly)
+
+
+def create_accumulator(granularity, variables=HOURLY_RESULTS):
+    """
+    Returns the accumulator of a granularity
+
+    :param granularity: One of GRANULARITIES
+    :type granularity: str
+    :param variables: Variables of the results
+    :type variables: list of str
+    :return: accumulator, results of the granularity with frame()
+    :rtype: AnnualAccumulator
+    """
+    check_granularity(granularity)
+
+    if granularity == 'hourly':
+        return HourlyAccumulator(variables)
+    if granularity == 'annual_only':
+        return AnnualAccumulator(variables)
+    if granularity == 'peaks':
+        return PeakAccumulator(variables)
+    if granularity == 'daily':
+        return PeriodAccumulator(DAY_STARTS, {'day': np.arange(1, len(DAY_STARTS) + 1),
+                                              'month': np.repeat(np.arange(1, 13), DAYS_PER_MONTH)}, variables)
+    return PeriodAccumulator(MONTH_STARTS, {'month': np.arange(1, 13)}, variables)
+
+
+def aggregate(hourly, granularity, variables=HOURLY_RESULTS):
+    """
+    Returns the results of a building in the granularity, for hourly results of all hours that are already calculated
+
+    :param hourly: Hourly results, 8760 values of each variable
+    :type hourly: dict or pd.DataFrame
+    :param granularity: One of GRANULARITIES
+    :type granularity: str
+    :param variables: Variables of the results
+    :type variables: list of str
+    :return: results in the granularity, None for 'annual_only'
+    :rtype: pd.DataFrame or None
+    """
+    accumulator = create_accumulator(granularity, variables)
+    accumulator.add(0, hourly)
+    return accumulator.frame()
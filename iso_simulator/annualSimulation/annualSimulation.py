@@ -3,11 +3,29 @@ Dynamic ISO Building Simulator (DIBS)
 
 HOW TO USE
 
-:: Install packages: pandas, numpy, namedlist and geopy 
-:: Simulate either 'Tiefenerhebung' or 'Breitenerhebung' 
-:: Specify in --> WhatToSimulate
-:: Run Simulation
-:: Results are stored in ./results/
+:: Install packages: pandas, numpy, namedlist and geopy (pyarrow for --output-format parquet)
+:: Run the simulation from the command line, all settings are arguments (see python annualSimulation.py --help):
+    python annualSimulation.py --building-data-file SimulationData_Tiefenerhebung.csv --weather-period 2004-2018 --workers 4 --output-format parquet
+:: Input file --> --building-data-file: csv file with the parameters of the buildings,
+   e.g. SimulationData_Breitenerhebung.csv (default) or SimulationData_Tiefenerhebung.csv
+:: Weather period --> --weather-period: '2007-2021' (default) or '2004-2018'
+:: Norms --> --profile-from-norm (gains per person and appliance gains), --gains-from-group-values (low, mid or max)
+   and --usage-from-norm (usage time): 'din18599' (DIN V 18599-10) or 'sia2024' (SIA 2024)
+:: Solver of the heating/cooling demand --> --solver: 'crank_nicolson' or 'closed_form'
+:: Engine --> --engine: 'building' (one building after another) or 'building_stock' (the buildings of each chunk
+   together, see building_stock.py, crank_nicolson only)
+:: Parallel processes --> --workers (default: number of CPUs) and --chunk-size (buildings sent to a process at once)
+:: Grouping by weather station --> --station-window: consecutive buildings grouped by weather station and occupancy
+   schedule, so that the data of a station is prepared once per chunk (0: in the order of the building data file)
+:: Time series of each building --> --granularity: 'hourly', 'daily', 'monthly', 'peaks' or 'annual_only'
+:: Output backend --> --output-format: 'csv', 'parquet', 'excel' or 'store', in the folder --results-path
+   (default: ./results/)
+:: An aborted simulation can be continued with --resume (see ./results/journal.jsonl)
+:: Unchanged buildings are taken from a cache of the results with --result-cache
+:: Weighted load profiles of the stock by group with --load-profiles and --load-profile-weight
+:: Time of the phases of the simulation with --profile (see ./results/profile.json)
+
+The defaults of the arguments are set below.
 
 
 Portions of this software are copyright of their respective authors and released under the MIT license:
@@ -32,876 +50,308 @@ mainPath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, mainPath)
 
 # Import more packages
-import numpy as np
+import argparse
+
 import pandas as pd
 
 # Import modules
-from collections import namedtuple
-from building_physics import Building
-import supply_system
-import emission_system
-from radiation import Location
-from radiation import Window
-from auxiliary import scheduleReader
-from auxiliary import normReader
-from auxiliary import TEKReader
+import lca
+from simulation import SimulationContext
+from simulation import ENGINES
+from simulation import simulate_stock
+from simulation import read_buildings
+from result_sink import create_sink
+from result_sink import SINKS
+from aggregation import GRANULARITIES
+from result_cache import ResultCache
+from checkpoint import CheckpointJournal
+from profiling import profiler
 
 import time
 
-# Create dictionary to store final DataFrames of the buildings
-dict_of_results = {}
-list_of_summary = []
+# Folder of this script, default paths of building data and results are relative to it (not to the working directory)
+scriptPath = os.path.dirname(os.path.abspath(__file__))
+
+# Defaults of the command line arguments, see parse_arguments()
 
-# WhatToSimulate
-# Read data with all the buildings from csv file    
-# building_data = pd.read_csv('SimulationData_Tiefenerhebung.csv', sep = ';', index_col = False, encoding = 'utf8') 
-building_data = pd.read_csv('SimulationData_Breitenerhebung.csv', sep=';', index_col=False, encoding='utf8')
+# Read data with all the buildings from csv file
+# building_data_file = 'SimulationData_Tiefenerhebung.csv'
+building_data_file = 'SimulationData_Breitenerhebung.csv'
 
 # What weather data periode to use for simulation
 # weather_period = "2004-2018"
 weather_period = "2007-2021"
 
-
-# Create namedlist of building_data for further iterations
-def iterate_namedlist(building_data):
-    Row = namedtuple('Gebaeude', building_data.columns)
-    for row in building_data.itertuples():
-        yield Row(*row[1:])
-
-
-namedlist_of_buildings = list(iterate_namedlist(building_data))
-
-# Read Emission and Primary Energy Factors
-
-GWP_PE_Factors = pd.read_csv('LCA/Primary_energy_and_emission_factors.csv', sep=';', decimal=',', index_col=False,
-                             encoding='cp1250')
-
-length_iteration = len(namedlist_of_buildings)
-
-# Outer loop: Iterate over all buildings in namedlist_of_buildings       
-for iteration, i_gebaeudeparameter in enumerate(namedlist_of_buildings):
+# How to solve the heating/cooling demand of each time step, see Building in building_physics.py
+# 'crank_nicolson' follows the steps of ISO 13790 Annex C, 'closed_form' gives the same results with less calculations
+# solver = "closed_form"
+solver = "crank_nicolson"
+
+# How the buildings are simulated, see simulation.py
+# 'building' simulates one building after another, 'building_stock' the buildings of each chunk (--chunk-size)
+# together in one loop over the hours of the year (same results, solver 'crank_nicolson' only)
+# engine = 'building_stock'
+engine = 'building'
+
+# Get information from DIN V 18599-10 or SIA 2024 for gain_per_person and appliance_gains depending on
+# hk_geb, uk_geb
+# Assignments see Excel/CSV-File in /auxiliary/norm_profiles/profiles_DIN18599_SIA2024
+din = 'din18599'
+sia = 'sia2024'
+low_values = 'low'
+mid_values = 'mid'
+max_values = 'max'
+
+profile_from_norm = din  # Choose here where to pick data from
+gains_from_group_values = mid_values  # Choose here here between low, mid or max values
+usage_from_norm = sia  # Choose here where to pick the usage time from
+
+# Number of processes simulating the buildings (None: number of CPUs, 1: no additional processes)
+# and number of buildings sent to a process at once
+workers = None
+chunk_size = 16
+
+# Number of consecutive buildings grouped by weather station and occupancy schedule (0: in the order of the
+# building data file). Each chunk holds the buildings of one group, so that the weather and solar data of a station is
+# prepared once per chunk. The results are saved in the order of the building data file anyway
+station_window = 256
+
+# Time series of the results of each building (the annual summary is always saved)
+# 'hourly': 8760 hours, 'daily': sums of 365 days, 'monthly': sums of 12 months, 'peaks': maximum, minimum and full
+# load hours of each variable, 'annual_only': summary only (see aggregation.py)
+granularity = 'hourly'
+
+# File format of the results, the hourly results and the annual sums of each building are saved right after its
+# simulation, the LCA columns are added to the summary at the end
+# 'csv': *BuildingID*.csv and annualResults_summary.csv
+# 'parquet': hourly/scr_gebaeude_id=*BuildingID*/part-0.parquet and annualResults_summary.parquet (requires pyarrow)
+# 'excel': *BuildingID*.xlsx and annualResults_summary.xlsx (slow, annualResults_summary.xlsx is saved at the end)
+# 'store': hourly_store/ with the hourly results of all buildings (see hourly_store.py) and annualResults_summary.csv
+output_format = 'csv'
+results_path = os.path.join(scriptPath, 'results')
+
+# Folder of the cache of the results (None: no cache), only changed buildings are simulated again, and its maximum size
+result_cache_path = None
+result_cache_size = 10  # in GB
+
+# Weighted hourly load profiles of the stock (electricity and fossil fuels), saved as load_profiles.csv and
+# load_profile_groups.csv in the results folder (see load_profiles.py)
+# Groups: a column of the building data (e.g. 'hk_geb' or a federal state column), 'fuel_type' (energy carrier of the
+# heating supply system), 'all' (one group) or None (no load profiles)
+load_profile_groups = None
+# Column of the building data with the extrapolation weight of each building (None: each building counts once)
+load_profile_weight_column = None
+
+# Measure the time of the phases of the simulation (weather data, reference data, solar gains, heating/cooling demand,
+# supply systems, LCA, saving of the results), saved as profile.json and profile.folded (for flamegraph.pl)
+# in the results folder
+profile = False
+
+
+def parse_arguments(argv=None):
+    """
+    Reads the settings from the command line, settings not given keep the values above
+
+    :param argv: Command line arguments (None: sys.argv)
+    :type argv: list of str or None
+    :return: settings of the simulation
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description='Dynamic ISO Building Simulator (DIBS): annual simulation of buildings')
+    parser.add_argument('--building-data-file', default=os.path.join(scriptPath, building_data_file),
+                        help='csv file with the parameters of the buildings')
+    parser.add_argument('--weather-period', default=weather_period, choices=['2007-2021', '2004-2018'])
+    parser.add_argument('--profile-from-norm', default=profile_from_norm, choices=[din, sia],
+                        help='where to pick gain_per_person and appliance_gains from')
+    parser.add_argument('--gains-from-group-values', default=gains_from_group_values,
+                        choices=[low_values, mid_values, max_values])
+    parser.add_argument('--usage-from-norm', default=usage_from_norm, choices=[din, sia],
+                        help='where to pick the usage time from')
+    parser.add_argument('--solver', default=solver, choices=['crank_nicolson', 'closed_form'])
+    parser.add_argument('--engine', default=engine, choices=list(ENGINES),
+                        help="'building_stock': simulate the buildings of each chunk together")
+    parser.add_argument('--workers', type=int, default=workers,
+                        help='number of processes simulating the buildings (default: number of CPUs)')
+    parser.add_argument('--chunk-size', type=int, default=chunk_size,
+                        help='number of buildings sent to a process at once')
+    parser.add_argument('--station-window', type=int, default=station_window,
+                        help='number of consecutive buildings grouped by weather station (0: not grouped)')
+    parser.add_argument('--granularity', default=granularity, choices=list(GRANULARITIES),
+                        help='time series of the results of each building')
+    parser.add_argument('--output-format', default=output_format, choices=list(SINKS))
+    parser.add_argument('--results-path', default=results_path, help='folder of the result files')
+    parser.add_argument('--result-cache', default=result_cache_path,
+                        help='folder of the cache of the results, only changed buildings are simulated again')
+    parser.add_argument('--result-cache-size', type=float, default=result_cache_size,
+                        help='maximum size of the cache of the results in GB')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue an aborted simulation, buildings in journal.jsonl of the results folder '
+                             'are not simulated again')
+    parser.add_argument('--load-profiles', default=load_profile_groups, metavar='GROUP_BY',
+                        help="save the weighted hourly load profiles of the stock by group: a column of the building "
+                             "data, 'fuel_type' or 'all'")
+    parser.add_argument('--load-profile-weight', default=load_profile_weight_column, metavar='COLUMN',
+                        help='column of the building data with the extrapolation weight of each building')
+    parser.add_argument('--profile', action='store_true', default=profile,
+                        help='measure the time of the phases of the simulation, saved as profile.json and '
+                             'profile.folded in the results folder')
+    args = parser.parse_args(argv)
+    if args.output_format == 'store' and args.granularity != 'hourly':
+        parser.error('--output-format store saves hourly results only, use --granularity hourly')
+    if args.engine == 'building_stock' and args.solver != 'crank_nicolson':
+        parser.error('--engine building_stock requires --solver crank_nicolson')
+    if args.load_profiles is not None:
+        # Buildings of the cache or of the journal are not simulated again, they would be missing in the load profiles
+        if args.result_cache is not None or args.resume:
+            parser.error('--load-profiles can not be combined with --result-cache or --resume')
+        columns = pd.read_csv(args.building_data_file, sep=';', nrows=0, encoding='utf8').columns
+        if args.load_profiles not in ('all', 'fuel_type') and args.load_profiles not in columns:
+            parser.error('column ' + args.load_profiles + ' is not in ' + args.building_data_file)
+        if args.load_profile_weight is not None and args.load_profile_weight not in columns:
+            parser.error('column ' + args.load_profile_weight + ' is not in ' + args.building_data_file)
+    elif args.load_profile_weight is not None:
+        parser.error('--load-profile-weight requires --load-profiles')
+    return args
+
+
+def main(argv=None):
+    """
+    Simulates all buildings of the building data file and saves the results
+
+    :param argv: Command line arguments (None: sys.argv)
+    :type argv: list of str or None
+    """
+    args = parse_arguments(argv)
+
+    if args.profile:
+        profiler.enable()
+
+    # Parameters of all buildings, one namedtuple per building
+    namedlist_of_buildings = list(read_buildings(args.building_data_file))
+
+    # Reference data, weather stations, weather files and LCA factors are loaded once (and once per process)
+    context = SimulationContext(weather_period=args.weather_period, profile_from_norm=args.profile_from_norm,
+                                gains_from_group_values=args.gains_from_group_values,
+                                usage_from_norm=args.usage_from_norm, solver=args.solver, engine=args.engine,
+                                granularity=args.granularity,
+                                load_profiles=None if args.load_profiles is None else
+                                {'group_by': None if args.load_profiles == 'all' else args.load_profiles,
+                                 'weight_column': args.load_profile_weight},
+                                lca_per_building=False)
+
+    # Writer of the results, saves the hourly results and the annual sums of each building right away
+    sink = create_sink(args.output_format, args.results_path, resume=args.resume)
+
+    # Journal of the simulated buildings, to continue with --resume if the simulation is aborted
+    journal = CheckpointJournal(os.path.join(args.results_path, 'journal.jsonl'), resume=args.resume)
+    if args.resume:
+        completed_ids = journal.completed_ids()
+        print("Resuming simulation,", len(completed_ids), "buildings are already simulated")
+        namedlist_of_buildings = [building for building in namedlist_of_buildings
+                                  if building.scr_gebaeude_id not in completed_ids]
+        # The summary contains the buildings simulated before, their hourly results are already saved
+        for summary in journal.summaries():
+            sink.write_summary(summary)
+
+    length_iteration = len(namedlist_of_buildings)
+
+    # Results of buildings simulated before with the same data
+    if args.result_cache is not None:
+        result_cache = ResultCache(args.result_cache, max_size=int(args.result_cache_size * 1024 ** 3))
+    else:
+        result_cache = None
 
     # take time for calculation of one building
     start_time_building = time.time()
 
-    # Empty Lists to store data
-    HeatingDemand = []
-    HeatingEnergy = []
-    Heating_Sys_Electricity = []
-    Heating_Sys_Fossils = []
-    CoolingDemand = []
-    CoolingEnergy = []
-    Cooling_Sys_Electricity = []
-    Cooling_Sys_Fossils = []
-    HotWaterDemand = []
-    HotWaterEnergy = []
-    HotWater_Sys_Electricity = []
-    HotWater_Sys_Fossils = []
-    TempAir = []
-    OutsideTemp = []
-    LightingDemand = []
-    InternalGains = []
-    Appliance_gains_demands = []
-    Appliance_gains_elt_demands = []
-    SolarGainsSouthWindow = []
-    SolarGainsEastWindow = []
-    SolarGainsWestWindow = []
-    SolarGainsNorthWindow = []
-    SolarGainsTotal = []
-    DayTime = []
-    hotwaterdemand = 0
-    hotwaterenergy = 0
-    HotWaterSysElectricity = 0
-    HotWaterSysFossils = 0
-
-    # Initialise an instance of the building
-    BuildingInstance = Building(scr_gebaeude_id=i_gebaeudeparameter.scr_gebaeude_id,
-                                plz=i_gebaeudeparameter.plz,
-                                hk_geb=i_gebaeudeparameter.hk_geb,
-                                uk_geb=i_gebaeudeparameter.uk_geb,
-                                max_occupancy=i_gebaeudeparameter.max_occupancy,
-                                wall_area_og=i_gebaeudeparameter.wall_area_og,
-                                wall_area_ug=i_gebaeudeparameter.wall_area_ug,
-                                window_area_north=i_gebaeudeparameter.window_area_north,
-                                window_area_east=i_gebaeudeparameter.window_area_east,
-                                window_area_south=i_gebaeudeparameter.window_area_south,
-                                window_area_west=i_gebaeudeparameter.window_area_west,
-                                roof_area=i_gebaeudeparameter.roof_area,
-                                net_room_area=i_gebaeudeparameter.net_room_area,
-                                base_area=i_gebaeudeparameter.base_area,
-                                energy_ref_area=i_gebaeudeparameter.energy_ref_area,
-                                building_height=i_gebaeudeparameter.building_height,
-                                lighting_load=i_gebaeudeparameter.lighting_load,
-                                lighting_control=i_gebaeudeparameter.lighting_control,
-                                lighting_utilisation_factor=i_gebaeudeparameter.lighting_utilisation_factor,
-                                lighting_maintenance_factor=i_gebaeudeparameter.lighting_maintenance_factor,
-                                glass_solar_transmittance=i_gebaeudeparameter.glass_solar_transmittance,
-                                glass_solar_shading_transmittance=i_gebaeudeparameter.glass_solar_shading_transmittance,
-                                glass_light_transmittance=i_gebaeudeparameter.glass_light_transmittance,
-                                u_windows=i_gebaeudeparameter.u_windows,
-                                u_walls=i_gebaeudeparameter.u_walls,
-                                u_roof=i_gebaeudeparameter.u_roof,
-                                u_base=i_gebaeudeparameter.u_base,
-                                temp_adj_base=i_gebaeudeparameter.temp_adj_base,
-                                temp_adj_walls_ug=i_gebaeudeparameter.temp_adj_walls_ug,
-                                ach_inf=i_gebaeudeparameter.ach_inf,
-                                ach_win=i_gebaeudeparameter.ach_win,
-                                ach_vent=i_gebaeudeparameter.ach_vent,
-                                heat_recovery_efficiency=i_gebaeudeparameter.heat_recovery_efficiency,
-                                thermal_capacitance=i_gebaeudeparameter.thermal_capacitance,
-                                t_start=i_gebaeudeparameter.t_start,
-                                t_set_heating=i_gebaeudeparameter.t_set_heating,
-                                t_set_cooling=i_gebaeudeparameter.t_set_cooling,
-                                night_flushing_flow=i_gebaeudeparameter.night_flushing_flow,
-                                max_cooling_energy_per_floor_area=i_gebaeudeparameter.max_cooling_energy_per_floor_area,
-                                max_heating_energy_per_floor_area=i_gebaeudeparameter.max_heating_energy_per_floor_area,
-                                heating_supply_system=getattr(supply_system, i_gebaeudeparameter.heating_supply_system),
-                                cooling_supply_system=getattr(supply_system, i_gebaeudeparameter.cooling_supply_system),
-                                heating_emission_system=getattr(emission_system,
-                                                                i_gebaeudeparameter.heating_emission_system),
-                                cooling_emission_system=getattr(emission_system,
-                                                                i_gebaeudeparameter.cooling_emission_system))
-
-    # If there's no heated area (energy_ref_area == -8) or no heating supply system (heating_supply_system == 'NoHeating')
-    # no heating demand can be calculated. In this case skip calculation and proceed with next building.
-    if (i_gebaeudeparameter.energy_ref_area == -8) | (i_gebaeudeparameter.heating_supply_system == 'NoHeating'):
-        print('Building ' + str(i_gebaeudeparameter.scr_gebaeude_id) + ' not heated')
-        continue
-    else:
-        pass
-
-    # Initialize the buildings location with a weather file from the nearest weather station depending on the plz
-    getEPWFile_list = Location.getEPWFile(BuildingInstance.plz, weather_period)
-    epw_filename = getEPWFile_list[0]
-    if (weather_period == "2007-2021"):
-        building_location = Location(
-            epwfile_path=os.path.join(mainPath, 'auxiliary/weather_data/weather_data_TMYx_2007_2021', epw_filename))
-    else:
-        building_location = Location(epwfile_path=os.path.join(mainPath, 'auxiliary/weather_data', epw_filename))
-
-    # Distance from weather station to the building
-    distance = getEPWFile_list[2]
-
-    # Extract coordinates of that weather station. Necessary for calc_sun_position()
-    latitude_station = getEPWFile_list[1][0]
-    longitude_station = getEPWFile_list[1][1]
-
-    # Define windows for each compass direction
-    SouthWindow = Window(azimuth_tilt=0, alititude_tilt=90,
-                         glass_solar_transmittance=BuildingInstance.glass_solar_transmittance,
-                         glass_solar_shading_transmittance=BuildingInstance.glass_solar_shading_transmittance,
-                         glass_light_transmittance=BuildingInstance.glass_light_transmittance,
-                         area=BuildingInstance.window_area_south)
-    EastWindow = Window(azimuth_tilt=90, alititude_tilt=90,
-                        glass_solar_transmittance=BuildingInstance.glass_solar_transmittance,
-                        glass_solar_shading_transmittance=BuildingInstance.glass_solar_shading_transmittance,
-                        glass_light_transmittance=BuildingInstance.glass_light_transmittance,
-                        area=BuildingInstance.window_area_east)
-    WestWindow = Window(azimuth_tilt=180, alititude_tilt=90,
-                        glass_solar_transmittance=BuildingInstance.glass_solar_transmittance,
-                        glass_solar_shading_transmittance=BuildingInstance.glass_solar_shading_transmittance,
-                        glass_light_transmittance=BuildingInstance.glass_light_transmittance,
-                        area=BuildingInstance.window_area_west)
-    NorthWindow = Window(azimuth_tilt=270, alititude_tilt=90,
-                         glass_solar_transmittance=BuildingInstance.glass_solar_transmittance,
-                         glass_solar_shading_transmittance=BuildingInstance.glass_solar_shading_transmittance,
-                         glass_light_transmittance=BuildingInstance.glass_light_transmittance,
-                         area=BuildingInstance.window_area_north)
-
-    # Get information from DIN V 18599-10 or SIA 2024 for gain_per_person and appliance_gains depending on 
-    # hk_geb, uk_geb
-    # Assignments see Excel/CSV-File in /auxiliary/norm_profiles/profiles_DIN18599_SIA2024
-    din = 'din18599'
-    sia = 'sia2024'
-    low_values = 'low'
-    mid_values = 'mid'
-    max_values = 'max'
-
-    profile_from_norm = din  # Choose here where to pick data from
-    gains_from_group_values = mid_values  # Choose here here between low, mid or max values
-    gain_per_person, appliance_gains, typ_norm = normReader.getGains(BuildingInstance.hk_geb, BuildingInstance.uk_geb,
-                                                                     profile_from_norm, gains_from_group_values)
-
-    # Get usage time of the specific building from DIN V 18599-10 or SIA2024
-    usage_from_norm = sia
-    usage_start, usage_end = normReader.getUsagetime(BuildingInstance.hk_geb, BuildingInstance.uk_geb, usage_from_norm)
-
-    # Read specific occupancy schedule
-    # Assignments see Excel/CSV-File in /auxiliary/occupancy_schedules/
-    occupancy_schedule, schedule_name = scheduleReader.getSchedule(BuildingInstance.hk_geb, BuildingInstance.uk_geb)
-
-    TEK_dhw, TEK_name = TEKReader.getTEK(BuildingInstance.hk_geb, BuildingInstance.uk_geb)  # TEK_dhw in kWh/m2*a
-    # print(TEK_name)
-    # print(TEK_dhw)
-    Occupancy_Full_Usage_Hours = occupancy_schedule.People.sum()  # in h/a
-    TEK_dhw_per_Occupancy_Full_Usage_Hour = TEK_dhw / Occupancy_Full_Usage_Hours  # in kWh/m2*h
-
-    # Starting temperature of the building. Set to t_start
-    t_m_prev = BuildingInstance.t_start
-
-    ## Inner Loop: Loop through all 8760 hours of the year
-    for hour in range(8760):
-
-        # Initialize t_set_heating at the beginning of each time step, due to BuildingInstance.t_set_heating = 0 if night flushing is active
-        # (Also see below)
-        BuildingInstance.t_set_heating = i_gebaeudeparameter.t_set_heating
-
-        # Extract the outdoor temperature in building_location for that hour from weather_data
-        t_out = building_location.weather_data['drybulb_C'][hour]
-
-        # Call calc_sun_position(). Depending on latitude, longitude, year and hour - Independent from epw weather_data
-        Altitude, Azimuth = building_location.calc_sun_position(
-            latitude_deg=latitude_station, longitude_deg=longitude_station,
-            year=building_location.weather_data['year'][hour], hoy=hour)
-
-        # Calculate H_ve_adj, See building_physics for details
-        BuildingInstance.h_ve_adj = BuildingInstance.calc_h_ve_adj(hour, t_out, usage_start, usage_end)
-
-        # Set t_set_heating = 0 for the time step, otherwise the heating system heats up during night flushing is on
-        # BuildingInstance.t_set_heating = 0
-
-        # Define t_air for calc_solar_gains(). Starting condition (hour==0) necessary for first time step  
-        if hour == 0:
-            t_air = round(BuildingInstance.t_set_heating, 2)
-        else:
-            t_air = round(BuildingInstance.t_air, 2)
-
-        # Calculate solar gains and illuminance through each window    
-        SouthWindow.calc_solar_gains(sun_altitude=Altitude, sun_azimuth=Azimuth,
-                                     normal_direct_radiation=building_location.weather_data[
-                                         'dirnorrad_Whm2'][hour],
-                                     horizontal_diffuse_radiation=building_location.weather_data['difhorrad_Whm2'][
-                                         hour],
-                                     t_air=t_air, hour=hour)
-
-        SouthWindow.calc_illuminance(sun_altitude=Altitude, sun_azimuth=Azimuth,
-                                     normal_direct_illuminance=building_location.weather_data[
-                                         'dirnorillum_lux'][hour],
-                                     horizontal_diffuse_illuminance=building_location.weather_data['difhorillum_lux'][
-                                         hour])
-
-        EastWindow.calc_solar_gains(sun_altitude=Altitude, sun_azimuth=Azimuth,
-                                    normal_direct_radiation=building_location.weather_data[
-                                        'dirnorrad_Whm2'][hour],
-                                    horizontal_diffuse_radiation=building_location.weather_data['difhorrad_Whm2'][hour],
-                                    t_air=t_air, hour=hour)
-
-        EastWindow.calc_illuminance(sun_altitude=Altitude, sun_azimuth=Azimuth,
-                                    normal_direct_illuminance=building_location.weather_data[
-                                        'dirnorillum_lux'][hour],
-                                    horizontal_diffuse_illuminance=building_location.weather_data['difhorillum_lux'][
-                                        hour])
-
-        WestWindow.calc_solar_gains(sun_altitude=Altitude, sun_azimuth=Azimuth,
-                                    normal_direct_radiation=building_location.weather_data[
-                                        'dirnorrad_Whm2'][hour],
-                                    horizontal_diffuse_radiation=building_location.weather_data['difhorrad_Whm2'][hour],
-                                    t_air=t_air, hour=hour)
-
-        WestWindow.calc_illuminance(sun_altitude=Altitude, sun_azimuth=Azimuth,
-                                    normal_direct_illuminance=building_location.weather_data[
-                                        'dirnorillum_lux'][hour],
-                                    horizontal_diffuse_illuminance=building_location.weather_data['difhorillum_lux'][
-                                        hour])
-
-        NorthWindow.calc_solar_gains(sun_altitude=Altitude, sun_azimuth=Azimuth,
-                                     normal_direct_radiation=building_location.weather_data[
-                                         'dirnorrad_Whm2'][hour],
-                                     horizontal_diffuse_radiation=building_location.weather_data['difhorrad_Whm2'][
-                                         hour],
-                                     t_air=t_air, hour=hour)
-
-        NorthWindow.calc_illuminance(sun_altitude=Altitude, sun_azimuth=Azimuth,
-                                     normal_direct_illuminance=building_location.weather_data[
-                                         'dirnorillum_lux'][hour],
-                                     horizontal_diffuse_illuminance=building_location.weather_data['difhorillum_lux'][
-                                         hour])
-
-        # Occupancy for the time step
-        occupancy_percent = occupancy_schedule.loc[hour, 'People']
-        occupancy = occupancy_schedule.loc[hour, 'People'] * BuildingInstance.max_occupancy
-
-        # Calculate the lighting of the building for the time step
-        BuildingInstance.solve_building_lighting(illuminance=
-                                                 SouthWindow.transmitted_illuminance +
-                                                 EastWindow.transmitted_illuminance +
-                                                 WestWindow.transmitted_illuminance +
-                                                 NorthWindow.transmitted_illuminance,
-                                                 occupancy=occupancy_percent)
-
-        # Calculate gains from occupancy and appliances
-        # This is thermal gains. Negative appliance_gains are heat sinks!
-        internal_gains = occupancy * gain_per_person + \
-                         appliance_gains * occupancy_schedule.loc[
-                             hour, 'Appliances'] * BuildingInstance.energy_ref_area + \
-                         BuildingInstance.lighting_demand
-
-        # Calculate appliance_gains as part of the internal_gains
-        Appliance_gains_demand = appliance_gains * occupancy_schedule.loc[
-            hour, 'Appliances'] * BuildingInstance.energy_ref_area
-
-        # Appliance_gains equal the electric energy that appliances use, except for negative appliance_gains of refrigerated counters in trade buildings for food!
-        if appliance_gains < 0:
-            appliance_gains_elt = -1 * appliance_gains / 2
-            # The assumption is: negative appliance_gains come from referigerated counters with heat pumps for which we assume a COP = 2.            
-        else:
-            appliance_gains_elt = appliance_gains
-
-        Appliance_gains_elt_demand = appliance_gains_elt * occupancy_schedule.loc[
-            hour, 'Appliances'] * BuildingInstance.energy_ref_area
-
-        # Calculate energy demand for the time step             
-        BuildingInstance.solve_building_energy(internal_gains=internal_gains,
-                                               solar_gains=
-                                               SouthWindow.solar_gains +
-                                               EastWindow.solar_gains +
-                                               WestWindow.solar_gains +
-                                               NorthWindow.solar_gains,
-                                               t_out=t_out, t_m_prev=t_m_prev)
-
-        # Calculate hot water usage of the building for the time step
-        # with (BuildingInstance.heating_energy / BuildingInstance.heating_demand) represents the Efficiency of the heat generation in the building
-        if i_gebaeudeparameter.dhw_system != 'NoDHW' and i_gebaeudeparameter.dhw_system != ' -':
-            hotwaterdemand = occupancy_schedule.loc[
-                                 hour, 'People'] * TEK_dhw_per_Occupancy_Full_Usage_Hour * 1000 * BuildingInstance.energy_ref_area  # in W
-
-            if BuildingInstance.heating_demand > 0:  # catch devision by zero error
-                hotwaterenergy = hotwaterdemand * (BuildingInstance.heating_energy / BuildingInstance.heating_demand)
-            else:
-                hotwaterenergy = hotwaterdemand
-
-            if (i_gebaeudeparameter.dhw_system == 'DecentralElectricDHW') or \
-                    (((i_gebaeudeparameter.dhw_system == 'CentralHeating') | (
-                            i_gebaeudeparameter.dhw_system == 'CentralDHW')) \
-                     and ((i_gebaeudeparameter.heating_supply_system == 'HeatPumpAirSource') | (
-                                    i_gebaeudeparameter.heating_supply_system == 'HeatPumpGroundSource') | \
-                          (i_gebaeudeparameter.heating_supply_system == 'ElectricHeating'))):
-                HotWaterSysElectricity = hotwaterenergy
-                HotWaterSysFossils = 0
-            else:
-                HotWaterSysFossils = hotwaterenergy
-                HotWaterSysElectricity = 0
-        else:
-            hotwaterdemand = 0
-            hotwaterenergy = 0
-            HotWaterSysElectricity = 0
-            HotWaterSysFossils = 0
-
-        # Set the previous temperature for the next time step
-        t_m_prev = BuildingInstance.t_m_next
-
-        # Append results to the created lists  
-        HeatingDemand.append(BuildingInstance.heating_demand)
-        HeatingEnergy.append(BuildingInstance.heating_energy)
-        Heating_Sys_Electricity.append(BuildingInstance.heating_sys_electricity)
-        Heating_Sys_Fossils.append(BuildingInstance.heating_sys_fossils)
-        CoolingDemand.append(BuildingInstance.cooling_demand)
-        CoolingEnergy.append(BuildingInstance.cooling_energy)
-        Cooling_Sys_Electricity.append(BuildingInstance.cooling_sys_electricity)
-        Cooling_Sys_Fossils.append(BuildingInstance.cooling_sys_fossils)
-        HotWaterDemand.append(hotwaterdemand)
-        HotWaterEnergy.append(hotwaterenergy)
-        HotWater_Sys_Electricity.append(HotWaterSysElectricity)
-        HotWater_Sys_Fossils.append(HotWaterSysFossils)
-        TempAir.append(BuildingInstance.t_air)
-        OutsideTemp.append(t_out)
-        LightingDemand.append(BuildingInstance.lighting_demand)
-        InternalGains.append(internal_gains)
-        Appliance_gains_demands.append(Appliance_gains_demand)
-        Appliance_gains_elt_demands.append(Appliance_gains_elt_demand)
-        SolarGainsSouthWindow.append(SouthWindow.solar_gains)
-        SolarGainsEastWindow.append(EastWindow.solar_gains)
-        SolarGainsWestWindow.append(WestWindow.solar_gains)
-        SolarGainsNorthWindow.append(NorthWindow.solar_gains)
-        SolarGainsTotal.append(
-            SouthWindow.solar_gains + EastWindow.solar_gains + WestWindow.solar_gains + NorthWindow.solar_gains)
-        DayTime.append(hour % 24)
-
-    # hier endet die Inner Loop
-
-    # DataFrame with hourly results of specific building 
-    hourlyResults = pd.DataFrame({
-        'HeatingDemand': HeatingDemand,
-        'HeatingEnergy': HeatingEnergy,
-        'Heating_Sys_Electricity': Heating_Sys_Electricity,
-        'Heating_Sys_Fossils': Heating_Sys_Fossils,
-        'CoolingDemand': CoolingDemand,
-        'CoolingEnergy': CoolingEnergy,
-        'Cooling_Sys_Electricity': Cooling_Sys_Electricity,
-        'Cooling_Sys_Fossils': Cooling_Sys_Fossils,
-        'HotWaterDemand': HotWaterDemand,
-        'HotWaterEnergy': HotWaterEnergy,
-        'HotWater_Sys_Electricity': HotWater_Sys_Electricity,
-        'HotWater_Sys_Fossils': HotWater_Sys_Fossils,
-        'IndoorAirTemperature': TempAir,
-        'OutsideTemperature': OutsideTemp,
-        'LightingDemand': LightingDemand,
-        'InternalGains': InternalGains,
-        'Appliance_gains_demands': Appliance_gains_demands,
-        'Appliance_gains_elt_demands': Appliance_gains_elt_demands,
-        'SolarGainsSouthWindow': SolarGainsSouthWindow,
-        'SolarGainsEastWindow': SolarGainsEastWindow,
-        'SolarGainsWestWindow': SolarGainsWestWindow,
-        'SolarGainsNorthWindow': SolarGainsNorthWindow,
-        'SolarGainsTotal': SolarGainsTotal,
-        'Daytime': DayTime,
-    })
-
-    # Count iteration (amount of buildings), add GebäudeID to the DataFrame and put 
-    # DataFrame to the dictionary (dict_of_results)
-    hourlyResults['iteration'] = iteration
-    hourlyResults['GebäudeID'] = i_gebaeudeparameter.scr_gebaeude_id
-    dict_of_results[i_gebaeudeparameter.scr_gebaeude_id] = hourlyResults.copy()
-
-    # Some calculations used for the console prints
-    HeatingDemand_sum = hourlyResults.HeatingDemand.sum() / 1000
-    HeatingEnergy_sum = hourlyResults.HeatingEnergy.sum() / 1000
-    Heating_Sys_Electricity_sum = hourlyResults.Heating_Sys_Electricity.sum() / 1000
-    Heating_Sys_Fossils_sum = hourlyResults.Heating_Sys_Fossils.sum() / 1000
-    CoolingDemand_sum = hourlyResults.CoolingDemand.sum() / 1000
-    CoolingEnergy_sum = hourlyResults.CoolingEnergy.sum() / 1000
-    Cooling_Sys_Electricity_sum = hourlyResults.Cooling_Sys_Electricity.sum() / 1000
-    Cooling_Sys_Fossils_sum = hourlyResults.Cooling_Sys_Fossils.sum() / 1000
-    HotWaterDemand_sum = hourlyResults.HotWaterDemand.sum() / 1000
-    HotWaterEnergy_sum = hourlyResults.HotWaterEnergy.sum() / 1000
-    HotWater_Sys_Electricity_sum = hourlyResults.HotWater_Sys_Electricity.sum() / 1000
-    HotWater_Sys_Fossils_sum = hourlyResults.HotWater_Sys_Fossils.sum() / 1000
-    InternalGains_sum = hourlyResults.InternalGains.sum() / 1000
-    Appliance_gains_demand_sum = hourlyResults.Appliance_gains_demands.sum() / 1000
-    Appliance_gains_elt_demand_sum = hourlyResults.Appliance_gains_elt_demands.sum() / 1000
-    LightingDemand_sum = hourlyResults.LightingDemand.sum() / 1000
-    SolarGainsSouthWindow_sum = hourlyResults.SolarGainsSouthWindow.sum() / 1000
-    SolarGainsEastWindow_sum = hourlyResults.SolarGainsEastWindow.sum() / 1000
-    SolarGainsWestWindow_sum = hourlyResults.SolarGainsWestWindow.sum() / 1000
-    SolarGainsNorthWindow_sum = hourlyResults.SolarGainsNorthWindow.sum() / 1000
-    SolarGainsTotal_sum = hourlyResults.SolarGainsTotal.sum() / 1000
-
-    # the fuel-related final energy sums, f.i. HeatingEnergy_sum, are calculated based upon the superior heating value Hs
-    # since the corresponding expenditure factors from TEK 9.24 represent the ration of Hs-related final energy to useful energy
-
-    # ------------------------------------------------------------------------------------------------------------------------------
-    # Carbon Emissions, Primary Energy and Hi-related Final Energy
-    # ------------------------------------------------------------------------------------------------------------------------------
-
-    # Calculation  related to HEATING and Hotwater energy
-
-    if (i_gebaeudeparameter.heating_supply_system == 'BiogasBoilerCondensingBefore95') \
-            | (i_gebaeudeparameter.heating_supply_system == 'BiogasBoilerCondensingFrom95'):
-        Fuel_Type = 'Biogas (general)'
-    elif (i_gebaeudeparameter.heating_supply_system == 'BiogasOilBoilerLowTempBefore95') \
-            | (i_gebaeudeparameter.heating_supply_system == 'BiogasOilBoilerCondensingFrom95') \
-            | (i_gebaeudeparameter.heating_supply_system == 'BiogasOilBoilerCondensingImproved'):
-        Fuel_Type = 'Biogas Bio-oil Mix (general)'
-    elif (i_gebaeudeparameter.heating_supply_system == 'OilBoilerStandardBefore86') \
-            | (i_gebaeudeparameter.heating_supply_system == 'OilBoilerStandardFrom95') \
-            | (i_gebaeudeparameter.heating_supply_system == 'OilBoilerLowTempBefore87') \
-            | (i_gebaeudeparameter.heating_supply_system == 'OilBoilerLowTempBefore95') \
-            | (i_gebaeudeparameter.heating_supply_system == 'OilBoilerLowTempFrom95') \
-            | (i_gebaeudeparameter.heating_supply_system == 'OilBoilerCondensingBefore95') \
-            | (i_gebaeudeparameter.heating_supply_system == 'OilBoilerCondensingFrom95') \
-            | (i_gebaeudeparameter.heating_supply_system == 'OilBoilerCondensingImproved'):
-        Fuel_Type = 'Light fuel oil'
-    elif (i_gebaeudeparameter.heating_supply_system == 'LGasBoilerLowTempBefore95') | \
-            (i_gebaeudeparameter.heating_supply_system == 'LGasBoilerLowTempFrom95') | \
-            (i_gebaeudeparameter.heating_supply_system == 'LGasBoilerCondensingBefore95') | \
-            (i_gebaeudeparameter.heating_supply_system == 'LGasBoilerCondensingFrom95') | \
-            (i_gebaeudeparameter.heating_supply_system == 'LGasBoilerCondensingImproved') | \
-            (i_gebaeudeparameter.heating_supply_system == 'LGasBoilerLowTempBefore87'):
-        Fuel_Type = 'Natural gas'
-    elif (i_gebaeudeparameter.heating_supply_system == 'GasBoilerStandardBefore86') | \
-            (i_gebaeudeparameter.heating_supply_system == 'GasBoilerStandardBefore95') | \
-            (i_gebaeudeparameter.heating_supply_system == 'GasBoilerStandardFrom95') | \
-            (i_gebaeudeparameter.heating_supply_system == 'GasBoilerLowTempBefore87') | \
-            (i_gebaeudeparameter.heating_supply_system == 'GasBoilerLowTempBefore95') | \
-            (i_gebaeudeparameter.heating_supply_system == 'GasBoilerLowTempFrom95') | \
-            (i_gebaeudeparameter.heating_supply_system == 'GasBoilerLowTempSpecialFrom78') | \
-            (i_gebaeudeparameter.heating_supply_system == 'GasBoilerLowTempSpecialFrom95') | \
-            (i_gebaeudeparameter.heating_supply_system == 'GasBoilerCondensingBefore95') | \
-            (i_gebaeudeparameter.heating_supply_system == 'GasBoilerCondensingImproved') | \
-            (i_gebaeudeparameter.heating_supply_system == 'GasBoilerCondensingFrom95'):
-        Fuel_Type = 'Natural gas'
-    elif (i_gebaeudeparameter.heating_supply_system == 'WoodChipSolidFuelBoiler') | \
-            (i_gebaeudeparameter.heating_supply_system == 'WoodPelletSolidFuelBoiler') | \
-            (i_gebaeudeparameter.heating_supply_system == 'WoodSolidFuelBoilerCentral'):
-        Fuel_Type = 'Wood'
-    elif (i_gebaeudeparameter.heating_supply_system == 'CoalSolidFuelBoiler'):
-        Fuel_Type = 'Hard coal'
-    elif (i_gebaeudeparameter.heating_supply_system == 'SolidFuelLiquidFuelFurnace'):
-        Fuel_Type = 'Hard coal'
-    elif (i_gebaeudeparameter.heating_supply_system == 'HeatPumpAirSource') | \
-            (i_gebaeudeparameter.heating_supply_system == 'HeatPumpGroundSource'):
-        Fuel_Type = 'Electricity grid mix'
-    elif (i_gebaeudeparameter.heating_supply_system == 'GasCHP'):
-        Fuel_Type = 'Natural gas'
-    elif (i_gebaeudeparameter.heating_supply_system == 'DistrictHeating'):
-        Fuel_Type = 'District heating (Combined Heat and Power) Gas or Liquid fuels'
-    elif (i_gebaeudeparameter.heating_supply_system == 'ElectricHeating'):
-        Fuel_Type = 'Electricity grid mix'
-    elif (i_gebaeudeparameter.heating_supply_system == 'DirectHeater'):
-        Fuel_Type = 'District heating (Combined Heat and Power) Coal'
-    elif (i_gebaeudeparameter.heating_supply_system == 'NoHeating'):
-        Fuel_Type = 'None'
-    else:
-        print(
-            "Error occured during calculation of GHG-Emission for Heating. The following heating_supply_system cannot be considered yet",
-            i_gebaeudeparameter.heating_supply_system)
-
-    # HEATING
-    # GHG-Faktor Heating
-    f_GHG = GWP_PE_Factors.loc[
-        GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'GWP spezific to heating value GEG [g/kWh]']
-    f_GHG = f_GHG.iloc[0]
-
-    # PE-Faktor Heating
-    f_PE = GWP_PE_Factors.loc[GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'Primary Energy Factor GEG   [-]']
-    f_PE = f_PE.iloc[0]
-
-    # Umrechnungsfaktor von Brennwert (Hs) zu Heizwert (Hi) einlesen
-    f_Hs_Hi = GWP_PE_Factors.loc[
-        GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'Relation Calorific to Heating Value GEG  [-]']
-    f_Hs_Hi = f_Hs_Hi.iloc[0]
-
-    Heating_Sys_Electricity_Hi_sum = 0
-    Heating_Sys_Fossils_Hi_sum = 0
-
-    if Heating_Sys_Electricity_sum > 0:
-        Heating_Sys_Electricity_Hi_sum = Heating_Sys_Electricity_sum / f_Hs_Hi  # for kWhHi Final Energy Demand
-        Heating_Sys_Carbon_sum = (Heating_Sys_Electricity_Hi_sum * f_GHG) / 1000  # for kg CO2eq
-        Heating_Sys_PE_sum = Heating_Sys_Electricity_Hi_sum * f_PE  # for kWh Primary Energy Demand
-    else:
-        Heating_Sys_Fossils_Hi_sum = Heating_Sys_Fossils_sum / f_Hs_Hi  # for kWhHi Final Energy Demand
-        Heating_Sys_Carbon_sum = (Heating_Sys_Fossils_Hi_sum * f_GHG) / 1000  # for kg CO2eq
-        Heating_Sys_PE_sum = Heating_Sys_Fossils_Hi_sum * f_PE  # for kWh Primary Energy Demand
-
-    Heating_Sys_Hi_sum = Heating_Sys_Electricity_Hi_sum + Heating_Sys_Fossils_Hi_sum
-
-    Heating_fuel_type = Fuel_Type
-    Heating_f_GHG = f_GHG
-    Heating_f_PE = f_PE
-    Heating_f_Hs_Hi = f_Hs_Hi
-
-    # HOT WATER
-    # Assumption: Central DHW-Systems use the same Fuel_type as Heating-Systems, only decentral DHW-Systems might have another Fuel-Type
-    if (i_gebaeudeparameter.dhw_system == 'DecentralElectricDHW'):
-        Fuel_Type = 'Electricity grid mix'
-    elif (i_gebaeudeparameter.dhw_system == 'DecentralFuelBasedDHW'):
-        Fuel_Type = 'Natural gas'
-    else:
-        Fuel_Type = Heating_fuel_type
-
-    # GHG-Faktor Hotwater        
-    f_GHG = GWP_PE_Factors.loc[
-        GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'GWP spezific to heating value GEG [g/kWh]']
-    f_GHG = f_GHG.iloc[0]
-
-    # PE-Faktor Hotwater
-    f_PE = GWP_PE_Factors.loc[GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'Primary Energy Factor GEG   [-]']
-    f_PE = f_PE.iloc[0]
-
-    # Umrechnungsfaktor von Brennwert (Hs) zu Heizwert (Hi) einlesen
-    f_Hs_Hi = GWP_PE_Factors.loc[
-        GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'Relation Calorific to Heating Value GEG  [-]']
-    f_Hs_Hi = f_Hs_Hi.iloc[0]
-
-    HotWater_Sys_Electricity_Hi_sum = 0
-    HotWater_Sys_Fossils_Hi_sum = 0
-
-    if HotWater_Sys_Electricity_sum > 0:
-        HotWater_Sys_Electricity_Hi_sum = HotWater_Sys_Electricity_sum / f_Hs_Hi  # for kWhHi Final Energy Demand
-        HotWater_Sys_PE_sum = HotWater_Sys_Electricity_Hi_sum * f_PE  # for kWh Primary Energy Demand
-        HotWater_Sys_Carbon_sum = (HotWater_Sys_Electricity_Hi_sum * f_GHG) / 1000  # for kg CO2eq
-    else:
-        HotWater_Sys_Fossils_Hi_sum = HotWater_Sys_Fossils_sum / f_Hs_Hi
-        HotWater_Sys_PE_sum = HotWater_Sys_Fossils_Hi_sum * f_PE  # for kWh Primary Energy Demand
-        HotWater_Sys_Carbon_sum = (HotWater_Sys_Fossils_Hi_sum * f_GHG) / 1000  # for kg CO2eq
-
-    HotWaterEnergy_Hi_sum = HotWater_Sys_Electricity_Hi_sum + HotWater_Sys_Fossils_Hi_sum
-
-    Hotwater_fuel_type = Fuel_Type
-    Hotwater_f_GHG = f_GHG
-    Hotwater_f_PE = f_PE
-    Hotwater_f_Hs_Hi = f_Hs_Hi
-
-    # Cooling energy
-
-    if (i_gebaeudeparameter.cooling_supply_system == 'AirCooledPistonScroll') \
-            | (i_gebaeudeparameter.cooling_supply_system == 'AirCooledPistonScrollMulti') \
-            | (i_gebaeudeparameter.cooling_supply_system == 'WaterCooledPistonScroll') \
-            | (i_gebaeudeparameter.cooling_supply_system == 'DirectCooler'):
-        Fuel_Type = 'Electricity grid mix'
-    elif (i_gebaeudeparameter.cooling_supply_system == 'AbsorptionRefrigerationSystem'):
-        Fuel_Type = 'Waste Heat generated close to building'
-    elif (i_gebaeudeparameter.cooling_supply_system == 'DistrictCooling'):
-        Fuel_Type = 'District cooling'
-    elif (i_gebaeudeparameter.cooling_supply_system == 'GasEnginePistonScroll'):
-        Fuel_Type = 'Natural gas'
-    elif (i_gebaeudeparameter.cooling_supply_system == 'NoCooling'):
-        Fuel_Type = 'None'
-    else:
-        print(
-            "Error occured during calculation of GHG-Emission for Cooling. The following cooling_supply_system cannot be considered yet",
-            i_gebaeudeparameter.cooling_supply_system)
-
-    # GEG-Faktor Cooling
-    # warum hier nochmal definieren??? Weil anderer Fuel_Type!!
-    f_GHG = GWP_PE_Factors.loc[
-        GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'GWP spezific to heating value GEG [g/kWh]']
-    f_GHG = f_GHG.iloc[0]  # Selects first row (0) value
-
-    # PE-Faktor Cooling
-    f_PE = GWP_PE_Factors.loc[GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'Primary Energy Factor GEG   [-]']
-    f_PE = f_PE.iloc[0]
-
-    # Umrechnungsfaktor von Brennwert (Hs) zu Heizwert (Hi) einlesen
-    f_Hs_Hi = GWP_PE_Factors.loc[
-        GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'Relation Calorific to Heating Value GEG  [-]']
-    f_Hs_Hi = f_Hs_Hi.iloc[0]
-
-    Cooling_Sys_Electricity_Hi_sum = 0
-    Cooling_Sys_Fossils_Hi_sum = 0
-
-    if Cooling_Sys_Electricity_sum > 0:
-        Cooling_Sys_Electricity_Hi_sum = Cooling_Sys_Electricity_sum / f_Hs_Hi  # for kWhHi Final Energy Demand
-        Cooling_Sys_Carbon_sum = (Cooling_Sys_Electricity_Hi_sum * f_GHG) / 1000  # for kg CO2eq
-        Cooling_Sys_PE_sum = Cooling_Sys_Electricity_Hi_sum * f_PE  # for kWh Primary Energy Demand
-    else:
-        Cooling_Sys_Fossils_Hi_sum = Cooling_Sys_Fossils_sum / f_Hs_Hi  # for kWhHi Final Energy Demand
-        Cooling_Sys_Carbon_sum = (Cooling_Sys_Fossils_Hi_sum * f_GHG) / 1000  # for kg CO2eq
-        Cooling_Sys_PE_sum = Cooling_Sys_Fossils_Hi_sum * f_PE  # for kWh Primary Energy Demand
-
-    Cooling_Sys_Hi_sum = Cooling_Sys_Electricity_Hi_sum + Cooling_Sys_Fossils_Hi_sum
-
-    Cooling_fuel_type = Fuel_Type
-    Cooling_f_GHG = f_GHG
-    Cooling_f_PE = f_PE
-    Cooling_f_Hs_Hi = f_Hs_Hi
-
-    # remaining Electric energy (LightingDemand_sum + Appliance_gains_elt_demand_sum)
-    # Lighting
-    Fuel_Type = 'Electricity grid mix'
-    f_GHG = GWP_PE_Factors.loc[
-        GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'GWP spezific to heating value GEG [g/kWh]']
-    f_GHG = f_GHG.iloc[0]
-
-    # PE-Faktor Lighting
-    f_PE = GWP_PE_Factors.loc[GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'Primary Energy Factor GEG   [-]']
-    f_PE = f_PE.iloc[0]
-
-    # Umrechnungsfaktor von Brennwert (Hs) zu Heizwert (Hi) einlesen
-    f_Hs_Hi = GWP_PE_Factors.loc[
-        GWP_PE_Factors['Energy Carrier'] == Fuel_Type, 'Relation Calorific to Heating Value GEG  [-]']
-    f_Hs_Hi = f_Hs_Hi.iloc[0]
-
-    # electrical energy for lighting
-    LightingDemand_Hi_sum = LightingDemand_sum / f_Hs_Hi  # for kWhHi Final Energy Demand
-    LightingDemand_Carbon_sum = (LightingDemand_Hi_sum * f_GHG) / 1000  # for kg CO2eq
-    LightingDemand_PE_sum = LightingDemand_Hi_sum * f_PE  # for kWhHs Primary Energy Demand
-
-    # electrical energy for Appliances
-    Appliance_gains_demand_Hi_sum = Appliance_gains_elt_demand_sum / f_Hs_Hi  # for kWhHi Final Energy Demand
-    Appliance_gains_demand_PE_sum = Appliance_gains_demand_Hi_sum * f_PE  # for kWhHs Primary Energy Demand
-    Appliance_gains_demand_Carbon_sum = (Appliance_gains_demand_Hi_sum * f_GHG) / 1000  # for kg CO2eq
-
-    LightAppl_fuel_type = Fuel_Type
-    LightAppl_f_GHG = f_GHG
-    LightAppl_f_PE = f_PE
-    LightAppl_f_Hs_Hi = f_Hs_Hi
-
-    # Calculation of Carbon Emission related to the entire energy consumption (Heating_Sys_Carbon_sum + Cooling_Sys_Carbon_sum + LightingDemand_Carbon_sum + Appliance_gains_demand_Carbon_sum)
-    Carbon_sum = Heating_Sys_Carbon_sum + Cooling_Sys_Carbon_sum + LightingDemand_Carbon_sum + Appliance_gains_demand_Carbon_sum + HotWater_Sys_Carbon_sum
-    # Calculation of Primary Energy Demand related to the entire energy consumption (Heating_Sys_PE_sum + Cooling_Sys_PE_sum + LightingDemand_PE_sum + Appliance_gains_demand_PE_sum + HotWater_Sys_PE_sum)
-    PE_sum = Heating_Sys_PE_sum + Cooling_Sys_PE_sum + LightingDemand_PE_sum + Appliance_gains_demand_PE_sum + HotWater_Sys_PE_sum
-    # Calculation of Final Energy Hi Demand related to the entire energy consumption
-    FE_Hi_sum = Heating_Sys_Hi_sum + Cooling_Sys_Hi_sum + LightingDemand_Hi_sum + Appliance_gains_demand_Hi_sum + HotWaterEnergy_Hi_sum
-
-    # ---------------------------------------------------------------------------------------- 
-
-    # ------------------------------------------------------------------------------------------------------------------------------
-    # Print selected Results in Console
-    # ------------------------------------------------------------------------------------------------------------------------------
-
-    print("# ", iteration)
-    print("hk_geb:", BuildingInstance.hk_geb)
-    print("GebäudeID:", i_gebaeudeparameter.scr_gebaeude_id)
-    # print("HeatingDemand [kwh]:", HeatingDemand_sum)
-    # print("HeatingDemand [kwh/m2]:", HeatingDemand_sum/BuildingInstance.energy_ref_area)
-    # print("HeatingEnergy [kwh]:", HeatingEnergy_sum)
-    # print("HeatingEnergy_Hi [kwh]:", Heating_Sys_Hi_sum)
-    print("HeatingEnergy [kwh/m2]:", HeatingEnergy_sum / BuildingInstance.energy_ref_area)
-    # print("Heating_Sys_Electricity [kwh]:", Heating_Sys_Electricity_sum)
-    # print("Heating_Sys_Fossils [kwh]:", Heating_Sys_Fossils_sum)
-    # print("CoolingDemand [kwh]:", CoolingDemand_sum)
-    # print("CoolingDemand [kwh/m2]:", CoolingDemand_sum/BuildingInstance.energy_ref_area)
-    # print("CoolingEnergy [kwh]:", CoolingEnergy_sum)
-    print("CoolingEnergy [kwh/m2]:", CoolingEnergy_sum / BuildingInstance.energy_ref_area)
-    # print("Cooling_Sys_Electricity [kwh]:", Cooling_Sys_Electricity_sum)
-    # print("Cooling_Sys_Fossils [kwh]:", Cooling_Sys_Fossils_sum)
-    # print("HotWaterDemand [kwh]:", HotWaterDemand_sum) 
-    # print("HotWaterDemand [kwh/m2]:", HotWaterDemand_sum/BuildingInstance.energy_ref_area) 
-    # print("HotWaterEnergy [kwh]:", HotWaterEnergy_sum) 
-    print("HotWaterEnergy [kwh/m2]:", HotWaterEnergy_sum / BuildingInstance.energy_ref_area)
-    # print("HotWater_Sys_Electricity [kwh]:", HotWater_Sys_Electricity_sum) 
-    # print("HotWater_Sys_Fossils [kwh]:", HotWater_Sys_Fossils_sum) 
-    # print("HotWaterEnergy_Hi [kwh]:", HotWaterEnergy_Hi_sum) 
-    # print("HotWater_Sys_GWP [kg]:", HotWater_Sys_Carbon_sum)
-    print("LightingDemand [kwh]:", LightingDemand_sum)
-    print("Appliance_gains_demand [kWh]:", Appliance_gains_demand_sum)
-    print("Appliance_gains_elt_demand [kWh]:", Appliance_gains_elt_demand_sum)
-    print("InternalGains [kwh]:", InternalGains_sum)
-    # print("SolarGainsSouthWindow [kwh]:", SolarGainsSouthWindow_sum)
-    # print("SolarGainsEastWindow [kwh]:", SolarGainsEastWindow_sum)
-    # print("SolarGainsWestWindow [kwh]:", SolarGainsWestWindow_sum)
-    # print("SolarGainsNorthWindow [kwh]:", SolarGainsNorthWindow_sum)
-    print("SolarGainsTotal [kwh]:", SolarGainsTotal_sum)
-    print("CarbonSumTotal [kgCO2e]:", Carbon_sum)
-    print("PrimaryEnergyTotal [kWh]:", PE_sum)
-    print("FinalEnergyTotal [kWhHi]:", FE_Hi_sum)
-    print("Heating_fuel_type:", Heating_fuel_type)
-    # print("Heating_f_GHG [g/kWhHi]:", Heating_f_GHG)
-    # print("Heating_f_PE [kWhPE/kWhHi]:",  Heating_f_PE)
-    # print("Heating_f_Hs_Hi [kWhHs/kWhHi]:", Heating_f_Hs_Hi)
-
-    # Summary of building to a separate DataFrame
-    annualResults_summary_temp = pd.DataFrame({
-        'GebäudeID': i_gebaeudeparameter.scr_gebaeude_id,
-        'EnergyRefArea': BuildingInstance.energy_ref_area,
-        'HeatingDemand [kWh]': HeatingDemand_sum,
-        'HeatingDemand [kwh/m2]': HeatingDemand_sum / BuildingInstance.energy_ref_area,
-        'HeatingEnergy [kWhHs]': HeatingEnergy_sum,
-        'HeatingEnergy [kwhHs/m2]': HeatingEnergy_sum / BuildingInstance.energy_ref_area,
-        'HeatingEnergy_Hi [kWhHi]': Heating_Sys_Hi_sum,
-        'Heating_Sys_Electricity [kWh]': Heating_Sys_Electricity_sum,
-        'Heating_Sys_Electricity [kwh/m2]': Heating_Sys_Electricity_sum / BuildingInstance.energy_ref_area,
-        'Heating_Sys_Electricity_Hi [kWhHi]': Heating_Sys_Electricity_Hi_sum,
-        'Heating_Sys_Fossils [kWhHs]': Heating_Sys_Fossils_sum,
-        'Heating_Sys_Fossils [kwhHs/m2]': Heating_Sys_Fossils_sum / BuildingInstance.energy_ref_area,
-        'Heating_Sys_Fossils_Hi [kWhHi]': Heating_Sys_Fossils_Hi_sum,
-        'Heating_Sys_GWP [kg]': Heating_Sys_Carbon_sum,
-        'Heating_Sys_GWP [kg/m2]': Heating_Sys_Carbon_sum / BuildingInstance.energy_ref_area,
-        'Heating_Sys_PE [kWh]': Heating_Sys_PE_sum,
-        'Heating_Sys_PE [kWh/m2]': Heating_Sys_PE_sum / BuildingInstance.energy_ref_area,
-        'CoolingDemand [kWh]': CoolingDemand_sum,
-        'CoolingDemand [kwh/m2]': CoolingDemand_sum / BuildingInstance.energy_ref_area,
-        'CoolingEnergy [kWhHs]': CoolingEnergy_sum,
-        'CoolingEnergy [kwhHs/m2]': CoolingEnergy_sum / BuildingInstance.energy_ref_area,
-        'Cooling_Sys_Electricity [kWh]': Cooling_Sys_Electricity_sum,
-        'Cooling_Sys_Electricity [kwh/m2]': Cooling_Sys_Electricity_sum / BuildingInstance.energy_ref_area,
-        'Cooling_Sys_Fossils [kWhHs]': Cooling_Sys_Fossils_sum,
-        'Cooling_Sys_Fossils [kwhHs/m2]': Cooling_Sys_Fossils_sum / BuildingInstance.energy_ref_area,
-        'Cooling_Sys_GWP [kg]': Cooling_Sys_Carbon_sum,
-        'Cooling_Sys_GWP [kg/m2]': Cooling_Sys_Carbon_sum / BuildingInstance.energy_ref_area,
-        'Cooling_Sys_PE [kWh]': Cooling_Sys_PE_sum,
-        'Cooling_Sys_PE [kWh/m2]': Cooling_Sys_PE_sum / BuildingInstance.energy_ref_area,
-        'HotWaterDemand [kwh]': HotWaterDemand_sum,
-        'HotWaterDemand [kwh/m2]': HotWaterDemand_sum / BuildingInstance.energy_ref_area,
-        'HotWaterEnergy [kwhHs]': HotWaterEnergy_sum,
-        'HotWaterEnergy [kwhHs/m2]': HotWaterEnergy_sum / BuildingInstance.energy_ref_area,
-        'HotWaterEnergy_Hi [kwhHi]': HotWaterEnergy_Hi_sum,
-        'HotWater_Sys_Electricity [kWh]': HotWater_Sys_Electricity_sum,
-        'HotWater_Sys_Fossils [kWhHs]': HotWater_Sys_Fossils_sum,
-        'HeatingSupplySystem': i_gebaeudeparameter.heating_supply_system,
-        'CoolingSupplySystem': i_gebaeudeparameter.cooling_supply_system,
-        'DHWSupplySystem': i_gebaeudeparameter.dhw_system,
-        'Heating_fuel_type': Heating_fuel_type,
-        'Heating_f_GHG [g/kWhHi]': Heating_f_GHG,
-        'Heating_f_PE [kWhPE/kWhHi]': Heating_f_PE,
-        'Heating_f_Hs_Hi [kWhHs/kWhHi]': Heating_f_Hs_Hi,
-        'Hotwater_fuel_type': Hotwater_fuel_type,
-        'Hotwater_f_GHG [g/kWhHi]': Hotwater_f_GHG,
-        'Hotwater_f_PE [kWhPE/kWhHi]': Hotwater_f_PE,
-        'Hotwater_f_Hs_Hi [kWhHs/kWhHi]': Hotwater_f_Hs_Hi,
-        'Cooling_fuel_type': Cooling_fuel_type,
-        'Cooling_f_GHG [g/kWhHi]': Cooling_f_GHG,
-        'Cooling_f_PE [kWhPE/kWhHi]': Cooling_f_PE,
-        'Cooling_f_Hs_Hi [kWhHs/kWhHi]': Cooling_f_Hs_Hi,
-        'LightAppl_fuel_type': LightAppl_fuel_type,
-        'LightAppl_f_GHG [g/kWhHi]': LightAppl_f_GHG,
-        'LightAppl_f_PE [kWhPE/kWhHi]': LightAppl_f_PE,
-        'LightAppl_f_Hs_Hi [kWhHs/kWhHi]': LightAppl_f_Hs_Hi,
-        'HotWater_Sys_GWP [kg]': HotWater_Sys_Carbon_sum,
-        'HotWater_Sys_GWP [kg/m2]': HotWater_Sys_Carbon_sum / BuildingInstance.energy_ref_area,
-        'HotWater_Sys_PE [kWh]': HotWater_Sys_PE_sum,
-        'HotWater_Sys_PE [kWh/m2]': HotWater_Sys_PE_sum / BuildingInstance.energy_ref_area,
-        'ElectricityDemandTotal [kWh]': Heating_Sys_Electricity_sum + HotWater_Sys_Electricity_sum + Cooling_Sys_Electricity_sum + LightingDemand_sum + Appliance_gains_elt_demand_sum,
-        'ElectricityDemandTotal [kwh/m2]': (
-                                                   Heating_Sys_Electricity_sum + HotWater_Sys_Electricity_sum + Cooling_Sys_Electricity_sum + LightingDemand_sum + Appliance_gains_elt_demand_sum) / BuildingInstance.energy_ref_area,
-        'FossilsDemandTotal [kWh]': Heating_Sys_Fossils_sum + Cooling_Sys_Fossils_sum,
-        'FossilsDemandTotal [kwh/m2]': (
-                                               Heating_Sys_Fossils_sum + Cooling_Sys_Fossils_sum) / BuildingInstance.energy_ref_area,
-        'LightingDemand [kWh]': LightingDemand_sum,
-        'LightingDemand_GWP [kg]': LightingDemand_Carbon_sum,
-        'LightingDemand_GWP [kg/m2]': LightingDemand_Carbon_sum / BuildingInstance.energy_ref_area,
-        'LightingDemand_PE [kWh]': LightingDemand_PE_sum,
-        'LightingDemand_PE [kWh/m2]': LightingDemand_PE_sum / BuildingInstance.energy_ref_area,
-        'Appliance_gains_demand [kWh]': Appliance_gains_demand_sum,
-        'Appliance_gains_elt_demand [kWh]': Appliance_gains_elt_demand_sum,
-        'Appliance_gains_demand_GWP [kg]': Appliance_gains_demand_Carbon_sum,
-        'Appliance_gains_demand_GWP [kg/m2]': Appliance_gains_demand_Carbon_sum / BuildingInstance.energy_ref_area,
-        'Appliance_gains_demand_PE [kWh]': Appliance_gains_demand_PE_sum,
-        'Appliance_gains_demand_PE [kWh/m2]': Appliance_gains_demand_PE_sum / BuildingInstance.energy_ref_area,
-        'GWP [kg]': Carbon_sum,
-        'GWP [kg/m2]': Carbon_sum / BuildingInstance.energy_ref_area,
-        'PE [kWh]': PE_sum,
-        'PE [kWh/m2]': PE_sum / BuildingInstance.energy_ref_area,
-        'FinalEnergy_Hi [kWhHi]': FE_Hi_sum,
-        'InternalGains [kWh]': InternalGains_sum,
-        'SolarGainsTotal [kWh]': SolarGainsTotal_sum,
-        'SolarGainsSouthWindow [kWh]': SolarGainsSouthWindow_sum,
-        'SolarGainsEastWindow [kWh]': SolarGainsEastWindow_sum,
-        'SolarGainsWestWindow [kWh]': SolarGainsWestWindow_sum,
-        'SolarGainsNorthWindow [kWh]': SolarGainsNorthWindow_sum,
-        'Gebäudefunktion Hauptkategorie': i_gebaeudeparameter.hk_geb,
-        'Gebäudefunktion Unterkategorie': i_gebaeudeparameter.uk_geb,
-        'Profil SIA 2024': [schedule_name],
-        'Profil 18599-10': [typ_norm],
-        'EPW-File': [epw_filename]
-    })
-    # Append DataFrame to list_of_summary
-    list_of_summary.append(annualResults_summary_temp)
-    # take end time for calculation of one building
-    end_time_building = time.time()
-    time_building = end_time_building - start_time_building
-    remaining_buildings = length_iteration - iteration
-    remaining_calculation_time_2_saving_annualResults_summary = (remaining_buildings * time_building) / 3600  # in Hours
-    calculation_time_4_saving_hourlyResults = (length_iteration * time_building) / 3600  # in Hours
-    remaining_time_total = remaining_calculation_time_2_saving_annualResults_summary + calculation_time_4_saving_hourlyResults  # in Hours
-    print("ETA:")
-    print("Estimated time for simulation and saving of annualResults_summary.xlsx",
-          remaining_calculation_time_2_saving_annualResults_summary, "hours")
-    print("Estimated time for simulation, saving of annualResults_summary.xlsx and saving of hourly results",
-          remaining_time_total, "hours")
-
-    # # Merge all summary DataFrames and save to disc 
-    # # Here every building is saved as seperate row in the excel file after it has been cacluated. In case of a crash, the results are saved.
-    # # THIS TAKES A LOT OF TIME; TURN OF IF NOT NEEDED -> THAN TURN ON SAVING OUTSIDE THE LOOP!
-    # # print("Saving annualResults_summary.xlsx")
-    # ################
-    # annualResults_summary = pd.concat(list_of_summary)
-    # annualResults_summary.to_excel(r'./results/annualResults_summary.xlsx', index = False)
-    # ################
-
-# hier endet outer loop pro Gebäude
-
-# Merge all summary DataFrames of all simulated buildings and save to disc
-# outside of LOOP, to save "save to Excel" time
-################
-annualResults_summary = pd.concat(list_of_summary)
-annualResults_summary.to_excel(r'./results/annualResults_summary.xlsx', index=False)
-################
-
-print(
-    "annualResults_summary.xlsx is now available in the DIBS---Dynamic-ISO-Building-Simulator\iso_simulator\annualSimulation\results folder")
-print("Saving hourly results of each building to *BuildingID*.xlsx")
-print(
-    "This might take as long or longer than the simulation of the buildings before. You can savely abort the script if only the annualResults_summary.xlsx data is requiered.")
-
-
-# The function writes DataFrames of dict_of_results to the system (to_excel)
-def save_dfs_dict(dictex):
-    for key, val in dictex.items():
-        val.to_excel(r'./results/{}.xlsx'.format(str(key)))
-
-
-save_dfs_dict(dict_of_results)
-print(
-    "Simulation Completed. All saved results can be found in the DIBS---Dynamic-ISO-Building-Simulator\iso_simulator\annualSimulation\results folder")
+    # Outer loop: Iterate over the results of all buildings in namedlist_of_buildings (in this order)
+    for result in simulate_stock(namedlist_of_buildings, context, workers=args.workers, chunk_size=args.chunk_size,
+                                 result_cache=result_cache, station_window=args.station_window):
+        iteration = result.iteration
+
+        # If there's no heated area (energy_ref_area == -8) or no heating supply system (heating_supply_system == 'NoHeating')
+        # no heating demand can be calculated. In this case the calculation was skipped, proceed with next building.
+        if result.status == 'not heated':
+            print('Building ' + str(result.scr_gebaeude_id) + ' not heated')
+            journal.write(result)
+            continue
+
+        # A failing building does not stop the simulation of the other buildings
+        if result.status == 'failed':
+            print('Simulation of building ' + str(result.scr_gebaeude_id) + ' failed:')
+            print(result.error)
+            journal.write(result)
+            continue
+
+        # Save the results of the building, they are not kept in memory
+        sink.write(result)
+        journal.write(result, hourly_path=sink.hourly_path(result.scr_gebaeude_id) if result.hourly is not None
+                      else None)
+
+        # ------------------------------------------------------------------------------------------------------------------------------
+        # Print selected Results in Console
+        # ------------------------------------------------------------------------------------------------------------------------------
+        summary = result.summary.iloc[0]
+
+        print("# ", iteration)
+        print("hk_geb:", summary['Gebäudefunktion Hauptkategorie'])
+        print("GebäudeID:", result.scr_gebaeude_id)
+        print("HeatingEnergy [kwh/m2]:", summary['HeatingEnergy [kwhHs/m2]'])
+        print("CoolingEnergy [kwh/m2]:", summary['CoolingEnergy [kwhHs/m2]'])
+        print("HotWaterEnergy [kwh/m2]:", summary['HotWaterEnergy [kwhHs/m2]'])
+        print("LightingDemand [kwh]:", summary['LightingDemand [kWh]'])
+        print("Appliance_gains_demand [kWh]:", summary['Appliance_gains_demand [kWh]'])
+        print("Appliance_gains_elt_demand [kWh]:", summary['Appliance_gains_elt_demand [kWh]'])
+        print("InternalGains [kwh]:", summary['InternalGains [kWh]'])
+        print("SolarGainsTotal [kwh]:", summary['SolarGainsTotal [kWh]'])
+
+        # take end time for calculation of one building
+        end_time_building = time.time()
+        time_building = end_time_building - start_time_building
+        start_time_building = end_time_building
+        remaining_buildings = length_iteration - iteration
+        remaining_calculation_time = (remaining_buildings * time_building) / 3600  # in Hours
+        print("ETA:")
+        print("Estimated time for simulation and saving of the results", remaining_calculation_time, "hours")
+
+    # hier endet outer loop pro Gebäude
+
+    # Carbon Emissions, Primary Energy and Hi-related Final Energy of all buildings (see lca.py): the summary saved
+    # above contains the annual sums of the buildings, it is read again in chunks and completed with the LCA columns
+    lca_totals = {}
+
+    def add_lca(summary):
+        summary = lca.recalculate_summary(summary, context.GWP_PE_Factors)
+        for column in ['GWP [kg]', 'PE [kWh]', 'FinalEnergy_Hi [kWhHi]']:
+            lca_totals[column] = lca_totals.get(column, 0) + summary[column].sum()
+        return summary
+
+    sink.rewrite_summary(add_lca, text_columns=lca.TEXT_COLUMNS)
+
+    if lca_totals:
+        print("CarbonSumTotal of all buildings [kgCO2e]:", lca_totals['GWP [kg]'])
+        print("PrimaryEnergyTotal of all buildings [kWh]:", lca_totals['PE [kWh]'])
+        print("FinalEnergyTotal of all buildings [kWhHi]:", lca_totals['FinalEnergy_Hi [kWhHi]'])
+
+    # Finish the result files
+    sink.close()
+    journal.close()
+
+    if result_cache is not None:
+        print(result_cache.report())
+
+    if context.load_profiles is not None:
+        context.load_profiles.write_csv(os.path.join(args.results_path, 'load_profiles.csv'),
+                                        groups_path=os.path.join(args.results_path, 'load_profile_groups.csv'))
+
+    if args.profile:
+        profiler.disable()
+        print(profiler.format())
+        profiler.write_json(os.path.join(args.results_path, 'profile.json'))
+        profiler.write_folded(os.path.join(args.results_path, 'profile.folded'))
+
+    print("Simulation Completed. All saved results can be found in the folder", args.results_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""
+Module with a catalog of the reference data of DIN V 18599 / SIA:2024, the occupancy schedules and the TEK values
+
+The functions of normReader, scheduleReader and TEKReader read their csv files on every call. ReferenceData reads
+all files once and returns the same values from dictionaries, so that it can be used for all buildings of a simulation.
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__credits__ = ""
+__license__ = "MIT"
+
+import os
+import pandas as pd
+
+from profiling import profiled
+
+
+class ReferenceData(object):
+    """
+    Catalog of the assignments of gains, usage times, occupancy schedules and TEK values to hk_geb/uk_geb
+
+    The rows of the assignment tables are found by uk_geb, hk_geb must be part of the table (as in normReader,
+    scheduleReader and TEKReader).
+
+    Methods:
+        getGains: Find data from DIN V 18599-10 or SIA2024
+        getUsagetime: Find building's usage time DIN 18599-10 or SIA2024
+        getSchedule: Find occupancy schedule from SIA2024
+        getTEK: Find TEK value for domestic hot water
+
+    :external input data: Assignments [../auxiliary/norm_profiles/profiles_zuweisungen.csv]
+                          Assignments [../auxiliary/occupancy_schedules/occupancy_schedules_zuweisungen.csv]
+                          Schedules [../auxiliary/occupancy_schedules/*schedule_name*.csv]
+                          Assignments [../auxiliary/TEKs/TEK_NWG_Vergleichswerte_zuweisung.csv]
+                          TEK values [../auxiliary/TEKs/TEK_NWG_Vergleichswerte.csv]
+
+    :param auxiliary_path: Directory of the auxiliary data
+    :type auxiliary_path: string
+    """
+
+    def __init__(self, auxiliary_path='../auxiliary'):
+
+        # Gains and usage times
+        gains_zuweisungen = pd.read_csv(os.path.join(auxiliary_path, 'norm_profiles/profiles_zuweisungen.csv'),
+                                        sep=';', encoding='latin')
+        self.gains_hk_geb = set(gains_zuweisungen['hk_geb'].values)
+        self.gains = {}
+        for uk_geb, row in gains_zuweisungen.groupby('uk_geb', sort=False):
+            # Same conversions as in normReader
+            self.gains[uk_geb] = {column: row[column].to_string(index=False).strip()
+                                  for column in gains_zuweisungen.columns}
+
+        # Occupancy schedules
+        schedule_zuweisungen = pd.read_csv(
+            os.path.join(auxiliary_path, 'occupancy_schedules/occupancy_schedules_zuweisungen.csv'),
+            sep=';', encoding='latin')
+        self.schedule_hk_geb = set(schedule_zuweisungen['hk_geb'].values)
+        self.schedule_names = {}
+        for uk_geb, row in schedule_zuweisungen.groupby('uk_geb', sort=False):
+            self.schedule_names[uk_geb] = row['schedule_name'].to_string(index=False).strip()
+
+        # Schedules are read on first use
+        self.schedule_path = os.path.join(auxiliary_path, 'occupancy_schedules')
+        self.schedules = {}
+
+        # TEK values for domestic hot water
+        tek_zuweisungen = pd.read_csv(os.path.join(auxiliary_path, 'TEKs/TEK_NWG_Vergleichswerte_zuweisung.csv'),
+                                      sep=';', decimal=',', encoding='cp1250')
+        DB_TEKs = pd.read_csv(os.path.join(auxiliary_path, 'TEKs/TEK_NWG_Vergleichswerte.csv'), sep=';',
+                              decimal=',', index_col=False, encoding='cp1250')
+        self.tek_hk_geb = set(tek_zuweisungen['hk_geb'].values)
+        # First row of each uk_geb and TEK_Category
+        self.tek_names = dict(zip(tek_zuweisungen['uk_geb'].iloc[::-1], tek_zuweisungen['TEK'].astype(str).iloc[::-1]))
+        self.tek_dhw = dict(zip(DB_TEKs['TEK_Category'].iloc[::-1], DB_TEKs['TEK Warmwasser'].astype(float).iloc[::-1]))
+
+    @profiled('getGains')
+    def getGains(self, hk_geb, uk_geb, profile_from_norm, gains_from_group_values):
+        """
+        Find data from DIN V 18599-10 or SIA2024, see normReader.getGains()
+
+        :param hk_geb: usage type (main category)
+        :type hk_geb: string
+        :param uk_geb: usage type (subcategory)
+        :type uk_geb: string
+        :param profile_from_norm: data source either 18599-10 or SIA2024 [specified in annualSimulation.py]
+        :type profile_from_norm: string
+        :param gains_from_group_values: group in norm low/medium/high [specified in annualSimulation.py]
+        :type gains_from_group_values: string
+
+        :return: gain_per_person, appliance_gains, typ_norm
+        :rtype: tuple (float, float, string)
+        """
+        row = self.getRow(self.gains, self.gains_hk_geb, hk_geb, uk_geb)
+
+        if profile_from_norm == 'sia2024':
+            typ_norm = row['typ_sia2024']
+            gain_per_person = float(row['gain_per_person_sia2024'])
+            appliance_gains_column = {'low': 'appliance_gains_ziel_sia2024',
+                                      'mid': 'appliance_gains_standard_sia2024',
+                                      'max': 'appliance_gains_bestand_sia2024'}[gains_from_group_values]
+
+        elif profile_from_norm == 'din18599':
+            typ_norm = row['typ_18599']
+            gain_per_person = float(row['gain_per_person_18599'])
+            appliance_gains_column = {'low': 'appliance_gains_tief_18599',
+                                      'mid': 'appliance_gains_mittel_18599',
+                                      'max': 'appliance_gains_hoch_18599'}[gains_from_group_values]
+
+        else:
+            raise ValueError('Unknown profile_from_norm ' + str(profile_from_norm))
+
+        return gain_per_person, float(row[appliance_gains_column]), typ_norm
+
+    @profiled('getUsagetime')
+    def getUsagetime(self, hk_geb, uk_geb, usage_from_norm):
+        """
+        Find building's usage time DIN 18599-10 or SIA2024, see normReader.getUsagetime()
+
+        :param hk_geb: usage type (main category)
+        :type hk_geb: string
+        :param uk_geb: usage type (subcategory)
+        :type uk_geb: string
+        :param usage_from_norm: data source either 18599-10 or SIA2024 [specified in annualSimulation.py]
+        :type usage_from_norm: string
+
+        :return: usage_start, usage_end
+        :rtype: tuple (int, int)
+        """
+        row = self.getRow(self.gains, self.gains_hk_geb, hk_geb, uk_geb)
+
+        if usage_from_norm == 'sia2024':
+            return int(row['usage_start_sia2024']), int(row['usage_end_sia2024'])
+
+        elif usage_from_norm == 'din18599':
+            return int(row['usage_start_18599']), int(row['usage_end_18599'])
+
+        else:
+            raise ValueError('Unknown usage_from_norm ' + str(usage_from_norm))
+
+    @profiled('getSchedule')
+    def getSchedule(self, hk_geb, uk_geb):
+        """
+        Find occupancy schedule from SIA2024, depending on hk_geb, uk_geb, see scheduleReader.getSchedule()
+
+        :param hk_geb: usage type (main category)
+        :type hk_geb: string
+        :param uk_geb: usage type (subcategory)
+        :type uk_geb: string
+
+        :return: schedule (read-only, fields People and Appliances for each hour), schedule_name
+        :rtype: np.recarray, string
+        """
+        schedule_name = self.getRow(self.schedule_names, self.schedule_hk_geb, hk_geb, uk_geb)
+
+        if schedule_name not in self.schedules:
+            df_schedule = pd.read_csv(os.path.join(self.schedule_path, schedule_name + '.csv'), sep=';')
+            schedule = df_schedule.to_records(index=False)
+            # The same schedule is shared by all buildings using it
+            schedule.flags.writeable = False
+            self.schedules[schedule_name] = schedule
+
+        return self.schedules[schedule_name], schedule_name
+
+    @profiled('getTEK')
+    def getTEK(self, hk_geb, uk_geb):
+        """
+        Find TEK value for domestic hot water depending on hk_geb, uk_geb, see TEKReader.getTEK()
+
+        :param hk_geb: usage type (main category)
+        :type hk_geb: string
+        :param uk_geb: usage type (subcategory)
+        :type uk_geb: string
+
+        :return: TEK_dhw, TEK_name
+        :rtype: float, string
+        """
+        TEK_name = self.getRow(self.tek_names, self.tek_hk_geb, hk_geb, uk_geb)
+
+        if TEK_name not in self.tek_dhw:
+            raise ValueError('TEK_Category ' + TEK_name + ' unbekannt')
+
+        return self.tek_dhw[TEK_name], TEK_name
+
+    @staticmethod
+    def getRow(rows, hk_geb_values, hk_geb, uk_geb):
+        """
+        Returns the entry of uk_geb, raises ValueError if hk_geb or uk_geb is unknown
+        """
+        if hk_geb not in hk_geb_values:
+            raise ValueError('hk_geb unbekannt: ' + str(hk_geb))
+
+        if uk_geb not in rows:
+            raise ValueError('uk_geb unbekannt: ' + str(uk_geb))
+
+        return rows[uk_geb]
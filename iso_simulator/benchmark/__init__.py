@@ -0,0 +1,8 @@
+"""
+Benchmarks of the simulation of building stocks
+
+synthetic_stock: Synthetic building stocks of any size
+benchmarkStock.py: Throughput, time per phase and peak memory of the simulation of synthetic stocks (JSON report)
+equivalence: Reference engine (hour by hour, scalar methods) and comparison of the results of the engines
+checkEquivalence.py: Regression check of the numerical equivalence of the engines (exit code 1 on divergence)
+"""
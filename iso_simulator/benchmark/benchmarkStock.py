@@ -0,0 +1,293 @@
+"""
+Benchmark of the simulation of building stocks
+
+Simulates synthetic stocks (see synthetic_stock.py) of 10, 1000 and 100,000 buildings and reports as JSON for each
+stock size:
+    buildings_per_second: Buildings simulated and saved per second (setup and generation of the stock excluded)
+    phases: Wall time of each phase [s]
+        generate: Generation of the synthetic stock (not part of the throughput)
+        setup: SimulationContext (reference data, weather stations, LCA factors)
+        weather: Weather station of each building and weather data of each station
+        solar: Sun position and incident radiation of each station
+        simulation: Thermal loop, supply systems and LCA of the buildings
+        output: Saving the results with the result sink
+    peak_rss_mb: Peak resident memory of the process [MB]
+    profile: With --profile, time and calls of the phases inside the simulation, e.g. has_demand, supply, lca
+             (see profiling.py)
+
+The buildings are simulated in this process with the engine of --engine (see simulation.py), 'building_stock'
+simulates --chunk-size buildings together. Each stock size is simulated in its own process, so that the peak memory of one size does not include the others.
+The report holds the commit and the versions of Python, NumPy and pandas; with the same arguments the reports of
+different commits simulate the same buildings and can be compared.
+
+The hourly results are written (and removed right after, so that the large stocks do not fill the disk, except for
+the store of all buildings of --output-format store), the summary is kept in a temporary folder that is deleted at
+the end.
+
+Example:
+    python benchmarkStock.py --sizes 10 1000 100000 --report benchmark.json
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# Set root folder one level up
+mainPath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, mainPath)
+
+import numpy as np
+import pandas as pd
+
+from simulation import SimulationContext
+from simulation import simulate_stock
+from simulation import ENGINES
+from radiation import Location
+from result_sink import create_sink
+from result_sink import SINKS
+from aggregation import GRANULARITIES
+from profiling import profiler
+from benchmark.synthetic_stock import generate_stock
+from benchmark.synthetic_stock import stock_buildings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Version of the layout of the report
+REPORT_VERSION = 1
+
+# Stock sizes simulated by default, add 100000 for the large stock (several hours)
+sizes = [10, 1000]
+
+PHASES = ('generate', 'setup', 'weather', 'solar', 'simulation', 'output')
+
+
+def peak_rss_mb():
+    """
+    Returns the peak resident memory of the process in MB, None if it is not available (Windows)
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    if sys.platform == 'darwin':
+        return max_rss / 1024 ** 2
+    return max_rss / 1024
+
+
+def git_revision():
+    """
+    Returns the commit of the working tree and whether it has uncommitted changes, None if git is not available
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=mainPath, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=mainPath,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+    return {'commit': commit, 'dirty': bool(status.strip())}
+
+
+def run_stock(n_buildings, args):
+    """
+    Simulates a synthetic stock in this process and returns the measurements
+
+    :param n_buildings: Number of buildings of the stock
+    :type n_buildings: int
+    :param args: Arguments of the command line
+    :type args: argparse.Namespace
+    :return: measurements of the stock
+    :rtype: dict
+    """
+    phases = dict.fromkeys(PHASES, 0.0)
+    results_dir = tempfile.mkdtemp(prefix='dibs_benchmark_')
+    weather_store_dir = os.path.join(results_dir, 'weather_store') if args.cold else None
+
+    if args.profile:
+        profiler.reset()
+        profiler.enable()
+
+    try:
+        start = time.perf_counter()
+        building_data = generate_stock(n_buildings, seed=args.seed)
+        buildings = list(stock_buildings(building_data))
+        phases['generate'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        settings = {'weather_period': args.weather_period, 'solver': args.solver, 'granularity': args.granularity,
+                    'engine': args.engine}
+        if weather_store_dir is not None:
+            settings['weather_store_dir'] = weather_store_dir
+        context = SimulationContext(**settings)
+        phases['setup'] = time.perf_counter() - start
+
+        # Stations of all buildings and their weather data
+        start = time.perf_counter()
+        stations = {}
+        for plz in building_data['plz'].unique():
+            epw_filename, coordinates_station, distance = context.station_locator.locate(plz)
+            stations[epw_filename] = coordinates_station
+        locations = {epw_filename: Location(epwfile_path=context.epwfile_path(epw_filename),
+                                            weather_store=context.weather_store)
+                     for epw_filename in stations}
+        phases['weather'] = time.perf_counter() - start
+
+        # Solar data of all stations, all of them are kept in memory so that the simulation only reads them
+        start = time.perf_counter()
+        context.solar_cache.max_stations = max(context.solar_cache.max_stations, len(stations))
+        for epw_filename, (latitude_station, longitude_station) in stations.items():
+            context.solar_cache.get(context.epwfile_path(epw_filename), latitude_station, longitude_station,
+                                    locations[epw_filename])
+        phases['solar'] = time.perf_counter() - start
+
+        status = Counter()
+        sink = create_sink(args.output_format, results_dir)
+        # The engine 'building_stock' simulates a chunk of buildings when the first of its results is taken
+        results = simulate_stock(buildings, context, workers=1, chunk_size=args.chunk_size)
+        while True:
+            start = time.perf_counter()
+            result = next(results, None)
+            phases['simulation'] += time.perf_counter() - start
+            if result is None:
+                break
+            status[result.status] += 1
+
+            if result.status == 'simulated':
+                start = time.perf_counter()
+                sink.write(result)
+                phases['output'] += time.perf_counter() - start
+
+                if sink.hourly_per_building:
+                    hourly_path = sink.hourly_path(result.scr_gebaeude_id)
+                    if os.path.isdir(hourly_path):
+                        shutil.rmtree(hourly_path)
+                    elif os.path.exists(hourly_path):
+                        os.remove(hourly_path)
+
+        # The summary file is written when the sink is closed
+        start = time.perf_counter()
+        sink.close()
+        phases['output'] += time.perf_counter() - start
+
+    finally:
+        shutil.rmtree(results_dir, ignore_errors=True)
+        profiler.disable()
+
+    simulation_time = sum(phases[phase] for phase in PHASES if phase not in ('generate', 'setup'))
+    run = {
+        'buildings': n_buildings,
+        'status': dict(status),
+        'stations': len(stations),
+        'buildings_per_second': n_buildings / simulation_time if simulation_time > 0 else None,
+        'seconds_per_building': {phase: phases[phase] / n_buildings for phase in PHASES},
+        'phases': phases,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    if args.profile:
+        run['profile'] = profiler.report()
+    return run
+
+
+def run_stock_in_subprocess(n_buildings, args):
+    """
+    Runs run_stock() in a new Python process and returns its measurements
+    """
+    with tempfile.TemporaryDirectory(prefix='dibs_benchmark_') as report_dir:
+        report_path = os.path.join(report_dir, 'report.json')
+        command = [sys.executable, os.path.abspath(__file__), '--sizes', str(n_buildings),
+                   '--seed', str(args.seed), '--weather-period', args.weather_period, '--solver', args.solver,
+                   '--engine', args.engine, '--chunk-size', str(args.chunk_size),
+                   '--granularity', args.granularity, '--output-format', args.output_format,
+                   '--report', report_path]
+        if args.cold:
+            command.append('--cold')
+        if args.profile:
+            command.append('--profile')
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        with open(report_path) as f:
+            return json.load(f)['runs'][0]
+
+
+def parse_arguments(argv=None):
+    """
+    Arguments of the command line
+    """
+    parser = argparse.ArgumentParser(description='Benchmark of the simulation of synthetic building stocks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=sizes,
+                        help='numbers of buildings of the stocks, e.g. 10 1000 100000')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic stocks')
+    parser.add_argument('--weather-period', default='2007-2021', choices=['2007-2021', '2004-2018'])
+    parser.add_argument('--solver', default='crank_nicolson', choices=['crank_nicolson', 'closed_form'])
+    parser.add_argument('--engine', default='building', choices=list(ENGINES),
+                        help="'building_stock': simulate the buildings of each chunk together")
+    parser.add_argument('--chunk-size', type=int, default=16,
+                        help='number of buildings simulated together by the engine building_stock')
+    parser.add_argument('--granularity', default='hourly', choices=list(GRANULARITIES),
+                        help='time series of the results of each building, see aggregation.py')
+    parser.add_argument('--output-format', default='csv', choices=list(SINKS))
+    parser.add_argument('--cold', action='store_true',
+                        help='convert the epw files again instead of using the weather store of the simulator')
+    parser.add_argument('--profile', action='store_true',
+                        help='add the time of the phases inside the simulation to the report (slower simulation)')
+    parser.add_argument('--report', default=None, help='path of the JSON report (default: printed)')
+    args = parser.parse_args(argv)
+    if args.output_format == 'store' and args.granularity != 'hourly':
+        parser.error('--output-format store saves hourly results only, use --granularity hourly')
+    if args.engine == 'building_stock' and args.solver != 'crank_nicolson':
+        parser.error('--engine building_stock requires --solver crank_nicolson')
+    return args
+
+
+def main(argv=None):
+    """
+    Runs the benchmark and writes the JSON report
+    """
+    args = parse_arguments(argv)
+
+    if len(args.sizes) == 1:
+        runs = [run_stock(args.sizes[0], args)]
+    else:
+        runs = [run_stock_in_subprocess(n_buildings, args) for n_buildings in args.sizes]
+
+    report = {
+        'report_version': REPORT_VERSION,
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'git': git_revision(),
+        'environment': {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+                        'platform': platform.platform(), 'processor': platform.processor(),
+                        'cpu_count': os.cpu_count()},
+        'settings': {'seed': args.seed, 'weather_period': args.weather_period, 'solver': args.solver,
+                     'engine': args.engine, 'chunk_size': args.chunk_size,
+                     'granularity': args.granularity, 'output_format': args.output_format, 'cold': args.cold, 'profile': args.profile},
+        'runs': runs,
+    }
+
+    if args.report is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Regression check of the numerical equivalence of the simulation engines
+
+Simulates a synthetic stock (see synthetic_stock.py) or the buildings of a building data file with the reference
+engine (hour by hour with the scalar methods, see equivalence.py) and with each candidate engine, compares all hourly
+results and all annual results and reports for each divergent building the first divergent hour and variable.
+The exit code is 1 if any engine diverges, so that the check can run before each change of the simulation is merged.
+
+Examples:
+    python checkEquivalence.py --buildings 20
+    python checkEquivalence.py --engines closed_form --tolerance IndoorAirTemperature=1e-6,1e-4
+    python checkEquivalence.py --buildings 50 \
+        --building-data-file ../annualSimulation/SimulationData_Breitenerhebung.csv
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import argparse
+import itertools
+import json
+import os
+import sys
+
+# Set root folder one level up
+mainPath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, mainPath)
+
+from simulation import SimulationContext
+from simulation import read_buildings
+from benchmark.equivalence import ENGINES
+from benchmark.equivalence import Tolerance
+from benchmark.equivalence import compare_engines
+from benchmark.synthetic_stock import generate_stock
+from benchmark.synthetic_stock import stock_buildings
+
+# Engines compared with the reference engine by default
+engines = ['simulation', 'closed_form', 'building_stock']
+
+# Tolerance of the numeric columns: |candidate - reference| <= atol + rtol * |reference|
+rtol = 1e-9
+atol = 1e-6
+
+
+def parse_tolerance(value):
+    """
+    Parses COLUMN=RTOL,ATOL of the command line
+    """
+    try:
+        column, tolerances = value.split('=', 1)
+        column_rtol, column_atol = tolerances.split(',')
+        return column, Tolerance(rtol=float(column_rtol), atol=float(column_atol))
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected COLUMN=RTOL,ATOL, got ' + value)
+
+
+def parse_arguments(argv=None):
+    """
+    Arguments of the command line
+    """
+    parser = argparse.ArgumentParser(description='Numerical equivalence of the simulation engines with the '
+                                                 'reference engine (hour by hour, scalar methods)')
+    parser.add_argument('--buildings', type=int, default=20, help='number of buildings simulated')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic stock')
+    parser.add_argument('--building-data-file', default=None,
+                        help='simulate the first buildings of this file instead of a synthetic stock')
+    parser.add_argument('--engines', nargs='+', default=engines, choices=[name for name in ENGINES
+                                                                          if name != 'reference'])
+    parser.add_argument('--weather-period', default='2007-2021', choices=['2007-2021', '2004-2018'])
+    parser.add_argument('--rtol', type=float, default=rtol, help='relative tolerance of the numeric columns')
+    parser.add_argument('--atol', type=float, default=atol, help='absolute tolerance of the numeric columns')
+    parser.add_argument('--tolerance', type=parse_tolerance, action='append', default=[],
+                        metavar='COLUMN=RTOL,ATOL', help='tolerance of one hourly or summary column')
+    parser.add_argument('--report', default=None, help='path of a JSON report')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Compares the engines and returns the exit code (0 if all engines are equivalent)
+    """
+    args = parse_arguments(argv)
+
+    if args.building_data_file is None:
+        buildings = list(stock_buildings(generate_stock(args.buildings, seed=args.seed)))
+    else:
+        buildings = list(itertools.islice(read_buildings(args.building_data_file), args.buildings))
+
+    context = SimulationContext(weather_period=args.weather_period)
+    tolerances = dict(args.tolerance)
+    default_tolerance = Tolerance(rtol=args.rtol, atol=args.atol)
+
+    reference_results = list(ENGINES['reference'](buildings, context))
+    reports = [compare_engines(buildings, context, ENGINES[name], name=name, tolerances=tolerances,
+                               default_tolerance=default_tolerance, reference_results=reference_results)
+               for name in args.engines]
+
+    for report in reports:
+        print(report.format())
+
+    if args.report is not None:
+        with open(args.report, 'w') as f:
+            json.dump({'buildings': len(buildings),
+                       'reference_status': {status: sum(result.status == status for result in reference_results)
+                                            for status in set(result.status for result in reference_results)},
+                       'default_tolerance': default_tolerance._asdict(),
+                       'tolerances': {column: tolerance._asdict() for column, tolerance in tolerances.items()},
+                       'passed': all(report.passed for report in reports),
+                       'engines': [report.to_dict() for report in reports]},
+                      f, indent=2, default=str)
+
+    return 0 if all(report.passed for report in reports) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,927 @@
+"""
+Numerical equivalence of the simulation engines
+
+The reference engine simulates a building hour by hour with the scalar methods of Building, Window and Location,
+as the original inner loop of annualSimulation.py did: sun position, solar gains and illuminance of each window,
+lighting, heating/cooling demand with the supply system and hot water, one hour after the other. The heating/cooling
+demand is calculated by ReferenceBuilding, a frozen copy of the original step of Building (EmissionDirector and
+supply system instantiated in each hour), so that optimisations of Building are compared with the original step. The annual results
+are calculated from the hourly results with the original LCA steps (fuel type of each supply system, Hs/Hi, primary
+energy and GWP factors of Primary_energy_and_emission_factors.csv).
+
+Faster engines (precomputed solar data, closed-form solver, supply systems for all hours at once, vectorised
+BuildingStock) are compared with the reference engine on the same buildings, e.g. of a synthetic stock:
+all hourly columns and all columns of the summary within configurable tolerances. For each building the first
+divergent hour and the variables that diverge there are reported.
+
+Example:
+    context = SimulationContext()
+    buildings = list(stock_buildings(generate_stock(20, seed=0)))
+    report = compare_engines(buildings, context, ENGINES['closed_form'])
+    print(report.format())
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import copy
+import os
+import sys
+import traceback
+from collections import namedtuple, OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Root folder of the simulator (one level up)
+mainPath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if mainPath not in sys.path:
+    sys.path.insert(0, mainPath)
+
+import simulation
+import lca
+import emission_system
+import supply_system
+from building_physics import Building
+from simulation import Result
+from radiation import Location
+from radiation import Window
+from radiation import WINDOW_AZIMUTH_TILTS
+from building_stock import HOURLY_RESULTS
+
+# Fuel type of each heating supply system, as in the original if/elif chain of annualSimulation.py
+REFERENCE_HEATING_FUEL_TYPES = {
+    'BiogasBoilerCondensingBefore95': 'Biogas (general)',
+    'BiogasBoilerCondensingFrom95': 'Biogas (general)',
+    'BiogasOilBoilerLowTempBefore95': 'Biogas Bio-oil Mix (general)',
+    'BiogasOilBoilerCondensingFrom95': 'Biogas Bio-oil Mix (general)',
+    'BiogasOilBoilerCondensingImproved': 'Biogas Bio-oil Mix (general)',
+    'OilBoilerStandardBefore86': 'Light fuel oil',
+    'OilBoilerStandardFrom95': 'Light fuel oil',
+    'OilBoilerLowTempBefore87': 'Light fuel oil',
+    'OilBoilerLowTempBefore95': 'Light fuel oil',
+    'OilBoilerLowTempFrom95': 'Light fuel oil',
+    'OilBoilerCondensingBefore95': 'Light fuel oil',
+    'OilBoilerCondensingFrom95': 'Light fuel oil',
+    'OilBoilerCondensingImproved': 'Light fuel oil',
+    'LGasBoilerLowTempBefore95': 'Natural gas',
+    'LGasBoilerLowTempFrom95': 'Natural gas',
+    'LGasBoilerCondensingBefore95': 'Natural gas',
+    'LGasBoilerCondensingFrom95': 'Natural gas',
+    'LGasBoilerCondensingImproved': 'Natural gas',
+    'LGasBoilerLowTempBefore87': 'Natural gas',
+    'GasBoilerStandardBefore86': 'Natural gas',
+    'GasBoilerStandardBefore95': 'Natural gas',
+    'GasBoilerStandardFrom95': 'Natural gas',
+    'GasBoilerLowTempBefore87': 'Natural gas',
+    'GasBoilerLowTempBefore95': 'Natural gas',
+    'GasBoilerLowTempFrom95': 'Natural gas',
+    'GasBoilerLowTempSpecialFrom78': 'Natural gas',
+    'GasBoilerLowTempSpecialFrom95': 'Natural gas',
+    'GasBoilerCondensingBefore95': 'Natural gas',
+    'GasBoilerCondensingImproved': 'Natural gas',
+    'GasBoilerCondensingFrom95': 'Natural gas',
+    'WoodChipSolidFuelBoiler': 'Wood',
+    'WoodPelletSolidFuelBoiler': 'Wood',
+    'WoodSolidFuelBoilerCentral': 'Wood',
+    'CoalSolidFuelBoiler': 'Hard coal',
+    'SolidFuelLiquidFuelFurnace': 'Hard coal',
+    'HeatPumpAirSource': 'Electricity grid mix',
+    'HeatPumpGroundSource': 'Electricity grid mix',
+    'GasCHP': 'Natural gas',
+    'DistrictHeating': 'District heating (Combined Heat and Power) Gas or Liquid fuels',
+    'ElectricHeating': 'Electricity grid mix',
+    'DirectHeater': 'District heating (Combined Heat and Power) Coal',
+    'NoHeating': 'None',
+}
+
+# Fuel type of each cooling supply system, as in the original if/elif chain of annualSimulation.py
+REFERENCE_COOLING_FUEL_TYPES = {
+    'AirCooledPistonScroll': 'Electricity grid mix',
+    'AirCooledPistonScrollMulti': 'Electricity grid mix',
+    'WaterCooledPistonScroll': 'Electricity grid mix',
+    'DirectCooler': 'Electricity grid mix',
+    'AbsorptionRefrigerationSystem': 'Waste Heat generated close to building',
+    'DistrictCooling': 'District cooling',
+    'GasEnginePistonScroll': 'Natural gas',
+    'NoCooling': 'None',
+}
+
+# Difference of one variable between the reference and a candidate
+# variable: Hourly column or summary column
+# count: Number of divergent hours (1 for a summary column)
+# first_hour: First divergent hour (None for a summary column)
+# max_abs_diff: Largest absolute difference of the numeric values (None if not numeric or missing)
+# reference, candidate: Values at the first divergent hour (None if the column is missing)
+Divergence = namedtuple('Divergence', ['variable', 'count', 'first_hour', 'max_abs_diff', 'reference', 'candidate'])
+
+# Comparison of one building
+# status_reference, status_candidate: Status of the Result of both engines
+# first_hour: First hour in which any hourly variable diverges (None if the hourly results are equivalent)
+# first_variables: Hourly variables that diverge in first_hour
+# hourly, summary: Divergence of each divergent hourly/summary column
+# summary_compared: False if the candidate does not calculate the summary
+BuildingComparison = namedtuple('BuildingComparison',
+                                ['scr_gebaeude_id', 'status_reference', 'status_candidate', 'first_hour',
+                                 'first_variables', 'hourly', 'summary', 'summary_compared'])
+
+# Tolerance of a variable, values are equivalent if |candidate - reference| <= atol + rtol * |reference|
+Tolerance = namedtuple('Tolerance', ['rtol', 'atol'])
+
+
+class ReferenceBuilding(Building):
+    """
+    Building with a frozen copy of the original hourly step of building_physics.py (ISO 13790 Annex C with
+    crank_nicolson): the EmissionDirector and the supply system are instantiated in each calculation of the heat
+    flows / each hour, as before the emission systems were compiled into EmissionCoefficients.
+
+    Changes of Building.solve_building_energy() and the methods it calls therefore do not change the reference.
+
+    Methods:
+        solve_building_energy: Calculates the heating and cooling consumption of a building for a set timestep
+        has_demand: Determines whether the building requires heating or cooling
+        calc_temperatures_crank_nicolson: Determines the node temperatures
+        calc_energy_demand: Calculates the energy demand of the space if heating/cooling is active
+        calc_energy_demand_unrestricted: Calculates the energy demand without maximum output restrictions
+        calc_heat_flow: Calculates the heat flows into the nodes with the EmissionDirector
+        calc_t_m_next, calc_phi_m_tot, calc_t_m, calc_t_s, calc_t_air: Equations C.4, C.5, C.9, C.10, C.11
+    """
+
+    @property
+    def h_tr_1(self):
+        # (C.6) in [C.3 ISO 13790]
+        return 1.0 / (1.0 / self.h_ve_adj + 1.0 / self.h_tr_is)
+
+    @property
+    def h_tr_2(self):
+        # (C.7) in [C.3 ISO 13790]
+        return self.h_tr_1 + self.h_tr_w
+
+    @property
+    def h_tr_3(self):
+        # (C.8) in [C.3 ISO 13790]
+        return 1.0 / (1.0 / self.h_tr_2 + 1.0 / self.h_tr_ms)
+
+    def solve_building_energy(self, internal_gains, solar_gains, t_out, t_m_prev, calc_supply=True):
+        """
+        Calculates the heating and cooling consumption of a building for a set timestep, see
+        Building.solve_building_energy() (calc_supply is ignored, the supply system is always calculated)
+        """
+        self.has_demand(internal_gains, solar_gains, t_out, t_m_prev)
+
+        if not self.has_heating_demand and not self.has_cooling_demand:
+            self.energy_demand = 0
+            self.heating_demand = 0
+            self.cooling_demand = 0
+            self.heating_sys_electricity = 0
+            self.heating_sys_fossils = 0
+            self.cooling_sys_electricity = 0
+            self.cooling_sys_fossils = 0
+            self.electricity_out = 0
+            self.cop = float('nan')
+
+        else:
+            self.calc_energy_demand(internal_gains, solar_gains, t_out, t_m_prev)
+
+            self.calc_temperatures_crank_nicolson(self.energy_demand, internal_gains, solar_gains, t_out, t_m_prev)
+
+            supply_director = supply_system.SupplyDirector()
+
+            if self.has_heating_demand:
+                supply_director.set_builder(self.heating_supply_system(load=self.energy_demand,
+                                                                       t_out=t_out,
+                                                                       heating_supply_temperature=self.heating_supply_temperature,
+                                                                       cooling_supply_temperature=self.cooling_supply_temperature,
+                                                                       has_heating_demand=self.has_heating_demand,
+                                                                       has_cooling_demand=self.has_cooling_demand))
+                supplyOut = supply_director.calc_system()
+                self.heating_demand = self.energy_demand
+                self.heating_sys_electricity = supplyOut.electricity_in
+                self.heating_sys_fossils = supplyOut.fossils_in
+                self.cooling_demand = 0
+                self.cooling_sys_electricity = 0
+                self.cooling_sys_fossils = 0
+                self.electricity_out = supplyOut.electricity_out
+
+            elif self.has_cooling_demand:
+                supply_director.set_builder(self.cooling_supply_system(load=self.energy_demand * (-1),
+                                                                       t_out=t_out,
+                                                                       heating_supply_temperature=self.heating_supply_temperature,
+                                                                       cooling_supply_temperature=self.cooling_supply_temperature,
+                                                                       has_heating_demand=self.has_heating_demand,
+                                                                       has_cooling_demand=self.has_cooling_demand))
+                supplyOut = supply_director.calc_system()
+                self.heating_demand = 0
+                self.heating_sys_electricity = 0
+                self.heating_sys_fossils = 0
+                self.cooling_demand = self.energy_demand
+                self.cooling_sys_electricity = supplyOut.electricity_in
+                self.cooling_sys_fossils = supplyOut.fossils_in
+                self.electricity_out = supplyOut.electricity_out
+
+            self.cop = supplyOut.cop
+
+        self.sys_total_energy = self.heating_sys_electricity + self.heating_sys_fossils + \
+                                self.cooling_sys_electricity + self.cooling_sys_fossils
+        self.heating_energy = self.heating_sys_electricity + self.heating_sys_fossils
+        self.cooling_energy = self.cooling_sys_electricity + self.cooling_sys_fossils
+
+    def has_demand(self, internal_gains, solar_gains, t_out, t_m_prev):
+        # step 1 in section C.4.2 in [C.3 ISO 13790]
+        self.calc_temperatures_crank_nicolson(0, internal_gains, solar_gains, t_out, t_m_prev)
+
+        if round(self.t_air, 1) < self.t_set_heating:
+            self.has_heating_demand = True
+            self.has_cooling_demand = False
+        elif round(self.t_air, 1) > self.t_set_cooling:
+            self.has_cooling_demand = True
+            self.has_heating_demand = False
+        else:
+            self.has_heating_demand = False
+            self.has_cooling_demand = False
+
+    def calc_temperatures_crank_nicolson(self, energy_demand, internal_gains, solar_gains, t_out, t_m_prev):
+        # section C.3 in [C.3 ISO 13790]
+        self.calc_heat_flow(t_out, internal_gains, solar_gains, energy_demand)
+        self.calc_phi_m_tot(t_out)
+        self.calc_t_m_next(t_m_prev)
+        self.calc_t_m(t_m_prev)
+        self.calc_t_s(t_out)
+        self.calc_t_air(t_out)
+
+        return self.t_m, self.t_air, self.t_opperative
+
+    def calc_energy_demand(self, internal_gains, solar_gains, t_out, t_m_prev):
+        # Step 1 - Step 4 in Section C.4.2 in [C.3 ISO 13790]
+        t_air_0 = self.calc_temperatures_crank_nicolson(0, internal_gains, solar_gains, t_out, t_m_prev)[1]
+
+        if self.has_heating_demand:
+            t_air_set = self.t_set_heating
+        elif self.has_cooling_demand:
+            t_air_set = self.t_set_cooling
+        else:
+            raise NameError('heating function has been called even though no heating is required')
+
+        energy_floorAx10 = 10 * self.energy_ref_area
+        t_air_10 = self.calc_temperatures_crank_nicolson(
+            energy_floorAx10, internal_gains, solar_gains, t_out, t_m_prev)[1]
+
+        self.calc_energy_demand_unrestricted(energy_floorAx10, t_air_set, t_air_0, t_air_10)
+
+        if self.max_cooling_energy <= self.energy_demand_unrestricted <= self.max_heating_energy:
+            self.energy_demand = self.energy_demand_unrestricted
+            self.t_air_ac = t_air_set
+        elif self.energy_demand_unrestricted > self.max_heating_energy:
+            self.energy_demand = self.max_heating_energy
+        elif self.energy_demand_unrestricted < self.max_cooling_energy:
+            self.energy_demand = self.max_cooling_energy
+        else:
+            self.energy_demand = 0
+            raise ValueError('unknown radiative heating/cooling system status')
+
+        self.calc_temperatures_crank_nicolson(self.energy_demand, internal_gains, solar_gains, t_out, t_m_prev)
+
+    def calc_energy_demand_unrestricted(self, energy_floorAx10, t_air_set, t_air_0, t_air_10):
+        # (C.13) in [C.3 ISO 13790]
+        self.energy_demand_unrestricted = energy_floorAx10 * (t_air_set - t_air_0) / (t_air_10 - t_air_0)
+
+    def calc_heat_flow(self, t_out, internal_gains, solar_gains, energy_demand):
+        # C.1 - C.3 in [C.3 ISO 13790], modified by the emission system of the energy demand
+        self.phi_ia = 0.5 * internal_gains
+        self.phi_st = (1 - (self.mass_area / self.A_t) - (self.h_tr_w /
+                                                          (9.1 * self.A_t))) * (0.5 * internal_gains + solar_gains)
+        self.phi_m = (self.mass_area / self.A_t) * (0.5 * internal_gains + solar_gains)
+
+        emDirector = emission_system.EmissionDirector()
+        if energy_demand > 0:
+            emDirector.set_builder(self.heating_emission_system(energy_demand=energy_demand))
+        else:
+            emDirector.set_builder(self.cooling_emission_system(energy_demand=energy_demand))
+        flows = emDirector.calc_flows()
+
+        self.phi_ia += flows.phi_ia_plus
+        self.phi_st += flows.phi_st_plus
+        self.phi_m += flows.phi_m_plus
+
+        self.heating_supply_temperature = flows.heating_supply_temperature
+        self.cooling_supply_temperature = flows.cooling_supply_temperature
+
+    def calc_t_m_next(self, t_m_prev):
+        # (C.4) in [C.3 ISO 13790]
+        self.t_m_next = ((t_m_prev * ((self.c_m / 3600.0) - 0.5 * (self.h_tr_3 + self.h_tr_em))) +
+                         self.phi_m_tot) / ((self.c_m / 3600.0) + 0.5 * (self.h_tr_3 + self.h_tr_em))
+
+    def calc_phi_m_tot(self, t_out):
+        # (C.5) in [C.3 ISO 13790], t_supply = t_out
+        t_supply = t_out
+        self.phi_m_tot = self.phi_m + self.h_tr_em * t_out + \
+                         self.h_tr_3 * (self.phi_st + self.h_tr_w * t_out + self.h_tr_1 *
+                                        ((self.phi_ia / self.h_ve_adj) + t_supply)) / self.h_tr_2
+
+    def calc_t_m(self, t_m_prev):
+        # (C.9) in [C.3 ISO 13790]
+        self.t_m = (self.t_m_next + t_m_prev) / 2.0
+
+    def calc_t_s(self, t_out):
+        # (C.10) in [C.3 ISO 13790], t_supply = t_out
+        t_supply = t_out
+        self.t_s = (self.h_tr_ms * self.t_m + self.phi_st + self.h_tr_w * t_out + self.h_tr_1 *
+                    (t_supply + self.phi_ia / self.h_ve_adj)) / (self.h_tr_ms + self.h_tr_w + self.h_tr_1)
+
+    def calc_t_air(self, t_out):
+        # (C.11) in [C.3 ISO 13790], t_supply = t_out
+        t_supply = t_out
+        self.t_air = (self.h_tr_is * self.t_s + self.h_ve_adj * t_supply + self.phi_ia) / \
+                     (self.h_tr_is + self.h_ve_adj)
+
+
+def create_reference_building(i_gebaeudeparameter):
+    """
+    Creates the ReferenceBuilding of the parameters of a building, same parameters as simulation.create_building()
+
+    :param i_gebaeudeparameter: Parameters of the building
+    :type i_gebaeudeparameter: namedtuple
+    :return: building
+    :rtype: ReferenceBuilding
+    """
+    building = simulation.create_building(i_gebaeudeparameter, solver='crank_nicolson')
+
+    # Same parameters and derived values (h_tr_*, c_m, ...), only the methods of the step differ
+    reference = ReferenceBuilding.__new__(ReferenceBuilding)
+    reference.__dict__.update(vars(building))
+    return reference
+
+
+def simulate_building_reference(i_gebaeudeparameter, context, iteration=0):
+    """
+    Simulates one building hour by hour with the scalar methods of ReferenceBuilding, Window and Location
+
+    :param i_gebaeudeparameter: Parameters of the building
+    :type i_gebaeudeparameter: namedtuple
+    :param context: Data used by the simulation (the solver of the context is not used, always crank_nicolson)
+    :type context: simulation.SimulationContext
+    :param iteration: Position of the building in the simulated stock
+    :type iteration: int
+    :return: hourly and annual results of the building
+    :rtype: simulation.Result
+    """
+    BuildingInstance = create_reference_building(i_gebaeudeparameter)
+
+    if (i_gebaeudeparameter.energy_ref_area == -8) | (i_gebaeudeparameter.heating_supply_system == 'NoHeating'):
+        return Result(iteration=iteration, scr_gebaeude_id=i_gebaeudeparameter.scr_gebaeude_id, status='not heated',
+                      hourly=None, summary=None, error=None)
+
+    epw_filename, (latitude_station, longitude_station), distance = \
+        context.station_locator.locate(BuildingInstance.plz)
+    building_location = Location(epwfile_path=context.epwfile_path(epw_filename))
+    weather_data = building_location.weather_data
+
+    # South, East, West, North (order of radiation.WINDOW_ORIENTATIONS)
+    window_areas = (BuildingInstance.window_area_south, BuildingInstance.window_area_east,
+                    BuildingInstance.window_area_west, BuildingInstance.window_area_north)
+    windows = [Window(azimuth_tilt=azimuth_tilt, alititude_tilt=90,
+                      glass_solar_transmittance=BuildingInstance.glass_solar_transmittance,
+                      glass_solar_shading_transmittance=BuildingInstance.glass_solar_shading_transmittance,
+                      glass_light_transmittance=BuildingInstance.glass_light_transmittance,
+                      area=area)
+               for azimuth_tilt, area in zip(WINDOW_AZIMUTH_TILTS, window_areas)]
+
+    gain_per_person, appliance_gains, typ_norm = context.reference_data.getGains(
+        BuildingInstance.hk_geb, BuildingInstance.uk_geb, context.profile_from_norm, context.gains_from_group_values)
+    usage_start, usage_end = context.reference_data.getUsagetime(BuildingInstance.hk_geb, BuildingInstance.uk_geb,
+                                                                 context.usage_from_norm)
+    occupancy_schedule, schedule_name = context.reference_data.getSchedule(BuildingInstance.hk_geb,
+                                                                           BuildingInstance.uk_geb)
+    TEK_dhw, TEK_name = context.reference_data.getTEK(BuildingInstance.hk_geb, BuildingInstance.uk_geb)
+    TEK_dhw_per_Occupancy_Full_Usage_Hour = TEK_dhw / occupancy_schedule.People.sum()
+
+    if appliance_gains < 0:
+        appliance_gains_elt = -1 * appliance_gains / 2
+    else:
+        appliance_gains_elt = appliance_gains
+
+    dhw_system = i_gebaeudeparameter.dhw_system
+    dhw_electric = (dhw_system == 'DecentralElectricDHW') or \
+                   ((dhw_system in ('CentralHeating', 'CentralDHW')) and
+                    (i_gebaeudeparameter.heating_supply_system in ('HeatPumpAirSource', 'HeatPumpGroundSource',
+                                                                   'ElectricHeating')))
+
+    hourly = {column: [] for column in HOURLY_RESULTS}
+
+    t_m_prev = BuildingInstance.t_start
+
+    for hour in range(8760):
+
+        BuildingInstance.t_set_heating = i_gebaeudeparameter.t_set_heating
+
+        t_out = weather_data['drybulb_C'][hour]
+
+        Altitude, Azimuth = building_location.calc_sun_position(
+            latitude_deg=latitude_station, longitude_deg=longitude_station,
+            year=weather_data['year'][hour], hoy=hour)
+
+        BuildingInstance.h_ve_adj = BuildingInstance.calc_h_ve_adj(hour, t_out, usage_start, usage_end)
+
+        if hour == 0:
+            t_air = round(BuildingInstance.t_set_heating, 2)
+        else:
+            t_air = round(BuildingInstance.t_air, 2)
+
+        for window in windows:
+            window.calc_solar_gains(sun_altitude=Altitude, sun_azimuth=Azimuth,
+                                    normal_direct_radiation=weather_data['dirnorrad_Whm2'][hour],
+                                    horizontal_diffuse_radiation=weather_data['difhorrad_Whm2'][hour],
+                                    t_air=t_air, hour=hour)
+            window.calc_illuminance(sun_altitude=Altitude, sun_azimuth=Azimuth,
+                                    normal_direct_illuminance=weather_data['dirnorillum_lux'][hour],
+                                    horizontal_diffuse_illuminance=weather_data['difhorillum_lux'][hour])
+
+        occupancy_percent = occupancy_schedule.People[hour]
+        occupancy = occupancy_percent * BuildingInstance.max_occupancy
+        appliances_percent = occupancy_schedule.Appliances[hour]
+
+        BuildingInstance.solve_building_lighting(
+            illuminance=windows[0].transmitted_illuminance + windows[1].transmitted_illuminance +
+                        windows[2].transmitted_illuminance + windows[3].transmitted_illuminance,
+            occupancy=occupancy_percent)
+
+        internal_gains = occupancy * gain_per_person + \
+                         appliance_gains * appliances_percent * BuildingInstance.energy_ref_area + \
+                         BuildingInstance.lighting_demand
+        solar_gains = [window.solar_gains for window in windows]
+
+        BuildingInstance.solve_building_energy(internal_gains=internal_gains,
+                                               solar_gains=solar_gains[0] + solar_gains[1] + solar_gains[2] +
+                                                           solar_gains[3],
+                                               t_out=t_out, t_m_prev=t_m_prev)
+
+        if dhw_system != 'NoDHW' and dhw_system != ' -':
+            hotwaterdemand = occupancy_percent * TEK_dhw_per_Occupancy_Full_Usage_Hour * 1000 * \
+                             BuildingInstance.energy_ref_area
+            if BuildingInstance.heating_demand > 0:
+                hotwaterenergy = hotwaterdemand * (BuildingInstance.heating_energy / BuildingInstance.heating_demand)
+            else:
+                hotwaterenergy = hotwaterdemand
+        else:
+            hotwaterdemand = 0
+            hotwaterenergy = 0
+
+        t_m_prev = BuildingInstance.t_m_next
+
+        hourly['HeatingDemand'].append(BuildingInstance.heating_demand)
+        hourly['HeatingEnergy'].append(BuildingInstance.heating_energy)
+        hourly['Heating_Sys_Electricity'].append(BuildingInstance.heating_sys_electricity)
+        hourly['Heating_Sys_Fossils'].append(BuildingInstance.heating_sys_fossils)
+        hourly['CoolingDemand'].append(BuildingInstance.cooling_demand)
+        hourly['CoolingEnergy'].append(BuildingInstance.cooling_energy)
+        hourly['Cooling_Sys_Electricity'].append(BuildingInstance.cooling_sys_electricity)
+        hourly['Cooling_Sys_Fossils'].append(BuildingInstance.cooling_sys_fossils)
+        hourly['HotWaterDemand'].append(hotwaterdemand)
+        hourly['HotWaterEnergy'].append(hotwaterenergy)
+        hourly['HotWater_Sys_Electricity'].append(hotwaterenergy if dhw_electric else 0)
+        hourly['HotWater_Sys_Fossils'].append(0 if dhw_electric else hotwaterenergy)
+        hourly['IndoorAirTemperature'].append(BuildingInstance.t_air)
+        hourly['OutsideTemperature'].append(t_out)
+        hourly['LightingDemand'].append(BuildingInstance.lighting_demand)
+        hourly['InternalGains'].append(internal_gains)
+        hourly['Appliance_gains_demands'].append(appliance_gains * appliances_percent *
+                                                 BuildingInstance.energy_ref_area)
+        hourly['Appliance_gains_elt_demands'].append(appliance_gains_elt * appliances_percent *
+                                                     BuildingInstance.energy_ref_area)
+        hourly['SolarGainsSouthWindow'].append(solar_gains[0])
+        hourly['SolarGainsEastWindow'].append(solar_gains[1])
+        hourly['SolarGainsWestWindow'].append(solar_gains[2])
+        hourly['SolarGainsNorthWindow'].append(solar_gains[3])
+        hourly['SolarGainsTotal'].append(solar_gains[0] + solar_gains[1] + solar_gains[2] + solar_gains[3])
+        hourly['Daytime'].append(hour % 24)
+
+    hourlyResults = pd.DataFrame(hourly)
+    hourlyResults['iteration'] = iteration
+    hourlyResults['GebäudeID'] = i_gebaeudeparameter.scr_gebaeude_id
+
+    summary = reference_summary(i_gebaeudeparameter, hourlyResults, context.GWP_PE_Factors,
+                                schedule_name=schedule_name, typ_norm=typ_norm, epw_filename=epw_filename)
+
+    return Result(iteration=iteration, scr_gebaeude_id=i_gebaeudeparameter.scr_gebaeude_id, status='simulated',
+                  hourly=hourlyResults, summary=summary, error=None)
+
+
+def reference_factors(GWP_PE_Factors, fuel_type):
+    """
+    Returns GWP [g/kWh], primary energy factor and Hs/Hi of an energy carrier (first row of the carrier)
+    """
+    row = GWP_PE_Factors.loc[GWP_PE_Factors['Energy Carrier'] == fuel_type]
+    return (row['GWP spezific to heating value GEG [g/kWh]'].iloc[0],
+            row['Primary Energy Factor GEG   [-]'].iloc[0],
+            row['Relation Calorific to Heating Value GEG  [-]'].iloc[0])
+
+
+def reference_end_use(electricity_sum, fossils_sum, factors):
+    """
+    Returns Hi-related electricity, Hi-related fossils, GWP [kg] and primary energy [kWh] of an end use,
+    the factors apply to the electricity if there is any, otherwise to the fossils
+    """
+    f_GHG, f_PE, f_Hs_Hi = factors
+    if electricity_sum > 0:
+        electricity_Hi, fossils_Hi = electricity_sum / f_Hs_Hi, 0
+        return electricity_Hi, fossils_Hi, electricity_Hi * f_GHG / 1000, electricity_Hi * f_PE
+    fossils_Hi = fossils_sum / f_Hs_Hi
+    return 0, fossils_Hi, fossils_Hi * f_GHG / 1000, fossils_Hi * f_PE
+
+
+def reference_summary(i_gebaeudeparameter, hourlyResults, GWP_PE_Factors, schedule_name, typ_norm, epw_filename):
+    """
+    Calculates the annual results of a building from its hourly results with the original LCA steps
+
+    :return: One row of annual results, same columns as the summary of simulation.simulate_building()
+    :rtype: pd.DataFrame
+    """
+    sums = {column: hourlyResults[column].sum() / 1000 for column in HOURLY_RESULTS}
+    area = i_gebaeudeparameter.energy_ref_area
+
+    if i_gebaeudeparameter.heating_supply_system not in REFERENCE_HEATING_FUEL_TYPES:
+        raise ValueError('heating_supply_system ' + str(i_gebaeudeparameter.heating_supply_system) + ' unknown')
+    if i_gebaeudeparameter.cooling_supply_system not in REFERENCE_COOLING_FUEL_TYPES:
+        raise ValueError('cooling_supply_system ' + str(i_gebaeudeparameter.cooling_supply_system) + ' unknown')
+
+    heating_fuel = REFERENCE_HEATING_FUEL_TYPES[i_gebaeudeparameter.heating_supply_system]
+    if i_gebaeudeparameter.dhw_system == 'DecentralElectricDHW':
+        hotwater_fuel = 'Electricity grid mix'
+    elif i_gebaeudeparameter.dhw_system == 'DecentralFuelBasedDHW':
+        hotwater_fuel = 'Natural gas'
+    else:
+        hotwater_fuel = heating_fuel
+    cooling_fuel = REFERENCE_COOLING_FUEL_TYPES[i_gebaeudeparameter.cooling_supply_system]
+    electricity_fuel = 'Electricity grid mix'
+
+    heating_factors = reference_factors(GWP_PE_Factors, heating_fuel)
+    hotwater_factors = reference_factors(GWP_PE_Factors, hotwater_fuel)
+    cooling_factors = reference_factors(GWP_PE_Factors, cooling_fuel)
+    electricity_factors = reference_factors(GWP_PE_Factors, electricity_fuel)
+
+    heating_el_Hi, heating_fo_Hi, heating_GWP, heating_PE = reference_end_use(
+        sums['Heating_Sys_Electricity'], sums['Heating_Sys_Fossils'], heating_factors)
+    hotwater_el_Hi, hotwater_fo_Hi, hotwater_GWP, hotwater_PE = reference_end_use(
+        sums['HotWater_Sys_Electricity'], sums['HotWater_Sys_Fossils'], hotwater_factors)
+    cooling_el_Hi, cooling_fo_Hi, cooling_GWP, cooling_PE = reference_end_use(
+        sums['Cooling_Sys_Electricity'], sums['Cooling_Sys_Fossils'], cooling_factors)
+
+    f_GHG, f_PE, f_Hs_Hi = electricity_factors
+    lighting_Hi = sums['LightingDemand'] / f_Hs_Hi
+    lighting_GWP, lighting_PE = lighting_Hi * f_GHG / 1000, lighting_Hi * f_PE
+    appliance_Hi = sums['Appliance_gains_elt_demands'] / f_Hs_Hi
+    appliance_GWP, appliance_PE = appliance_Hi * f_GHG / 1000, appliance_Hi * f_PE
+
+    GWP = heating_GWP + cooling_GWP + lighting_GWP + appliance_GWP + hotwater_GWP
+    PE = heating_PE + cooling_PE + lighting_PE + appliance_PE + hotwater_PE
+    FE_Hi = (heating_el_Hi + heating_fo_Hi) + (cooling_el_Hi + cooling_fo_Hi) + lighting_Hi + appliance_Hi + \
+            (hotwater_el_Hi + hotwater_fo_Hi)
+    electricity = sums['Heating_Sys_Electricity'] + sums['HotWater_Sys_Electricity'] + \
+                  sums['Cooling_Sys_Electricity'] + sums['LightingDemand'] + sums['Appliance_gains_elt_demands']
+    fossils = sums['Heating_Sys_Fossils'] + sums['Cooling_Sys_Fossils']
+
+    return pd.DataFrame({
+        'GebäudeID': i_gebaeudeparameter.scr_gebaeude_id,
+        'EnergyRefArea': area,
+        'HeatingDemand [kWh]': sums['HeatingDemand'],
+        'HeatingDemand [kwh/m2]': sums['HeatingDemand'] / area,
+        'HeatingEnergy [kWhHs]': sums['HeatingEnergy'],
+        'HeatingEnergy [kwhHs/m2]': sums['HeatingEnergy'] / area,
+        'HeatingEnergy_Hi [kWhHi]': heating_el_Hi + heating_fo_Hi,
+        'Heating_Sys_Electricity [kWh]': sums['Heating_Sys_Electricity'],
+        'Heating_Sys_Electricity [kwh/m2]': sums['Heating_Sys_Electricity'] / area,
+        'Heating_Sys_Electricity_Hi [kWhHi]': heating_el_Hi,
+        'Heating_Sys_Fossils [kWhHs]': sums['Heating_Sys_Fossils'],
+        'Heating_Sys_Fossils [kwhHs/m2]': sums['Heating_Sys_Fossils'] / area,
+        'Heating_Sys_Fossils_Hi [kWhHi]': heating_fo_Hi,
+        'Heating_Sys_GWP [kg]': heating_GWP,
+        'Heating_Sys_GWP [kg/m2]': heating_GWP / area,
+        'Heating_Sys_PE [kWh]': heating_PE,
+        'Heating_Sys_PE [kWh/m2]': heating_PE / area,
+        'CoolingDemand [kWh]': sums['CoolingDemand'],
+        'CoolingDemand [kwh/m2]': sums['CoolingDemand'] / area,
+        'CoolingEnergy [kWhHs]': sums['CoolingEnergy'],
+        'CoolingEnergy [kwhHs/m2]': sums['CoolingEnergy'] / area,
+        'Cooling_Sys_Electricity [kWh]': sums['Cooling_Sys_Electricity'],
+        'Cooling_Sys_Electricity [kwh/m2]': sums['Cooling_Sys_Electricity'] / area,
+        'Cooling_Sys_Fossils [kWhHs]': sums['Cooling_Sys_Fossils'],
+        'Cooling_Sys_Fossils [kwhHs/m2]': sums['Cooling_Sys_Fossils'] / area,
+        'Cooling_Sys_GWP [kg]': cooling_GWP,
+        'Cooling_Sys_GWP [kg/m2]': cooling_GWP / area,
+        'Cooling_Sys_PE [kWh]': cooling_PE,
+        'Cooling_Sys_PE [kWh/m2]': cooling_PE / area,
+        'HotWaterDemand [kwh]': sums['HotWaterDemand'],
+        'HotWaterDemand [kwh/m2]': sums['HotWaterDemand'] / area,
+        'HotWaterEnergy [kwhHs]': sums['HotWaterEnergy'],
+        'HotWaterEnergy [kwhHs/m2]': sums['HotWaterEnergy'] / area,
+        'HotWaterEnergy_Hi [kwhHi]': hotwater_el_Hi + hotwater_fo_Hi,
+        'HotWater_Sys_Electricity [kWh]': sums['HotWater_Sys_Electricity'],
+        'HotWater_Sys_Fossils [kWhHs]': sums['HotWater_Sys_Fossils'],
+        'HeatingSupplySystem': i_gebaeudeparameter.heating_supply_system,
+        'CoolingSupplySystem': i_gebaeudeparameter.cooling_supply_system,
+        'DHWSupplySystem': i_gebaeudeparameter.dhw_system,
+        'Heating_fuel_type': heating_fuel,
+        'Heating_f_GHG [g/kWhHi]': heating_factors[0],
+        'Heating_f_PE [kWhPE/kWhHi]': heating_factors[1],
+        'Heating_f_Hs_Hi [kWhHs/kWhHi]': heating_factors[2],
+        'Hotwater_fuel_type': hotwater_fuel,
+        'Hotwater_f_GHG [g/kWhHi]': hotwater_factors[0],
+        'Hotwater_f_PE [kWhPE/kWhHi]': hotwater_factors[1],
+        'Hotwater_f_Hs_Hi [kWhHs/kWhHi]': hotwater_factors[2],
+        'Cooling_fuel_type': cooling_fuel,
+        'Cooling_f_GHG [g/kWhHi]': cooling_factors[0],
+        'Cooling_f_PE [kWhPE/kWhHi]': cooling_factors[1],
+        'Cooling_f_Hs_Hi [kWhHs/kWhHi]': cooling_factors[2],
+        'LightAppl_fuel_type': electricity_fuel,
+        'LightAppl_f_GHG [g/kWhHi]': electricity_factors[0],
+        'LightAppl_f_PE [kWhPE/kWhHi]': electricity_factors[1],
+        'LightAppl_f_Hs_Hi [kWhHs/kWhHi]': electricity_factors[2],
+        'HotWater_Sys_GWP [kg]': hotwater_GWP,
+        'HotWater_Sys_GWP [kg/m2]': hotwater_GWP / area,
+        'HotWater_Sys_PE [kWh]': hotwater_PE,
+        'HotWater_Sys_PE [kWh/m2]': hotwater_PE / area,
+        'ElectricityDemandTotal [kWh]': electricity,
+        'ElectricityDemandTotal [kwh/m2]': electricity / area,
+        'FossilsDemandTotal [kWh]': fossils,
+        'FossilsDemandTotal [kwh/m2]': fossils / area,
+        'LightingDemand [kWh]': sums['LightingDemand'],
+        'LightingDemand_GWP [kg]': lighting_GWP,
+        'LightingDemand_GWP [kg/m2]': lighting_GWP / area,
+        'LightingDemand_PE [kWh]': lighting_PE,
+        'LightingDemand_PE [kWh/m2]': lighting_PE / area,
+        'Appliance_gains_demand [kWh]': sums['Appliance_gains_demands'],
+        'Appliance_gains_elt_demand [kWh]': sums['Appliance_gains_elt_demands'],
+        'Appliance_gains_demand_GWP [kg]': appliance_GWP,
+        'Appliance_gains_demand_GWP [kg/m2]': appliance_GWP / area,
+        'Appliance_gains_demand_PE [kWh]': appliance_PE,
+        'Appliance_gains_demand_PE [kWh/m2]': appliance_PE / area,
+        'GWP [kg]': GWP,
+        'GWP [kg/m2]': GWP / area,
+        'PE [kWh]': PE,
+        'PE [kWh/m2]': PE / area,
+        'FinalEnergy_Hi [kWhHi]': FE_Hi,
+        'InternalGains [kWh]': sums['InternalGains'],
+        'SolarGainsTotal [kWh]': sums['SolarGainsTotal'],
+        'SolarGainsSouthWindow [kWh]': sums['SolarGainsSouthWindow'],
+        'SolarGainsEastWindow [kWh]': sums['SolarGainsEastWindow'],
+        'SolarGainsWestWindow [kWh]': sums['SolarGainsWestWindow'],
+        'SolarGainsNorthWindow [kWh]': sums['SolarGainsNorthWindow'],
+        'Gebäudefunktion Hauptkategorie': i_gebaeudeparameter.hk_geb,
+        'Gebäudefunktion Unterkategorie': i_gebaeudeparameter.uk_geb,
+        'Profil SIA 2024': [schedule_name],
+        'Profil 18599-10': [typ_norm],
+        'EPW-File': [epw_filename]
+    })
+
+
+def run_reference(buildings, context):
+    """
+    Engine: simulate_building_reference() for each building, failing buildings give a Result with status 'failed'
+    """
+    for iteration, i_gebaeudeparameter in enumerate(buildings):
+        try:
+            yield simulate_building_reference(i_gebaeudeparameter, context, iteration)
+        except Exception:
+            yield Result(iteration=iteration, scr_gebaeude_id=i_gebaeudeparameter.scr_gebaeude_id, status='failed',
+                         hourly=None, summary=None, error=traceback.format_exc())
+
+
+def run_simulation(buildings, context):
+    """
+    Engine: simulation.simulate_building() with the solver of the context
+    """
+    for iteration, i_gebaeudeparameter in enumerate(buildings):
+        yield simulation.simulate_building_safe(i_gebaeudeparameter, context, iteration)
+
+
+def run_closed_form(buildings, context):
+    """
+    Engine: simulation.simulate_building() with the closed-form solver
+    """
+    closed_form_context = copy.copy(context)
+    closed_form_context.solver = 'closed_form'
+    return run_simulation(buildings, closed_form_context)
+
+
+def run_building_stock(buildings, context, chunk_size=200):
+    """
+    Engine: simulation.simulate_stock() with the engine 'building_stock', chunk_size buildings are simulated together
+    (see simulation.simulate_building_stock())
+    """
+    building_stock_context = copy.copy(context)
+    building_stock_context.engine = 'building_stock'
+    return simulation.simulate_stock(buildings, building_stock_context, workers=1, chunk_size=chunk_size)
+
+
+# Engines that can be compared, each takes (buildings, context) and yields a Result per building in order
+ENGINES = OrderedDict([
+    ('reference', run_reference),
+    ('simulation', run_simulation),
+    ('closed_form', run_closed_form),
+    ('building_stock', run_building_stock),
+])
+
+
+def compare_columns(reference, candidate, columns, tolerances, default_tolerance):
+    """
+    Compares columns of two DataFrames row by row
+
+    :return: Divergence of each divergent column
+    :rtype: list of Divergence
+    """
+    divergences = []
+    for column in columns:
+        if column not in reference.columns or column not in candidate.columns:
+            divergences.append(Divergence(variable=column, count=max(len(reference), len(candidate)), first_hour=0,
+                                          max_abs_diff=None, reference=None, candidate=None))
+            continue
+
+        reference_values = reference[column].to_numpy()
+        candidate_values = candidate[column].to_numpy()
+        length = min(len(reference_values), len(candidate_values))
+        reference_values, candidate_values = reference_values[:length], candidate_values[:length]
+
+        numeric = pd.api.types.is_numeric_dtype(reference_values.dtype) and \
+                  pd.api.types.is_numeric_dtype(candidate_values.dtype)
+        if numeric:
+            tolerance = tolerances.get(column, default_tolerance)
+            reference_values = reference_values.astype(float)
+            candidate_values = candidate_values.astype(float)
+            equal = np.isclose(candidate_values, reference_values, rtol=tolerance.rtol, atol=tolerance.atol,
+                               equal_nan=True)
+        else:
+            equal = np.array([r == c for r, c in zip(reference_values, candidate_values)], dtype=bool)
+
+        divergent = np.flatnonzero(~equal)
+        if len(reference[column]) != len(candidate[column]):
+            divergent = np.append(divergent, length)
+
+        if len(divergent):
+            first = divergent[0]
+            max_abs_diff = None
+            if numeric:
+                with np.errstate(invalid='ignore'):
+                    differences = np.abs(candidate_values - reference_values)[~equal]
+                max_abs_diff = float(np.nanmax(differences)) if np.isfinite(differences).any() else None
+            divergences.append(Divergence(
+                variable=column, count=int(len(divergent)), first_hour=int(first), max_abs_diff=max_abs_diff,
+                reference=reference_values[first].item() if first < length and numeric else
+                (reference_values[first] if first < length else None),
+                candidate=candidate_values[first].item() if first < length and numeric else
+                (candidate_values[first] if first < length else None)))
+    return divergences
+
+
+def compare_results(reference, candidate, tolerances=None, default_tolerance=Tolerance(rtol=1e-9, atol=1e-6)):
+    """
+    Compares the Results of one building of two engines
+
+    :param reference: Result of the reference engine
+    :type reference: simulation.Result
+    :param candidate: Result of the candidate engine
+    :type candidate: simulation.Result
+    :param tolerances: Tolerance of single hourly or summary columns, default_tolerance for the others
+    :type tolerances: dict of Tolerance or None
+    :param default_tolerance: Tolerance of the numeric columns
+    :type default_tolerance: Tolerance
+    :return: comparison of the building
+    :rtype: BuildingComparison
+    """
+    tolerances = tolerances or {}
+    hourly, summary = [], []
+    summary_compared = candidate.summary is not None or reference.summary is None
+
+    if reference.hourly is not None and candidate.hourly is not None:
+        columns = list(reference.hourly.columns) + [column for column in candidate.hourly.columns
+                                                    if column not in reference.hourly.columns]
+        hourly = compare_columns(reference.hourly, candidate.hourly, columns, tolerances, default_tolerance)
+
+    if reference.summary is not None and candidate.summary is not None:
+        columns = list(reference.summary.columns) + [column for column in candidate.summary.columns
+                                                     if column not in reference.summary.columns]
+        summary = [divergence._replace(first_hour=None)
+                   for divergence in compare_columns(reference.summary.reset_index(drop=True),
+                                                     candidate.summary.reset_index(drop=True), columns,
+                                                     tolerances, default_tolerance)]
+
+    first_hour, first_variables = None, []
+    if hourly:
+        first_hour = min(divergence.first_hour for divergence in hourly)
+        first_variables = [divergence.variable for divergence in hourly if divergence.first_hour == first_hour]
+
+    return BuildingComparison(scr_gebaeude_id=reference.scr_gebaeude_id, status_reference=reference.status,
+                              status_candidate=candidate.status, first_hour=first_hour,
+                              first_variables=first_variables, hourly=hourly, summary=summary,
+                              summary_compared=summary_compared)
+
+
+class EquivalenceReport(object):
+    """
+    Comparison of a candidate engine with the reference engine for the buildings of a stock
+
+    Methods:
+        to_dict: The report as dictionary (for json.dump)
+        format: The report as text
+
+    :param engine: Name of the candidate engine
+    :type engine: str
+    :param comparisons: Comparison of each building
+    :type comparisons: list of BuildingComparison
+    """
+
+    def __init__(self, engine, comparisons):
+
+        self.engine = engine
+        self.comparisons = comparisons
+
+    @staticmethod
+    def is_equivalent(comparison):
+        return comparison.status_reference == comparison.status_candidate and not comparison.hourly and \
+               not comparison.summary
+
+    @property
+    def divergent(self):
+        """
+        Comparisons of the buildings that are not equivalent
+        """
+        return [comparison for comparison in self.comparisons if not self.is_equivalent(comparison)]
+
+    @property
+    def passed(self):
+        return not self.divergent
+
+    def to_dict(self):
+        def as_dict(comparison):
+            result = comparison._asdict()
+            result['hourly'] = [divergence._asdict() for divergence in comparison.hourly]
+            result['summary'] = [divergence._asdict() for divergence in comparison.summary]
+            return result
+
+        return {'engine': self.engine,
+                'passed': self.passed,
+                'buildings': len(self.comparisons),
+                'divergent_buildings': len(self.divergent),
+                'summary_compared': all(comparison.summary_compared for comparison in self.comparisons),
+                'divergent': [as_dict(comparison) for comparison in self.divergent]}
+
+    def format(self):
+        lines = ['{}: {} of {} buildings equivalent'.format(self.engine, len(self.comparisons) - len(self.divergent),
+                                                            len(self.comparisons))]
+        if not all(comparison.summary_compared for comparison in self.comparisons):
+            lines.append('  (summary not calculated by the engine, only the hourly results are compared)')
+
+        for comparison in self.divergent:
+            lines.append('  ' + str(comparison.scr_gebaeude_id) + ':')
+            if comparison.status_reference != comparison.status_candidate:
+                lines.append('    status {} (reference {})'.format(comparison.status_candidate,
+                                                                   comparison.status_reference))
+            if comparison.first_hour is not None:
+                lines.append('    first divergent hour {}: {}'.format(comparison.first_hour,
+                                                                      ', '.join(comparison.first_variables)))
+            for divergence in comparison.hourly:
+                lines.append('    hourly  {}: {} hours, first {} (reference {}, candidate {}), max diff {}'.format(
+                    divergence.variable, divergence.count, divergence.first_hour, divergence.reference,
+                    divergence.candidate, divergence.max_abs_diff))
+            for divergence in comparison.summary:
+                lines.append('    summary {}: reference {}, candidate {}'.format(
+                    divergence.variable, divergence.reference, divergence.candidate))
+        return '\n'.join(lines)
+
+
+def compare_engines(buildings, context, candidate, reference=run_reference, name=None, tolerances=None,
+                    default_tolerance=Tolerance(rtol=1e-9, atol=1e-6), reference_results=None):
+    """
+    Simulates the buildings with the reference and the candidate engine and compares the results
+
+    :param buildings: Parameters of the buildings, e.g. of synthetic_stock.generate_stock()
+    :type buildings: list of namedtuple
+    :param context: Data used by the simulation
+    :type context: simulation.SimulationContext
+    :param candidate: Candidate engine, e.g. ENGINES['closed_form']
+    :type candidate: function
+    :param reference: Reference engine
+    :type reference: function
+    :param name: Name of the candidate engine in the report (default: name of the function)
+    :type name: str or None
+    :param tolerances: Tolerance of single hourly or summary columns
+    :type tolerances: dict of Tolerance or None
+    :param default_tolerance: Tolerance of the other numeric columns
+    :type default_tolerance: Tolerance
+    :param reference_results: Results of the reference engine if already simulated (the reference is not run)
+    :type reference_results: list of simulation.Result or None
+    :return: comparison of all buildings
+    :rtype: EquivalenceReport
+    """
+    buildings = list(buildings)
+    if reference_results is None:
+        reference_results = list(reference(buildings, context))
+
+    comparisons = [compare_results(reference_result, candidate_result, tolerances, default_tolerance)
+                   for reference_result, candidate_result in zip(reference_results, candidate(buildings, context))]
+    return EquivalenceReport(name or candidate.__name__, comparisons)
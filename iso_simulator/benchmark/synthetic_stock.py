@@ -0,0 +1,327 @@
+"""
+Synthetic building stocks for benchmarks and regression tests
+
+generate_stock() draws any number of buildings with the columns of SimulationData_Breitenerhebung.csv. The
+distributions of the parameters of Building are chosen to cover the range of the ENOB:dataNWG survey data
+(sizes over several orders of magnitude, old and refurbished envelopes, with and without ventilation or cooling).
+The usage types are the ones of profiles_zuweisungen.csv that can be simulated (see usage_types()), the supply
+systems are the classes of supply_system.py and the zip codes are the ones of plzcodes.csv.
+
+The same n_buildings and seed always give the same stock, so that benchmarks of different commits simulate the same
+buildings. Parameters are drawn column by column, the first n buildings of a larger stock are not the same as the
+buildings of a smaller stock.
+
+Example:
+    building_data = generate_stock(1000, seed=0)
+    building_data.to_csv('SimulationData_Synthetic.csv', sep=';', index=False)
+    for result in simulate_stock(stock_buildings(building_data), context):
+        ...
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Root folder of the simulator (one level up)
+mainPath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if mainPath not in sys.path:
+    sys.path.insert(0, mainPath)
+
+from auxiliary.referenceData import ReferenceData
+
+# Columns of SimulationData_Breitenerhebung.csv, in this order
+BUILDING_DATA_COLUMNS = (
+    'scr_gebaeude_id', 'plz', 'hk_geb', 'uk_geb', 'max_occupancy', 'wall_area_og', 'wall_area_ug',
+    'window_area_north', 'window_area_east', 'window_area_south', 'window_area_west', 'roof_area', 'net_room_area',
+    'energy_ref_area', 'base_area', 'gross_base_area', 'building_height', 'net_volume', 'gross_volume',
+    'envelope_area', 'lighting_load', 'lighting_control', 'lighting_utilisation_factor',
+    'lighting_maintenance_factor', 'aw_construction', 'shading_device', 'shading_solar_transmittance',
+    'glass_solar_transmittance', 'glass_solar_shading_transmittance', 'glass_light_transmittance', 'u_windows',
+    'u_walls', 'u_roof', 'u_base', 'temp_adj_base', 'temp_adj_walls_ug', 'ach_inf', 'ach_win', 'ach_vent',
+    'heat_recovery_efficiency', 'thermal_capacitance', 't_set_heating', 't_start', 't_set_cooling',
+    'night_flushing_flow', 'max_heating_energy_per_floor_area', 'max_cooling_energy_per_floor_area',
+    'heating_supply_system', 'cooling_supply_system', 'heating_emission_system', 'cooling_emission_system',
+    'dhw_system')
+
+# Shares of the energy carriers of the heating supply systems, the systems of a carrier are equally likely
+HEATING_SUPPLY_SYSTEMS = (
+    (0.44, ('GasBoilerStandardBefore86', 'GasBoilerStandardBefore95', 'GasBoilerStandardFrom95',
+            'GasBoilerLowTempBefore87', 'GasBoilerLowTempBefore95', 'GasBoilerLowTempFrom95',
+            'GasBoilerLowTempSpecialFrom78', 'GasBoilerLowTempSpecialFrom95', 'GasBoilerCondensingBefore95',
+            'GasBoilerCondensingFrom95', 'GasBoilerCondensingImproved', 'LGasBoilerLowTempBefore87',
+            'LGasBoilerLowTempBefore95', 'LGasBoilerLowTempFrom95', 'LGasBoilerCondensingBefore95',
+            'LGasBoilerCondensingFrom95', 'LGasBoilerCondensingImproved')),
+    (0.17, ('OilBoilerStandardBefore86', 'OilBoilerStandardFrom95', 'OilBoilerLowTempBefore87',
+            'OilBoilerLowTempBefore95', 'OilBoilerLowTempFrom95', 'OilBoilerCondensingBefore95',
+            'OilBoilerCondensingFrom95', 'OilBoilerCondensingImproved')),
+    (0.17, ('DistrictHeating',)),
+    (0.07, ('HeatPumpAirSource', 'HeatPumpGroundSource')),
+    (0.04, ('WoodChipSolidFuelBoiler', 'WoodPelletSolidFuelBoiler', 'WoodSolidFuelBoilerCentral')),
+    (0.03, ('ElectricHeating', 'DirectHeater')),
+    (0.02, ('BiogasBoilerCondensingBefore95', 'BiogasBoilerCondensingFrom95', 'BiogasOilBoilerLowTempBefore95',
+            'BiogasOilBoilerCondensingFrom95', 'BiogasOilBoilerCondensingImproved')),
+    (0.03, ('GasCHP',)),
+    (0.02, ('CoalSolidFuelBoiler', 'SolidFuelLiquidFuelFurnace')),
+    (0.01, ('NoHeating',)),
+)
+
+# Shares of the cooling supply systems
+COOLING_SUPPLY_SYSTEMS = (
+    (0.70, 'NoCooling'),
+    (0.14, 'AirCooledPistonScroll'),
+    (0.05, 'AirCooledPistonScrollMulti'),
+    (0.04, 'WaterCooledPistonScroll'),
+    (0.02, 'DirectCooler'),
+    (0.02, 'DistrictCooling'),
+    (0.02, 'AbsorptionRefrigerationSystem'),
+    (0.01, 'GasEnginePistonScroll'),
+)
+
+# Shares of the heating emission systems (cooling uses the same system if the building is cooled)
+EMISSION_SYSTEMS = (
+    (0.60, 'AirConditioning'),
+    (0.30, 'SurfaceHeatingCooling'),
+    (0.10, 'ThermallyActivated'),
+)
+
+# Shares of the hot water systems
+DHW_SYSTEMS = (
+    (0.45, 'CentralHeating'),
+    (0.10, 'CentralDHW'),
+    (0.35, 'DecentralElectricDHW'),
+    (0.05, 'DecentralFuelBasedDHW'),
+    (0.05, 'NoDHW'),
+)
+
+# Glazing: glass_solar_transmittance, glass_light_transmittance, range of u_windows [W/m2K]
+GLAZINGS = (
+    (0.25, (0.87, 0.377527, (4.8, 5.2))),
+    (0.45, (0.78, 0.33558, (1.7, 3.0))),
+    (0.30, (0.67, 0.39627, (0.9, 1.6))),
+)
+
+
+def usage_types(auxiliary_path=os.path.join(mainPath, 'auxiliary')):
+    """
+    Returns the usage types of profiles_zuweisungen.csv that can be simulated: they have gains, usage times,
+    an occupancy schedule with full usage hours and a TEK value
+
+    :param auxiliary_path: Directory of the auxiliary data
+    :type auxiliary_path: str
+    :return: hk_geb and uk_geb of each usage type
+    :rtype: list of tuple (str, str)
+    """
+    reference_data = ReferenceData(auxiliary_path=auxiliary_path)
+    gains_zuweisungen = pd.read_csv(os.path.join(auxiliary_path, 'norm_profiles/profiles_zuweisungen.csv'),
+                                    sep=';', encoding='latin')
+
+    usage = []
+    # The rows of the reference data are found by uk_geb, so each uk_geb is used once
+    for hk_geb, uk_geb in gains_zuweisungen[['hk_geb', 'uk_geb']].drop_duplicates(subset='uk_geb').itertuples(
+            index=False, name=None):
+        try:
+            reference_data.getGains(hk_geb, uk_geb, 'din18599', 'mid')
+            reference_data.getUsagetime(hk_geb, uk_geb, 'sia2024')
+            occupancy_schedule, schedule_name = reference_data.getSchedule(hk_geb, uk_geb)
+            reference_data.getTEK(hk_geb, uk_geb)
+        except (OSError, ValueError):
+            continue
+        if occupancy_schedule.People.sum() > 0:
+            usage.append((hk_geb, uk_geb))
+    return usage
+
+
+def zip_codes(weather_data_path=os.path.join(mainPath, 'auxiliary/weather_data')):
+    """
+    Returns the zip codes of plzcodes.csv
+
+    :param weather_data_path: Directory of the weather data
+    :type weather_data_path: str
+    :return: zip codes
+    :rtype: np.ndarray of int
+    """
+    plz_data = pd.read_csv(os.path.join(weather_data_path, 'plzcodes.csv'), encoding='latin',
+                           dtype={'zipcode': int})
+    return plz_data['zipcode'].drop_duplicates().to_numpy()
+
+
+def choose(rng, shares, size):
+    """
+    Draws size values of ((share, value), ...)
+    """
+    p = np.array([share for share, value in shares], dtype=float)
+    indices = rng.choice(len(shares), size=size, p=p / p.sum())
+    return [shares[i][1] for i in indices]
+
+
+def generate_stock(n_buildings, seed=0, auxiliary_path=os.path.join(mainPath, 'auxiliary')):
+    """
+    Generates a synthetic building stock
+
+    :param n_buildings: Number of buildings
+    :type n_buildings: int
+    :param seed: Seed of the random numbers, the same seed gives the same stock
+    :type seed: int
+    :param auxiliary_path: Directory of the auxiliary data (usage types and zip codes)
+    :type auxiliary_path: str
+    :return: building data with the columns of SimulationData_Breitenerhebung.csv (BUILDING_DATA_COLUMNS)
+    :rtype: pd.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    n = n_buildings
+
+    usage = usage_types(auxiliary_path)
+    usage_index = rng.integers(len(usage), size=n)
+    plz = rng.choice(zip_codes(os.path.join(auxiliary_path, 'weather_data')), size=n)
+
+    # Size and shape: energy reference area from 50 m2 to 100,000 m2 (median 1000 m2)
+    energy_ref_area = np.clip(rng.lognormal(np.log(1000), 1.1, size=n), 50, 100000)
+    net_room_area = energy_ref_area / rng.uniform(0.7, 1.0, size=n)
+    n_floors = np.clip(1 + rng.poisson(np.log10(energy_ref_area), size=n), 1, 20)
+    storey_height = rng.uniform(3.0, 4.2, size=n)
+    building_height = n_floors * storey_height
+    base_area = energy_ref_area / n_floors
+    gross_base_area = base_area * rng.uniform(1.1, 1.2, size=n)
+    aspect_ratio = rng.uniform(1, 3, size=n)
+    perimeter = 2 * (np.sqrt(gross_base_area * aspect_ratio) + np.sqrt(gross_base_area / aspect_ratio))
+    facade_area = perimeter * building_height
+    gross_volume = gross_base_area * building_height
+    net_volume = gross_volume * rng.uniform(0.8, 0.9, size=n)
+    roof_area = gross_base_area * rng.uniform(1.0, 1.3, size=n)
+
+    # Windows: 10 % to 50 % of the facade, the orientations differ by the layout of the building
+    window_area = facade_area * rng.uniform(0.1, 0.5, size=n)
+    window_shares = rng.dirichlet((8, 8, 8, 8), size=n)
+    wall_area_og = facade_area - window_area
+    has_basement = rng.random(size=n) < 0.5
+    wall_area_ug = np.where(has_basement, perimeter * rng.uniform(2.5, 3.0, size=n), 0.0)
+    envelope_area = facade_area + roof_area + gross_base_area + wall_area_ug
+
+    max_occupancy = np.maximum(1, np.round(energy_ref_area / rng.uniform(10, 40, size=n))).astype(int)
+
+    # Lighting
+    lighting_load = np.clip(rng.lognormal(np.log(12), 0.4, size=n), 3, 60)
+    lighting_control = rng.choice([200, 300, 500], size=n, p=[0.1, 0.4, 0.5])
+    lighting_maintenance_factor = rng.choice([0.8, 0.9], size=n)
+
+    # Glazing and shading (shading reduces the solar transmittance to 15 % to 100 %)
+    glazings = choose(rng, GLAZINGS, n)
+    glass_solar_transmittance = np.array([glazing[0] for glazing in glazings])
+    glass_light_transmittance = np.array([glazing[1] for glazing in glazings])
+    u_windows = np.array([rng.uniform(*glazing[2]) for glazing in glazings])
+    has_shading = rng.random(size=n) < 0.4
+    glass_solar_shading_transmittance = np.where(has_shading,
+                                                 glass_solar_transmittance * rng.uniform(0.15, 0.5, size=n),
+                                                 glass_solar_transmittance)
+
+    # Opaque envelope from unrefurbished to refurbished (log-uniform)
+    u_walls = np.exp(rng.uniform(np.log(0.2), np.log(1.8), size=n))
+    u_roof = np.exp(rng.uniform(np.log(0.15), np.log(2.0), size=n))
+    u_base = np.exp(rng.uniform(np.log(0.25), np.log(1.5), size=n))
+    temp_adj_base = rng.choice([0.25, 0.35, 0.45, 0.55], size=n)
+    temp_adj_walls_ug = np.where(has_basement, rng.choice([0.4, 0.6], size=n), 0.0)
+
+    # Ventilation: 30 % of the buildings have a ventilation system, half of them with heat recovery
+    ach_inf = np.clip(rng.lognormal(np.log(0.25), 0.5, size=n), 0.05, 1.5)
+    ach_win = rng.uniform(0.5, 3.5, size=n)
+    has_ventilation = rng.random(size=n) < 0.3
+    ach_vent = np.where(has_ventilation, rng.uniform(0.1, 1.0, size=n), 0.0)
+    heat_recovery_efficiency = np.where(has_ventilation & (rng.random(size=n) < 0.5),
+                                        rng.uniform(0.5, 0.85, size=n), 0.0)
+    night_flushing_flow = np.where(rng.random(size=n) < 0.1, rng.uniform(0.5, 2.0, size=n), 0.0)
+
+    thermal_capacitance = rng.choice([110000, 165000, 260000, 370000], size=n, p=[0.3, 0.4, 0.2, 0.1])
+    t_set_heating = rng.choice([20, 21, 22], size=n, p=[0.2, 0.6, 0.2])
+    t_set_cooling = rng.choice([24, 25, 26], size=n, p=[0.5, 0.3, 0.2])
+
+    # Supply and emission systems
+    heating_supply_system = choose(rng, [(share / len(systems), system) for share, systems in HEATING_SUPPLY_SYSTEMS
+                                         for system in systems], n)
+    cooling_supply_system = choose(rng, COOLING_SUPPLY_SYSTEMS, n)
+    heating_emission_system = choose(rng, EMISSION_SYSTEMS, n)
+    cooling_emission_system = [emission if cooling != 'NoCooling' else 'NoCooling'
+                               for emission, cooling in zip(heating_emission_system, cooling_supply_system)]
+    dhw_system = choose(rng, DHW_SYSTEMS, n)
+
+    building_data = pd.DataFrame({
+        'scr_gebaeude_id': ['SYN{}_{:07d}'.format(seed, i) for i in range(n)],
+        'plz': plz,
+        'hk_geb': [usage[i][0] for i in usage_index],
+        'uk_geb': [usage[i][1] for i in usage_index],
+        'max_occupancy': max_occupancy,
+        'wall_area_og': wall_area_og,
+        'wall_area_ug': wall_area_ug,
+        'window_area_north': window_area * window_shares[:, 0],
+        'window_area_east': window_area * window_shares[:, 1],
+        'window_area_south': window_area * window_shares[:, 2],
+        'window_area_west': window_area * window_shares[:, 3],
+        'roof_area': roof_area,
+        'net_room_area': net_room_area,
+        'energy_ref_area': energy_ref_area,
+        'base_area': base_area,
+        'gross_base_area': gross_base_area,
+        'building_height': building_height,
+        'net_volume': net_volume,
+        'gross_volume': gross_volume,
+        'envelope_area': envelope_area,
+        'lighting_load': lighting_load,
+        'lighting_control': lighting_control,
+        'lighting_utilisation_factor': 0.45,
+        'lighting_maintenance_factor': lighting_maintenance_factor,
+        'aw_construction': 1,
+        'shading_device': np.where(has_shading, 1, 6),
+        'shading_solar_transmittance': np.where(has_shading, 0.5, 1.0),
+        'glass_solar_transmittance': glass_solar_transmittance,
+        'glass_solar_shading_transmittance': glass_solar_shading_transmittance,
+        'glass_light_transmittance': glass_light_transmittance,
+        'u_windows': u_windows,
+        'u_walls': u_walls,
+        'u_roof': u_roof,
+        'u_base': u_base,
+        'temp_adj_base': temp_adj_base,
+        'temp_adj_walls_ug': temp_adj_walls_ug,
+        'ach_inf': ach_inf,
+        'ach_win': ach_win,
+        'ach_vent': ach_vent,
+        'heat_recovery_efficiency': heat_recovery_efficiency,
+        'thermal_capacitance': thermal_capacitance,
+        't_set_heating': t_set_heating,
+        't_start': t_set_heating,
+        't_set_cooling': t_set_cooling,
+        'night_flushing_flow': night_flushing_flow,
+        'max_heating_energy_per_floor_area': np.inf,
+        'max_cooling_energy_per_floor_area': -np.inf,
+        'heating_supply_system': heating_supply_system,
+        'cooling_supply_system': cooling_supply_system,
+        'heating_emission_system': heating_emission_system,
+        'cooling_emission_system': cooling_emission_system,
+        'dhw_system': dhw_system,
+    }, columns=list(BUILDING_DATA_COLUMNS))
+
+    return building_data
+
+
+def stock_buildings(building_data):
+    """
+    Yields the buildings of building data as namedtuples, as simulation.read_buildings() does for a csv file
+
+    :param building_data: Building data, e.g. of generate_stock()
+    :type building_data: pd.DataFrame
+    :return: Parameters of each building
+    :rtype: generator of namedtuple
+    """
+    Row = namedtuple('Gebaeude', building_data.columns)
+    for row in building_data.itertuples(index=False):
+        yield Row(*row)
@@ -16,8 +16,19 @@ __author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
 __copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
 __license__ = "MIT"
 
+from collections import namedtuple
+
+import numpy as np
+
 import supply_system
 import emission_system
+from radiation import round_temperature
+from profiling import profiled
+
+# Consumption of the supply systems in each time step, see Building.calc_supply_loads_array()
+SupplyLoads = namedtuple('SupplyLoads', ['heating_sys_electricity', 'heating_sys_fossils', 'cooling_sys_electricity',
+                                         'cooling_sys_fossils', 'electricity_out', 'cop', 'sys_total_energy',
+                                         'heating_energy', 'cooling_energy'])
 
 
 class Building(object):
@@ -68,6 +79,8 @@ class Building(object):
     cooling_supply_system: The type of cooling system
     heating_emission_system: How the heat is distributed to the building
     cooling_emission_system: How the cooling energy is distributed to the building
+    solver: How the heating/cooling demand is solved in each time step. 'crank_nicolson' evaluates the node temperatures
+            for each step of section C.4.2 (ISO 13790 Annex C), 'closed_form' evaluates them once (see calc_temperatures_closed_form)
 
 
     VARIABLE DEFINITION
@@ -146,7 +159,8 @@ class Building(object):
                  heating_supply_system,
                  cooling_supply_system,
                  heating_emission_system,
-                 cooling_emission_system):
+                 cooling_emission_system,
+                 solver='crank_nicolson'):
 
         ## Dimensions
         # area of all windows 
@@ -253,6 +267,15 @@ class Building(object):
         self.heating_emission_system = heating_emission_system
         self.cooling_emission_system = cooling_emission_system
 
+        ## Solver
+        if solver not in ('crank_nicolson', 'closed_form'):
+            raise ValueError('Unknown solver: ' + str(solver))
+        self.solver = solver
+        # Heat flows of the emission systems per W of energy demand, used by calc_heat_flow() and
+        # calc_temperatures_closed_form()
+        self.heating_emission_coefficients = emission_system.compile_emission_system(heating_emission_system)
+        self.cooling_emission_coefficients = emission_system.compile_emission_system(cooling_emission_system)
+
     @property
     def h_tr_1(self):
         """
@@ -395,8 +418,8 @@ class Building(object):
         if self.night_flushing_flow > 0 \
                 and (cooling_season == True) \
                 and (is_night_time == True) \
-                and (round(self.t_air, 1) > 21) \
-                and (round(self.t_air, 1) > (t_out + 2)):
+                and (round_temperature(self.t_air, 1) > 21) \
+                and (round_temperature(self.t_air, 1) > (t_out + 2)):
 
             self.night_flushing_on = True
 
@@ -405,6 +428,7 @@ class Building(object):
 
         return self.night_flushing_on
 
+    @profiled('lighting')
     def solve_building_lighting(self, illuminance, occupancy):
         """
         Calculates the lighting demand for a set timestep
@@ -433,10 +457,35 @@ class Building(object):
         else:
             self.lighting_demand = 0
 
-    def solve_building_energy(self, internal_gains, solar_gains, t_out, t_m_prev):
+    @profiled('lighting')
+    def solve_building_lighting_array(self, illuminance, occupancy):
+        """
+        Calculates the lighting demand for all time steps at once, same as solve_building_lighting() for each time step
+
+        :param illuminance: Illuminance transmitted through the window of each time step [Lumens]
+        :type illuminance: np.ndarray
+        :param occupancy: Probability of full occupancy of each time step
+        :type occupancy: np.ndarray
+
+        :return: Lighting Energy Required for each time step
+        :rtype: np.ndarray
+        """
+        lux = (illuminance * self.lighting_utilisation_factor *
+               self.lighting_maintenance_factor) / self.net_room_area  # [Lux]
+
+        return np.where((lux < self.lighting_control) & (occupancy > 0),
+                        self.lighting_load * self.net_room_area * occupancy, 0.0)
+
+    @profiled('solve_building_energy')
+    def solve_building_energy(self, internal_gains, solar_gains, t_out, t_m_prev, calc_supply=True):
         """
         Calculates the heating and cooling consumption of a building for a set timestep
 
+        With calc_supply=False only the heating/cooling demand is calculated. The consumption of the supply system
+        (heating_sys_electricity ... cop) is set to nan and calculated for all time steps at once afterwards with
+        calc_supply_loads_array() from energy_demand, has_heating_demand, has_cooling_demand, t_out and the supply
+        temperatures of each time step.
+
         :param internal_gains: internal heat gains from people and appliances [W]
         :type internal_gains: float
         :param solar_gains: solar heat gains [W]
@@ -445,6 +494,8 @@ class Building(object):
         :type t_out: float
         :param t_m_prev: Previous air temperature [C]
         :type t_m_prev: float
+        :param calc_supply: Calculate the consumption of the supply system in this time step
+        :type calc_supply: bool
 
         :return: self.heating_demand, space heating demand of the building
         :return: self.heating_sys_electricity, heating electricity consumption
@@ -462,8 +513,12 @@ class Building(object):
         """
         # Main File
 
-        # check demand, and change state of self.has_heating_demand, and self._has_cooling_demand
-        self.has_demand(internal_gains, solar_gains, t_out, t_m_prev)
+        if self.solver == 'closed_form':
+            # check demand, and calculate energy_demand and the resulting temperatures in one step
+            self.calc_temperatures_closed_form(internal_gains, solar_gains, t_out, t_m_prev)
+        else:
+            # check demand, and change state of self.has_heating_demand, and self._has_cooling_demand
+            self.has_demand(internal_gains, solar_gains, t_out, t_m_prev)
 
         if not self.has_heating_demand and not self.has_cooling_demand:
 
@@ -496,14 +551,29 @@ class Building(object):
 
             # has heating/cooling demand
 
-            # Calculates energy_demand used below
-            self.calc_energy_demand(
-                internal_gains, solar_gains, t_out, t_m_prev)
-
-            self.calc_temperatures_crank_nicolson(
-                self.energy_demand, internal_gains, solar_gains, t_out, t_m_prev)
-            # calculates the actual t_m resulting from the actual heating
-            # demand (energy_demand)
+            if self.solver != 'closed_form':
+                # Calculates energy_demand used below
+                self.calc_energy_demand(
+                    internal_gains, solar_gains, t_out, t_m_prev)
+
+                self.calc_temperatures_crank_nicolson(
+                    self.energy_demand, internal_gains, solar_gains, t_out, t_m_prev)
+                # calculates the actual t_m resulting from the actual heating
+                # demand (energy_demand)
+
+            if not calc_supply:
+                # Only the demand, the supply system is calculated later (see calc_supply_loads_array)
+                if self.has_heating_demand:
+                    self.heating_demand = self.energy_demand
+                    self.cooling_demand = 0
+                else:
+                    self.heating_demand = 0
+                    self.cooling_demand = self.energy_demand
+                self.heating_sys_electricity = self.heating_sys_fossils = float('nan')
+                self.cooling_sys_electricity = self.cooling_sys_fossils = float('nan')
+                self.electricity_out = self.cop = float('nan')
+                self.sys_total_energy = self.heating_energy = self.cooling_energy = float('nan')
+                return
 
             # Calculate the Heating/Cooling Input Energy Required
 
@@ -549,9 +619,84 @@ class Building(object):
         self.heating_energy = self.heating_sys_electricity + self.heating_sys_fossils
         self.cooling_energy = self.cooling_sys_electricity + self.cooling_sys_fossils
 
+    @profiled('supply')
+    def calc_supply_loads_array(self, energy_demand, t_out, heating_supply_temperature, cooling_supply_temperature,
+                                has_heating_demand, has_cooling_demand):
+        """
+        Calculates the consumption of the heating and cooling supply systems for many time steps at once, the
+        results are the same as of solve_building_energy() in each time step
+        Used after solve_building_energy() with calc_supply=False
+
+        :param energy_demand: energy_demand of each time step [W]
+        :type energy_demand: array_like
+        :param t_out: Outdoor air temperature of each time step [C]
+        :type t_out: array_like
+        :param heating_supply_temperature: heating_supply_temperature of each time step [C]
+        :type heating_supply_temperature: array_like
+        :param cooling_supply_temperature: cooling_supply_temperature of each time step [C]
+        :type cooling_supply_temperature: array_like
+        :param has_heating_demand: has_heating_demand of each time step
+        :type has_heating_demand: array_like (bool)
+        :param has_cooling_demand: has_cooling_demand of each time step
+        :type has_cooling_demand: array_like (bool)
+
+        :return: consumption of the supply systems in each time step
+        :rtype: SupplyLoads
+        """
+        energy_demand = np.asarray(energy_demand, dtype=float)
+        t_out = np.asarray(t_out, dtype=float)
+        heating_supply_temperature = np.asarray(heating_supply_temperature, dtype=float)
+        cooling_supply_temperature = np.asarray(cooling_supply_temperature, dtype=float)
+        heating = np.asarray(has_heating_demand, dtype=bool)
+        cooling = np.asarray(has_cooling_demand, dtype=bool) & ~heating
+
+        # No heating or cooling demand: no consumption and COP nan
+        heating_sys_electricity = np.zeros(energy_demand.shape)
+        heating_sys_fossils = np.zeros(energy_demand.shape)
+        cooling_sys_electricity = np.zeros(energy_demand.shape)
+        cooling_sys_fossils = np.zeros(energy_demand.shape)
+        electricity_out = np.zeros(energy_demand.shape)
+        cop = np.full(energy_demand.shape, np.nan)
+
+        if heating.any():
+            supplyOut = self.heating_supply_system.calc_loads_array(
+                load=energy_demand[heating], t_out=t_out[heating],
+                heating_supply_temperature=heating_supply_temperature[heating],
+                cooling_supply_temperature=cooling_supply_temperature[heating],
+                has_heating_demand=np.ones(heating.sum(), dtype=bool),
+                has_cooling_demand=np.zeros(heating.sum(), dtype=bool))
+            heating_sys_electricity[heating] = supplyOut.electricity_in
+            heating_sys_fossils[heating] = supplyOut.fossils_in
+            electricity_out[heating] = supplyOut.electricity_out
+            cop[heating] = supplyOut.cop
+
+        if cooling.any():
+            supplyOut = self.cooling_supply_system.calc_loads_array(
+                load=energy_demand[cooling] * (-1), t_out=t_out[cooling],
+                heating_supply_temperature=heating_supply_temperature[cooling],
+                cooling_supply_temperature=cooling_supply_temperature[cooling],
+                has_heating_demand=np.zeros(cooling.sum(), dtype=bool),
+                has_cooling_demand=np.ones(cooling.sum(), dtype=bool))
+            cooling_sys_electricity[cooling] = supplyOut.electricity_in
+            cooling_sys_fossils[cooling] = supplyOut.fossils_in
+            electricity_out[cooling] = supplyOut.electricity_out
+            cop[cooling] = supplyOut.cop
+
+        return SupplyLoads(heating_sys_electricity=heating_sys_electricity,
+                           heating_sys_fossils=heating_sys_fossils,
+                           cooling_sys_electricity=cooling_sys_electricity,
+                           cooling_sys_fossils=cooling_sys_fossils,
+                           electricity_out=electricity_out,
+                           cop=cop,
+                           sys_total_energy=heating_sys_electricity + heating_sys_fossils +
+                                            cooling_sys_electricity + cooling_sys_fossils,
+                           heating_energy=heating_sys_electricity + heating_sys_fossils,
+                           cooling_energy=cooling_sys_electricity + cooling_sys_fossils)
+
     # TODO: rename. this is expected to return a boolean. instead, it changes state??? you don't want to change state...
     # why not just return has_heating_demand and has_cooling_demand?? then call the function "check_demand"
     # has_heating_demand, has_cooling_demand = self.check_demand(...)
+    @profiled('has_demand')
     def has_demand(self, internal_gains, solar_gains, t_out, t_m_prev):
         """
         Determines whether the building requires heating or cooling
@@ -569,10 +714,10 @@ class Building(object):
 
         # If the air temperature is less or greater than the set temperature,
         # there is a heating/cooling load
-        if round(self.t_air, 1) < self.t_set_heating:
+        if round_temperature(self.t_air, 1) < self.t_set_heating:
             self.has_heating_demand = True
             self.has_cooling_demand = False
-        elif round(self.t_air, 1) > self.t_set_cooling:
+        elif round_temperature(self.t_air, 1) > self.t_set_cooling:
             self.has_cooling_demand = True
             self.has_heating_demand = False
         else:
@@ -604,6 +749,7 @@ class Building(object):
 
         return self.t_m, self.t_air, self.t_opperative
 
+    @profiled('energy_demand')
     def calc_energy_demand(self, internal_gains, solar_gains, t_out, t_m_prev):
         """
         Calculates the energy demand of the space if heating/cooling is active
@@ -644,6 +790,20 @@ class Building(object):
         self.calc_energy_demand_unrestricted(
             energy_floorAx10, t_air_set, t_air_0, t_air_10)
 
+        # Step 3 and Step 4
+        self.calc_energy_demand_restricted(t_air_set)
+
+        # calculate system temperatures for Step 3/Step 4
+        self.calc_temperatures_crank_nicolson(
+            self.energy_demand, internal_gains, solar_gains, t_out, t_m_prev)
+
+    def calc_energy_demand_restricted(self, t_air_set):
+        """
+        Limits the unrestricted energy demand to the available heating/cooling power
+        Used in: calc_energy_demand(), calc_temperatures_closed_form()
+        # Step 3 - Step 4 in Section C.4.2 in [C.3 ISO 13790]
+        """
+
         # Step 3: Check if available heating or cooling power is sufficient
         # If max_cooling_energy_per_floor_area is set so -inf and 
         # max_heating_energy_per_floor_area to inf, this condition is always true
@@ -668,9 +828,109 @@ class Building(object):
             self.energy_demand = 0
             raise ValueError('unknown radiative heating/cooling system status')
 
-        # calculate system temperatures for Step 3/Step 4
-        self.calc_temperatures_crank_nicolson(
-            self.energy_demand, internal_gains, solar_gains, t_out, t_m_prev)
+    @profiled('closed_form_demand')
+    def calc_temperatures_closed_form(self, internal_gains, solar_gains, t_out, t_m_prev):
+        """
+        Determines whether the building requires heating or cooling, the energy demand and the resulting node
+        temperatures (t_air, t_m, t_s) with one evaluation of the node temperatures
+        Used in: solve_building_energy() if solver == 'closed_form'
+
+        Within a time step all node temperatures are affine in energy_demand, the slope depends on the node the
+        emission system emits to (see calc_temperature_slopes). The temperatures without heating/cooling and these
+        slopes give the same results as the evaluations of calc_temperatures_crank_nicolson() in has_demand(),
+        calc_energy_demand() and solve_building_energy().
+        # Section C.3 and C.4.2 in [C.3 ISO 13790]
+        """
+
+        # Step 1: Calculate the temperatures with no heating/cooling
+        self.calc_heat_flow_gains(internal_gains, solar_gains)
+        self.calc_phi_m_tot(t_out)
+        self.calc_t_m_next(t_m_prev)
+        self.calc_t_m(t_m_prev)
+        self.calc_t_s(t_out)
+        self.calc_t_air(t_out)
+
+        # Supply temperatures of the cooling emission system, as set by calc_heat_flow() for energy_demand = 0
+        self.heating_supply_temperature = self.cooling_emission_coefficients.heating_supply_temperature
+        self.cooling_supply_temperature = self.cooling_emission_coefficients.cooling_supply_temperature
+
+        # If the air temperature is less or greater than the set temperature,
+        # there is a heating/cooling load (see has_demand)
+        if round_temperature(self.t_air, 1) < self.t_set_heating:
+            self.has_heating_demand = True
+            self.has_cooling_demand = False
+            t_air_set = self.t_set_heating
+        elif round_temperature(self.t_air, 1) > self.t_set_cooling:
+            self.has_cooling_demand = True
+            self.has_heating_demand = False
+            t_air_set = self.t_set_cooling
+        else:
+            self.has_heating_demand = False
+            self.has_cooling_demand = False
+            return
+
+        # Step 2: Calculate the unrestricted heating/cooling required
+        # The 10 W/m2 heating case is emitted by the heating emission system
+        t_air_0 = self.t_air
+        energy_floorAx10 = 10 * self.energy_ref_area
+        heating_slopes = self.calc_temperature_slopes(self.heating_emission_coefficients)
+        t_air_10 = t_air_0 + heating_slopes[4] * energy_floorAx10
+        self.calc_energy_demand_unrestricted(energy_floorAx10, t_air_set, t_air_0, t_air_10)
+
+        # Step 3 and Step 4
+        self.calc_energy_demand_restricted(t_air_set)
+
+        # Temperatures resulting from the actual energy_demand
+        if self.energy_demand > 0:
+            flows = self.heating_emission_coefficients
+            slopes = heating_slopes
+        else:
+            flows = self.cooling_emission_coefficients
+            slopes = self.calc_temperature_slopes(flows)
+        slope_phi_m_tot, slope_t_m_next, slope_t_m, slope_t_s, slope_t_air = slopes
+
+        self.phi_ia += flows.phi_ia_plus * self.energy_demand
+        self.phi_st += flows.phi_st_plus * self.energy_demand
+        self.phi_m += flows.phi_m_plus * self.energy_demand
+        self.phi_m_tot += slope_phi_m_tot * self.energy_demand
+        self.t_m_next += slope_t_m_next * self.energy_demand
+        self.t_m += slope_t_m * self.energy_demand
+        self.t_s += slope_t_s * self.energy_demand
+        self.t_air += slope_t_air * self.energy_demand
+
+        self.heating_supply_temperature = flows.heating_supply_temperature
+        self.cooling_supply_temperature = flows.cooling_supply_temperature
+
+    def calc_temperature_slopes(self, flows):
+        """
+        Calculates the change of phi_m_tot, t_m_next, t_m, t_s and t_air per W of energy_demand emitted by an emission system
+        Used in: calc_temperatures_closed_form()
+        # Derivatives of (C.4), (C.5), (C.9), (C.10) and (C.11) in [C.3 ISO 13790]
+
+        :param flows: Heat flows of the emission system per W of energy_demand
+        :type flows: emission_system.EmissionCoefficients
+
+        :return: slopes of phi_m_tot [W/W], t_m_next, t_m, t_s, t_air [K/W]
+        :rtype: tuple (float)
+        """
+        h_tr_1 = self.h_tr_1
+        h_tr_2 = h_tr_1 + self.h_tr_w
+        h_tr_3 = 1.0 / (1.0 / h_tr_2 + 1.0 / self.h_tr_ms)
+
+        # (C.5)
+        phi_m_tot = flows.phi_m_plus + h_tr_3 * (flows.phi_st_plus + h_tr_1 *
+                                                 (flows.phi_ia_plus / self.h_ve_adj)) / h_tr_2
+        # (C.4)
+        t_m_next = phi_m_tot / ((self.c_m / 3600.0) + 0.5 * (h_tr_3 + self.h_tr_em))
+        # (C.9)
+        t_m = t_m_next / 2.0
+        # (C.10)
+        t_s = (self.h_tr_ms * t_m + flows.phi_st_plus + h_tr_1 * (flows.phi_ia_plus / self.h_ve_adj)) / \
+              (self.h_tr_ms + self.h_tr_w + h_tr_1)
+        # (C.11)
+        t_air = (self.h_tr_is * t_s + flows.phi_ia_plus) / (self.h_tr_is + self.h_ve_adj)
+
+        return phi_m_tot, t_m_next, t_m, t_s, t_air
 
     def calc_energy_demand_unrestricted(self, energy_floorAx10, t_air_set, t_air_0, t_air_10):
         """
@@ -702,38 +962,40 @@ class Building(object):
         """
 
         # Calculates the heat flows to various points of the building based on the breakdown in section C.2, formulas C.1-C.3
-        # Heat flow to the air node
-        self.phi_ia = 0.5 * internal_gains
-        # Heat flow to the surface node
-        self.phi_st = (1 - (self.mass_area / self.A_t) - (self.h_tr_w /
-                                                          (9.1 * self.A_t))) * (0.5 * internal_gains + solar_gains)
-        # Heatflow to the thermal mass node
-        self.phi_m = (self.mass_area / self.A_t) * \
-                     (0.5 * internal_gains + solar_gains)
-
-        # We call the EmissionDirector to modify these flows depending on the
-        # system and the energy demand
-        emDirector = emission_system.EmissionDirector()
+        self.calc_heat_flow_gains(internal_gains, solar_gains)
 
-        # Set the emission system to the type specified by the user
+        # Modify these flows depending on the emission system and the energy demand
+        # (the heat flows of the emission systems are compiled once, see emission_system.compile_emission_system)
         if energy_demand > 0:
-            emDirector.set_builder(self.heating_emission_system(
-                energy_demand=energy_demand))
+            flows = self.heating_emission_coefficients
         else:
-            emDirector.set_builder(self.cooling_emission_system(
-                energy_demand=energy_demand))
-        # Calculate the new flows to each node based on the heating/cooling system
-        flows = emDirector.calc_flows()
+            flows = self.cooling_emission_coefficients
 
         # Set modified flows to building object
-        self.phi_ia += flows.phi_ia_plus
-        self.phi_st += flows.phi_st_plus
-        self.phi_m += flows.phi_m_plus
+        self.phi_ia += flows.phi_ia_plus * energy_demand
+        self.phi_st += flows.phi_st_plus * energy_demand
+        self.phi_m += flows.phi_m_plus * energy_demand
 
         # Set supply temperature to building object
         self.heating_supply_temperature = flows.heating_supply_temperature
         self.cooling_supply_temperature = flows.cooling_supply_temperature
 
+    def calc_heat_flow_gains(self, internal_gains, solar_gains):
+        """
+        Calculates the heat flow from the solar gains and internal gains into the air node, surface node and thermal mass node
+        Used in: calc_heat_flow(), calc_temperatures_closed_form()
+        #C.1 - C.3 in [C.3 ISO 13790]
+        """
+
+        # Heat flow to the air node
+        self.phi_ia = 0.5 * internal_gains
+        # Heat flow to the surface node
+        self.phi_st = (1 - (self.mass_area / self.A_t) - (self.h_tr_w /
+                                                          (9.1 * self.A_t))) * (0.5 * internal_gains + solar_gains)
+        # Heatflow to the thermal mass node
+        self.phi_m = (self.mass_area / self.A_t) * \
+                     (0.5 * internal_gains + solar_gains)
+
     def calc_t_m_next(self, t_m_prev):
         """
         Primary Equation, calculates the temperature of the next time step
@@ -0,0 +1,658 @@
+"""
+Physics required to calculate sensible space heating and space cooling loads of whole building stocks (DIN EN ISO 13970:2008)
+
+The equations are the ones of building_physics.py (ISO 13790 Annex C). Instead of one Building object per simulation,
+the state and the parameters of N buildings are kept in NumPy arrays, so that all buildings of a stock are advanced
+together in one loop over the 8760 hours of the year. The results are the same as for N separate Building objects.
+
+
+Portions of this software are copyright of their respective authors and released under the MIT license:
+RC_BuildingSimulator, Copyright 2016 Architecture and Building Systems, ETH Zurich
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+from collections import namedtuple
+
+import numpy as np
+
+import supply_system
+import emission_system
+from radiation import round_temperature
+
+# Hourly weather and solar data of one weather station
+# t_out: Outdoor air temperature [C], shape (8760,)
+# solar: Incident solar radiation per m2 window area [W/m2], shape (8760, 4), windows ordered as in radiation.WINDOW_ORIENTATIONS
+# illuminance: Incident illuminance per m2 window area [Lx], shape (8760, 4), windows ordered as in radiation.WINDOW_ORIENTATIONS
+StationWeather = namedtuple('StationWeather', ['t_out', 'solar', 'illuminance'])
+
+# Columns of the hourly results, same as hourlyResults in annualSimulation.py
+HOURLY_RESULTS = ['HeatingDemand', 'HeatingEnergy', 'Heating_Sys_Electricity', 'Heating_Sys_Fossils',
+                  'CoolingDemand', 'CoolingEnergy', 'Cooling_Sys_Electricity', 'Cooling_Sys_Fossils',
+                  'HotWaterDemand', 'HotWaterEnergy', 'HotWater_Sys_Electricity', 'HotWater_Sys_Fossils',
+                  'IndoorAirTemperature', 'OutsideTemperature', 'LightingDemand', 'InternalGains',
+                  'Appliance_gains_demands', 'Appliance_gains_elt_demands',
+                  'SolarGainsSouthWindow', 'SolarGainsEastWindow', 'SolarGainsWestWindow', 'SolarGainsNorthWindow',
+                  'SolarGainsTotal', 'Daytime']
+
+
+def group_indices(values):
+    """
+    Returns the indices of each value of a list, e.g. the buildings with the same supply system
+
+    :param values: Values to group
+    :type values: list
+    :return: indices of each value, in order of first appearance
+    :rtype: dict of np.ndarray
+    """
+    groups = {}
+    for i, value in enumerate(values):
+        groups.setdefault(value, []).append(i)
+    return {value: np.array(indices, dtype=int) for value, indices in groups.items()}
+
+
+def calc_station_weather(location, station_solar):
+    """
+    Combines the hourly outdoor temperature of a weather station with its incident solar radiation and illuminance
+    per m2 window area. The values do not depend on the building, only on the station and the window orientation.
+
+    :param location: Location of the weather station
+    :type location: radiation.Location
+    :param station_solar: Sun position and incident radiation of the station, see radiation.SolarCache
+    :type station_solar: radiation.StationSolar
+    :return: hourly weather and solar data of the station
+    :rtype: StationWeather
+    """
+    t_out = location.weather_data['drybulb_C'].to_numpy(dtype=float)[:8760]
+
+    return StationWeather(t_out=t_out, solar=station_solar.solar, illuminance=station_solar.illuminance)
+
+
+class BuildingStock(object):
+    """
+    Sets the parameters of N buildings as arrays of shape (N,).
+
+    The parameters are taken from Building objects, so the definitions of building_physics.Building apply
+    (see there for the INPUT PARAMETER DEFINITION and VARIABLE DEFINITION). All methods work like their
+    counterparts in building_physics.Building, but take and return arrays with one value per building.
+
+    :param buildings: Buildings of the stock
+    :type buildings: list of building_physics.Building
+    """
+
+    def __init__(self, buildings):
+
+        def stack(name):
+            return np.array([getattr(building, name) for building in buildings], dtype=float)
+
+        self.number_of_buildings = len(buildings)
+
+        ## Dimensions
+        self.window_area_north = stack('window_area_north')
+        self.window_area_east = stack('window_area_east')
+        self.window_area_south = stack('window_area_south')
+        self.window_area_west = stack('window_area_west')
+        self.net_room_area = stack('net_room_area')
+        self.energy_ref_area = stack('energy_ref_area')
+
+        ## Fenestration and Lighting Properties
+        self.glass_solar_transmittance = stack('glass_solar_transmittance')
+        self.glass_light_transmittance = stack('glass_light_transmittance')
+        self.glass_solar_shading_transmittance = stack('glass_solar_shading_transmittance')
+        self.lighting_load = stack('lighting_load')
+        self.lighting_control = stack('lighting_control')
+        self.lighting_utilisation_factor = stack('lighting_utilisation_factor')
+        self.lighting_maintenance_factor = stack('lighting_maintenance_factor')
+
+        ## Constants of the building
+        self.max_occupancy = stack('max_occupancy')
+        self.night_flushing_flow = stack('night_flushing_flow')
+
+        ## Calculated Properties
+        self.mass_area = stack('mass_area')
+        self.building_vol = stack('building_vol')
+        self.A_t = stack('A_t')
+        self.c_m = stack('c_m')
+        self.h_tr_op = stack('h_tr_op')
+        self.h_tr_w = stack('h_tr_w')
+        self.ach_inf = stack('ach_inf')
+        self.ach_win = stack('ach_win')
+        self.ach_vent = stack('ach_vent')
+        self.b_ek = stack('b_ek')
+        self.h_tr_ms = stack('h_tr_ms')
+        self.h_tr_is = stack('h_tr_is')
+        self.h_tr_em = stack('h_tr_em')
+
+        # The ventilation conductances of calc_h_ve_adj() only depend on the building (Eq. 21 in ISO 13790)
+        self.h_ve_inf = 1200 * 1 * self.building_vol * (self.ach_inf / 3600)
+        self.h_ve_usage = 1200 * ((self.b_ek * self.building_vol * (self.ach_vent / 3600)) + (
+                1 * self.building_vol * (self.ach_win / 3600)))
+        self.h_ve_night_flushing = 1200 * 1 * self.building_vol * (self.night_flushing_flow / 3600)
+        self.only_infiltration = (self.ach_vent == 0) & (self.ach_win == 0)
+
+        # Split of the internal and solar gains to the surface and mass node (Eq. C.2 and C.3)
+        self.share_st = (1 - (self.mass_area / self.A_t) - (self.h_tr_w / (9.1 * self.A_t)))
+        self.share_m = (self.mass_area / self.A_t)
+
+        ## Thermal set points and starting temperature
+        self.t_set_heating_base = stack('t_set_heating')
+        self.t_set_heating = self.t_set_heating_base.copy()
+        self.t_set_cooling = stack('t_set_cooling')
+        self.t_start = stack('t_start')
+
+        ## Thermal Properties
+        self.has_heating_demand = np.zeros(self.number_of_buildings, dtype=bool)
+        self.has_cooling_demand = np.zeros(self.number_of_buildings, dtype=bool)
+        self.max_cooling_energy = stack('max_cooling_energy')
+        self.max_heating_energy = stack('max_heating_energy')
+        self.t_air = np.full(self.number_of_buildings, np.nan)
+
+        ## Building System Properties
+        self.heating_supply_system = [building.heating_supply_system for building in buildings]
+        self.cooling_supply_system = [building.cooling_supply_system for building in buildings]
+        self.heating_emission_system = [building.heating_emission_system for building in buildings]
+        self.cooling_emission_system = [building.cooling_emission_system for building in buildings]
+        # Indices of the buildings of each supply system, their consumption is calculated at once
+        self.heating_supply_groups = group_indices(self.heating_supply_system)
+        self.cooling_supply_groups = group_indices(self.cooling_supply_system)
+
+        # The emission systems only decide to which node the heating/cooling energy is emitted and which supply
+        # temperatures are used. The shares of each node are compiled once per system.
+        heating_flows = [emission_system.compile_emission_system(system) for system in self.heating_emission_system]
+        cooling_flows = [emission_system.compile_emission_system(system) for system in self.cooling_emission_system]
+        self.heating_emission_share = {node: np.array([getattr(flows, node) for flows in heating_flows], dtype=float)
+                                       for node in ('phi_ia_plus', 'phi_st_plus', 'phi_m_plus')}
+        self.cooling_emission_share = {node: np.array([getattr(flows, node) for flows in cooling_flows], dtype=float)
+                                       for node in ('phi_ia_plus', 'phi_st_plus', 'phi_m_plus')}
+        self.heating_emission_temperature = {
+            temperature: np.array([getattr(flows, temperature) for flows in heating_flows], dtype=float)
+            for temperature in ('heating_supply_temperature', 'cooling_supply_temperature')}
+        self.cooling_emission_temperature = {
+            temperature: np.array([getattr(flows, temperature) for flows in cooling_flows], dtype=float)
+            for temperature in ('heating_supply_temperature', 'cooling_supply_temperature')}
+
+    def calc_h_ve_adj(self, hour, t_out, usage_start, usage_end):
+        """
+        Calculates h_ve_adj depending on the building's usage time
+        See building_physics.Building.calc_h_ve_adj()
+
+        :param hour: Hour of the timestep
+        :type hour: int
+        :param t_out: Outdoor temperature of this timestep
+        :type t_out: np.ndarray
+        :param usage_start: Beginning of usage time according to SIA2024
+        :type usage_start: np.ndarray
+        :param usage_end: Ending of usage time according to SIA2024
+        :type usage_end: np.ndarray
+
+        :return: self.h_ve_adj
+        :rtype: np.ndarray
+        """
+        self.check_night_flushing(hour, t_out)
+
+        daytime = hour % 24
+
+        in_usage_time = np.where(usage_start < usage_end,
+                                 (usage_start <= daytime) & (daytime < usage_end),
+                                 ~((usage_end <= daytime) & (daytime < usage_start)))
+
+        self.h_ve_adj = np.where(in_usage_time, self.h_ve_usage, self.h_ve_inf)
+        self.h_ve_adj = np.where(self.night_flushing_on, self.h_ve_night_flushing, self.h_ve_adj)
+        self.h_ve_adj = np.where(self.only_infiltration, self.h_ve_inf, self.h_ve_adj)
+
+        # Set t_set_heating = 0 for the time step, otherwise the heating system heats up during night flushing is on
+        self.t_set_heating = np.where(self.night_flushing_on & ~self.only_infiltration, 0, self.t_set_heating)
+
+        # Combined heat conductances (C.6) - (C.8), constant within the time step
+        self.h_tr_1 = 1.0 / (1.0 / self.h_ve_adj + 1.0 / self.h_tr_is)
+        self.h_tr_2 = self.h_tr_1 + self.h_tr_w
+        self.h_tr_3 = 1.0 / (1.0 / self.h_tr_2 + 1.0 / self.h_tr_ms)
+
+        return self.h_ve_adj
+
+    def check_night_flushing(self, hour, t_out):
+        """
+        Checks if night flushing is on/off
+        See building_physics.Building.check_night_flushing()
+
+        :param hour: Hour of the timestep
+        :type hour: int
+        :param t_out: Outdoor temperature of this timestep
+        :type t_out: np.ndarray
+
+        :return: self.night_flushing_on
+        :rtype: np.ndarray (bool)
+        """
+        daytime = hour % 24  # Hour of the day
+        cooling_season = (2169 < hour < 6561)  # Assume cooling season from 01/04 9am - 01/10 9am
+        is_night_time = (daytime < 6 or daytime > 23)  # Define night time between 23:00 and 6:00
+
+        if cooling_season and is_night_time:
+            t_air = round_temperature(self.t_air, 1)
+            self.night_flushing_on = (self.night_flushing_flow > 0) & (t_air > 21) & (t_air > (t_out + 2))
+        else:
+            self.night_flushing_on = np.zeros(self.number_of_buildings, dtype=bool)
+
+        return self.night_flushing_on
+
+    def solve_building_lighting(self, illuminance, occupancy):
+        """
+        Calculates the lighting demand for a set timestep
+        See building_physics.Building.solve_building_lighting()
+
+        :param illuminance: Illuminance transmitted through the window [Lumens]
+        :type illuminance: np.ndarray
+        :param occupancy: Probability of full occupancy
+        :type occupancy: np.ndarray
+
+        :return: self.lighting_demand, Lighting Energy Required for the timestep
+        :rtype: np.ndarray
+        """
+        lux = (illuminance * self.lighting_utilisation_factor *
+               self.lighting_maintenance_factor) / self.net_room_area  # [Lux]
+
+        self.lighting_demand = np.where((lux < self.lighting_control) & (occupancy > 0),
+                                        self.lighting_load * self.net_room_area * occupancy, 0.0)
+
+    def solve_building_energy(self, internal_gains, solar_gains, t_out, t_m_prev):
+        """
+        Calculates the heating and cooling consumption of all buildings for a set timestep
+        See building_physics.Building.solve_building_energy() for the returned variables
+
+        :param internal_gains: internal heat gains from people and appliances [W]
+        :type internal_gains: np.ndarray
+        :param solar_gains: solar heat gains [W]
+        :type solar_gains: np.ndarray
+        :param t_out: Outdoor air temperature [C]
+        :type t_out: np.ndarray
+        :param t_m_prev: Previous air temperature [C]
+        :type t_m_prev: np.ndarray
+        """
+        # check demand, and change state of self.has_heating_demand, and self._has_cooling_demand
+        self.has_demand(internal_gains, solar_gains, t_out, t_m_prev)
+        has_demand = self.has_heating_demand | self.has_cooling_demand
+
+        self.energy_demand = np.zeros(self.number_of_buildings)
+        self.heating_demand = np.zeros(self.number_of_buildings)
+        self.heating_sys_electricity = np.zeros(self.number_of_buildings)
+        self.heating_sys_fossils = np.zeros(self.number_of_buildings)
+        self.cooling_demand = np.zeros(self.number_of_buildings)
+        self.cooling_sys_electricity = np.zeros(self.number_of_buildings)
+        self.cooling_sys_fossils = np.zeros(self.number_of_buildings)
+        self.electricity_out = np.zeros(self.number_of_buildings)
+        self.cop = np.full(self.number_of_buildings, np.nan)
+
+        if has_demand.any():
+
+            # Calculates energy_demand and the temperatures resulting from it. Buildings without demand keep the
+            # temperatures of has_demand(), which are the same as the temperatures with an energy demand of 0
+            self.calc_energy_demand(internal_gains, solar_gains, t_out, t_m_prev)
+
+            # Calculate the Heating/Cooling Input Energy Required, once for all buildings with the same supply system
+            heating = self.has_heating_demand
+            self.heating_demand[heating] = self.energy_demand[heating]
+            for system, members in self.heating_supply_groups.items():
+                i = members[heating[members]]
+                if len(i) == 0:
+                    continue
+                supplyOut = system.calc_loads_array(load=self.energy_demand[i], t_out=t_out[i],
+                                                    heating_supply_temperature=self.heating_supply_temperature[i],
+                                                    cooling_supply_temperature=self.cooling_supply_temperature[i],
+                                                    has_heating_demand=np.ones(len(i), dtype=bool),
+                                                    has_cooling_demand=np.zeros(len(i), dtype=bool))
+                self.heating_sys_electricity[i] = supplyOut.electricity_in
+                self.heating_sys_fossils[i] = supplyOut.fossils_in
+                self.electricity_out[i] = supplyOut.electricity_out
+                self.cop[i] = supplyOut.cop
+
+            cooling = self.has_cooling_demand
+            self.cooling_demand[cooling] = self.energy_demand[cooling]
+            for system, members in self.cooling_supply_groups.items():
+                i = members[cooling[members]]
+                if len(i) == 0:
+                    continue
+                supplyOut = system.calc_loads_array(load=self.energy_demand[i] * (-1), t_out=t_out[i],
+                                                    heating_supply_temperature=self.heating_supply_temperature[i],
+                                                    cooling_supply_temperature=self.cooling_supply_temperature[i],
+                                                    has_heating_demand=np.zeros(len(i), dtype=bool),
+                                                    has_cooling_demand=np.ones(len(i), dtype=bool))
+                self.cooling_sys_electricity[i] = supplyOut.electricity_in
+                self.cooling_sys_fossils[i] = supplyOut.fossils_in
+                self.electricity_out[i] = supplyOut.electricity_out
+                self.cop[i] = supplyOut.cop
+
+        self.sys_total_energy = self.heating_sys_electricity + self.heating_sys_fossils + \
+                                self.cooling_sys_electricity + self.cooling_sys_fossils
+        self.heating_energy = self.heating_sys_electricity + self.heating_sys_fossils
+        self.cooling_energy = self.cooling_sys_electricity + self.cooling_sys_fossils
+
+    def has_demand(self, internal_gains, solar_gains, t_out, t_m_prev):
+        """
+        Determines whether the buildings require heating or cooling
+        Used in: solve_building_energy()
+
+        # step 1 in section C.4.2 in [C.3 ISO 13790]
+        """
+        # set energy demand to 0 and see if temperatures are within the comfort range
+        energy_demand = np.zeros(self.number_of_buildings)
+        # Solve for the internal temperature t_Air
+        self.calc_temperatures_crank_nicolson(energy_demand, internal_gains, solar_gains, t_out, t_m_prev)
+
+        # If the air temperature is less or greater than the set temperature, there is a heating/cooling load
+        t_air = round_temperature(self.t_air, 1)
+        self.has_heating_demand = t_air < self.t_set_heating
+        self.has_cooling_demand = ~self.has_heating_demand & (t_air > self.t_set_cooling)
+
+    def calc_temperatures_crank_nicolson(self, energy_demand, internal_gains, solar_gains, t_out, t_m_prev):
+        """
+        Determines node temperatures (t_air, t_m, t_s) and computes derivation to determine the new node temperatures
+        Used in: has_demand(), solve_building_energy(), calc_energy_demand()
+        # section C.3 in [C.3 ISO 13790]
+        """
+        # Eq. C.1 - C.3
+        self.calc_heat_flow(t_out, internal_gains, solar_gains, energy_demand)
+        # Eq. C.5
+        self.calc_phi_m_tot(t_out)
+        # Eq. C.4
+        self.calc_t_m_next(t_m_prev)
+        # Eq. C.9
+        self.calc_t_m(t_m_prev)
+        # Eq. C.10
+        self.calc_t_s(t_out)
+        # Eq. C.11
+        self.calc_t_air(t_out)
+
+        return self.t_m, self.t_air
+
+    def calc_energy_demand(self, internal_gains, solar_gains, t_out, t_m_prev):
+        """
+        Calculates the energy demand of the space if heating/cooling is active
+        Used in: solve_building_energy()
+        # Step 1 - Step 4 in Section C.4.2 in [C.3 ISO 13790]
+        """
+        has_demand = self.has_heating_demand | self.has_cooling_demand
+
+        # Step 1: Air temperature with no heating/cooling, already calculated in has_demand()
+        t_air_0 = self.t_air
+
+        # Step 2: Calculate the unrestricted heating/cooling required
+        t_air_set = np.where(self.has_heating_demand, self.t_set_heating, self.t_set_cooling)
+
+        # Set a heating case where the heating load is 10x the energy_ref_area (10 W/m2)
+        energy_floorAx10 = 10 * self.energy_ref_area
+
+        # Calculate the air temperature obtained by having this 10 W/m2 setpoint
+        t_air_10 = self.calc_temperatures_crank_nicolson(
+            energy_floorAx10, internal_gains, solar_gains, t_out, t_m_prev)[1]
+
+        # Determine the unrestricted heating/cooling of the building. Buildings without demand are not needed.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.calc_energy_demand_unrestricted(energy_floorAx10, t_air_set, t_air_0, t_air_10)
+
+        # Step 3: Check if available heating or cooling power is sufficient
+        # Step 4: if not sufficient then set the heating/cooling setting to the maximum
+        unrestricted = self.energy_demand_unrestricted
+        if np.isnan(unrestricted[has_demand]).any():
+            raise ValueError('unknown radiative heating/cooling system status')
+
+        self.energy_demand = np.where(unrestricted < self.max_cooling_energy, self.max_cooling_energy, unrestricted)
+        self.energy_demand = np.where(unrestricted > self.max_heating_energy, self.max_heating_energy,
+                                      self.energy_demand)
+        self.energy_demand = np.where(has_demand, self.energy_demand, 0.0)
+
+        # calculate system temperatures for Step 3/Step 4
+        self.calc_temperatures_crank_nicolson(self.energy_demand, internal_gains, solar_gains, t_out, t_m_prev)
+
+    def calc_energy_demand_unrestricted(self, energy_floorAx10, t_air_set, t_air_0, t_air_10):
+        """
+        Calculates the energy demand of the system if it has no maximum output restrictions
+        # (C.13) in [C.3 ISO 13790]
+        """
+        self.energy_demand_unrestricted = energy_floorAx10 * (t_air_set - t_air_0) / (t_air_10 - t_air_0)
+
+    def calc_heat_flow(self, t_out, internal_gains, solar_gains, energy_demand):
+        """
+        Calculates the heat flow from the solar gains, heating/cooling system, and internal gains into the building
+        The heating/cooling energy enters the node of the heating emission system if energy_demand > 0, otherwise
+        the node of the cooling emission system
+        #C.1 - C.3 in [C.3 ISO 13790]
+        """
+        # Heat flow to the air node
+        self.phi_ia = 0.5 * internal_gains
+        # Heat flow to the surface node
+        self.phi_st = self.share_st * (0.5 * internal_gains + solar_gains)
+        # Heatflow to the thermal mass node
+        self.phi_m = self.share_m * (0.5 * internal_gains + solar_gains)
+
+        # Modify these flows depending on the emission system and the energy demand
+        heating = energy_demand > 0
+        self.phi_ia = self.phi_ia + np.where(heating, self.heating_emission_share['phi_ia_plus'],
+                                             self.cooling_emission_share['phi_ia_plus']) * energy_demand
+        self.phi_st = self.phi_st + np.where(heating, self.heating_emission_share['phi_st_plus'],
+                                             self.cooling_emission_share['phi_st_plus']) * energy_demand
+        self.phi_m = self.phi_m + np.where(heating, self.heating_emission_share['phi_m_plus'],
+                                           self.cooling_emission_share['phi_m_plus']) * energy_demand
+
+        # Set supply temperature to building object
+        self.heating_supply_temperature = np.where(
+            heating, self.heating_emission_temperature['heating_supply_temperature'],
+            self.cooling_emission_temperature['heating_supply_temperature'])
+        self.cooling_supply_temperature = np.where(
+            heating, self.heating_emission_temperature['cooling_supply_temperature'],
+            self.cooling_emission_temperature['cooling_supply_temperature'])
+
+    def calc_t_m_next(self, t_m_prev):
+        """
+        Primary Equation, calculates the temperature of the next time step
+        # (C.4) in [C.3 ISO 13790]
+        """
+        self.t_m_next = ((t_m_prev * ((self.c_m / 3600.0) - 0.5 * (self.h_tr_3 + self.h_tr_em))) +
+                         self.phi_m_tot) / ((self.c_m / 3600.0) + 0.5 * (self.h_tr_3 + self.h_tr_em))
+
+    def calc_phi_m_tot(self, t_out):
+        """
+        Calculates a global heat transfer
+        # (C.5) in [C.3 ISO 13790]
+        """
+        t_supply = t_out  # ASSUMPTION: Supply air comes straight from the outside air
+
+        self.phi_m_tot = self.phi_m + self.h_tr_em * t_out + \
+                         self.h_tr_3 * (self.phi_st + self.h_tr_w * t_out + self.h_tr_1 *
+                                        ((self.phi_ia / self.h_ve_adj) + t_supply)) / self.h_tr_2
+
+    def calc_t_m(self, t_m_prev):
+        """
+        Temperature used for the calculations, average between newly calculated and previous bulk temperature
+        # (C.9) in [C.3 ISO 13790]
+        """
+        self.t_m = (self.t_m_next + t_m_prev) / 2.0
+
+    def calc_t_s(self, t_out):
+        """
+        Calculate the temperature of the inside room surfaces
+        # (C.10) in [C.3 ISO 13790]
+        """
+        t_supply = t_out  # ASSUMPTION: Supply air comes straight from the outside air
+
+        self.t_s = (self.h_tr_ms * self.t_m + self.phi_st + self.h_tr_w * t_out + self.h_tr_1 * \
+                    (t_supply + self.phi_ia / self.h_ve_adj)) / \
+                   (self.h_tr_ms + self.h_tr_w + self.h_tr_1)
+
+    def calc_t_air(self, t_out):
+        """
+        Calculate the temperature of the air node
+        # (C.11) in [C.3 ISO 13790]
+        """
+        t_supply = t_out
+
+        self.t_air = (self.h_tr_is * self.t_s + self.h_ve_adj *
+                      t_supply + self.phi_ia) / (self.h_tr_is + self.h_ve_adj)
+
+
+def simulate_stock(stock, weather, station_index, schedules, schedule_index, usage_start, usage_end,
+                   gain_per_person, appliance_gains, dhw_per_full_usage_hour, dhw_system, heating_supply_system):
+    """
+    Simulates all buildings of the stock together for the 8760 hours of the year.
+    The calculation steps are the same as in the inner loop of annualSimulation.py.
+
+    The hourly results are kept for all buildings (24 arrays of shape (8760, N)), so large stocks should be
+    simulated in chunks of a few hundred buildings.
+
+    :param stock: Buildings to simulate
+    :type stock: BuildingStock
+    :param weather: Hourly data of each weather station used by the stock
+    :type weather: list of StationWeather
+    :param station_index: Index of the weather station of each building in weather
+    :type station_index: np.ndarray (int)
+    :param schedules: Occupancy schedules used by the stock (columns 'People' and 'Appliances'),
+                      see auxiliary.referenceData.ReferenceData.getSchedule()
+    :type schedules: list of np.recarray or DataFrame
+    :param schedule_index: Index of the occupancy schedule of each building in schedules
+    :type schedule_index: np.ndarray (int)
+    :param usage_start: Beginning of usage time of each building
+    :type usage_start: np.ndarray
+    :param usage_end: Ending of usage time of each building
+    :type usage_end: np.ndarray
+    :param gain_per_person: Heat gains per person of each building [W/person]
+    :type gain_per_person: np.ndarray
+    :param appliance_gains: Appliance gains of each building [W/m2]
+    :type appliance_gains: np.ndarray
+    :param dhw_per_full_usage_hour: TEK_dhw_per_Occupancy_Full_Usage_Hour of each building [kWh/m2*h]
+    :type dhw_per_full_usage_hour: np.ndarray
+    :param dhw_system: dhw_system of each building
+    :type dhw_system: list of string
+    :param heating_supply_system: heating_supply_system of each building
+    :type heating_supply_system: list of string
+
+    :return: hourly results with the columns of HOURLY_RESULTS, one array of shape (8760, N) per column
+    :rtype: dict
+    """
+    station_index = np.asarray(station_index, dtype=int)
+    schedule_index = np.asarray(schedule_index, dtype=int)
+    usage_start = np.asarray(usage_start)
+    usage_end = np.asarray(usage_end)
+    gain_per_person = np.asarray(gain_per_person, dtype=float)
+    appliance_gains = np.asarray(appliance_gains, dtype=float)
+    dhw_per_full_usage_hour = np.asarray(dhw_per_full_usage_hour, dtype=float)
+
+    t_out_stations = np.column_stack([station.t_out for station in weather])
+    solar_stations = np.stack([station.solar for station in weather], axis=1)
+    illuminance_stations = np.stack([station.illuminance for station in weather], axis=1)
+    people = np.column_stack([np.asarray(schedule['People'], dtype=float) for schedule in schedules])
+    appliances = np.column_stack([np.asarray(schedule['Appliances'], dtype=float) for schedule in schedules])
+
+    window_areas = [stock.window_area_south, stock.window_area_east, stock.window_area_west, stock.window_area_north]
+
+    # Appliance_gains equal the electric energy that appliances use, except for negative appliance_gains of
+    # refrigerated counters in trade buildings for food (heat pumps with COP = 2 assumed)
+    appliance_gains_elt = np.where(appliance_gains < 0, -1 * appliance_gains / 2, appliance_gains)
+
+    # Hot water, see annualSimulation.py
+    has_dhw = np.array([(system != 'NoDHW') and (system != ' -') for system in dhw_system])
+    dhw_electric = np.array([(dhw == 'DecentralElectricDHW') or
+                             ((dhw == 'CentralHeating' or dhw == 'CentralDHW') and
+                              heating in ('HeatPumpAirSource', 'HeatPumpGroundSource', 'ElectricHeating'))
+                             for dhw, heating in zip(dhw_system, heating_supply_system)], dtype=bool)
+
+    results = {column: np.zeros((8760, stock.number_of_buildings)) for column in HOURLY_RESULTS}
+
+    # Starting temperature of the building. Set to t_start
+    t_m_prev = stock.t_start.copy()
+
+    for hour in range(8760):
+
+        # Initialize t_set_heating at the beginning of each time step, due to t_set_heating = 0 if night flushing
+        # is active
+        stock.t_set_heating = stock.t_set_heating_base.copy()
+
+        t_out = t_out_stations[hour, station_index]
+
+        stock.calc_h_ve_adj(hour, t_out, usage_start, usage_end)
+
+        # Define t_air for the solar gains. Starting condition (hour==0) necessary for first time step
+        if hour == 0:
+            t_air = round_temperature(stock.t_set_heating, 2)
+        else:
+            t_air = round_temperature(stock.t_air, 2)
+
+        # Use the reduced glass_solar_transmittance of activated sun shadings during the cooling season if the indoor
+        # air temperature is > 24 C, see radiation.Window.calc_solar_gains()
+        cooling_season = (2169 < hour < 6561)  # Assume cooling season from 01/04 9am - 01/10 9am
+        if cooling_season:
+            shading = (round_temperature(t_air, 1) > 24) & (stock.glass_solar_shading_transmittance > 0)
+            transmittance = np.where(shading, stock.glass_solar_shading_transmittance,
+                                     stock.glass_solar_transmittance)
+        else:
+            transmittance = stock.glass_solar_transmittance
+
+        solar_gains = []
+        illuminance = 0
+        for i, area in enumerate(window_areas):
+            solar_gains.append(transmittance * (solar_stations[hour, station_index, i] * area))
+            illuminance = illuminance + (illuminance_stations[hour, station_index, i] * area) * \
+                          stock.glass_light_transmittance
+        solar_gains_total = solar_gains[0] + solar_gains[1] + solar_gains[2] + solar_gains[3]
+
+        # Occupancy for the time step
+        occupancy_percent = people[hour, schedule_index]
+        occupancy = occupancy_percent * stock.max_occupancy
+        appliances_percent = appliances[hour, schedule_index]
+
+        # Calculate the lighting of the buildings for the time step
+        stock.solve_building_lighting(illuminance=illuminance, occupancy=occupancy_percent)
+
+        # Calculate gains from occupancy and appliances
+        # This is thermal gains. Negative appliance_gains are heat sinks!
+        internal_gains = occupancy * gain_per_person + \
+                         appliance_gains * appliances_percent * stock.energy_ref_area + \
+                         stock.lighting_demand
+        appliance_gains_demand = appliance_gains * appliances_percent * stock.energy_ref_area
+        appliance_gains_elt_demand = appliance_gains_elt * appliances_percent * stock.energy_ref_area
+
+        # Calculate energy demand for the time step
+        stock.solve_building_energy(internal_gains=internal_gains, solar_gains=solar_gains_total,
+                                    t_out=t_out, t_m_prev=t_m_prev)
+
+        # Calculate hot water usage of the buildings for the time step
+        hotwaterdemand = np.where(has_dhw, occupancy_percent * dhw_per_full_usage_hour * 1000 *
+                                  stock.energy_ref_area, 0.0)  # in W
+        with np.errstate(divide='ignore', invalid='ignore'):
+            hotwaterenergy = np.where(stock.heating_demand > 0,
+                                      hotwaterdemand * (stock.heating_energy / stock.heating_demand),
+                                      hotwaterdemand)
+
+        # Set the previous temperature for the next time step
+        t_m_prev = stock.t_m_next
+
+        results['HeatingDemand'][hour] = stock.heating_demand
+        results['HeatingEnergy'][hour] = stock.heating_energy
+        results['Heating_Sys_Electricity'][hour] = stock.heating_sys_electricity
+        results['Heating_Sys_Fossils'][hour] = stock.heating_sys_fossils
+        results['CoolingDemand'][hour] = stock.cooling_demand
+        results['CoolingEnergy'][hour] = stock.cooling_energy
+        results['Cooling_Sys_Electricity'][hour] = stock.cooling_sys_electricity
+        results['Cooling_Sys_Fossils'][hour] = stock.cooling_sys_fossils
+        results['HotWaterDemand'][hour] = hotwaterdemand
+        results['HotWaterEnergy'][hour] = hotwaterenergy
+        results['HotWater_Sys_Electricity'][hour] = np.where(dhw_electric, hotwaterenergy, 0.0)
+        results['HotWater_Sys_Fossils'][hour] = np.where(dhw_electric, 0.0, hotwaterenergy)
+        results['IndoorAirTemperature'][hour] = stock.t_air
+        results['OutsideTemperature'][hour] = t_out
+        results['LightingDemand'][hour] = stock.lighting_demand
+        results['InternalGains'][hour] = internal_gains
+        results['Appliance_gains_demands'][hour] = appliance_gains_demand
+        results['Appliance_gains_elt_demands'][hour] = appliance_gains_elt_demand
+        results['SolarGainsSouthWindow'][hour] = solar_gains[0]
+        results['SolarGainsEastWindow'][hour] = solar_gains[1]
+        results['SolarGainsWestWindow'][hour] = solar_gains[2]
+        results['SolarGainsNorthWindow'][hour] = solar_gains[3]
+        results['SolarGainsTotal'][hour] = solar_gains_total
+        results['Daytime'][hour] = hour % 24
+
+    return results
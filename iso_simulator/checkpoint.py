@@ -0,0 +1,137 @@
+"""
+Journal of the simulated buildings of a stock, to resume a simulation that was aborted
+
+Each building is appended as one line of JSON to the journal as soon as its results are saved:
+    {"scr_gebaeude_id": ..., "status": ..., "hourly": path of the hourly results, "summary": {column: value}}
+A simulation started again with resume=True skips the buildings of the journal and takes their summaries from it.
+A line that was not completely written when the simulation was aborted is ignored.
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import json
+import os
+
+import pandas as pd
+
+# Buildings with these status are not simulated again when resuming, failed buildings are
+COMPLETED_STATUS = ('simulated', 'not heated')
+
+
+def to_json_value(value):
+    """
+    Converts numpy scalars of the summary for json.dumps()
+    """
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError('Not serializable: ' + repr(value))
+
+
+class CheckpointJournal(object):
+    """
+    Append-only journal (JSON lines) of the simulated buildings
+
+    Methods:
+        write: Appends a building to the journal
+        completed_ids: scr_gebaeude_id of the buildings that do not need to be simulated again
+        summaries: Summaries of the simulated buildings of the journal
+        close: Closes the journal
+
+    :param path: Path of the journal
+    :type path: str
+    :param resume: Keep the buildings of an existing journal (otherwise the journal is started again)
+    :type resume: bool
+    :param fsync: Write each line to the disk before the next building (otherwise it may stay in the buffers
+                  of the operating system)
+    :type fsync: bool
+    """
+
+    def __init__(self, path, resume=False, fsync=True):
+
+        self.path = path
+        self.fsync = fsync
+
+        # Last record of each building of the existing journal
+        self.records = {}
+        if resume and os.path.exists(path):
+            for record in self.read(path):
+                self.records[record['scr_gebaeude_id']] = record
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, 'a' if resume else 'w', encoding='utf8')
+        if resume and self.file.tell() > 0:
+            # Start a new line after a line that was not completely written
+            self.file.write('\n')
+
+    @staticmethod
+    def read(path):
+        """
+        Returns the records of a journal, incomplete lines are skipped
+
+        :param path: Path of the journal
+        :type path: str
+        :return: records in the order of the journal
+        :rtype: list of dict
+        """
+        records = []
+        with open(path, encoding='utf8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+    def write(self, result, hourly_path=None):
+        """
+        Appends a building to the journal
+
+        :param result: Result of the building
+        :type result: simulation.Result
+        :param hourly_path: Path of the saved hourly results
+        :type hourly_path: str or None
+        """
+        record = {'scr_gebaeude_id': result.scr_gebaeude_id,
+                  'status': result.status,
+                  'hourly': hourly_path,
+                  'summary': result.summary.iloc[0].to_dict() if result.summary is not None else None}
+        self.file.write(json.dumps(record, default=to_json_value) + '\n')
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def completed_ids(self):
+        """
+        Returns the scr_gebaeude_id of the buildings of the existing journal that were simulated or not heated
+
+        :rtype: set
+        """
+        return {scr_gebaeude_id for scr_gebaeude_id, record in self.records.items()
+                if record['status'] in COMPLETED_STATUS}
+
+    def summaries(self):
+        """
+        Yields the summaries of the simulated buildings of the existing journal
+
+        :return: one row of annual results per building
+        :rtype: generator of pd.DataFrame
+        """
+        for record in self.records.values():
+            if record['status'] == 'simulated':
+                yield pd.DataFrame([record['summary']])
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
@@ -3,6 +3,10 @@ Emission System Parameters for Heating and Cooling
 
 Model of different Emission systems. New Emission Systems can be introduced by adding new classes
 
+The heat flows of an emission system are proportional to the energy demand. compile_emission_system() asks a class once
+for its flows of 1 W and returns them as an immutable EmissionCoefficients record, which the building models use in
+every time step instead of creating new instances.
+
 Temperatures only relevant in combination with heat pumps at this stage 
 Temperatures taken from RC_BuildingSimulator and CEA (https://github.com/architecture-building-systems/CityEnergyAnalyst/blob/master/cea/databases/CH/assemblies/HVAC.xls)
 
@@ -19,6 +23,11 @@ __author__ = "Simon Knoll, Julian Bischof, Michael Hörner "
 __copyright__ = "Copyright 2022, Institut Wohnen und Umwelt"
 __license__ = "MIT"
 
+from collections import namedtuple
+from functools import lru_cache
+
+from profiling import profiler
+
 
 class EmissionDirector:
 
@@ -28,6 +37,10 @@ class EmissionDirector:
 
     builder = None
 
+    def __init__(self):
+        if profiler.enabled:
+            profiler.count('EmissionDirector')
+
     # Sets what Emission system is used
     def set_builder(self, builder):
         # self.__builder = builder
@@ -52,6 +65,8 @@ class EmissionSystemBase:
 
     def __init__(self, energy_demand):
 
+        if profiler.enabled:
+            profiler.count('EmissionSystem')
         self.energy_demand = energy_demand
 
 
@@ -172,3 +187,35 @@ class Flows:
     heating_supply_temperature = float("nan")
     cooling_supply_temperature = float("nan")
     # return temperatures
+    heating_return_temperature = float("nan")
+    cooling_return_temperature = float("nan")
+
+    def __init__(self):
+        if profiler.enabled:
+            profiler.count('EmissionFlows')
+
+
+# Heat flows of an emission system per W of energy demand and its supply/return temperatures
+# phi_ia_plus: share emitted to the air node
+# phi_st_plus: share emitted to the surface node
+# phi_m_plus: share emitted to the thermal mass node
+# Same attribute names as Flows, so a record can be used wherever the flows of an energy demand of 1 W are expected
+EmissionCoefficients = namedtuple('EmissionCoefficients',
+                                  ['phi_ia_plus', 'phi_st_plus', 'phi_m_plus',
+                                   'heating_supply_temperature', 'heating_return_temperature',
+                                   'cooling_supply_temperature', 'cooling_return_temperature'])
+
+
+@lru_cache(maxsize=None)
+def compile_emission_system(emission_system):
+    """
+    Returns the heat flows of an emission system per W of energy demand, each class is asked once
+
+    :param emission_system: Emission system, e.g. AirConditioning
+    :type emission_system: subclass of EmissionSystemBase
+    :return: shares of the nodes and temperatures of the emission system
+    :rtype: EmissionCoefficients
+    """
+    flows = emission_system(energy_demand=1).heat_flows()
+
+    return EmissionCoefficients(*(float(getattr(flows, field)) for field in EmissionCoefficients._fields))
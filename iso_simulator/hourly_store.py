@@ -0,0 +1,322 @@
+"""
+Module with a columnar store of the hourly results of a building stock (buildings x 8760 hours x variables)
+
+Instead of one file per building, the store keeps one data file per variable. The 8760 values of a variable of a
+building are one chunk: float32 compressed with zlib (level 1 by default, level 0: not compressed, faster to write
+but about 4 times larger). The index (index.csv) holds the GebäudeID of each building and the position of its chunk in
+each data file, so that
+    - one variable of all (or some) buildings is read from one data file only (read_variable())
+    - all variables of one building are read with one chunk per data file (read_building())
+without reading the rest of the store.
+
+Each building is appended to the data files and then to the index as soon as it is written, the memory used does not
+grow with the number of buildings. A building whose index line was not written completely (e.g. aborted simulation)
+is not part of the store. If a building is written again, its last chunks are used.
+
+Layout of the directory:
+    meta.json: version, variables, hours, dtype and compression of the store
+    index.csv: GebäudeID, iteration and offset/nbytes of the chunk in each data file, one line per building
+    *variable*.bin: chunks of the variable, one per building
+
+Example:
+    with HourlyStore('results/hourly_store', mode='w') as store:
+        store.write(scr_gebaeude_id, hourlyResults)
+    store = HourlyStore('results/hourly_store')
+    heating = store.read_variable('HeatingDemand')      # 8760 rows, one column per building
+    building = store.read_building(scr_gebaeude_id)    # 8760 rows, one column per variable
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import json
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from building_stock import HOURLY_RESULTS
+
+# Version of the layout of the store
+STORE_VERSION = 1
+
+HOURS = 8760
+DTYPE = np.dtype('<f4')
+
+
+def encode(values, level):
+    """
+    Returns the chunk of the values of one variable of a building
+
+    :param values: 8760 values
+    :type values: array_like
+    :param level: zlib compression level (0: not compressed, 1: fastest, 9: smallest)
+    :type level: int
+    :rtype: bytes
+    """
+    data = np.ascontiguousarray(values, dtype=DTYPE).tobytes()
+    if level:
+        return zlib.compress(data, level)
+    return data
+
+
+def decode(chunk, level):
+    """
+    Returns the values of a chunk written by encode()
+
+    :param chunk: chunk of the data file
+    :type chunk: bytes
+    :param level: zlib compression level of the chunk
+    :type level: int
+    :rtype: np.ndarray of float32
+    """
+    if level:
+        chunk = zlib.decompress(chunk)
+    return np.frombuffer(chunk, dtype=DTYPE)
+
+
+class HourlyStore(object):
+    """
+    Columnar store of the hourly results of a building stock
+
+    Methods:
+        write: Appends the hourly results of a building
+        read_variable: One variable of all or some buildings
+        read_building: All or some variables of one building
+        close: Closes the data files
+
+    :param directory: Directory of the store
+    :type directory: str
+    :param mode: 'r': read, 'a': append to the store (created if it does not exist), 'w': new store (an existing
+                 store in the directory is replaced)
+    :type mode: str
+    :param variables: Variables of a new store (default: columns of building_stock.HOURLY_RESULTS)
+    :type variables: list of str
+    :param level: zlib compression level of a new store (0: not compressed)
+    :type level: int
+    """
+
+    def __init__(self, directory, mode='r', variables=None, level=1):
+
+        if mode not in ('r', 'a', 'w'):
+            raise ValueError('Unknown mode ' + str(mode) + ", use 'r', 'a' or 'w'")
+        self.directory = directory
+        self.mode = mode
+        self.files = {}
+        self.index_file = None
+
+        if mode == 'w' or (mode == 'a' and not os.path.exists(self.meta_path)):
+            self.create(list(HOURLY_RESULTS if variables is None else variables), level)
+        elif not os.path.exists(self.meta_path):
+            raise FileNotFoundError('No hourly store in ' + str(directory))
+
+        with open(self.meta_path) as f:
+            self.meta = json.load(f)
+        if self.meta['store_version'] != STORE_VERSION:
+            raise ValueError('Hourly store version ' + str(self.meta['store_version']) + ' is not supported')
+        self.variables = self.meta['variables']
+        self.hours = self.meta['hours']
+        self.level = self.meta['level']
+
+        if mode != 'r':
+            self.truncate_index()
+            self.index_file = open(self.index_path, 'a', newline='', encoding='utf8')
+            self.files = {variable: open(self.data_path(variable), 'ab') for variable in self.variables}
+        self._index = None
+
+    @property
+    def meta_path(self):
+        return os.path.join(self.directory, 'meta.json')
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, 'index.csv')
+
+    def data_path(self, variable):
+        return os.path.join(self.directory, variable + '.bin')
+
+    def create(self, variables, level):
+        """
+        Creates an empty store, the files of an existing store are removed
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        old_variables = []
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                old_variables = json.load(f)['variables']
+        for path in [self.index_path] + [self.data_path(variable) for variable in old_variables + variables]:
+            if os.path.exists(path):
+                os.remove(path)
+
+        header = ['GebäudeID', 'iteration'] + [variable + suffix for variable in variables
+                                                for suffix in ('_offset', '_nbytes')]
+        with open(self.index_path, 'w', newline='', encoding='utf8') as f:
+            f.write(';'.join(header) + '\n')
+        with open(self.meta_path, 'w') as f:
+            json.dump({'store_version': STORE_VERSION, 'variables': variables, 'hours': HOURS,
+                       'dtype': DTYPE.str, 'compression': 'zlib' if level else None, 'level': level}, f, indent=2)
+
+    def truncate_index(self):
+        """
+        Removes a line of the index that was not completely written (aborted simulation), the chunks it refers to
+        are ignored
+        """
+        with open(self.index_path, 'rb+') as f:
+            data = f.read()
+            if not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    def write(self, scr_gebaeude_id, hourly, iteration=-1):
+        """
+        Appends the hourly results of a building
+
+        :param scr_gebaeude_id: ID of the building
+        :type scr_gebaeude_id: int or str
+        :param hourly: Hourly results of the building with (at least) the variables of the store, e.g. the hourly
+                       DataFrame of simulation.simulate_building() or a dict of arrays
+        :type hourly: pd.DataFrame or dict
+        :param iteration: Position of the building in the simulated stock
+        :type iteration: int
+        """
+        if self.mode == 'r':
+            raise ValueError('Hourly store is opened for reading')
+        if isinstance(hourly, pd.DataFrame) and 'iteration' in hourly and iteration == -1:
+            iteration = int(hourly['iteration'].iloc[0])
+
+        positions = []
+        for variable in self.variables:
+            values = np.asarray(hourly[variable])
+            if len(values) != self.hours:
+                raise ValueError('{} of building {} has {} values, expected {}'.format(
+                    variable, scr_gebaeude_id, len(values), self.hours))
+            chunk = encode(values, self.level)
+            data_file = self.files[variable]
+            positions += [data_file.tell(), len(chunk)]
+            data_file.write(chunk)
+
+        # The index line is written after the chunks, a building is only part of the store with all its chunks
+        for data_file in self.files.values():
+            data_file.flush()
+        self.index_file.write(';'.join(map(str, [scr_gebaeude_id, iteration] + positions)) + '\n')
+        self.index_file.flush()
+        self._index = None
+
+    @property
+    def index(self):
+        """
+        Index of the buildings of the store, one row per building (the last one if a building was written more
+        than once), in the order they were written
+
+        :rtype: pd.DataFrame
+        """
+        if self._index is None:
+            with open(self.index_path, encoding='utf8') as f:
+                lines = f.read().split('\n')
+            # The last line is incomplete if writing it was aborted
+            header = lines[0].split(';')
+            rows = [line.split(';') for line in lines[1:-1]]
+            rows = [row for row in rows if len(row) == len(header)]
+            index = pd.DataFrame(rows, columns=header)
+            try:
+                index['GebäudeID'] = pd.to_numeric(index['GebäudeID'])
+            except ValueError:
+                pass  # IDs that are not numbers stay strings
+            index[header[1:]] = index[header[1:]].astype(np.int64)
+            self._index = index.drop_duplicates(subset='GebäudeID', keep='last').reset_index(drop=True)
+        return self._index
+
+    @property
+    def building_ids(self):
+        """
+        GebäudeID of the buildings of the store
+        """
+        return list(self.index['GebäudeID'])
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, scr_gebaeude_id):
+        return bool((self.index['GebäudeID'] == scr_gebaeude_id).any())
+
+    def rows(self, building_ids):
+        """
+        Returns the rows of the index of the buildings (all buildings if None)
+        """
+        index = self.index
+        if building_ids is None:
+            return index
+        positions = pd.Index(index['GebäudeID']).get_indexer(list(building_ids))
+        if (positions < 0).any():
+            missing = [building_id for building_id, position in zip(building_ids, positions) if position < 0]
+            raise KeyError('Buildings not in the hourly store: ' + ', '.join(map(str, missing)))
+        return index.iloc[positions]
+
+    def read_variable(self, variable, building_ids=None):
+        """
+        Returns one variable of all or some buildings, only the data file of the variable is read
+
+        :param variable: Name of the variable, e.g. 'HeatingDemand'
+        :type variable: str
+        :param building_ids: GebäudeID of the buildings (None: all buildings of the store)
+        :type building_ids: list or None
+        :return: 8760 rows (hours), one column per building (GebäudeID)
+        :rtype: pd.DataFrame
+        """
+        if variable not in self.variables:
+            raise KeyError('Variable not in the hourly store: ' + str(variable))
+        rows = self.rows(building_ids)
+        values = np.empty((self.hours, len(rows)), dtype=DTYPE)
+        offsets = rows[variable + '_offset'].to_numpy()
+        nbytes = rows[variable + '_nbytes'].to_numpy()
+        with open(self.data_path(variable), 'rb') as f:
+            if building_ids is None:
+                data = f.read()
+                for column, (offset, size) in enumerate(zip(offsets, nbytes)):
+                    values[:, column] = decode(data[offset:offset + size], self.level)
+            else:
+                for column, (offset, size) in enumerate(zip(offsets, nbytes)):
+                    f.seek(offset)
+                    values[:, column] = decode(f.read(size), self.level)
+        return pd.DataFrame(values, columns=pd.Index(rows['GebäudeID'], name='GebäudeID'))
+
+    def read_building(self, scr_gebaeude_id, variables=None):
+        """
+        Returns all or some variables of one building, one chunk of each data file is read
+
+        :param scr_gebaeude_id: ID of the building
+        :type scr_gebaeude_id: int or str
+        :param variables: Names of the variables (None: all variables of the store)
+        :type variables: list of str or None
+        :return: 8760 rows (hours), one column per variable
+        :rtype: pd.DataFrame
+        """
+        row = self.rows([scr_gebaeude_id]).iloc[0]
+        results = {}
+        for variable in (self.variables if variables is None else variables):
+            if variable not in self.variables:
+                raise KeyError('Variable not in the hourly store: ' + str(variable))
+            with open(self.data_path(variable), 'rb') as f:
+                f.seek(row[variable + '_offset'])
+                results[variable] = decode(f.read(row[variable + '_nbytes']), self.level)
+        return pd.DataFrame(results)
+
+    def close(self):
+        for data_file in self.files.values():
+            data_file.close()
+        self.files = {}
+        if self.index_file is not None:
+            self.index_file.close()
+            self.index_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
@@ -0,0 +1,389 @@
+"""
+Module with the LCA of the annual results: final energy related to the net calorific value (Hi), primary energy (PE)
+and global warming potential (GWP) of heating, hot water, cooling, lighting and appliances
+
+The energy carrier of each supply system is registered as energy_carrier of its class in supply_system.py, the energy
+carrier of decentral hot water systems in DHW_ENERGY_CARRIERS. summarize() calculates the annual summary of any number
+of buildings at once: the energy carriers of all buildings are joined with the factor table
+(Primary_energy_and_emission_factors.csv) in one step and the LCA columns are calculated as arrays. It is used for
+each building by simulation.simulate_building(), or, if the buildings are simulated without LCA (see
+annual_summary()), once for all buildings of the stock by annualSimulation.py with recalculate_summary(). It can also
+be applied to a whole annualResults_summary afterwards, e.g. with a new factor table.
+
+The electricity / fossil fuel consumption of an end use is converted from the gross calorific value (Hs) to the net
+calorific value (Hi) with the factor of its energy carrier. If the end use consumes electricity, only the electricity
+is considered, otherwise only the fossil fuel.
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import numpy as np
+import pandas as pd
+
+import supply_system
+
+# Energy carrier of the decentral hot water systems, central hot water systems use the energy carrier of the heating
+DHW_ENERGY_CARRIERS = {'DecentralElectricDHW': 'Electricity grid mix',
+                       'DecentralFuelBasedDHW': 'Natural gas'}
+
+# Energy carrier of lighting and appliances
+ELECTRICITY = 'Electricity grid mix'
+
+# Columns of the factor table used for the LCA
+GWP_COLUMN = 'GWP spezific to heating value GEG [g/kWh]'
+PE_COLUMN = 'Primary Energy Factor GEG   [-]'
+HS_HI_COLUMN = 'Relation Calorific to Heating Value GEG  [-]'
+
+# Columns of the annual sums summarize() needs, the annual sums of the hourly results in kWh (see annual_sums())
+# and the data of the building. They are part of the summary, so summarize() can also be applied to a summary.
+ANNUAL_SUM_COLUMNS = {
+    'HeatingDemand': 'HeatingDemand [kWh]',
+    'HeatingEnergy': 'HeatingEnergy [kWhHs]',
+    'Heating_Sys_Electricity': 'Heating_Sys_Electricity [kWh]',
+    'Heating_Sys_Fossils': 'Heating_Sys_Fossils [kWhHs]',
+    'CoolingDemand': 'CoolingDemand [kWh]',
+    'CoolingEnergy': 'CoolingEnergy [kWhHs]',
+    'Cooling_Sys_Electricity': 'Cooling_Sys_Electricity [kWh]',
+    'Cooling_Sys_Fossils': 'Cooling_Sys_Fossils [kWhHs]',
+    'HotWaterDemand': 'HotWaterDemand [kwh]',
+    'HotWaterEnergy': 'HotWaterEnergy [kwhHs]',
+    'HotWater_Sys_Electricity': 'HotWater_Sys_Electricity [kWh]',
+    'HotWater_Sys_Fossils': 'HotWater_Sys_Fossils [kWhHs]',
+    'LightingDemand': 'LightingDemand [kWh]',
+    'Appliance_gains_demands': 'Appliance_gains_demand [kWh]',
+    'Appliance_gains_elt_demands': 'Appliance_gains_elt_demand [kWh]',
+    'InternalGains': 'InternalGains [kWh]',
+    'SolarGainsTotal': 'SolarGainsTotal [kWh]',
+    'SolarGainsSouthWindow': 'SolarGainsSouthWindow [kWh]',
+    'SolarGainsEastWindow': 'SolarGainsEastWindow [kWh]',
+    'SolarGainsWestWindow': 'SolarGainsWestWindow [kWh]',
+    'SolarGainsNorthWindow': 'SolarGainsNorthWindow [kWh]',
+}
+BUILDING_COLUMNS = ['GebäudeID', 'EnergyRefArea', 'HeatingSupplySystem', 'CoolingSupplySystem', 'DHWSupplySystem',
+                    'Gebäudefunktion Hauptkategorie', 'Gebäudefunktion Unterkategorie', 'Profil SIA 2024',
+                    'Profil 18599-10', 'EPW-File']
+
+# Columns of BUILDING_COLUMNS with text, read as str from a written summary (e.g. IDs with leading zeros)
+TEXT_COLUMNS = [column for column in BUILDING_COLUMNS if column != 'EnergyRefArea']
+
+# Columns of the summary per m2 energy reference area and the column of the total
+PER_AREA_COLUMNS = {
+    'HeatingDemand [kwh/m2]': 'HeatingDemand [kWh]',
+    'HeatingEnergy [kwhHs/m2]': 'HeatingEnergy [kWhHs]',
+    'Heating_Sys_Electricity [kwh/m2]': 'Heating_Sys_Electricity [kWh]',
+    'Heating_Sys_Fossils [kwhHs/m2]': 'Heating_Sys_Fossils [kWhHs]',
+    'Heating_Sys_GWP [kg/m2]': 'Heating_Sys_GWP [kg]',
+    'Heating_Sys_PE [kWh/m2]': 'Heating_Sys_PE [kWh]',
+    'CoolingDemand [kwh/m2]': 'CoolingDemand [kWh]',
+    'CoolingEnergy [kwhHs/m2]': 'CoolingEnergy [kWhHs]',
+    'Cooling_Sys_Electricity [kwh/m2]': 'Cooling_Sys_Electricity [kWh]',
+    'Cooling_Sys_Fossils [kwhHs/m2]': 'Cooling_Sys_Fossils [kWhHs]',
+    'Cooling_Sys_GWP [kg/m2]': 'Cooling_Sys_GWP [kg]',
+    'Cooling_Sys_PE [kWh/m2]': 'Cooling_Sys_PE [kWh]',
+    'HotWaterDemand [kwh/m2]': 'HotWaterDemand [kwh]',
+    'HotWaterEnergy [kwhHs/m2]': 'HotWaterEnergy [kwhHs]',
+    'HotWater_Sys_GWP [kg/m2]': 'HotWater_Sys_GWP [kg]',
+    'HotWater_Sys_PE [kWh/m2]': 'HotWater_Sys_PE [kWh]',
+    'ElectricityDemandTotal [kwh/m2]': 'ElectricityDemandTotal [kWh]',
+    'FossilsDemandTotal [kwh/m2]': 'FossilsDemandTotal [kWh]',
+    'LightingDemand_GWP [kg/m2]': 'LightingDemand_GWP [kg]',
+    'LightingDemand_PE [kWh/m2]': 'LightingDemand_PE [kWh]',
+    'Appliance_gains_demand_GWP [kg/m2]': 'Appliance_gains_demand_GWP [kg]',
+    'Appliance_gains_demand_PE [kWh/m2]': 'Appliance_gains_demand_PE [kWh]',
+    'GWP [kg/m2]': 'GWP [kg]',
+    'PE [kWh/m2]': 'PE [kWh]',
+}
+
+# Columns of the summary of a building, in this order
+SUMMARY_COLUMNS = [
+    'GebäudeID', 'EnergyRefArea',
+    'HeatingDemand [kWh]', 'HeatingDemand [kwh/m2]', 'HeatingEnergy [kWhHs]', 'HeatingEnergy [kwhHs/m2]',
+    'HeatingEnergy_Hi [kWhHi]', 'Heating_Sys_Electricity [kWh]', 'Heating_Sys_Electricity [kwh/m2]',
+    'Heating_Sys_Electricity_Hi [kWhHi]', 'Heating_Sys_Fossils [kWhHs]', 'Heating_Sys_Fossils [kwhHs/m2]',
+    'Heating_Sys_Fossils_Hi [kWhHi]', 'Heating_Sys_GWP [kg]', 'Heating_Sys_GWP [kg/m2]', 'Heating_Sys_PE [kWh]',
+    'Heating_Sys_PE [kWh/m2]',
+    'CoolingDemand [kWh]', 'CoolingDemand [kwh/m2]', 'CoolingEnergy [kWhHs]', 'CoolingEnergy [kwhHs/m2]',
+    'Cooling_Sys_Electricity [kWh]', 'Cooling_Sys_Electricity [kwh/m2]', 'Cooling_Sys_Fossils [kWhHs]',
+    'Cooling_Sys_Fossils [kwhHs/m2]', 'Cooling_Sys_GWP [kg]', 'Cooling_Sys_GWP [kg/m2]', 'Cooling_Sys_PE [kWh]',
+    'Cooling_Sys_PE [kWh/m2]',
+    'HotWaterDemand [kwh]', 'HotWaterDemand [kwh/m2]', 'HotWaterEnergy [kwhHs]', 'HotWaterEnergy [kwhHs/m2]',
+    'HotWaterEnergy_Hi [kwhHi]', 'HotWater_Sys_Electricity [kWh]', 'HotWater_Sys_Fossils [kWhHs]',
+    'HeatingSupplySystem', 'CoolingSupplySystem', 'DHWSupplySystem',
+    'Heating_fuel_type', 'Heating_f_GHG [g/kWhHi]', 'Heating_f_PE [kWhPE/kWhHi]', 'Heating_f_Hs_Hi [kWhHs/kWhHi]',
+    'Hotwater_fuel_type', 'Hotwater_f_GHG [g/kWhHi]', 'Hotwater_f_PE [kWhPE/kWhHi]', 'Hotwater_f_Hs_Hi [kWhHs/kWhHi]',
+    'Cooling_fuel_type', 'Cooling_f_GHG [g/kWhHi]', 'Cooling_f_PE [kWhPE/kWhHi]', 'Cooling_f_Hs_Hi [kWhHs/kWhHi]',
+    'LightAppl_fuel_type', 'LightAppl_f_GHG [g/kWhHi]', 'LightAppl_f_PE [kWhPE/kWhHi]',
+    'LightAppl_f_Hs_Hi [kWhHs/kWhHi]',
+    'HotWater_Sys_GWP [kg]', 'HotWater_Sys_GWP [kg/m2]', 'HotWater_Sys_PE [kWh]', 'HotWater_Sys_PE [kWh/m2]',
+    'ElectricityDemandTotal [kWh]', 'ElectricityDemandTotal [kwh/m2]', 'FossilsDemandTotal [kWh]',
+    'FossilsDemandTotal [kwh/m2]',
+    'LightingDemand [kWh]', 'LightingDemand_GWP [kg]', 'LightingDemand_GWP [kg/m2]', 'LightingDemand_PE [kWh]',
+    'LightingDemand_PE [kWh/m2]',
+    'Appliance_gains_demand [kWh]', 'Appliance_gains_elt_demand [kWh]', 'Appliance_gains_demand_GWP [kg]',
+    'Appliance_gains_demand_GWP [kg/m2]', 'Appliance_gains_demand_PE [kWh]', 'Appliance_gains_demand_PE [kWh/m2]',
+    'GWP [kg]', 'GWP [kg/m2]', 'PE [kWh]', 'PE [kWh/m2]', 'FinalEnergy_Hi [kWhHi]',
+    'InternalGains [kWh]', 'SolarGainsTotal [kWh]', 'SolarGainsSouthWindow [kWh]', 'SolarGainsEastWindow [kWh]',
+    'SolarGainsWestWindow [kWh]', 'SolarGainsNorthWindow [kWh]',
+    'Gebäudefunktion Hauptkategorie', 'Gebäudefunktion Unterkategorie', 'Profil SIA 2024', 'Profil 18599-10',
+    'EPW-File',
+]
+
+
+def energy_carrier(supply_system_name):
+    """
+    Returns the energy carrier of a heating or cooling supply system
+
+    :param supply_system_name: Name of the class of the supply system, e.g. 'GasBoilerCondensingFrom95'
+    :type supply_system_name: str
+    :return: energy carrier in the factor table, e.g. 'Natural gas'
+    :rtype: str
+    """
+    system = getattr(supply_system, str(supply_system_name), None)
+    if not (isinstance(system, type) and issubclass(system, supply_system.SupplySystemBase)) or \
+            system.energy_carrier is None:
+        raise ValueError('No energy carrier of the supply system ' + str(supply_system_name))
+    return system.energy_carrier
+
+
+def hotwater_energy_carrier(dhw_system, heating_energy_carrier):
+    """
+    Returns the energy carrier of a hot water system. Assumption: Central DHW-Systems use the same energy carrier as
+    the heating system, only decentral DHW-Systems might have another one.
+    """
+    return DHW_ENERGY_CARRIERS.get(dhw_system, heating_energy_carrier)
+
+
+class LCAFactors(object):
+    """
+    GWP, primary energy factor and Hs/Hi of each energy carrier, the first row of each energy carrier of the
+    factor table
+
+    Methods:
+        lookup: Factors of an array of energy carriers
+
+    :param GWP_PE_Factors: Content of Primary_energy_and_emission_factors.csv
+    :type GWP_PE_Factors: pd.DataFrame
+    """
+
+    def __init__(self, GWP_PE_Factors):
+
+        table = GWP_PE_Factors.drop_duplicates(subset='Energy Carrier', keep='first')
+        self.carriers = pd.Index(table['Energy Carrier'])
+        self.f_GHG = table[GWP_COLUMN].to_numpy()
+        self.f_PE = table[PE_COLUMN].to_numpy()
+        self.f_Hs_Hi = table[HS_HI_COLUMN].to_numpy()
+
+    def lookup(self, carriers):
+        """
+        Joins energy carriers with the factor table
+
+        :param carriers: Energy carrier of each building
+        :type carriers: array_like of str
+        :return: f_GHG [g/kWhHi], f_PE [kWhPE/kWhHi] and f_Hs_Hi [kWhHs/kWhHi] of each building
+        :rtype: tuple of np.ndarray
+        """
+        positions = self.carriers.get_indexer(carriers)
+        if (positions < 0).any():
+            self.check(np.asarray(carriers, dtype=object)[positions < 0])
+        return self.f_GHG[positions], self.f_PE[positions], self.f_Hs_Hi[positions]
+
+    def check(self, carriers):
+        """
+        Raises a ValueError if one of the energy carriers is not in the factor table
+
+        :param carriers: Energy carriers
+        :type carriers: iterable of str
+        """
+        missing = sorted(set(carrier for carrier in carriers if carrier not in self.carriers))
+        if missing:
+            raise ValueError('Energy carrier not in the factor table: ' + ', '.join(map(str, missing)))
+
+
+def annual_sums(hourly):
+    """
+    Returns the annual sums of the hourly results in kWh
+
+    :param hourly: Hourly results [W] of one building (DataFrame or dict of 8760 values) or of several buildings
+                   (dict of arrays of the shape (8760, number of buildings), e.g. of building_stock.simulate_stock())
+    :type hourly: pd.DataFrame or dict
+    :return: annual sums with the column names of the summary
+    :rtype: dict
+    """
+    if isinstance(hourly, pd.DataFrame):
+        return {column: hourly[variable].sum() / 1000 for variable, column in ANNUAL_SUM_COLUMNS.items()}
+    return {column: np.asarray(hourly[variable]).sum(axis=0) / 1000
+            for variable, column in ANNUAL_SUM_COLUMNS.items()}
+
+
+def annual_summary(annual, factors):
+    """
+    Returns the summary of one building without the LCA columns: the annual sums (also per m2) and the data of the
+    building, in the order of SUMMARY_COLUMNS. The LCA columns are calculated afterwards for all buildings at once with
+    recalculate_summary(). The energy carriers are checked here, so that a building with an unknown energy carrier
+    fails on its own.
+
+    :param annual: Annual sums (see annual_sums()) and data of the building (BUILDING_COLUMNS)
+    :type annual: dict
+    :param factors: Factors of the energy carriers
+    :type factors: LCAFactors
+    :return: summary, one row
+    :rtype: pd.DataFrame
+    """
+    heating_carrier = energy_carrier(annual['HeatingSupplySystem'])
+    factors.check([heating_carrier, hotwater_energy_carrier(annual['DHWSupplySystem'], heating_carrier),
+                   energy_carrier(annual['CoolingSupplySystem']), ELECTRICITY])
+
+    summary = dict(annual)
+    for name, total in PER_AREA_COLUMNS.items():
+        if total in annual:
+            summary[name] = annual[total] / annual['EnergyRefArea']
+
+    return pd.DataFrame({name: [summary[name]] for name in SUMMARY_COLUMNS if name in summary})
+
+
+def end_use(electricity, fossils, f_GHG, f_PE, f_Hs_Hi):
+    """
+    Returns the Hi-related electricity and fossil fuel, GWP [kg] and primary energy [kWh] of an end use of each
+    building, the factors apply to the electricity if there is any, otherwise to the fossil fuel
+    """
+    electric = electricity > 0
+    electricity_Hi = np.where(electric, electricity / f_Hs_Hi, 0)
+    fossils_Hi = np.where(electric, 0, fossils / f_Hs_Hi)
+    final_energy_Hi = np.where(electric, electricity_Hi, fossils_Hi)
+    return electricity_Hi, fossils_Hi, (final_energy_Hi * f_GHG) / 1000, final_energy_Hi * f_PE
+
+
+def summarize(annual, factors):
+    """
+    Calculates the annual summary of any number of buildings
+
+    :param annual: Annual sums (see annual_sums()) and data of the buildings (BUILDING_COLUMNS), e.g. an
+                   annualResults_summary
+    :type annual: pd.DataFrame or dict of array_like
+    :param factors: Factors of the energy carriers
+    :type factors: LCAFactors
+    :return: summary, one row per building with the columns SUMMARY_COLUMNS
+    :rtype: pd.DataFrame
+    """
+    def column(name):
+        return np.atleast_1d(np.asarray(annual[name]))
+
+    sums = {name: column(name) for name in ANNUAL_SUM_COLUMNS.values()}
+    area = column('EnergyRefArea')
+
+    heating_supply_system = column('HeatingSupplySystem')
+    cooling_supply_system = column('CoolingSupplySystem')
+    dhw_system = column('DHWSupplySystem')
+
+    # Energy carriers of the systems, joined with the factor table
+    heating_carrier = np.array([energy_carrier(system) for system in heating_supply_system], dtype=object)
+    hotwater_carrier = np.array([hotwater_energy_carrier(system, carrier)
+                                 for system, carrier in zip(dhw_system, heating_carrier)], dtype=object)
+    cooling_carrier = np.array([energy_carrier(system) for system in cooling_supply_system], dtype=object)
+    electricity_carrier = np.full(len(area), ELECTRICITY, dtype=object)
+
+    heating_f = factors.lookup(heating_carrier)
+    hotwater_f = factors.lookup(hotwater_carrier)
+    cooling_f = factors.lookup(cooling_carrier)
+    electricity_f = factors.lookup(electricity_carrier)
+
+    heating_el_Hi, heating_fo_Hi, heating_GWP, heating_PE = end_use(
+        sums['Heating_Sys_Electricity [kWh]'], sums['Heating_Sys_Fossils [kWhHs]'], *heating_f)
+    hotwater_el_Hi, hotwater_fo_Hi, hotwater_GWP, hotwater_PE = end_use(
+        sums['HotWater_Sys_Electricity [kWh]'], sums['HotWater_Sys_Fossils [kWhHs]'], *hotwater_f)
+    cooling_el_Hi, cooling_fo_Hi, cooling_GWP, cooling_PE = end_use(
+        sums['Cooling_Sys_Electricity [kWh]'], sums['Cooling_Sys_Fossils [kWhHs]'], *cooling_f)
+    heating_Hi = heating_el_Hi + heating_fo_Hi
+    hotwater_Hi = hotwater_el_Hi + hotwater_fo_Hi
+    cooling_Hi = cooling_el_Hi + cooling_fo_Hi
+
+    # Lighting and appliances
+    f_GHG, f_PE, f_Hs_Hi = electricity_f
+    lighting_Hi = sums['LightingDemand [kWh]'] / f_Hs_Hi
+    lighting_GWP = (lighting_Hi * f_GHG) / 1000
+    lighting_PE = lighting_Hi * f_PE
+    appliance_Hi = sums['Appliance_gains_elt_demand [kWh]'] / f_Hs_Hi
+    appliance_PE = appliance_Hi * f_PE
+    appliance_GWP = (appliance_Hi * f_GHG) / 1000
+
+    GWP = heating_GWP + cooling_GWP + lighting_GWP + appliance_GWP + hotwater_GWP
+    PE = heating_PE + cooling_PE + lighting_PE + appliance_PE + hotwater_PE
+    final_energy_Hi = heating_Hi + cooling_Hi + lighting_Hi + appliance_Hi + hotwater_Hi
+    electricity = sums['Heating_Sys_Electricity [kWh]'] + sums['HotWater_Sys_Electricity [kWh]'] + \
+                  sums['Cooling_Sys_Electricity [kWh]'] + sums['LightingDemand [kWh]'] + \
+                  sums['Appliance_gains_elt_demand [kWh]']
+    fossils = sums['Heating_Sys_Fossils [kWhHs]'] + sums['Cooling_Sys_Fossils [kWhHs]']
+
+    summary = {
+        'GebäudeID': column('GebäudeID'),
+        'EnergyRefArea': area,
+        'HeatingEnergy_Hi [kWhHi]': heating_Hi,
+        'Heating_Sys_Electricity_Hi [kWhHi]': heating_el_Hi,
+        'Heating_Sys_Fossils_Hi [kWhHi]': heating_fo_Hi,
+        'Heating_Sys_GWP [kg]': heating_GWP,
+        'Heating_Sys_PE [kWh]': heating_PE,
+        'Cooling_Sys_GWP [kg]': cooling_GWP,
+        'Cooling_Sys_PE [kWh]': cooling_PE,
+        'HotWaterEnergy_Hi [kwhHi]': hotwater_Hi,
+        'HeatingSupplySystem': heating_supply_system,
+        'CoolingSupplySystem': cooling_supply_system,
+        'DHWSupplySystem': dhw_system,
+        'Heating_fuel_type': heating_carrier,
+        'Heating_f_GHG [g/kWhHi]': heating_f[0],
+        'Heating_f_PE [kWhPE/kWhHi]': heating_f[1],
+        'Heating_f_Hs_Hi [kWhHs/kWhHi]': heating_f[2],
+        'Hotwater_fuel_type': hotwater_carrier,
+        'Hotwater_f_GHG [g/kWhHi]': hotwater_f[0],
+        'Hotwater_f_PE [kWhPE/kWhHi]': hotwater_f[1],
+        'Hotwater_f_Hs_Hi [kWhHs/kWhHi]': hotwater_f[2],
+        'Cooling_fuel_type': cooling_carrier,
+        'Cooling_f_GHG [g/kWhHi]': cooling_f[0],
+        'Cooling_f_PE [kWhPE/kWhHi]': cooling_f[1],
+        'Cooling_f_Hs_Hi [kWhHs/kWhHi]': cooling_f[2],
+        'LightAppl_fuel_type': electricity_carrier,
+        'LightAppl_f_GHG [g/kWhHi]': electricity_f[0],
+        'LightAppl_f_PE [kWhPE/kWhHi]': electricity_f[1],
+        'LightAppl_f_Hs_Hi [kWhHs/kWhHi]': electricity_f[2],
+        'HotWater_Sys_GWP [kg]': hotwater_GWP,
+        'HotWater_Sys_PE [kWh]': hotwater_PE,
+        'ElectricityDemandTotal [kWh]': electricity,
+        'FossilsDemandTotal [kWh]': fossils,
+        'LightingDemand_GWP [kg]': lighting_GWP,
+        'LightingDemand_PE [kWh]': lighting_PE,
+        'Appliance_gains_demand_GWP [kg]': appliance_GWP,
+        'Appliance_gains_demand_PE [kWh]': appliance_PE,
+        'GWP [kg]': GWP,
+        'PE [kWh]': PE,
+        'FinalEnergy_Hi [kWhHi]': final_energy_Hi,
+    }
+    summary.update(sums)
+    for name in BUILDING_COLUMNS[5:]:
+        summary[name] = column(name)
+
+    # Values per m2 energy reference area
+    for name, total in PER_AREA_COLUMNS.items():
+        summary[name] = summary[total] / area
+
+    return pd.DataFrame({name: summary[name] for name in SUMMARY_COLUMNS})
+
+
+def recalculate_summary(summary, GWP_PE_Factors):
+    """
+    Calculates the LCA columns of an annualResults_summary again (e.g. with a new factor table), for all buildings at
+    once without simulating them
+
+    :param summary: annualResults_summary, e.g. pd.read_csv('annualResults_summary.csv', sep=';')
+    :type summary: pd.DataFrame
+    :param GWP_PE_Factors: Content of Primary_energy_and_emission_factors.csv
+    :type GWP_PE_Factors: pd.DataFrame
+    :return: summary with the recalculated LCA columns
+    :rtype: pd.DataFrame
+    """
+    return summarize(summary.reset_index(drop=True), LCAFactors(GWP_PE_Factors))
@@ -0,0 +1,190 @@
+"""
+Module with the load profiles of a building stock: weighted sums of the hourly electricity and fossil fuel
+consumption of all simulated buildings, by group of buildings
+
+Each building is added with the weight of its extrapolation column (e.g. the extrapolation factor of the survey, 1 if
+no weight column is given) to the load profile of its group:
+    a column of the building data, e.g. 'hk_geb' or a federal state column
+    'fuel_type': energy carrier of the heating supply system (see lca.energy_carrier())
+    None: all buildings in one group
+Only the sums of each group are kept (groups x variables x 8760 values), the hourly results of the buildings are not
+needed afterwards. The load profiles of several processes are added with snapshot() and merge().
+
+Example:
+    load_profiles = LoadProfileAggregator(group_by='hk_geb', weight_column='hochrechnungsfaktor')
+    context = SimulationContext(load_profiles=load_profiles.settings)
+    ... simulate the buildings, the context adds each building to context.load_profiles ...
+    context.load_profiles.write_csv('results/load_profiles.csv')
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import numpy as np
+import pandas as pd
+
+import lca
+
+HOURS = 8760
+
+# Hourly results summed up [W]
+ELECTRICITY_VARIABLES = ['Heating_Sys_Electricity', 'HotWater_Sys_Electricity', 'Cooling_Sys_Electricity',
+                         'LightingDemand', 'Appliance_gains_elt_demands']
+FOSSILS_VARIABLES = ['Heating_Sys_Fossils', 'HotWater_Sys_Fossils', 'Cooling_Sys_Fossils']
+PROFILE_VARIABLES = ELECTRICITY_VARIABLES + FOSSILS_VARIABLES
+
+# Group of the energy carrier of the heating supply system
+FUEL_TYPE = 'fuel_type'
+
+
+class LoadProfileAggregator(object):
+    """
+    Weighted hourly load profiles of the groups of a building stock
+
+    Methods:
+        add: Adds the hourly results of a building
+        snapshot: Sums as picklable dictionary (e.g. to send them from a worker process)
+        merge: Adds the sums of a snapshot
+        groups: Number of buildings and sum of the weights of each group
+        frame: Load profiles of all groups
+        write_csv: Saves frame() and groups()
+
+    :param group_by: Column of the building data, 'fuel_type' or None (one group)
+    :type group_by: str or None
+    :param weight_column: Column of the building data with the extrapolation weight of each building (None: 1)
+    :type weight_column: str or None
+    """
+
+    def __init__(self, group_by='hk_geb', weight_column=None):
+
+        self.group_by = group_by
+        self.weight_column = weight_column
+        # Sum of each variable and hour, number of buildings and sum of the weights of each group
+        self.sums = {}
+        self.buildings = {}
+        self.weights = {}
+
+    @property
+    def settings(self):
+        """
+        Arguments to create an empty LoadProfileAggregator with the same groups, e.g. in another process
+        """
+        return {'group_by': self.group_by, 'weight_column': self.weight_column}
+
+    def group_of(self, i_gebaeudeparameter):
+        """
+        Returns the group of a building
+        """
+        if self.group_by is None:
+            return 'all'
+        if self.group_by == FUEL_TYPE:
+            return lca.energy_carrier(i_gebaeudeparameter.heating_supply_system)
+        if self.group_by not in i_gebaeudeparameter._fields:
+            raise KeyError('Column ' + str(self.group_by) + ' of the load profile groups is not in the building data')
+        return getattr(i_gebaeudeparameter, self.group_by)
+
+    def weight_of(self, i_gebaeudeparameter):
+        """
+        Returns the extrapolation weight of a building
+        """
+        if self.weight_column is None:
+            return 1.0
+        if self.weight_column not in i_gebaeudeparameter._fields:
+            raise KeyError('Weight column ' + str(self.weight_column) + ' is not in the building data')
+        weight = float(getattr(i_gebaeudeparameter, self.weight_column))
+        if not np.isfinite(weight):
+            raise ValueError('Weight of building ' + str(i_gebaeudeparameter.scr_gebaeude_id) + ' is ' + str(weight))
+        return weight
+
+    def add(self, i_gebaeudeparameter, hourly):
+        """
+        Adds the hourly results of a building to the load profile of its group
+
+        :param i_gebaeudeparameter: Parameters of the building
+        :type i_gebaeudeparameter: namedtuple
+        :param hourly: Hourly results of the building [W], 8760 values of each of PROFILE_VARIABLES
+        :type hourly: dict or pd.DataFrame
+        """
+        group = self.group_of(i_gebaeudeparameter)
+        weight = self.weight_of(i_gebaeudeparameter)
+        values = np.array([np.asarray(hourly[variable], dtype=float) for variable in PROFILE_VARIABLES])
+
+        if group not in self.sums:
+            self.sums[group] = np.zeros((len(PROFILE_VARIABLES), HOURS))
+            self.buildings[group] = 0
+            self.weights[group] = 0.0
+        self.sums[group] += weight * values
+        self.buildings[group] += 1
+        self.weights[group] += weight
+
+    def snapshot(self, reset=False):
+        """
+        Returns the sums, which can be added to another LoadProfileAggregator with merge()
+
+        :param reset: Forget the sums afterwards
+        :type reset: bool
+        """
+        snapshot = {'sums': self.sums, 'buildings': self.buildings, 'weights': self.weights}
+        if reset:
+            self.sums, self.buildings, self.weights = {}, {}, {}
+        else:
+            snapshot = {'sums': {group: sums.copy() for group, sums in self.sums.items()},
+                        'buildings': dict(self.buildings), 'weights': dict(self.weights)}
+        return snapshot
+
+    def merge(self, snapshot):
+        """
+        Adds the sums of a snapshot, e.g. of a worker process
+        """
+        for group, sums in snapshot['sums'].items():
+            if group not in self.sums:
+                self.sums[group] = np.zeros((len(PROFILE_VARIABLES), HOURS))
+                self.buildings[group] = 0
+                self.weights[group] = 0.0
+            self.sums[group] += sums
+            self.buildings[group] += snapshot['buildings'][group]
+            self.weights[group] += snapshot['weights'][group]
+
+    def groups(self):
+        """
+        Returns the number of buildings and the sum of the weights of each group
+
+        :rtype: pd.DataFrame
+        """
+        groups = sorted(self.sums, key=str)
+        return pd.DataFrame({'group': groups,
+                             'buildings': [self.buildings[group] for group in groups],
+                             'weight': [self.weights[group] for group in groups]})
+
+    def frame(self):
+        """
+        Returns the load profiles of all groups, 8760 rows per group with the weighted sum of each variable [W]
+        and the totals of electricity and fossil fuels
+
+        :rtype: pd.DataFrame
+        """
+        frames = []
+        for group in sorted(self.sums, key=str):
+            frame = pd.DataFrame(self.sums[group].T, columns=PROFILE_VARIABLES)
+            frame.insert(0, 'hour', np.arange(HOURS))
+            frame.insert(0, 'group', group)
+            frame['ElectricityTotal'] = frame[ELECTRICITY_VARIABLES].sum(axis=1)
+            frame['FossilsTotal'] = frame[FOSSILS_VARIABLES].sum(axis=1)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=['group', 'hour'] + PROFILE_VARIABLES + ['ElectricityTotal', 'FossilsTotal'])
+        return pd.concat(frames, ignore_index=True)
+
+    def write_csv(self, path, groups_path=None, sep=';'):
+        """
+        Saves the load profiles (frame()) to path and the groups (groups()) to groups_path
+        """
+        self.frame().to_csv(path, sep=sep, index=False)
+        if groups_path is not None:
+            self.groups().to_csv(groups_path, sep=sep, index=False)
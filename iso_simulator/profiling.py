@@ -0,0 +1,355 @@
+"""
+Module with an opt-in profiler of the phases of the simulation
+
+The profiler accumulates the wall time and the number of calls of the phases of the simulation (loading of the epw
+files, search of the weather station, reference data, sun position, solar gains and illuminance of the windows,
+heating/cooling demand, supply systems, LCA factors, DataFrames of the results, saving of the results) and counters,
+e.g. of the objects created by the emission and supply systems.
+
+The profiler is disabled by default and then costs (almost) nothing: profiled() only registers a function or method,
+profiler.enable() replaces the registered functions in their modules and classes by wrappers that measure them and
+profiler.disable() restores them. Enable the profiler after the modules of the simulator are imported.
+
+Phases are nested, e.g. has_demand is measured inside solve_building_energy inside simulate_building. For each
+nesting (stack) of phases the calls, the total time and the self time (total time without the nested phases) are kept.
+The report is available as dictionary (JSON), as text and in the folded stack format of flamegraph.pl/speedscope
+("simulate_building;solve_building_energy;has_demand 123456", self time in microseconds).
+
+Example:
+    profiler.enable()
+    ... simulate buildings ...
+    print(profiler.format())
+    profiler.write_json('profile.json')
+    profiler.write_folded('profile.folded')
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import functools
+import json
+import sys
+import time
+from collections import Counter
+
+# Version of the layout of the report
+REPORT_VERSION = 1
+
+
+class NullPhase(object):
+    """
+    Phase of a disabled profiler, measures nothing
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        return False
+
+
+NULL_PHASE = NullPhase()
+
+
+class Phase(object):
+    """
+    Measures one call of a phase, see Profiler.phase()
+    """
+
+    __slots__ = ('profiler', 'name', 'start', 'children')
+
+    def __init__(self, profiler, name):
+
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.stack.append(self)
+        self.children = 0.0
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        elapsed = time.perf_counter() - self.start
+        profiler = self.profiler
+        stack = profiler.stack
+        if self not in stack:
+            # The profiler was reset during the phase
+            return False
+        # Phases started with Profiler.start() and not stopped because of an exception end here as well
+        index = len(stack) - 1 - stack[::-1].index(self)
+        key = tuple(phase.name for phase in stack[:index + 1])
+        del stack[index:]
+        if stack:
+            stack[-1].children += elapsed
+
+        stats = profiler.phases.get(key)
+        if stats is None:
+            profiler.phases[key] = [1, elapsed, elapsed - self.children]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] += elapsed - self.children
+        return False
+
+
+class Profiler(object):
+    """
+    Wall time and calls of the phases of the simulation and counters
+
+    Methods:
+        enable: Starts measuring
+        disable: Stops measuring, the measurements are kept
+        reset: Forgets all measurements
+        phase: Context manager measuring a phase
+        start: Starts measuring a phase
+        stop: Ends a phase started with start()
+        count: Increases a counter
+        snapshot: Measurements as picklable dictionary (e.g. to send them from a worker process)
+        merge: Adds the measurements of a snapshot
+        report: Measurements as dictionary
+        format: Measurements as text
+        folded: Measurements in the folded stack format of flamegraph.pl
+        write_json: Saves report() as JSON file
+        write_folded: Saves folded() as text file
+    """
+
+    def __init__(self):
+
+        self.enabled = False
+        self.instrumented = []
+        self.reset()
+
+    def enable(self):
+        """
+        Starts measuring, the functions registered with profiled() are replaced by measuring wrappers
+        """
+        if self.enabled:
+            return
+        self.enabled = True
+        self.enabled_at = time.perf_counter()
+        self.instrumented = instrument(self)
+
+    def disable(self):
+        """
+        Stops measuring, the functions registered with profiled() are restored
+        """
+        if not self.enabled:
+            return
+        for owner, attribute, function in self.instrumented:
+            setattr(owner, attribute, function)
+        self.instrumented = []
+        self.wall_time += time.perf_counter() - self.enabled_at
+        self.enabled = False
+
+    def reset(self):
+        # Calls, total time [s] and self time [s] of each stack of phase names
+        self.phases = {}
+        self.counters = Counter()
+        self.stack = []
+        self.wall_time = 0.0
+        self.enabled_at = time.perf_counter()
+
+    def phase(self, name):
+        """
+        Context manager measuring a phase, nested in the phases that are measured when it starts
+
+        :param name: Name of the phase
+        :type name: str
+        """
+        if not self.enabled:
+            return NULL_PHASE
+        return Phase(self, name)
+
+    def start(self, name):
+        """
+        Starts measuring a phase that ends with stop(name), for code that is not a with block
+        """
+        if self.enabled:
+            Phase(self, name).__enter__()
+
+    def stop(self, name):
+        """
+        Ends the phase name started with start()
+        """
+        if self.stack and self.stack[-1].name == name:
+            self.stack[-1].__exit__(None, None, None)
+
+    def count(self, name, n=1):
+        """
+        Increases the counter name by n (only if the profiler is enabled)
+        """
+        if self.enabled:
+            self.counters[name] += n
+
+    def snapshot(self, reset=False):
+        """
+        Returns the measurements as dictionary of builtin types, which can be added to another profiler with merge()
+
+        :param reset: Forget the measurements afterwards (the profiler stays enabled)
+        :type reset: bool
+        """
+        snapshot = {'phases': {key: list(stats) for key, stats in self.phases.items()},
+                    'counters': dict(self.counters)}
+        if reset:
+            self.phases = {}
+            self.counters = Counter()
+        return snapshot
+
+    def merge(self, snapshot):
+        """
+        Adds the measurements of a snapshot, e.g. of a worker process. The phases of several processes run at the
+        same time, so their times can add up to more than the wall time.
+        """
+        for key, (calls, total, self_time) in snapshot['phases'].items():
+            stats = self.phases.setdefault(tuple(key), [0, 0.0, 0.0])
+            stats[0] += calls
+            stats[1] += total
+            stats[2] += self_time
+        self.counters.update(snapshot['counters'])
+
+    def current_wall_time(self):
+        if self.enabled:
+            return self.wall_time + time.perf_counter() - self.enabled_at
+        return self.wall_time
+
+    def report(self):
+        """
+        Returns the measurements as dictionary
+
+        stacks: calls, total and self time of each nesting of phases
+        phases: calls, total and self time of each phase over all stacks (the total time of a phase nested in itself
+                is counted once)
+        counters: value of each counter
+        """
+        phases = {}
+        for key, (calls, total, self_time) in self.phases.items():
+            name = key[-1]
+            stats = phases.setdefault(name, {'calls': 0, 'total_s': 0.0, 'self_s': 0.0})
+            stats['calls'] += calls
+            stats['self_s'] += self_time
+            if name not in key[:-1]:
+                stats['total_s'] += total
+        for stats in phases.values():
+            stats['mean_us'] = stats['total_s'] / stats['calls'] * 1e6 if stats['calls'] else None
+
+        return {
+            'report_version': REPORT_VERSION,
+            'wall_time_s': self.current_wall_time(),
+            'phases': dict(sorted(phases.items(), key=lambda item: -item[1]['total_s'])),
+            'stacks': [{'stack': ';'.join(key), 'calls': calls, 'total_s': total, 'self_s': self_time}
+                       for key, (calls, total, self_time) in sorted(self.phases.items())],
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def format(self):
+        """
+        Returns the phases and counters as text table
+        """
+        report = self.report()
+        lines = ['Profile (wall time {:.3f} s)'.format(report['wall_time_s']),
+                 '{:<32}{:>12}{:>12}{:>12}{:>14}'.format('phase', 'calls', 'total [s]', 'self [s]', 'mean [us]')]
+        for name, stats in report['phases'].items():
+            lines.append('{:<32}{:>12}{:>12.3f}{:>12.3f}{:>14.1f}'.format(name, stats['calls'], stats['total_s'],
+                                                                        stats['self_s'], stats['mean_us']))
+        if report['counters']:
+            lines.append('{:<32}{:>12}'.format('counter', 'value'))
+            for name, value in report['counters'].items():
+                lines.append('{:<32}{:>12}'.format(name, value))
+        return '\n'.join(lines)
+
+    def folded(self):
+        """
+        Returns the self time of each stack of phases in the folded stack format of flamegraph.pl, one line
+        "phase;nested phase;... microseconds" per stack
+        """
+        return ''.join('{} {}\n'.format(';'.join(key), int(round(self_time * 1e6)))
+                       for key, (calls, total, self_time) in sorted(self.phases.items()))
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def write_folded(self, path):
+        with open(path, 'w') as f:
+            f.write(self.folded())
+
+
+# Profiler of the process, used by all modules of the simulator
+profiler = Profiler()
+
+# Functions and methods registered with profiled() and the name of their phase
+PROFILED = []
+
+
+def profiled(name):
+    """
+    Decorator registering a function or method as phase name, it is measured while the profiler is enabled.
+    The function itself is returned unchanged.
+
+    :param name: Name of the phase
+    :type name: str
+    """
+    def decorator(function):
+        PROFILED.append((function, name))
+        return function
+    return decorator
+
+
+def measured(profiler, function, name):
+    """
+    Returns a wrapper of function that measures each call as phase name
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with Phase(profiler, name):
+            return function(*args, **kwargs)
+    return wrapper
+
+
+def references(function):
+    """
+    Yields (owner, attribute) of each place a profiled function is found: the class of a method, the module of a
+    function and the modules that imported the function by name
+    """
+    module = sys.modules.get(function.__module__)
+    path = function.__qualname__.split('.')
+    if module is None or '<locals>' in path:
+        return
+
+    if len(path) > 1:
+        owner = module
+        for part in path[:-1]:
+            owner = getattr(owner, part)
+        if owner.__dict__.get(path[-1]) is function:
+            yield owner, path[-1]
+        return
+
+    # A module can be in sys.modules under several names
+    modules = {id(other_module): other_module for other_module in list(sys.modules.values())}
+    for other_module in modules.values():
+        for attribute, value in list(getattr(other_module, '__dict__', {}).items()):
+            if value is function:
+                yield other_module, attribute
+
+
+def instrument(profiler):
+    """
+    Replaces the functions registered with profiled() by measuring wrappers
+
+    :return: (owner, attribute, function) of each replaced function, to restore them
+    :rtype: list of tuple
+    """
+    instrumented = []
+    for function, name in PROFILED:
+        wrapper = measured(profiler, function, name)
+        for owner, attribute in references(function):
+            setattr(owner, attribute, wrapper)
+            instrumented.append((owner, attribute, function))
+    return instrumented
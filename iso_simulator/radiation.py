@@ -20,8 +20,71 @@ import os
 import sys
 import math
 import datetime
+import json
+import shutil
+from collections import namedtuple, OrderedDict
 from geopy.distance import geodesic
 
+from profiling import profiled
+from profiling import profiler
+
+# Orientations of the windows of a building and their azimuth_tilt, see definition of the windows in annualSimulation.py
+WINDOW_ORIENTATIONS = ('south', 'east', 'west', 'north')
+WINDOW_AZIMUTH_TILTS = (0, 90, 180, 270)
+
+# Sun position and incident radiation of a weather station for all 8760 hours of the year
+# altitude, azimuth: Sun position [degrees], shape (8760,)
+# solar: Incident solar radiation per m2 window area [W/m2], shape (8760, 4), columns ordered as in WINDOW_ORIENTATIONS
+# illuminance: Incident illuminance per m2 window area [Lx], shape (8760, 4), columns ordered as in WINDOW_ORIENTATIONS
+StationSolar = namedtuple('StationSolar', ['altitude', 'azimuth', 'solar', 'illuminance'])
+
+# EPW Labels
+EPW_LABELS = ['year', 'month', 'day', 'hour', 'minute', 'datasource', 'drybulb_C', 'dewpoint_C',
+              'relhum_percent',
+              'atmos_Pa', 'exthorrad_Whm2', 'extdirrad_Whm2', 'horirsky_Whm2', 'glohorrad_Whm2',
+              'dirnorrad_Whm2', 'difhorrad_Whm2', 'glohorillum_lux', 'dirnorillum_lux', 'difhorillum_lux',
+              'zenlum_lux', 'winddir_deg', 'windspd_ms', 'totskycvr_tenths', 'opaqskycvr_tenths',
+              'visibility_km',
+              'ceiling_hgt_m', 'presweathobs', 'presweathcodes', 'precip_wtr_mm', 'aerosol_opt_thousandths',
+              'snowdepth_cm', 'days_last_snow', 'Albedo', 'liq_precip_depth_mm', 'liq_precip_rate_Hour']
+
+# Columns of the epw file used by the simulation
+WEATHER_COLUMNS = ('year', 'drybulb_C', 'dirnorrad_Whm2', 'difhorrad_Whm2', 'dirnorillum_lux', 'difhorillum_lux')
+
+
+def round_temperature(values, ndigits):
+    """
+    Rounds the temperatures of the threshold checks (sun shading, night flushing, heating/cooling demand) in the same
+    way for scalars and arrays
+
+    The temperatures of the simulation are np.float64, for which round() gives the result of np.round() (scale,
+    round half to even, scale back). round() of a python float rounds its exact binary value instead, e.g.
+    round(24.05, 1) = 24.1 but np.round(24.05, 1) = 24.0. The scalar and the array methods both use this function, so
+    that they switch at the same temperatures whatever the type of the values is.
+
+    :param values: Values to round
+    :type values: float or array_like
+    :param ndigits: Number of decimals
+    :type ndigits: int
+    :return: rounded values
+    :rtype: np.float64 or np.ndarray
+    """
+    if isinstance(values, (float, int)):
+        return round(np.float64(values), ndigits)
+    return np.round(np.asarray(values, dtype=float), ndigits)
+
+
+def read_epw(epwfile_path):
+    """
+    Reads an epw file
+
+    :param epwfile_path: Path of the epw file
+    :type epwfile_path: str
+    :return: weather_data, all columns of the epw file except datasource
+    :rtype: pd.DataFrame
+    """
+    return pd.read_csv(epwfile_path, skiprows=8, header=None, names=EPW_LABELS).drop('datasource', axis=1)
+
 
 class Location(object):
     """
@@ -30,23 +93,17 @@ class Location(object):
     Methods:
         getEPWFile: Function finds the epw file depending on building location
         calc_sun_position: Calculates the sun position for a specific hour and location
+        calc_sun_position_array: Calculates the sun position for arrays of hours, e.g. all hours of the year
     """
 
-    def __init__(self, epwfile_path):
-
-        # Set EPW Labels and import epw file
-        epw_labels = ['year', 'month', 'day', 'hour', 'minute', 'datasource', 'drybulb_C', 'dewpoint_C',
-                      'relhum_percent',
-                      'atmos_Pa', 'exthorrad_Whm2', 'extdirrad_Whm2', 'horirsky_Whm2', 'glohorrad_Whm2',
-                      'dirnorrad_Whm2', 'difhorrad_Whm2', 'glohorillum_lux', 'dirnorillum_lux', 'difhorillum_lux',
-                      'zenlum_lux', 'winddir_deg', 'windspd_ms', 'totskycvr_tenths', 'opaqskycvr_tenths',
-                      'visibility_km',
-                      'ceiling_hgt_m', 'presweathobs', 'presweathcodes', 'precip_wtr_mm', 'aerosol_opt_thousandths',
-                      'snowdepth_cm', 'days_last_snow', 'Albedo', 'liq_precip_depth_mm', 'liq_precip_rate_Hour']
+    def __init__(self, epwfile_path, weather_store=None):
 
-        # Import EPW file
-        self.weather_data = pd.read_csv(
-            epwfile_path, skiprows=8, header=None, names=epw_labels).drop('datasource', axis=1)
+        # Import EPW file, from the binary columns of the weather_store if given (See WeatherStore)
+        with profiler.phase('load_weather'):
+            if weather_store is None:
+                self.weather_data = read_epw(epwfile_path)
+            else:
+                self.weather_data = weather_store.read(epwfile_path)
 
     def getEPWFile(plz, weather_period):
         """
@@ -60,45 +117,15 @@ class Location(object):
         :rtype: tuple (string)
         :return coordinates_station: latitude and longitute of the selected station
         :rtype: tuple (float)
-        """
-
-        # Read data
-        # plz_data = pd.read_csv(os.path.join('../auxiliary/weather_data/plzcodes.csv'), encoding = 'latin')
-        plz_data = pd.read_csv(os.path.join('../auxiliary/weather_data/plzcodes.csv'), encoding='latin',
-                               dtype={'zipcode': int})
-
-        if (weather_period == "2007-2021"):
-            weatherfiles_stations = pd.read_csv(
-                os.path.join('../auxiliary/weather_data/weather_data_TMYx_2007_2021/weatherfiles_stations_109.csv'),
-                sep=';')
-        else:
-            weatherfiles_stations = pd.read_csv(os.path.join('../auxiliary/weather_data/weatherfiles_stations_93.csv'),
-                                                sep=';')
-
-        # Pick latitude and longitude from plz_data and put values into a list
-        coordinates_plz = plz_data.loc[plz_data['zipcode'] == plz, ['latitude', 'longitude']].iloc[0].tolist()
-
-        # Append plz to weatherfiles_stations
-        weatherfiles_stations['latitude_building'] = coordinates_plz[0]
-        weatherfiles_stations['longitude_building'] = coordinates_plz[1]
-
-        # Calculate minimum distance to next weather station
-        weatherfiles_stations['distance'] = weatherfiles_stations.apply(
-            lambda x: geodesic((x['latitude'], x['longitude']),
-                               (x['latitude_building'], x['longitude_building'])).km, axis=1)
-
-        # Pick filename of minimum distance
-        epw_filename = weatherfiles_stations.loc[weatherfiles_stations['distance'].idxmin(), 'filename']
-
-        # Pick latitude and longitude from station as arguments in calc_sun_position(), See annualSimulation.py
-        coordinates_station = weatherfiles_stations.loc[
-            weatherfiles_stations['distance'].idxmin(), ['latitude', 'longitude']].tolist()
+        :return distance: distance between zip code and station [km]
+        :rtype: float
 
-        # Distance 
-        distance = distance = weatherfiles_stations.loc[weatherfiles_stations['distance'].idxmin(), 'distance']
+        The zip codes and weather stations are read for each call, use one StationLocator for several buildings.
+        """
 
-        return epw_filename, coordinates_station, distance
+        return StationLocator(weather_period).locate(plz)
 
+    @profiled('calc_sun_position')
     def calc_sun_position(self, latitude_deg, longitude_deg, year, hoy):
         """
         Calculates the sun position for a specific hour and location
@@ -163,13 +190,199 @@ class Location(object):
         else:
             return math.degrees(altitude_rad), (180 - math.degrees(azimuth_rad))
 
+    @profiled('calc_sun_position')
+    def calc_sun_position_array(self, latitude_deg, longitude_deg, year, hoy):
+        """
+        Calculates the sun position for arrays of hours, same equations as calc_sun_position()
+
+        :param latitude_deg: Geographical Latitude in Degrees
+        :type latitude_deg: float
+        :param longitude_deg: Geographical Longitude in Degrees
+        :type longitude_deg: float
+        :param year: year of each hour, e.g. weather_data['year']
+        :type year: int or np.ndarray
+        :param hoy: Hours of the year from the start. The first hour of January is 1
+        :type hoy: np.ndarray
+        :return: altitude, azimuth: Sun position in altitude and azimuth degrees [degrees]
+        :rtype: tuple (np.ndarray)
+        """
+
+        # Convert to Radians
+        latitude_rad = np.radians(latitude_deg)
+        hoy = np.asarray(hoy, dtype=np.int64)
+
+        # Set the date in UTC based off the hour of year and the year itself
+        start_of_year = (np.asarray(year, dtype=np.int64) - 1970).astype('datetime64[Y]')
+        utc_datetime = start_of_year.astype('datetime64[h]') + hoy.astype('timedelta64[h]')
+
+        # Determine the day of the year and the hour of the day
+        utc_date = utc_datetime.astype('datetime64[D]')
+        day_of_year = (utc_date - utc_date.astype('datetime64[Y]').astype('datetime64[D]')).astype(np.int64) + 1
+        utc_hour = (utc_datetime - utc_date.astype('datetime64[h]')).astype(np.int64)
+
+        # Calculate the declination angle: The variation due to the earths tilt
+        declination_rad = np.radians(
+            23.45 * np.sin((2 * math.pi / 365.0) * (day_of_year - 81)))
+
+        # Normalise the day to 2*pi
+        angle_of_day = (day_of_year - 81) * (2 * math.pi / 364)
+
+        # The deviation between local standard time and true solar time
+        equation_of_time = (9.87 * np.sin(2 * angle_of_day)) - \
+                           (7.53 * np.cos(angle_of_day)) - (1.5 * np.sin(angle_of_day))
+
+        # True Solar Time, minute is always 0 for whole hours
+        solar_time = ((utc_hour * 60) + 0 + (4 * longitude_deg) + equation_of_time) / 60.0
+
+        # Angle between the local longitude and longitude where the sun is at
+        # higher altitude
+        hour_angle_rad = np.radians(15 * (12 - solar_time))
+
+        # Altitude Position of the Sun in Radians
+        altitude_rad = np.arcsin(np.cos(latitude_rad) * np.cos(declination_rad) * np.cos(hour_angle_rad) +
+                                 np.sin(latitude_rad) * np.sin(declination_rad))
+
+        # Azimuth Position fo the sun in radians
+        azimuth_rad = np.arcsin(
+            np.cos(declination_rad) * np.sin(hour_angle_rad) / np.cos(altitude_rad))
+
+        # Quadrant of the azimuth, see calc_sun_position()
+        azimuth_deg = np.where(np.cos(hour_angle_rad) >= (np.tan(declination_rad) / np.tan(latitude_rad)),
+                               np.degrees(azimuth_rad), 180 - np.degrees(azimuth_rad))
+
+        return np.degrees(altitude_rad), azimuth_deg
+
+
+class StationLocator(object):
+    """
+    Finds the nearest weather station of zip codes. The zip codes and weather stations are read once per weather period,
+    so that one StationLocator can be used for all buildings of a simulation.
+
+    The stations are ranked by the great circle distance on the unit sphere. The geodesic distance (geopy) is only
+    calculated for the nearest station and for stations with a great circle distance within GEODESIC_MARGIN of it,
+    as the ranking on the ellipsoid can differ from the ranking on the sphere for almost equidistant stations.
+    The results are the same as for the comparison of the geodesic distances of all stations.
+
+    Methods:
+        locate: Finds the nearest weather station of a zip code
+        locate_many: Finds the nearest weather stations of several zip codes
+
+    :external input data: File with german zip codes [../auxiliary/weather_data/plzcodes.csv]
+                          File with metadata of weather stations (e.g. longitude, latitude) [../auxiliary/weather_data/weatherfiles_stations_93.csv]
+
+    :param weather_period: "2007-2021" or "2004-2018"
+    :type weather_period: str
+    :param weather_data_path: Directory of the weather data
+    :type weather_data_path: str
+    """
+
+    # Relative difference between the great circle distance on the sphere and the geodesic distance
+    # on the WGS-84 ellipsoid is below 0.6 %
+    GEODESIC_MARGIN = 0.01
+
+    def __init__(self, weather_period, weather_data_path='../auxiliary/weather_data'):
+
+        plz_data = pd.read_csv(os.path.join(weather_data_path, 'plzcodes.csv'), encoding='latin',
+                               dtype={'zipcode': int})
+
+        if (weather_period == "2007-2021"):
+            weatherfiles_stations = pd.read_csv(
+                os.path.join(weather_data_path, 'weather_data_TMYx_2007_2021/weatherfiles_stations_109.csv'),
+                sep=';')
+        else:
+            weatherfiles_stations = pd.read_csv(os.path.join(weather_data_path, 'weatherfiles_stations_93.csv'),
+                                                sep=';')
+
+        # Coordinates of the first entry of each zip code
+        plz_data = plz_data.drop_duplicates(subset='zipcode', keep='first')
+        self.coordinates_plz = dict(zip(plz_data['zipcode'],
+                                        zip(plz_data['latitude'].tolist(), plz_data['longitude'].tolist())))
+
+        self.filenames = weatherfiles_stations['filename'].tolist()
+        self.latitudes = weatherfiles_stations['latitude'].tolist()
+        self.longitudes = weatherfiles_stations['longitude'].tolist()
+        self.unit_vectors = self.calc_unit_vectors(np.array(self.latitudes), np.array(self.longitudes))
+
+        # Results of the zip codes already located
+        self.stations_of_plz = {}
+
+    @profiled('getEPWFile')
+    def locate(self, plz):
+        """
+        Finds the nearest weather station of a zip code
+
+        :param plz: zip code
+        :type plz: int
+        :return epw_filename: filename of the epw
+        :rtype: tuple (string)
+        :return coordinates_station: latitude and longitute of the selected station
+        :rtype: tuple (float)
+        :return distance: geodesic distance between zip code and station [km]
+        :rtype: float
+        """
+        if plz not in self.stations_of_plz:
+            self.stations_of_plz[plz] = self.locate_many([plz])[0]
+
+        epw_filename, coordinates_station, distance = self.stations_of_plz[plz]
+        return epw_filename, list(coordinates_station), distance
+
+    def locate_many(self, plzs):
+        """
+        Finds the nearest weather stations of several zip codes
+
+        :param plzs: zip codes
+        :type plzs: list of int
+        :return: (epw_filename, coordinates_station, distance) of each zip code, see locate()
+        :rtype: list of tuple
+        """
+        try:
+            coordinates_plz = np.array([self.coordinates_plz[plz] for plz in plzs], dtype=float).reshape(-1, 2)
+        except KeyError as e:
+            raise IndexError('Zip code {} not found in plzcodes.csv'.format(e.args[0]))
+
+        # Angle between zip codes and stations on the unit sphere, shape (len(plzs), number of stations)
+        cos_angles = self.calc_unit_vectors(coordinates_plz[:, 0], coordinates_plz[:, 1]) @ self.unit_vectors.T
+        angles = np.arccos(np.clip(cos_angles, -1, 1))
+        min_angles = angles.min(axis=1, keepdims=True)
+
+        results = []
+        for i, candidates in enumerate(angles <= min_angles * (1 + self.GEODESIC_MARGIN) + 1e-12):
+            # Geodesic distance of the candidates, the first station wins if equidistant (as idxmin)
+            best_station, best_distance = None, None
+            for station in np.flatnonzero(candidates):
+                distance = geodesic((self.latitudes[station], self.longitudes[station]),
+                                    (coordinates_plz[i, 0], coordinates_plz[i, 1])).km
+                if best_distance is None or distance < best_distance:
+                    best_station, best_distance = station, distance
+
+            results.append((self.filenames[best_station],
+                            (self.latitudes[best_station], self.longitudes[best_station]), best_distance))
+
+        return results
+
+    @staticmethod
+    def calc_unit_vectors(latitude_deg, longitude_deg):
+        """
+        Converts latitudes and longitudes into unit vectors, shape (n, 3)
+        """
+        latitude_rad = np.radians(latitude_deg)
+        longitude_rad = np.radians(longitude_deg)
+        return np.stack([np.cos(latitude_rad) * np.cos(longitude_rad),
+                         np.cos(latitude_rad) * np.sin(longitude_rad),
+                         np.sin(latitude_rad)], axis=-1)
+
 
 class Window(object):
     """
     Methods:
         calc_solar_gains: Calculates the solar gains in the building zone through the set window
+        calc_solar_gains_from_incident: Calculates the solar gains from the incident solar radiation per m2 window area
         calc_illuminance: Calculates the illuminance in the building zone through the set window
+        calc_illuminance_from_incident: Calculates the illuminance from the incident illuminance per m2 window area
+        calc_solar_gains_array: Calculates the solar gains through the set window for arrays of hours
+        calc_illuminance_array: Calculates the illuminance through the set window for arrays of hours
         calc_direct_solar_factor: Calculates the cosine of the angle of incidence on the window 
+        calc_direct_solar_factor_array: Calculates the cosine of the angle of incidence for arrays of sun positions
         calc_diffuse_solar_factor: Calculates the proportion of diffuse radiation
     """
 
@@ -186,6 +399,7 @@ class Window(object):
         self.area = area
         self.glass_solar_shading_transmittance = glass_solar_shading_transmittance
 
+    @profiled('window_solar_gains')
     def calc_solar_gains(self, sun_altitude, sun_azimuth, normal_direct_radiation, horizontal_diffuse_radiation, t_air,
                          hour):
         """
@@ -209,38 +423,47 @@ class Window(object):
         :rtype: float
         """
 
-        # Check conditions cooling seasons == True and outdoor temperature > 24 (requiered indoor temperature in the cooling case for 85% of usage zones according to DIN V 18599-10):
-        # If condition is true, use reduced glass_solar_transmittance (called glass_solar_shading_transmittance) due to the use
-        # of activated sunshadings 
-        cooling_season = (2169 < hour < 6561)  # Assume cooling season from 01/04 9am - 01/10 9am
-
-        if round(t_air, 1) > 24 and (cooling_season == True):
+        direct_factor = self.calc_direct_solar_factor(sun_altitude, sun_azimuth)
+        diffuse_factor = self.calc_diffuse_solar_factor()
 
-            direct_factor = self.calc_direct_solar_factor(sun_altitude, sun_azimuth, )
-            diffuse_factor = self.calc_diffuse_solar_factor()
+        direct_solar = direct_factor * normal_direct_radiation
+        diffuse_solar = horizontal_diffuse_radiation * diffuse_factor
 
-            direct_solar = direct_factor * normal_direct_radiation
-            diffuse_solar = horizontal_diffuse_radiation * diffuse_factor
-            self.incident_solar = (direct_solar + diffuse_solar) * self.area
+        self.calc_solar_gains_from_incident(direct_solar + diffuse_solar, t_air, hour)
 
-            if self.glass_solar_shading_transmittance > 0:  # Check if the building has sunshading
+    @profiled('window_solar_gains')
+    def calc_solar_gains_from_incident(self, incident_solar_per_area, t_air, hour):
+        """
+        Calculates the solar gains in the building zone through the set window from the incident solar radiation
+        per m2 window area, e.g. taken from StationSolar
 
-                self.solar_gains = self.glass_solar_shading_transmittance * self.incident_solar
+        :param incident_solar_per_area: Incident Solar Radiation per m2 window area [W/m2]
+        :type incident_solar_per_area: float
+        :param t_air: Indoor air temperature [C]
+        :type t_air: float
+        :param hour: Hour of the year
+        :type hour: int
 
-            else:
-                self.solar_gains = self.glass_solar_transmittance * self.incident_solar
+        :return: self.incident_solar, Incident Solar Radiation on window
+        :return: self.solar_gains - Solar gains in building after transmitting through the window
+        :rtype: float
+        """
 
-        else:
+        # Check conditions cooling seasons == True and outdoor temperature > 24 (requiered indoor temperature in the cooling case for 85% of usage zones according to DIN V 18599-10):
+        # If condition is true, use reduced glass_solar_transmittance (called glass_solar_shading_transmittance) due to the use
+        # of activated sunshadings 
+        cooling_season = (2169 < hour < 6561)  # Assume cooling season from 01/04 9am - 01/10 9am
 
-            direct_factor = self.calc_direct_solar_factor(sun_altitude, sun_azimuth)
-            diffuse_factor = self.calc_diffuse_solar_factor()
+        self.incident_solar = incident_solar_per_area * self.area
 
-            direct_solar = direct_factor * normal_direct_radiation
-            diffuse_solar = horizontal_diffuse_radiation * diffuse_factor
-            self.incident_solar = (direct_solar + diffuse_solar) * self.area
+        if round_temperature(t_air, 1) > 24 and (cooling_season == True) and self.glass_solar_shading_transmittance > 0:
+            # Building has sunshading
+            self.solar_gains = self.glass_solar_shading_transmittance * self.incident_solar
 
+        else:
             self.solar_gains = self.glass_solar_transmittance * self.incident_solar
 
+    @profiled('window_illuminance')
     def calc_illuminance(self, sun_altitude, sun_azimuth, normal_direct_illuminance, horizontal_diffuse_illuminance):
         """
         Calculates the illuminance in the building zone through the set window
@@ -264,11 +487,92 @@ class Window(object):
         direct_illuminance = direct_factor * normal_direct_illuminance
         diffuse_illuminance = diffuse_factor * horizontal_diffuse_illuminance
 
-        self.incident_illuminance = (
-                                            direct_illuminance + diffuse_illuminance) * self.area
+        self.calc_illuminance_from_incident(direct_illuminance + diffuse_illuminance)
+
+    @profiled('window_illuminance')
+    def calc_illuminance_from_incident(self, incident_illuminance_per_area):
+        """
+        Calculates the illuminance in the building zone through the set window from the incident illuminance
+        per m2 window area, e.g. taken from StationSolar
+
+        :param incident_illuminance_per_area: Incident Illuminance per m2 window area [Lx]
+        :type incident_illuminance_per_area: float
+        :return: self.incident_illuminance, Incident Illuminance on window [Lumens]
+        :return: self.transmitted_illuminance - Illuminance in building after transmitting through the window [Lumens]
+        :rtype: float
+        """
+
+        self.incident_illuminance = incident_illuminance_per_area * self.area
         self.transmitted_illuminance = self.incident_illuminance * \
                                        self.glass_light_transmittance
 
+    @profiled('window_solar_gains')
+    def calc_solar_gains_array(self, sun_altitude, sun_azimuth, normal_direct_radiation, horizontal_diffuse_radiation,
+                               t_air, hour):
+        """
+        Calculates the solar gains through the set window for arrays of hours, same as calc_solar_gains()
+
+        :param sun_altitude: Altitude Angle of the Sun in Degrees
+        :type sun_altitude: np.ndarray
+        :param sun_azimuth: Azimuth angle of the sun in degrees
+        :type sun_azimuth: np.ndarray
+        :param normal_direct_radiation: Normal Direct Radiation from weather file
+        :type normal_direct_radiation: np.ndarray
+        :param horizontal_diffuse_radiation: Horizontal Diffuse Radiation from weather file
+        :type horizontal_diffuse_radiation: np.ndarray
+        :param t_air: Indoor air temperature of each hour [C]
+        :type t_air: np.ndarray
+        :param hour: Hours of the year
+        :type hour: np.ndarray
+        :return: incident_solar, Incident Solar Radiation on window
+        :return: solar_gains - Solar gains in building after transmitting through the window
+        :rtype: tuple (np.ndarray)
+        """
+
+        direct_factor = self.calc_direct_solar_factor_array(sun_altitude, sun_azimuth)
+        diffuse_factor = self.calc_diffuse_solar_factor()
+
+        direct_solar = direct_factor * normal_direct_radiation
+        diffuse_solar = horizontal_diffuse_radiation * diffuse_factor
+        incident_solar = (direct_solar + diffuse_solar) * self.area
+
+        # Sunshading in the cooling season if the indoor air temperature is > 24 C, see calc_solar_gains_from_incident()
+        hour = np.asarray(hour)
+        cooling_season = (2169 < hour) & (hour < 6561)
+        shading = (round_temperature(t_air, 1) > 24) & cooling_season & (self.glass_solar_shading_transmittance > 0)
+        solar_gains = np.where(shading, self.glass_solar_shading_transmittance * incident_solar,
+                               self.glass_solar_transmittance * incident_solar)
+
+        return incident_solar, solar_gains
+
+    @profiled('window_illuminance')
+    def calc_illuminance_array(self, sun_altitude, sun_azimuth, normal_direct_illuminance,
+                               horizontal_diffuse_illuminance):
+        """
+        Calculates the illuminance through the set window for arrays of hours, same as calc_illuminance()
+
+        :param sun_altitude: Altitude Angle of the Sun in Degrees
+        :type sun_altitude: np.ndarray
+        :param sun_azimuth: Azimuth angle of the sun in degrees
+        :type sun_azimuth: np.ndarray
+        :param normal_direct_illuminance: Normal Direct Illuminance from weather file [Lx]
+        :type normal_direct_illuminance: np.ndarray
+        :param horizontal_diffuse_illuminance: Horizontal Diffuse Illuminance from weather file [Lx]
+        :type horizontal_diffuse_illuminance: np.ndarray
+        :return: incident_illuminance, Incident Illuminance on window [Lumens]
+        :return: transmitted_illuminance - Illuminance in building after transmitting through the window [Lumens]
+        :rtype: tuple (np.ndarray)
+        """
+
+        direct_factor = self.calc_direct_solar_factor_array(sun_altitude, sun_azimuth)
+        diffuse_factor = self.calc_diffuse_solar_factor()
+
+        direct_illuminance = direct_factor * normal_direct_illuminance
+        diffuse_illuminance = diffuse_factor * horizontal_diffuse_illuminance
+        incident_illuminance = (direct_illuminance + diffuse_illuminance) * self.area
+
+        return incident_illuminance, incident_illuminance * self.glass_light_transmittance
+
     def calc_direct_solar_factor(self, sun_altitude, sun_azimuth):
         """
         Calculates the cosine of the angle of incidence on the window 
@@ -292,6 +596,23 @@ class Window(object):
 
         return direct_factor
 
+    def calc_direct_solar_factor_array(self, sun_altitude, sun_azimuth):
+        """
+        Calculates the cosine of the angle of incidence on the window for arrays of sun positions,
+        same as calc_direct_solar_factor()
+        """
+        sun_altitude_rad = np.radians(sun_altitude)
+        sun_azimuth_rad = np.radians(sun_azimuth)
+
+        direct_factor = np.cos(sun_altitude_rad) * math.sin(self.alititude_tilt_rad) * np.cos(
+            sun_azimuth_rad - self.azimuth_tilt_rad) + \
+                        np.sin(sun_altitude_rad) * math.cos(self.alititude_tilt_rad)
+
+        # If the sun is behind the window surface (clip only guards arccos against rounding beyond +-1)
+        behind = np.degrees(np.arccos(np.clip(direct_factor, -1, 1))) > 90
+
+        return np.where(behind, 0, direct_factor)
+
     def calc_diffuse_solar_factor(self):
         """
         Calculates the proportion of diffuse radiation
@@ -300,5 +621,297 @@ class Window(object):
         return (1 + math.cos(self.alititude_tilt_rad)) / 2
 
 
+@profiled('calc_station_solar')
+def calc_station_solar(location, latitude_station, longitude_station):
+    """
+    Calculates the sun position and the incident solar radiation and illuminance per m2 window area for all 8760 hours
+    of the year. The values only depend on the weather station and the orientation of the window, not on the building.
+
+    :param location: Location of the weather station
+    :type location: Location
+    :param latitude_station: Latitude of the weather station
+    :type latitude_station: float
+    :param longitude_station: Longitude of the weather station
+    :type longitude_station: float
+    :return: sun position and incident radiation of the station
+    :rtype: StationSolar
+    """
+    weather_data = location.weather_data.iloc[:8760]
+    hours = np.arange(8760)
+    altitude, azimuth = location.calc_sun_position_array(latitude_deg=latitude_station,
+                                                         longitude_deg=longitude_station,
+                                                         year=weather_data['year'].to_numpy(), hoy=hours)
+
+    # Windows with the default area of 1 m2, so the incident values are per m2 window area
+    solar = np.zeros((8760, len(WINDOW_AZIMUTH_TILTS)))
+    illuminance = np.zeros((8760, len(WINDOW_AZIMUTH_TILTS)))
+    for i, azimuth_tilt in enumerate(WINDOW_AZIMUTH_TILTS):
+        window = Window(azimuth_tilt=azimuth_tilt, alititude_tilt=90)
+        solar[:, i], _ = window.calc_solar_gains_array(altitude, azimuth,
+                                                       weather_data['dirnorrad_Whm2'].to_numpy(dtype=float),
+                                                       weather_data['difhorrad_Whm2'].to_numpy(dtype=float),
+                                                       t_air=np.zeros(8760), hour=hours)
+        illuminance[:, i], _ = window.calc_illuminance_array(altitude, azimuth,
+                                                             weather_data['dirnorillum_lux'].to_numpy(dtype=float),
+                                                             weather_data['difhorillum_lux'].to_numpy(dtype=float))
+
+    return StationSolar(altitude=altitude, azimuth=azimuth, solar=solar, illuminance=illuminance)
+
+
+class SolarCache(object):
+    """
+    Keeps the StationSolar data of the recently used weather stations, so that the sun position and the incident
+    radiation are calculated once per epw file and not once per building.
+
+    The stations are kept in memory in least recently used order, at most max_stations of them. If cache_dir is set,
+    the data is also saved as .npz file per station and reused by later simulations as long as the epw file
+    is unchanged (same modification time and size).
+
+    Methods:
+        get: Returns the StationSolar data of a weather station
+        clear: Removes all stations from memory
+
+    :param max_stations: Maximum number of stations kept in memory
+    :type max_stations: int
+    :param cache_dir: Directory for the .npz files, None to keep the data in memory only
+    :type cache_dir: str or None
+    """
+
+    def __init__(self, max_stations=32, cache_dir=None):
+
+        self.max_stations = max_stations
+        self.cache_dir = cache_dir
+        self.stations = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, epwfile_path, latitude_station, longitude_station, location=None):
+        """
+        Returns the StationSolar data of a weather station, calculates it only if it is neither in memory nor on disk
+
+        :param epwfile_path: Path of the epw file of the station
+        :type epwfile_path: str
+        :param latitude_station: Latitude of the weather station
+        :type latitude_station: float
+        :param longitude_station: Longitude of the weather station
+        :type longitude_station: float
+        :param location: Location of the epw file if already loaded, otherwise the epw file is read if necessary
+        :type location: Location or None
+        :return: sun position and incident radiation of the station
+        :rtype: StationSolar
+        """
+        key = (os.path.abspath(epwfile_path), latitude_station, longitude_station)
+
+        if key in self.stations:
+            self.hits += 1
+            self.stations.move_to_end(key)
+            return self.stations[key]
+
+        self.misses += 1
+        station_solar = self.load(epwfile_path, latitude_station, longitude_station)
+        if station_solar is None:
+            if location is None:
+                location = Location(epwfile_path=epwfile_path)
+            station_solar = calc_station_solar(location, latitude_station, longitude_station)
+            self.save(epwfile_path, latitude_station, longitude_station, station_solar)
+
+        # The same arrays are shared by all buildings of the station
+        for array in station_solar:
+            array.flags.writeable = False
+
+        self.stations[key] = station_solar
+        if len(self.stations) > self.max_stations:
+            self.stations.popitem(last=False)
+
+        return station_solar
+
+    def clear(self):
+        """
+        Removes all stations from memory, the files in cache_dir are kept
+        """
+        self.stations.clear()
+
+    def cache_file(self, epwfile_path, latitude_station, longitude_station):
+        """
+        Returns the path of the .npz file of a station in cache_dir
+        """
+        epw_name = os.path.splitext(os.path.basename(epwfile_path))[0]
+        return os.path.join(self.cache_dir, '{}_{}_{}.npz'.format(epw_name, latitude_station, longitude_station))
+
+    def load(self, epwfile_path, latitude_station, longitude_station):
+        """
+        Reads the StationSolar data from cache_dir, returns None if there is no file or the epw file has changed
+        """
+        if self.cache_dir is None:
+            return None
+
+        cache_file = self.cache_file(epwfile_path, latitude_station, longitude_station)
+        if not os.path.isfile(cache_file):
+            return None
+
+        epw_stat = os.stat(epwfile_path)
+        with np.load(cache_file) as data:
+            if data['epw_mtime'] != epw_stat.st_mtime or data['epw_size'] != epw_stat.st_size:
+                return None
+            return StationSolar(*(data[field] for field in StationSolar._fields))
+
+    def save(self, epwfile_path, latitude_station, longitude_station, station_solar):
+        """
+        Writes the StationSolar data to cache_dir
+        """
+        if self.cache_dir is None:
+            return
+
+        # Written to a temporary file first, so that no other process reads an incomplete file
+        epw_stat = os.stat(epwfile_path)
+        cache_file = self.cache_file(epwfile_path, latitude_station, longitude_station)
+        tmp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+        with open(tmp_file, 'wb') as f:
+            np.savez(f, epw_mtime=epw_stat.st_mtime, epw_size=epw_stat.st_size, **station_solar._asdict())
+        os.replace(tmp_file, cache_file)
+
+
+class WeatherStore(object):
+    """
+    Keeps the columns of epw files in a binary format, so that the csv of an epw file is parsed only once.
+
+    Each epw file is converted into one .npy file per numeric column in cache_dir/<epw name>/<size>_<mtime>/. A station
+    is read by memory mapping only the requested columns. If the epw file changes (modification time or size), it is
+    converted into a new directory.
+
+    The columns are written to a temporary directory that is then renamed, so the files of a station are never
+    rewritten. Several processes can convert and read the same station at the same time, and a process never
+    memory maps a file that another process is writing.
+
+    Methods:
+        read: Returns the weather data of an epw file
+        convert: Converts an epw file into the binary columns
+
+    :param cache_dir: Directory of the binary columns
+    :type cache_dir: str
+    :param columns: Columns to read, default WEATHER_COLUMNS
+    :type columns: tuple of str
+    """
+
+    def __init__(self, cache_dir, columns=WEATHER_COLUMNS):
+
+        self.cache_dir = cache_dir
+        self.columns = tuple(columns)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def read(self, epwfile_path, columns=None):
+        """
+        Returns the weather data of an epw file, converts the epw file first if necessary
+
+        :param epwfile_path: Path of the epw file
+        :type epwfile_path: str
+        :param columns: Columns to read, default self.columns
+        :type columns: tuple of str or None
+        :return: weather_data with the requested columns (read-only, memory mapped)
+        :rtype: pd.DataFrame
+        """
+        if columns is None:
+            columns = self.columns
+
+        station_dir = self.station_dir(epwfile_path)
+        if not self.is_valid(epwfile_path):
+            self.convert(epwfile_path)
+
+        return pd.DataFrame({column: np.load(os.path.join(station_dir, column + '.npy'), mmap_mode='r')
+                             for column in columns}, copy=False)
+
+    def convert(self, epwfile_path):
+        """
+        Converts an epw file into one .npy file per numeric column
+
+        The columns are written to a temporary directory of this process and published by renaming it to
+        station_dir(). If another process has published the station in the meantime, its columns are used.
+
+        :param epwfile_path: Path of the epw file
+        :type epwfile_path: str
+        """
+        station_dir = self.station_dir(epwfile_path)
+        parent_dir, version = os.path.split(station_dir)
+        os.makedirs(parent_dir, exist_ok=True)
+        tmp_dir = os.path.join(parent_dir, '.{}.{}.tmp'.format(version, os.getpid()))
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        try:
+            weather_data = read_epw(epwfile_path)
+            for column in weather_data.select_dtypes(include='number').columns:
+                np.save(os.path.join(tmp_dir, column + '.npy'), weather_data[column].to_numpy())
+
+            epw_stat = os.stat(epwfile_path)
+            write_json_atomic(os.path.join(tmp_dir, 'epw_stat.json'),
+                              {'mtime': epw_stat.st_mtime, 'size': epw_stat.st_size})
+
+            try:
+                os.replace(tmp_dir, station_dir)
+            except OSError:
+                # Published by another process (the target directory is not empty)
+                if not self.is_valid(epwfile_path):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.remove_old_versions(epwfile_path)
+
+    def is_valid(self, epwfile_path):
+        """
+        Checks if the binary columns of an epw file exist and the epw file is unchanged since the conversion
+        """
+        stat_file = os.path.join(self.station_dir(epwfile_path), 'epw_stat.json')
+        if not os.path.isfile(stat_file):
+            return False
+
+        with open(stat_file) as f:
+            saved_stat = json.load(f)
+        epw_stat = os.stat(epwfile_path)
+        return saved_stat['mtime'] == epw_stat.st_mtime and saved_stat['size'] == epw_stat.st_size
+
+    def station_dir(self, epwfile_path):
+        """
+        Returns the directory of the binary columns of the current version (size and modification time) of an epw file
+        """
+        epw_stat = os.stat(epwfile_path)
+        return os.path.join(self.cache_dir, os.path.splitext(os.path.basename(epwfile_path))[0],
+                            '{}_{}'.format(epw_stat.st_size, epw_stat.st_mtime_ns))
+
+    def remove_old_versions(self, epwfile_path):
+        """
+        Removes the columns of former versions of an epw file. Files that are still memory mapped by another process
+        stay readable for it (POSIX) or are kept until the next conversion (Windows).
+        """
+        parent_dir, version = os.path.split(self.station_dir(epwfile_path))
+        for name in os.listdir(parent_dir):
+            if name == version or name.startswith('.'):
+                continue
+            path = os.path.join(parent_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                # Columns of the former layout directly in cache_dir/<epw name>/
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def write_json_atomic(path, data):
+    """
+    Writes data as json file, first to a temporary file that is then renamed to path, so that no other process
+    reads an incomplete file
+    """
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
 if __name__ == '__main__':
     pass
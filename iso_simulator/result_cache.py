@@ -0,0 +1,310 @@
+"""
+On-disk cache of the simulation results of buildings
+
+A building is simulated again only if something its results depend on has changed. The key of a building is a hash of
+    - the parameters of the building (its row of e.g. SimulationData_Breitenerhebung.csv)
+    - the contents of the epw file of its weather station
+    - the reference data (norm profiles, occupancy schedules, TEKs) and the LCA factors
+    - the settings of the simulation (weather period, norms, solver, granularity of the results)
+    - the source code of the simulator
+The results are stored as one pickle file per building. If the files are larger than max_size, the least recently
+used ones are deleted.
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict, deque
+
+import pandas as pd
+
+import simulation
+
+# Files the results depend on besides the building parameters and the epw file, relative to simulation.mainPath
+DEPENDENCIES = ['auxiliary/norm_profiles/*.csv',
+                'auxiliary/occupancy_schedules/*.csv',
+                'auxiliary/TEKs/*.csv',
+                'annualSimulation/LCA/*.csv',
+                '*.py',
+                'auxiliary/*.py']
+
+# Settings of the SimulationContext that change the results
+RESULT_SETTINGS = ['weather_period', 'profile_from_norm', 'gains_from_group_values', 'usage_from_norm', 'solver',
+                   'granularity', 'lca_per_building', 'engine']
+
+
+def hash_file(path):
+    """
+    Returns the sha256 of the contents of a file
+
+    :param path: Path of the file
+    :type path: str
+    :return: hex digest
+    :rtype: str
+    """
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+class ResultCache(object):
+    """
+    Cache of the Results of simulation.simulate_building() in a directory
+
+    Results with status 'simulated' and 'not heated' are cached, failed buildings are simulated again.
+
+    Methods:
+        key: Returns the key of a building
+        load: Returns the cached Result of a key
+        store: Saves a Result
+        evict: Deletes the least recently used results
+        simulate_stock: Simulates the buildings of a stock that are not cached
+        stats: Statistics of the cache
+        report: Statistics of the cache as text
+
+    :param cache_dir: Directory of the cached results
+    :type cache_dir: str
+    :param max_size: Maximum size of all cached results [bytes]
+    :type max_size: int
+    """
+
+    def __init__(self, cache_dir, max_size=10 * 1024 ** 3):
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Size of the cached results, least recently used first
+        self.entries = OrderedDict()
+        paths = glob.glob(os.path.join(self.cache_dir, '*.pkl'))
+        for path in sorted(paths, key=os.path.getmtime):
+            self.entries[os.path.basename(path)[:-4]] = os.path.getsize(path)
+        self.size = sum(self.entries.values())
+
+        # Hashes of the epw files and of the data of a SimulationContext
+        self.file_hashes = {}
+        self.context_hashes = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.stored = 0
+        self.evicted = 0
+
+        self.evict()
+
+    def context_hash(self, context):
+        """
+        Returns the hash of the settings of context, the reference data, the LCA factors and the source code
+        """
+        settings = tuple(context.settings[name] for name in RESULT_SETTINGS)
+        if settings not in self.context_hashes:
+            hasher = hashlib.sha256(json.dumps(settings).encode())
+            for pattern in DEPENDENCIES:
+                for path in sorted(glob.glob(os.path.join(simulation.mainPath, pattern))):
+                    hasher.update(os.path.relpath(path, simulation.mainPath).encode())
+                    hasher.update(hash_file(path).encode())
+            self.context_hashes[settings] = hasher.hexdigest()
+
+        return self.context_hashes[settings]
+
+    def epw_hash(self, epwfile_path):
+        """
+        Returns the hash of the contents of an epw file, each file is read once as long as it is not modified
+        """
+        stat = os.stat(epwfile_path)
+        if self.file_hashes.get(epwfile_path, (None,))[0] != (stat.st_mtime_ns, stat.st_size):
+            self.file_hashes[epwfile_path] = ((stat.st_mtime_ns, stat.st_size), hash_file(epwfile_path))
+
+        return self.file_hashes[epwfile_path][1]
+
+    def key(self, i_gebaeudeparameter, context):
+        """
+        Returns the key of a building, None if the weather station of the building can not be found
+
+        :param i_gebaeudeparameter: Parameters of the building
+        :type i_gebaeudeparameter: namedtuple
+        :param context: Data used by the simulation
+        :type context: simulation.SimulationContext
+        :return: hex digest
+        :rtype: str or None
+        """
+        try:
+            epw_filename = context.station_locator.locate(i_gebaeudeparameter.plz)[0]
+            epw_hash = self.epw_hash(context.epwfile_path(epw_filename))
+        except (IndexError, KeyError, OSError, ValueError):
+            return None
+
+        # numpy scalars as python values, so that the representation is the same for all versions
+        parameters = [(field, repr(value.item() if hasattr(value, 'item') else value))
+                      for field, value in zip(i_gebaeudeparameter._fields, i_gebaeudeparameter)]
+
+        hasher = hashlib.sha256(json.dumps(parameters).encode())
+        hasher.update(epw_hash.encode())
+        hasher.update(self.context_hash(context).encode())
+        return hasher.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key + '.pkl')
+
+    def load(self, key, iteration=0):
+        """
+        Returns the cached Result of key (with the position iteration in the stock), None if not cached
+
+        :param key: Key of the building, see key()
+        :type key: str
+        :param iteration: Position of the building in the simulated stock
+        :type iteration: int
+        :return: cached Result
+        :rtype: simulation.Result or None
+        """
+        if key not in self.entries:
+            self.misses += 1
+            return None
+
+        try:
+            result = pd.read_pickle(self.path(key))
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            # Deleted by another process or not completely written
+            self.size -= self.entries.pop(key)
+            self.misses += 1
+            return None
+
+        # Most recently used
+        self.entries.move_to_end(key)
+        os.utime(self.path(key))
+        self.hits += 1
+
+        if result.hourly is not None:
+            result.hourly['iteration'] = iteration
+        return result._replace(iteration=iteration)
+
+    def store(self, key, result):
+        """
+        Saves a Result and deletes the least recently used results if the cache is larger than max_size (see evict)
+
+        :param key: Key of the building, see key()
+        :type key: str
+        :param result: Result of the building
+        :type result: simulation.Result
+        """
+        if result.status not in ('simulated', 'not heated'):
+            return
+
+        # Written to a temporary file first, so that no other process reads an incomplete file
+        path = self.path(key)
+        pd.to_pickle(result, path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+        self.size += os.path.getsize(path) - self.entries.pop(key, 0)
+        self.entries[key] = os.path.getsize(path)
+        self.stored += 1
+        self.evict()
+
+    def evict(self):
+        """
+        Deletes the least recently used results until the cache is not larger than max_size
+        """
+        while self.size > self.max_size and len(self.entries) > 1:
+            old_key, old_size = self.entries.popitem(last=False)
+            self.size -= old_size
+            self.evicted += 1
+            try:
+                os.remove(self.path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def simulate_stock(self, buildings, context, workers=1, chunk_size=16, station_window=None):
+        """
+        Yields the results of the buildings in the order of the buildings, only buildings that are not cached are
+        simulated (with simulation.run_parallel) and saved
+
+        :param buildings: Parameters of the buildings
+        :type buildings: iterable of namedtuple
+        :param context: Data used by the simulation
+        :type context: simulation.SimulationContext
+        :param workers: Number of worker processes, None for the number of CPUs
+        :type workers: int or None
+        :param chunk_size: Number of buildings sent to a worker process at once
+        :type chunk_size: int
+        :param station_window: Number of consecutive buildings grouped by weather station
+        :type station_window: int or None
+        :return: Result of each building
+        :rtype: generator of Result
+        """
+        # (iteration, key, parameters if cached) of the buildings in order, until their results are yielded
+        order = deque()
+
+        def iterate_misses():
+            for iteration, i_gebaeudeparameter in enumerate(buildings):
+                key = self.key(i_gebaeudeparameter, context)
+                if key is None:
+                    self.uncacheable += 1
+                    order.append((iteration, None, None))
+                    yield i_gebaeudeparameter
+                elif key in self.entries:
+                    order.append((iteration, key, i_gebaeudeparameter))
+                else:
+                    self.misses += 1
+                    order.append((iteration, key, None))
+                    yield i_gebaeudeparameter
+
+        def iterate_cached():
+            # Results of the cached buildings before the next simulated building
+            while order and order[0][2] is not None:
+                iteration, key, i_gebaeudeparameter = order.popleft()
+                result = self.load(key, iteration)
+                if result is None:
+                    # Removed in the meantime (e.g. by another process)
+                    result = simulation.simulate_building_safe(i_gebaeudeparameter, context, iteration)
+                    self.store(key, result)
+                yield result
+
+        for result in simulation.run_parallel(iterate_misses(), context, workers=workers, chunk_size=chunk_size,
+                                              station_window=station_window):
+            yield from iterate_cached()
+            iteration, key, _ = order.popleft()
+            # Position in the whole stock instead of the position among the simulated buildings
+            if result.hourly is not None:
+                result.hourly['iteration'] = iteration
+            result = result._replace(iteration=iteration)
+            if key is not None:
+                self.store(key, result)
+            yield result
+
+        yield from iterate_cached()
+
+    def stats(self):
+        """
+        Returns the statistics of the cache
+
+        :return: hits, misses, uncacheable (station not found), stored, evicted, entries and size [bytes]
+        :rtype: dict
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'uncacheable': self.uncacheable, 'stored': self.stored,
+                'evicted': self.evicted, 'entries': len(self.entries), 'size': self.size}
+
+    def report(self):
+        """
+        Returns the statistics of the cache as text
+        """
+        stats = self.stats()
+        requests = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / requests if requests else 0.0
+        return ('Result cache ' + self.cache_dir + ': ' +
+                '{hits} hits, {misses} misses'.format(**stats) + ' ({:.1%} hit rate), '.format(hit_rate) +
+                '{uncacheable} not cacheable, {stored} stored, {evicted} evicted, '.format(**stats) +
+                '{} results with {:.1f} MB'.format(stats['entries'], stats['size'] / 1024 ** 2))
@@ -0,0 +1,373 @@
+"""
+Module with writers that save the results of each building right after its simulation
+
+Instead of keeping the hourly results of all buildings in memory until the end of the simulation, a ResultSink
+writes the hourly results and the annual summary of a building as soon as it is simulated and then forgets them.
+The memory used does not grow with the number of buildings. Columns calculated for all buildings at once (e.g. the
+LCA, see lca.recalculate_summary()) are added at the end with rewrite_summary(), which reads the written summary
+again in chunks.
+
+Backends:
+    ParquetSink: hourly results partitioned by building, summary as one parquet file (requires pyarrow)
+    CSVSink: hourly results as one csv file per building, summary as one csv file
+    ExcelSink: hourly results as one xlsx file per building, summary as one xlsx file (as the results before)
+    StoreSink: hourly results of all buildings in one columnar store (see hourly_store.py), summary as one csv file
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import abc
+import os
+
+import pandas as pd
+
+from hourly_store import HourlyStore
+from profiling import profiled
+
+
+class ResultSink(abc.ABC):
+    """
+    Abstract base class of the writers. write() saves the results of one building, close() finishes the files.
+    Can be used as context manager. The backends implement write_hourly(), write_summary(), rewrite_summary() and
+    hourly_path() and set the file extension of the summary.
+
+    Methods:
+        write: Saves the hourly results and the summary of a building
+        write_hourly: Saves the hourly results of a building
+        write_summary: Saves the summary of a building
+        rewrite_summary: Replaces the summary written so far by a transformation of it, chunk by chunk
+        hourly_path: Path of the hourly results of a building
+        close: Finishes the files
+
+    :param directory: Directory of the result files
+    :type directory: str
+    """
+
+    summary_name = 'annualResults_summary'
+
+    # False if the hourly results of all buildings are saved in the same files
+    hourly_per_building = True
+
+    def __init__(self, directory):
+
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    @profiled('output')
+    def write(self, result):
+        """
+        Saves the hourly results (if any, see aggregation.py) and the summary of a building
+
+        :param result: Result of simulation.simulate_building() with status 'simulated'
+        :type result: simulation.Result
+        """
+        if result.hourly is not None:
+            self.write_hourly(result.scr_gebaeude_id, result.hourly)
+        self.write_summary(result.summary)
+
+    @abc.abstractmethod
+    def write_hourly(self, scr_gebaeude_id, hourly):
+        """
+        Saves the hourly results of a building
+
+        :param scr_gebaeude_id: ID of the building
+        :type scr_gebaeude_id: str
+        :param hourly: Results of the building in the granularity of the simulation (see aggregation.py)
+        :type hourly: pd.DataFrame
+        """
+
+    @abc.abstractmethod
+    def write_summary(self, summary):
+        """
+        Saves the summary of one or more buildings
+
+        :param summary: Rows of annualResults_summary
+        :type summary: pd.DataFrame
+        """
+
+    @abc.abstractmethod
+    def rewrite_summary(self, transform, text_columns=(), chunk_size=1000):
+        """
+        Reads the summary written so far in chunks of chunk_size buildings and replaces it by transform() of the
+        chunks. No summaries can be written afterwards. Nothing is done if no summary was written.
+
+        :param transform: Function returning the new rows of a chunk of the summary
+        :type transform: callable
+        :param text_columns: Columns read as str (from text files, e.g. to keep leading zeros of the IDs)
+        :type text_columns: list
+        :param chunk_size: Number of buildings per chunk
+        :type chunk_size: int
+        """
+
+    @abc.abstractmethod
+    def hourly_path(self, scr_gebaeude_id):
+        """
+        Returns the path of the hourly results of a building
+        """
+
+    def close(self):
+        """
+        Finishes the files, nothing to finish by default
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    @property
+    def summary_path(self):
+        """
+        Path of the summary file
+        """
+        return os.path.join(self.directory, self.summary_name + '.' + self.extension)
+
+
+class CSVSink(ResultSink):
+    """
+    Writes the hourly results of each building to *BuildingID*.csv and appends the summary of each building
+    to annualResults_summary.csv
+    """
+
+    extension = 'csv'
+
+    def __init__(self, directory, sep=';'):
+
+        super().__init__(directory)
+        self.sep = sep
+        self.summary_file = None
+
+    def hourly_path(self, scr_gebaeude_id):
+        return os.path.join(self.directory, '{}.csv'.format(scr_gebaeude_id))
+
+    @profiled('write_hourly')
+    def write_hourly(self, scr_gebaeude_id, hourly):
+        hourly.to_csv(self.hourly_path(scr_gebaeude_id), sep=self.sep)
+
+    @profiled('write_summary')
+    def write_summary(self, summary):
+        # Header with the first building only, the file is flushed so that the rows are saved in case of a crash
+        write_header = self.summary_file is None
+        if write_header:
+            self.summary_file = open(self.summary_path, 'w', newline='', encoding='utf8')
+        summary.to_csv(self.summary_file, sep=self.sep, index=False, header=write_header)
+        self.summary_file.flush()
+
+    @profiled('output')
+    def rewrite_summary(self, transform, text_columns=(), chunk_size=1000):
+        if self.summary_file is None:
+            return
+        self.summary_file.close()
+
+        # The floats are read exactly as written, the new file replaces the summary once it is complete
+        path = self.summary_path + '.tmp'
+        with pd.read_csv(self.summary_path, sep=self.sep, encoding='utf8', chunksize=chunk_size,
+                         float_precision='round_trip', converters={column: str for column in text_columns}) as chunks:
+            with open(path, 'w', newline='', encoding='utf8') as file:
+                for index, chunk in enumerate(chunks):
+                    transform(chunk).to_csv(file, sep=self.sep, index=False, header=index == 0)
+        os.replace(path, self.summary_path)
+
+    @profiled('output')
+    def close(self):
+        if self.summary_file is not None:
+            self.summary_file.close()
+
+
+class ParquetSink(ResultSink):
+    """
+    Writes the hourly results of each building to hourly/scr_gebaeude_id=*BuildingID*/part-0.parquet (partitioned by
+    building, e.g. readable with pd.read_parquet(directory/hourly)) and the summaries to annualResults_summary.parquet.
+
+    The summaries are written in row groups of summary_batch_size buildings. Numbers are saved as float, as some of
+    them are int for some buildings and float for others (the files of all buildings must have the same schema).
+
+    :param summary_batch_size: Number of buildings per row group of the summary
+    :type summary_batch_size: int
+    """
+
+    extension = 'parquet'
+
+    def __init__(self, directory, summary_batch_size=1000):
+
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError('ParquetSink requires the package pyarrow (pip install pyarrow)')
+        self.pyarrow = pyarrow
+
+        super().__init__(directory)
+        self.summary_batch_size = summary_batch_size
+        self.summaries = []
+        self.summary_writer = None
+
+    def hourly_path(self, scr_gebaeude_id):
+        return os.path.join(self.directory, 'hourly', 'scr_gebaeude_id={}'.format(scr_gebaeude_id), 'part-0.parquet')
+
+    @profiled('write_hourly')
+    def write_hourly(self, scr_gebaeude_id, hourly):
+        path = self.hourly_path(scr_gebaeude_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.numbers_as_float(hourly).to_parquet(path, index=False)
+
+    @profiled('write_summary')
+    def write_summary(self, summary):
+        self.summaries.append(summary)
+        if len(self.summaries) >= self.summary_batch_size:
+            self.flush_summaries()
+
+    def flush_summaries(self):
+        """
+        Writes the buffered summaries as one row group
+        """
+        if not self.summaries:
+            return
+
+        summaries = self.numbers_as_float(pd.concat(self.summaries, ignore_index=True))
+        table = self.pyarrow.Table.from_pandas(summaries, preserve_index=False)
+
+        if self.summary_writer is None:
+            self.summary_writer = self.pyarrow.parquet.ParquetWriter(self.summary_path, table.schema)
+        self.summary_writer.write_table(table)
+        self.summaries = []
+
+    @profiled('output')
+    def rewrite_summary(self, transform, text_columns=(), chunk_size=1000):
+        self.flush_summaries()
+        if self.summary_writer is None:
+            return
+        self.summary_writer.close()
+        self.summary_writer = None
+
+        # One row group per chunk, the new file replaces the summary once it is complete
+        path = self.summary_path + '.tmp'
+        source = self.pyarrow.parquet.ParquetFile(self.summary_path)
+        writer = None
+        for batch in source.iter_batches(batch_size=chunk_size):
+            table = self.pyarrow.Table.from_pandas(self.numbers_as_float(transform(batch.to_pandas())),
+                                                   preserve_index=False)
+            if writer is None:
+                writer = self.pyarrow.parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+        source.close()
+        writer.close()
+        os.replace(path, self.summary_path)
+
+    @staticmethod
+    def numbers_as_float(df):
+        """
+        Returns df with all int and bool columns converted to float
+        """
+        numbers = df.select_dtypes(include=['number', 'bool']).columns
+        return df.astype({column: float for column in numbers})
+
+    @profiled('output')
+    def close(self):
+        self.flush_summaries()
+        if self.summary_writer is not None:
+            self.summary_writer.close()
+            self.summary_writer = None
+
+
+class ExcelSink(ResultSink):
+    """
+    Writes the hourly results of each building to *BuildingID*.xlsx and the summaries of all buildings to
+    annualResults_summary.xlsx (at close(), as xlsx files can not be appended)
+    """
+
+    extension = 'xlsx'
+
+    def __init__(self, directory):
+
+        super().__init__(directory)
+        self.summaries = []
+
+    def hourly_path(self, scr_gebaeude_id):
+        return os.path.join(self.directory, '{}.xlsx'.format(scr_gebaeude_id))
+
+    @profiled('write_hourly')
+    def write_hourly(self, scr_gebaeude_id, hourly):
+        hourly.to_excel(self.hourly_path(scr_gebaeude_id))
+
+    @profiled('write_summary')
+    def write_summary(self, summary):
+        self.summaries.append(summary)
+
+    @profiled('output')
+    def rewrite_summary(self, transform, text_columns=(), chunk_size=1000):
+        if not self.summaries:
+            return
+        summaries = pd.concat(self.summaries, ignore_index=True)
+        self.summaries = [transform(summaries.iloc[start:start + chunk_size])
+                          for start in range(0, len(summaries), chunk_size)]
+
+    @profiled('output')
+    def close(self):
+        if self.summaries:
+            pd.concat(self.summaries).to_excel(self.summary_path, index=False)
+            self.summaries = []
+
+
+class StoreSink(CSVSink):
+    """
+    Writes the hourly results of all buildings to the columnar store hourly_store/ (float32, see hourly_store.py)
+    and appends the summary of each building to annualResults_summary.csv
+
+    :param resume: Keep the buildings of an existing store (continue an aborted simulation), otherwise the store is
+                   started again
+    :type resume: bool
+    """
+
+    hourly_per_building = False
+
+    def __init__(self, directory, sep=';', resume=False):
+
+        super().__init__(directory, sep=sep)
+        self.store = HourlyStore(os.path.join(self.directory, 'hourly_store'), mode='a' if resume else 'w')
+
+    def hourly_path(self, scr_gebaeude_id):
+        return self.store.directory
+
+    @profiled('write_hourly')
+    def write_hourly(self, scr_gebaeude_id, hourly):
+        self.store.write(scr_gebaeude_id, hourly)
+
+    @profiled('output')
+    def close(self):
+        super().close()
+        self.store.close()
+
+
+# Backends by name, see create_sink()
+SINKS = {'parquet': ParquetSink, 'csv': CSVSink, 'excel': ExcelSink, 'store': StoreSink}
+
+
+def create_sink(output_format, directory, resume=False):
+    """
+    Returns the writer of an output format
+
+    :param output_format: 'parquet', 'csv', 'excel' or 'store'
+    :type output_format: str
+    :param directory: Directory of the result files
+    :type directory: str
+    :param resume: Keep the hourly results saved before in the directory (continue an aborted simulation), only
+                   used by the store, the other formats save one file per building
+    :type resume: bool
+    :return: writer of the results
+    :rtype: ResultSink
+    """
+    if output_format not in SINKS:
+        raise ValueError('Unknown output format ' + str(output_format) + ', use one of ' + ', '.join(SINKS))
+
+    if output_format == 'store':
+        return StoreSink(directory, resume=resume)
+    return SINKS[output_format](directory)
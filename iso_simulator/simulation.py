@@ -0,0 +1,1020 @@
+"""
+Simulation of single buildings and building stocks (annual simulation of annualSimulation.py)
+
+The data used by all buildings (reference data, weather stations, weather files, solar data, LCA factors) is loaded
+once into a SimulationContext. simulate_building() simulates one building with it, simulate_stock() simulates the
+buildings of a stock one after another. run_parallel() distributes the buildings of a stock to several processes that
+each load their own SimulationContext once. With the engine 'building_stock' of the SimulationContext the buildings of
+each chunk are simulated together in one loop over the hours of the year (see simulate_building_stock() and
+building_stock.py).
+
+Example:
+    context = SimulationContext(weather_period="2007-2021")
+    for result in simulate_stock(read_buildings('SimulationData_Breitenerhebung.csv'), context):
+        print(result.scr_gebaeude_id, result.status)
+
+
+Portions of this software are copyright of their respective authors and released under the MIT license:
+RC_BuildingSimulator, Copyright 2016 Architecture and Building Systems, ETH Zurich
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import os
+import sys
+import traceback
+from collections import namedtuple, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Root folder of the simulator, all data paths are relative to it
+mainPath = os.path.dirname(os.path.abspath(__file__))
+if mainPath not in sys.path:
+    sys.path.insert(0, mainPath)
+
+from building_physics import Building
+from building_stock import BuildingStock
+from building_stock import calc_station_weather
+import building_stock
+import supply_system
+import emission_system
+from radiation import Location
+from radiation import Window
+from radiation import round_temperature
+from radiation import SolarCache
+from radiation import WeatherStore
+from radiation import StationLocator
+from auxiliary.referenceData import ReferenceData
+import lca
+import aggregation
+from load_profiles import LoadProfileAggregator
+from load_profiles import PROFILE_VARIABLES
+from profiling import profiled
+from profiling import profiler
+
+# Result of the simulation of one building
+# iteration: Position of the building in the simulated stock
+# scr_gebaeude_id: ID of the building
+# status: 'simulated', 'not heated' (no heated area or no heating supply system) or 'failed'
+# hourly: DataFrame with the hourly results, aggregated to the granularity of the SimulationContext (None if not
+#         simulated or granularity 'annual_only')
+# summary: DataFrame with one row of annual results (None if not simulated)
+# error: Traceback of the exception if failed, otherwise None
+Result = namedtuple('Result', ['iteration', 'scr_gebaeude_id', 'status', 'hourly', 'summary', 'error'])
+
+# Engines of the simulation: 'building' simulates one Building after another (simulate_building()), 'building_stock'
+# the buildings of a chunk together (simulate_building_stock())
+ENGINES = ('building', 'building_stock')
+
+
+class SimulationContext(object):
+    """
+    Data used by the simulation of all buildings, loaded once
+
+    All paths are relative to the root folder of the simulator, the simulation does not depend on the working directory.
+
+    :param weather_period: What weather data periode to use for simulation, "2007-2021" or "2004-2018"
+    :type weather_period: str
+    :param profile_from_norm: Where to pick gain_per_person and appliance_gains from, 'din18599' or 'sia2024'
+    :type profile_from_norm: str
+    :param gains_from_group_values: Group values of the appliance_gains, 'low', 'mid' or 'max'
+    :type gains_from_group_values: str
+    :param usage_from_norm: Where to pick the usage time from, 'din18599' or 'sia2024'
+    :type usage_from_norm: str
+    :param solver: How to solve the heating/cooling demand of each time step, see Building in building_physics.py
+    :type solver: str
+    :param weather_store_dir: Directory of the binary columns of the epw files, see radiation.WeatherStore
+    :type weather_store_dir: str
+    :param solar_cache_dir: Directory of the solar data of the weather stations (None: memory only),
+                            see radiation.SolarCache
+    :type solar_cache_dir: str or None
+    :param granularity: Time series of the results, 'hourly', 'daily', 'monthly', 'peaks' or 'annual_only'
+                        (see aggregation.py)
+    :type granularity: str
+    :param load_profiles: Settings of the load profiles of the stock (None: no load profiles), each simulated building
+                          is added to the LoadProfileAggregator load_profiles of the context (see load_profiles.py)
+    :type load_profiles: dict or None
+    :param lca_per_building: Calculate the LCA columns of the summary of each building. False: the summary contains
+                             the annual sums and the data of the building only (see lca.annual_summary()), the LCA
+                             columns are calculated for all buildings at once afterwards with lca.recalculate_summary()
+    :type lca_per_building: bool
+    :param engine: How the buildings are simulated, one of ENGINES. 'building_stock' simulates the buildings of each
+                   chunk together and solves the time steps with 'crank_nicolson' only
+    :type engine: str
+    """
+
+    def __init__(self, weather_period="2007-2021", profile_from_norm='din18599', gains_from_group_values='mid',
+                 usage_from_norm='sia2024', solver='crank_nicolson',
+                 weather_store_dir=os.path.join(mainPath, 'auxiliary/weather_data/weather_store'),
+                 solar_cache_dir=None, granularity='hourly', load_profiles=None, lca_per_building=True,
+                 engine='building'):
+
+        if engine not in ENGINES:
+            raise ValueError('Unknown engine ' + str(engine) + ', use one of ' + ', '.join(ENGINES))
+        if engine == 'building_stock' and solver != 'crank_nicolson':
+            raise ValueError('The engine building_stock solves the time steps with crank_nicolson only')
+
+        self.weather_period = weather_period
+        self.profile_from_norm = profile_from_norm
+        self.gains_from_group_values = gains_from_group_values
+        self.usage_from_norm = usage_from_norm
+        self.solver = solver
+        self.weather_store_dir = weather_store_dir
+        self.solar_cache_dir = solar_cache_dir
+        aggregation.check_granularity(granularity)
+        self.granularity = granularity
+        self.lca_per_building = lca_per_building
+        self.engine = engine
+
+        # Weighted hourly load profiles of the simulated buildings, by group
+        self.load_profiles = LoadProfileAggregator(**load_profiles) if load_profiles is not None else None
+
+        # Gains, usage times, occupancy schedules and TEK values of DIN V 18599 / SIA 2024
+        self.reference_data = ReferenceData(auxiliary_path=os.path.join(mainPath, 'auxiliary'))
+
+        # Nearest weather station of each zip code
+        self.station_locator = StationLocator(weather_period,
+                                              weather_data_path=os.path.join(mainPath, 'auxiliary/weather_data'))
+
+        # Binary columns of the epw files and solar data of the weather stations
+        self.weather_store = WeatherStore(cache_dir=weather_store_dir)
+        self.solar_cache = SolarCache(max_stations=32, cache_dir=solar_cache_dir)
+
+        # Emission and Primary Energy Factors ('None' is an energy carrier, not a missing value)
+        self.GWP_PE_Factors = pd.read_csv(
+            os.path.join(mainPath, 'annualSimulation/LCA/Primary_energy_and_emission_factors.csv'), sep=';',
+            decimal=',', index_col=False, encoding='cp1250', keep_default_na=False)
+        # Factors of each energy carrier, see lca.py
+        self.lca_factors = lca.LCAFactors(self.GWP_PE_Factors)
+
+    @property
+    def settings(self):
+        """
+        Arguments to create the same SimulationContext again, e.g. in another process
+        """
+        return {'weather_period': self.weather_period,
+                'profile_from_norm': self.profile_from_norm,
+                'gains_from_group_values': self.gains_from_group_values,
+                'usage_from_norm': self.usage_from_norm,
+                'solver': self.solver,
+                'weather_store_dir': self.weather_store_dir,
+                'solar_cache_dir': self.solar_cache_dir,
+                'granularity': self.granularity,
+                'load_profiles': self.load_profiles.settings if self.load_profiles is not None else None,
+                'lca_per_building': self.lca_per_building,
+                'engine': self.engine}
+
+    def epwfile_path(self, epw_filename):
+        """
+        Returns the path of an epw file of the weather period
+        """
+        if (self.weather_period == "2007-2021"):
+            return os.path.join(mainPath, 'auxiliary/weather_data/weather_data_TMYx_2007_2021', epw_filename)
+        else:
+            return os.path.join(mainPath, 'auxiliary/weather_data', epw_filename)
+
+
+def create_building(i_gebaeudeparameter, solver='crank_nicolson'):
+    """
+    Creates the Building of the parameters of a building
+
+    :param i_gebaeudeparameter: Parameters of the building, one row of e.g. SimulationData_Breitenerhebung.csv
+    :type i_gebaeudeparameter: namedtuple
+    :param solver: How to solve the heating/cooling demand of each time step, see Building in building_physics.py
+    :type solver: str
+    :return: building
+    :rtype: Building
+    """
+    return Building(scr_gebaeude_id=i_gebaeudeparameter.scr_gebaeude_id,
+                    plz=i_gebaeudeparameter.plz,
+                    hk_geb=i_gebaeudeparameter.hk_geb,
+                    uk_geb=i_gebaeudeparameter.uk_geb,
+                    max_occupancy=i_gebaeudeparameter.max_occupancy,
+                    wall_area_og=i_gebaeudeparameter.wall_area_og,
+                    wall_area_ug=i_gebaeudeparameter.wall_area_ug,
+                    window_area_north=i_gebaeudeparameter.window_area_north,
+                    window_area_east=i_gebaeudeparameter.window_area_east,
+                    window_area_south=i_gebaeudeparameter.window_area_south,
+                    window_area_west=i_gebaeudeparameter.window_area_west,
+                    roof_area=i_gebaeudeparameter.roof_area,
+                    net_room_area=i_gebaeudeparameter.net_room_area,
+                    base_area=i_gebaeudeparameter.base_area,
+                    energy_ref_area=i_gebaeudeparameter.energy_ref_area,
+                    building_height=i_gebaeudeparameter.building_height,
+                    lighting_load=i_gebaeudeparameter.lighting_load,
+                    lighting_control=i_gebaeudeparameter.lighting_control,
+                    lighting_utilisation_factor=i_gebaeudeparameter.lighting_utilisation_factor,
+                    lighting_maintenance_factor=i_gebaeudeparameter.lighting_maintenance_factor,
+                    glass_solar_transmittance=i_gebaeudeparameter.glass_solar_transmittance,
+                    glass_solar_shading_transmittance=i_gebaeudeparameter.glass_solar_shading_transmittance,
+                    glass_light_transmittance=i_gebaeudeparameter.glass_light_transmittance,
+                    u_windows=i_gebaeudeparameter.u_windows,
+                    u_walls=i_gebaeudeparameter.u_walls,
+                    u_roof=i_gebaeudeparameter.u_roof,
+                    u_base=i_gebaeudeparameter.u_base,
+                    temp_adj_base=i_gebaeudeparameter.temp_adj_base,
+                    temp_adj_walls_ug=i_gebaeudeparameter.temp_adj_walls_ug,
+                    ach_inf=i_gebaeudeparameter.ach_inf,
+                    ach_win=i_gebaeudeparameter.ach_win,
+                    ach_vent=i_gebaeudeparameter.ach_vent,
+                    heat_recovery_efficiency=i_gebaeudeparameter.heat_recovery_efficiency,
+                    thermal_capacitance=i_gebaeudeparameter.thermal_capacitance,
+                    t_start=i_gebaeudeparameter.t_start,
+                    t_set_heating=i_gebaeudeparameter.t_set_heating,
+                    t_set_cooling=i_gebaeudeparameter.t_set_cooling,
+                    night_flushing_flow=i_gebaeudeparameter.night_flushing_flow,
+                    max_cooling_energy_per_floor_area=i_gebaeudeparameter.max_cooling_energy_per_floor_area,
+                    max_heating_energy_per_floor_area=i_gebaeudeparameter.max_heating_energy_per_floor_area,
+                    heating_supply_system=getattr(supply_system, i_gebaeudeparameter.heating_supply_system),
+                    cooling_supply_system=getattr(supply_system, i_gebaeudeparameter.cooling_supply_system),
+                    heating_emission_system=getattr(emission_system,
+                                                    i_gebaeudeparameter.heating_emission_system),
+                    cooling_emission_system=getattr(emission_system,
+                                                    i_gebaeudeparameter.cooling_emission_system),
+                    solver=solver)
+
+
+@profiled('simulate_building')
+def simulate_building(i_gebaeudeparameter, context, iteration=0):
+    """
+    Simulates the 8760 hours of the year of one building and calculates the annual results
+
+    :param i_gebaeudeparameter: Parameters of the building, one row of e.g. SimulationData_Breitenerhebung.csv
+    :type i_gebaeudeparameter: namedtuple
+    :param context: Data used by the simulation
+    :type context: SimulationContext
+    :param iteration: Position of the building in the simulated stock
+    :type iteration: int
+    :return: hourly and annual results of the building
+    :rtype: Result
+    """
+
+    # Empty Lists to store data of the inner loop, emptied after each month
+    HeatingDemand = []
+    CoolingDemand = []
+    EnergyDemand = []
+    HasHeatingDemand = []
+    HasCoolingDemand = []
+    HeatingSupplyTemperature = []
+    CoolingSupplyTemperature = []
+    TempAir = []
+    SolarGainsSouthWindow = []
+    SolarGainsEastWindow = []
+    SolarGainsWestWindow = []
+    SolarGainsNorthWindow = []
+    SolarGainsTotal = []
+
+    # Initialise an instance of the building
+    BuildingInstance = create_building(i_gebaeudeparameter, solver=context.solver)
+
+    # If there's no heated area (energy_ref_area == -8) or no heating supply system (heating_supply_system == 'NoHeating')
+    # no heating demand can be calculated. In this case skip calculation and proceed with next building.
+    if (i_gebaeudeparameter.energy_ref_area == -8) | (i_gebaeudeparameter.heating_supply_system == 'NoHeating'):
+        return Result(iteration=iteration, scr_gebaeude_id=i_gebaeudeparameter.scr_gebaeude_id, status='not heated',
+                      hourly=None, summary=None, error=None)
+
+    # Initialize the buildings location with a weather file from the nearest weather station depending on the plz
+    getEPWFile_list = context.station_locator.locate(BuildingInstance.plz)
+    epw_filename = getEPWFile_list[0]
+    epwfile_path = context.epwfile_path(epw_filename)
+    building_location = Location(epwfile_path=epwfile_path, weather_store=context.weather_store)
+
+    # Distance from weather station to the building
+    distance = getEPWFile_list[2]
+
+    # Extract coordinates of that weather station. Necessary for calc_sun_position()
+    latitude_station = getEPWFile_list[1][0]
+    longitude_station = getEPWFile_list[1][1]
+
+    # Sun position and incident radiation per m2 window area of the station for all hours of the year
+    station_solar = context.solar_cache.get(epwfile_path, latitude_station, longitude_station, building_location)
+
+    # Define windows for each compass direction
+    SouthWindow = Window(azimuth_tilt=0, alititude_tilt=90,
+                         glass_solar_transmittance=BuildingInstance.glass_solar_transmittance,
+                         glass_solar_shading_transmittance=BuildingInstance.glass_solar_shading_transmittance,
+                         glass_light_transmittance=BuildingInstance.glass_light_transmittance,
+                         area=BuildingInstance.window_area_south)
+    EastWindow = Window(azimuth_tilt=90, alititude_tilt=90,
+                        glass_solar_transmittance=BuildingInstance.glass_solar_transmittance,
+                        glass_solar_shading_transmittance=BuildingInstance.glass_solar_shading_transmittance,
+                        glass_light_transmittance=BuildingInstance.glass_light_transmittance,
+                        area=BuildingInstance.window_area_east)
+    WestWindow = Window(azimuth_tilt=180, alititude_tilt=90,
+                        glass_solar_transmittance=BuildingInstance.glass_solar_transmittance,
+                        glass_solar_shading_transmittance=BuildingInstance.glass_solar_shading_transmittance,
+                        glass_light_transmittance=BuildingInstance.glass_light_transmittance,
+                        area=BuildingInstance.window_area_west)
+    NorthWindow = Window(azimuth_tilt=270, alititude_tilt=90,
+                         glass_solar_transmittance=BuildingInstance.glass_solar_transmittance,
+                         glass_solar_shading_transmittance=BuildingInstance.glass_solar_shading_transmittance,
+                         glass_light_transmittance=BuildingInstance.glass_light_transmittance,
+                         area=BuildingInstance.window_area_north)
+
+    # Get information from DIN V 18599-10 or SIA 2024 for gain_per_person and appliance_gains depending on 
+    # hk_geb, uk_geb
+    # Assignments see Excel/CSV-File in /auxiliary/norm_profiles/profiles_DIN18599_SIA2024
+    # Data source (din18599 or sia2024) and group values (low, mid or max) are set in the SimulationContext
+    gain_per_person, appliance_gains, typ_norm = context.reference_data.getGains(BuildingInstance.hk_geb,
+                                                                                 BuildingInstance.uk_geb,
+                                                                                 context.profile_from_norm,
+                                                                                 context.gains_from_group_values)
+
+    # Get usage time of the specific building from DIN V 18599-10 or SIA2024
+    usage_start, usage_end = context.reference_data.getUsagetime(BuildingInstance.hk_geb, BuildingInstance.uk_geb,
+                                                                 context.usage_from_norm)
+
+    # Read specific occupancy schedule
+    # Assignments see Excel/CSV-File in /auxiliary/occupancy_schedules/
+    occupancy_schedule, schedule_name = context.reference_data.getSchedule(BuildingInstance.hk_geb,
+                                                                           BuildingInstance.uk_geb)
+
+    TEK_dhw, TEK_name = context.reference_data.getTEK(BuildingInstance.hk_geb,
+                                                      BuildingInstance.uk_geb)  # TEK_dhw in kWh/m2*a
+    # print(TEK_name)
+    # print(TEK_dhw)
+    Occupancy_Full_Usage_Hours = occupancy_schedule.People.sum()  # in h/a
+    TEK_dhw_per_Occupancy_Full_Usage_Hour = TEK_dhw / Occupancy_Full_Usage_Hours  # in kWh/m2*h
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Pre-pass: values of all hours that do not depend on the temperatures of the building
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # Outdoor temperature in building_location for all hours from weather_data
+    OutsideTemp = np.asarray(building_location.weather_data['drybulb_C'], dtype=float)[:8760]
+
+    # Occupancy and appliance usage of all hours
+    occupancy_percent = np.asarray(occupancy_schedule.People, dtype=float)
+    appliances_percent = np.asarray(occupancy_schedule.Appliances, dtype=float)
+    occupancy = occupancy_percent * BuildingInstance.max_occupancy
+
+    # Illuminance through each window from the incident illuminance of the station
+    # (columns South, East, West, North, see radiation.WINDOW_ORIENTATIONS)
+    SouthWindow.calc_illuminance_from_incident(station_solar.illuminance[:, 0])
+    EastWindow.calc_illuminance_from_incident(station_solar.illuminance[:, 1])
+    WestWindow.calc_illuminance_from_incident(station_solar.illuminance[:, 2])
+    NorthWindow.calc_illuminance_from_incident(station_solar.illuminance[:, 3])
+
+    # Calculate the lighting of the building
+    LightingDemand = BuildingInstance.solve_building_lighting_array(illuminance=
+                                                                    SouthWindow.transmitted_illuminance +
+                                                                    EastWindow.transmitted_illuminance +
+                                                                    WestWindow.transmitted_illuminance +
+                                                                    NorthWindow.transmitted_illuminance,
+                                                                    occupancy=occupancy_percent)
+
+    # Calculate gains from occupancy and appliances
+    # This is thermal gains. Negative appliance_gains are heat sinks!
+    InternalGains = occupancy * gain_per_person + \
+                    appliance_gains * appliances_percent * BuildingInstance.energy_ref_area + \
+                    LightingDemand
+
+    # Calculate appliance_gains as part of the internal_gains
+    Appliance_gains_demands = appliance_gains * appliances_percent * BuildingInstance.energy_ref_area
+
+    # Appliance_gains equal the electric energy that appliances use, except for negative appliance_gains of refrigerated counters in trade buildings for food!
+    if appliance_gains < 0:
+        appliance_gains_elt = -1 * appliance_gains / 2
+        # The assumption is: negative appliance_gains come from referigerated counters with heat pumps for which we assume a COP = 2.
+    else:
+        appliance_gains_elt = appliance_gains
+
+    Appliance_gains_elt_demands = appliance_gains_elt * appliances_percent * BuildingInstance.energy_ref_area
+
+    # Calculate hot water demand of the building (the energy used for it depends on the efficiency of the heat
+    # generation and is calculated after the inner loop)
+    if i_gebaeudeparameter.dhw_system != 'NoDHW' and i_gebaeudeparameter.dhw_system != ' -':
+        HotWaterDemand = occupancy_percent * TEK_dhw_per_Occupancy_Full_Usage_Hour * 1000 * \
+                         BuildingInstance.energy_ref_area  # in W
+    else:
+        HotWaterDemand = np.zeros(8760)
+
+    # Last hour of each month, the results of the inner loop are processed month by month
+    month_ends = set((aggregation.MONTH_STARTS[1:] - 1).tolist()) | {8759}
+    month_start = 0
+
+    # Hot water heated with electricity or fossil fuel
+    dhw_electric = (i_gebaeudeparameter.dhw_system == 'DecentralElectricDHW') or \
+                   (((i_gebaeudeparameter.dhw_system == 'CentralHeating') | (
+                           i_gebaeudeparameter.dhw_system == 'CentralDHW')) \
+                    and ((i_gebaeudeparameter.heating_supply_system == 'HeatPumpAirSource') | (
+                                   i_gebaeudeparameter.heating_supply_system == 'HeatPumpGroundSource') | \
+                         (i_gebaeudeparameter.heating_supply_system == 'ElectricHeating')))
+
+    # The results of each month are added to the accumulator of the granularity of the context (see aggregation.py),
+    # which keeps only the values of the granularity. The hourly values of the load profile variables are only kept
+    # if the building is added to the load profiles
+    results = aggregation.create_accumulator(context.granularity)
+    accumulators = [results]
+    load_profile = None
+    if context.load_profiles is not None:
+        load_profile = aggregation.HourlyAccumulator(PROFILE_VARIABLES)
+        accumulators.append(load_profile)
+
+    # Starting temperature of the building. Set to t_start
+    t_m_prev = BuildingInstance.t_start
+
+    ## Inner Loop: Loop through all 8760 hours of the year
+    for hour in range(8760):
+
+        # Initialize t_set_heating at the beginning of each time step, due to BuildingInstance.t_set_heating = 0 if night flushing is active
+        # (Also see below)
+        BuildingInstance.t_set_heating = i_gebaeudeparameter.t_set_heating
+
+        # Outdoor temperature of the hour
+        t_out = OutsideTemp[hour]
+
+        # Calculate H_ve_adj, See building_physics for details
+        BuildingInstance.h_ve_adj = BuildingInstance.calc_h_ve_adj(hour, t_out, usage_start, usage_end)
+
+        # Set t_set_heating = 0 for the time step, otherwise the heating system heats up during night flushing is on
+        # BuildingInstance.t_set_heating = 0
+
+        # Define t_air for calc_solar_gains(). Starting condition (hour==0) necessary for first time step  
+        if hour == 0:
+            t_air = round_temperature(BuildingInstance.t_set_heating, 2)
+        else:
+            t_air = round_temperature(BuildingInstance.t_air, 2)
+
+        # Calculate solar gains through each window from the incident radiation of the station
+        # (columns South, East, West, North, see radiation.WINDOW_ORIENTATIONS)
+        SouthWindow.calc_solar_gains_from_incident(station_solar.solar[hour, 0], t_air=t_air, hour=hour)
+        EastWindow.calc_solar_gains_from_incident(station_solar.solar[hour, 1], t_air=t_air, hour=hour)
+        WestWindow.calc_solar_gains_from_incident(station_solar.solar[hour, 2], t_air=t_air, hour=hour)
+        NorthWindow.calc_solar_gains_from_incident(station_solar.solar[hour, 3], t_air=t_air, hour=hour)
+
+        # Calculate energy demand for the time step             
+        # The supply systems are calculated for all hours after the inner loop
+        BuildingInstance.solve_building_energy(internal_gains=InternalGains[hour],
+                                               solar_gains=
+                                               SouthWindow.solar_gains +
+                                               EastWindow.solar_gains +
+                                               WestWindow.solar_gains +
+                                               NorthWindow.solar_gains,
+                                               t_out=t_out, t_m_prev=t_m_prev, calc_supply=False)
+
+        # Set the previous temperature for the next time step
+        t_m_prev = BuildingInstance.t_m_next
+
+        # Append results to the created lists  
+        HeatingDemand.append(BuildingInstance.heating_demand)
+        CoolingDemand.append(BuildingInstance.cooling_demand)
+        EnergyDemand.append(BuildingInstance.energy_demand)
+        HasHeatingDemand.append(BuildingInstance.has_heating_demand)
+        HasCoolingDemand.append(BuildingInstance.has_cooling_demand)
+        HeatingSupplyTemperature.append(BuildingInstance.heating_supply_temperature)
+        CoolingSupplyTemperature.append(BuildingInstance.cooling_supply_temperature)
+        TempAir.append(BuildingInstance.t_air)
+        SolarGainsSouthWindow.append(SouthWindow.solar_gains)
+        SolarGainsEastWindow.append(EastWindow.solar_gains)
+        SolarGainsWestWindow.append(WestWindow.solar_gains)
+        SolarGainsNorthWindow.append(NorthWindow.solar_gains)
+        SolarGainsTotal.append(
+            SouthWindow.solar_gains + EastWindow.solar_gains + WestWindow.solar_gains + NorthWindow.solar_gains)
+
+        if hour not in month_ends:
+            continue
+
+        # End of the month: supply systems and hot water of the hours of the month, then the results of the month are
+        # added to the accumulators and the lists are emptied
+        month = slice(month_start, hour + 1)
+
+        # Electricity / fossil fuel consumption of the heating and cooling supply systems for all hours of the month
+        supply_loads = BuildingInstance.calc_supply_loads_array(energy_demand=EnergyDemand, t_out=OutsideTemp[month],
+                                                                heating_supply_temperature=HeatingSupplyTemperature,
+                                                                cooling_supply_temperature=CoolingSupplyTemperature,
+                                                                has_heating_demand=HasHeatingDemand,
+                                                                has_cooling_demand=HasCoolingDemand)
+
+        # Calculate hot water usage of the building
+        # with (HeatingEnergy / HeatingDemand) represents the Efficiency of the heat generation in the building
+        HeatingDemandMonth = np.array(HeatingDemand, dtype=float)
+        # catch devision by zero error: without heating demand the efficiency is 1
+        heat_generation_efficiency = np.divide(supply_loads.heating_energy, HeatingDemandMonth,
+                                               out=np.ones(len(HeatingDemandMonth)), where=HeatingDemandMonth > 0)
+        HotWaterEnergy = HotWaterDemand[month] * heat_generation_efficiency
+
+        if dhw_electric:
+            HotWater_Sys_Electricity = HotWaterEnergy
+            HotWater_Sys_Fossils = np.zeros(len(HotWaterEnergy))
+        else:
+            HotWater_Sys_Fossils = HotWaterEnergy
+            HotWater_Sys_Electricity = np.zeros(len(HotWaterEnergy))
+
+        hourly = {
+            'HeatingDemand': HeatingDemandMonth,
+            'HeatingEnergy': supply_loads.heating_energy,
+            'Heating_Sys_Electricity': supply_loads.heating_sys_electricity,
+            'Heating_Sys_Fossils': supply_loads.heating_sys_fossils,
+            'CoolingDemand': CoolingDemand,
+            'CoolingEnergy': supply_loads.cooling_energy,
+            'Cooling_Sys_Electricity': supply_loads.cooling_sys_electricity,
+            'Cooling_Sys_Fossils': supply_loads.cooling_sys_fossils,
+            'HotWaterDemand': HotWaterDemand[month],
+            'HotWaterEnergy': HotWaterEnergy,
+            'HotWater_Sys_Electricity': HotWater_Sys_Electricity,
+            'HotWater_Sys_Fossils': HotWater_Sys_Fossils,
+            'IndoorAirTemperature': TempAir,
+            'OutsideTemperature': OutsideTemp[month],
+            'LightingDemand': LightingDemand[month],
+            'InternalGains': InternalGains[month],
+            'Appliance_gains_demands': Appliance_gains_demands[month],
+            'Appliance_gains_elt_demands': Appliance_gains_elt_demands[month],
+            'SolarGainsSouthWindow': SolarGainsSouthWindow,
+            'SolarGainsEastWindow': SolarGainsEastWindow,
+            'SolarGainsWestWindow': SolarGainsWestWindow,
+            'SolarGainsNorthWindow': SolarGainsNorthWindow,
+            'SolarGainsTotal': SolarGainsTotal,
+            'Daytime': np.arange(month_start, hour + 1) % 24,
+        }
+        for accumulator in accumulators:
+            accumulator.add(month_start, hourly)
+        month_start = hour + 1
+
+        for values in (HeatingDemand, CoolingDemand, EnergyDemand, HasHeatingDemand, HasCoolingDemand,
+                       HeatingSupplyTemperature, CoolingSupplyTemperature, TempAir, SolarGainsSouthWindow,
+                       SolarGainsEastWindow, SolarGainsWestWindow, SolarGainsNorthWindow, SolarGainsTotal):
+            values.clear()
+
+    # hier endet die Inner Loop
+
+    return building_result(i_gebaeudeparameter, context, iteration, results, load_profile,
+                           energy_ref_area=BuildingInstance.energy_ref_area, schedule_name=schedule_name,
+                           typ_norm=typ_norm, epw_filename=epw_filename)
+
+
+def building_result(i_gebaeudeparameter, context, iteration, results, load_profile, energy_ref_area, schedule_name,
+                    typ_norm, epw_filename):
+    """
+    Returns the Result of a simulated building: its results in the granularity of the context and its summary. The
+    building is added to the load profiles of the context.
+
+    :param i_gebaeudeparameter: Parameters of the building
+    :type i_gebaeudeparameter: namedtuple
+    :param context: Data used by the simulation
+    :type context: SimulationContext
+    :param iteration: Position of the building in the simulated stock
+    :type iteration: int
+    :param results: Results of all hours of the building in the granularity of the context
+    :type results: aggregation.AnnualAccumulator
+    :param load_profile: Hourly values of the load profile variables (None without load profiles)
+    :type load_profile: aggregation.HourlyAccumulator or None
+    :param energy_ref_area: Energy reference area of the building [m2]
+    :type energy_ref_area: float
+    :param schedule_name: Name of the occupancy schedule of the building
+    :type schedule_name: str
+    :param typ_norm: Profile of DIN V 18599-10 / SIA 2024 of the gains of the building
+    :type typ_norm: str
+    :param epw_filename: epw file of the weather station of the building
+    :type epw_filename: str
+    :return: results of the building with status 'simulated'
+    :rtype: Result
+    """
+    # DataFrame with hourly results of specific building in the granularity of the context (see aggregation.py),
+    # only the annual sums are kept of the hours otherwise
+    profiler.start('dataframe')
+    hourlyResults = results.frame()
+    if hourlyResults is not None:
+        # Count iteration (amount of buildings), add GebäudeID to the DataFrame
+        hourlyResults['iteration'] = iteration
+        hourlyResults['GebäudeID'] = i_gebaeudeparameter.scr_gebaeude_id
+    profiler.stop('dataframe')
+
+    # Annual sums [kWh]
+    sums = results.sums()
+    annual = {column: sums[variable] / 1000 for variable, column in lca.ANNUAL_SUM_COLUMNS.items()}
+
+    # the fuel-related final energy sums, f.i. HeatingEnergy [kWhHs], are calculated based upon the superior heating value Hs
+    # since the corresponding expenditure factors from TEK 9.24 represent the ration of Hs-related final energy to useful energy
+
+    # ------------------------------------------------------------------------------------------------------------------------------
+    # Carbon Emissions, Primary Energy and Hi-related Final Energy, see lca.py
+    # ------------------------------------------------------------------------------------------------------------------------------
+    annual.update({
+        'GebäudeID': i_gebaeudeparameter.scr_gebaeude_id,
+        'EnergyRefArea': energy_ref_area,
+        'HeatingSupplySystem': i_gebaeudeparameter.heating_supply_system,
+        'CoolingSupplySystem': i_gebaeudeparameter.cooling_supply_system,
+        'DHWSupplySystem': i_gebaeudeparameter.dhw_system,
+        'Gebäudefunktion Hauptkategorie': i_gebaeudeparameter.hk_geb,
+        'Gebäudefunktion Unterkategorie': i_gebaeudeparameter.uk_geb,
+        'Profil SIA 2024': schedule_name,
+        'Profil 18599-10': typ_norm,
+        'EPW-File': epw_filename,
+    })
+
+    # Summary of building to a separate DataFrame, with the LCA columns or the LCA of the whole stock afterwards
+    with profiler.phase('lca'):
+        if context.lca_per_building:
+            annualResults_summary_temp = lca.summarize(annual, context.lca_factors)
+        else:
+            annualResults_summary_temp = lca.annual_summary(annual, context.lca_factors)
+
+    # Hourly results of the building added to the load profile of its group
+    if load_profile is not None:
+        context.load_profiles.add(i_gebaeudeparameter, load_profile.hourly)
+
+    return Result(iteration=iteration, scr_gebaeude_id=i_gebaeudeparameter.scr_gebaeude_id, status='simulated',
+                  hourly=hourlyResults, summary=annualResults_summary_temp, error=None)
+
+
+def simulate_building_safe(i_gebaeudeparameter, context, iteration=0):
+    """
+    Same as simulate_building(), but an exception is returned as Result with status 'failed' instead of raised,
+    so that one failing building does not stop the simulation of the stock
+    """
+    try:
+        return simulate_building(i_gebaeudeparameter, context, iteration)
+    except Exception:
+        return Result(iteration=iteration, scr_gebaeude_id=getattr(i_gebaeudeparameter, 'scr_gebaeude_id', None),
+                      status='failed', hourly=None, summary=None, error=traceback.format_exc())
+
+
+# Data of a building prepared for simulate_building_stock()
+StockMember = namedtuple('StockMember', ['iteration', 'i_gebaeudeparameter', 'building', 'station', 'schedule',
+                                         'gain_per_person', 'appliance_gains', 'typ_norm', 'usage_start', 'usage_end',
+                                         'dhw_per_full_usage_hour', 'schedule_name', 'epw_filename'])
+
+
+@profiled('simulate_building_stock')
+def simulate_building_stock(group, context):
+    """
+    Simulates the buildings of a group together with building_stock.simulate_stock() (engine 'building_stock'). The
+    results are the same as of simulate_building() for each building, except for the rounding of the floats.
+
+    The hourly results of all buildings of the group are kept until the end of the year, so the group should be a
+    chunk of a few hundred buildings at most (see station_chunks()). A building whose data can not be read gives a
+    Result with status 'failed', an exception in the simulation of the stock fails all buildings of the group.
+
+    :param group: (iteration, building) of the buildings
+    :type group: list of tuple (int, namedtuple)
+    :param context: Data used by the simulation
+    :type context: SimulationContext
+    :return: Result of each building in the order of the group
+    :rtype: list of Result
+    """
+    results = {}
+    members = []
+    weather, stations = [], {}
+    schedules, schedule_names = [], {}
+
+    def failed(iteration, i_gebaeudeparameter):
+        return Result(iteration=iteration, scr_gebaeude_id=getattr(i_gebaeudeparameter, 'scr_gebaeude_id', None),
+                      status='failed', hourly=None, summary=None, error=traceback.format_exc())
+
+    # Parameters, weather station, gains, usage time, occupancy schedule and hot water of each building, the weather
+    # and solar data of a station and an occupancy schedule are used by all buildings of the group with it
+    for iteration, i_gebaeudeparameter in group:
+        try:
+            BuildingInstance = create_building(i_gebaeudeparameter, solver=context.solver)
+
+            if (i_gebaeudeparameter.energy_ref_area == -8) | (i_gebaeudeparameter.heating_supply_system == 'NoHeating'):
+                results[iteration] = Result(iteration=iteration, scr_gebaeude_id=i_gebaeudeparameter.scr_gebaeude_id,
+                                            status='not heated', hourly=None, summary=None, error=None)
+                continue
+
+            epw_filename, (latitude_station, longitude_station), distance = \
+                context.station_locator.locate(BuildingInstance.plz)
+            if epw_filename not in stations:
+                epwfile_path = context.epwfile_path(epw_filename)
+                building_location = Location(epwfile_path=epwfile_path, weather_store=context.weather_store)
+                station_solar = context.solar_cache.get(epwfile_path, latitude_station, longitude_station,
+                                                        building_location)
+                stations[epw_filename] = len(weather)
+                weather.append(calc_station_weather(building_location, station_solar))
+
+            gain_per_person, appliance_gains, typ_norm = context.reference_data.getGains(
+                BuildingInstance.hk_geb, BuildingInstance.uk_geb, context.profile_from_norm,
+                context.gains_from_group_values)
+            usage_start, usage_end = context.reference_data.getUsagetime(BuildingInstance.hk_geb,
+                                                                         BuildingInstance.uk_geb,
+                                                                         context.usage_from_norm)
+            occupancy_schedule, schedule_name = context.reference_data.getSchedule(BuildingInstance.hk_geb,
+                                                                                   BuildingInstance.uk_geb)
+            TEK_dhw, TEK_name = context.reference_data.getTEK(BuildingInstance.hk_geb, BuildingInstance.uk_geb)
+        except Exception:
+            results[iteration] = failed(iteration, i_gebaeudeparameter)
+            continue
+
+        if schedule_name not in schedule_names:
+            schedule_names[schedule_name] = len(schedules)
+            schedules.append(occupancy_schedule)
+
+        members.append(StockMember(
+            iteration=iteration, i_gebaeudeparameter=i_gebaeudeparameter, building=BuildingInstance,
+            station=stations[epw_filename], schedule=schedule_names[schedule_name], gain_per_person=gain_per_person,
+            appliance_gains=appliance_gains, typ_norm=typ_norm, usage_start=usage_start, usage_end=usage_end,
+            dhw_per_full_usage_hour=TEK_dhw / occupancy_schedule.People.sum(), schedule_name=schedule_name,
+            epw_filename=epw_filename))
+
+    if members:
+        try:
+            hourly = building_stock.simulate_stock(
+                BuildingStock([member.building for member in members]), weather,
+                [member.station for member in members], schedules, [member.schedule for member in members],
+                np.array([member.usage_start for member in members]),
+                np.array([member.usage_end for member in members]),
+                [member.gain_per_person for member in members], [member.appliance_gains for member in members],
+                [member.dhw_per_full_usage_hour for member in members],
+                [member.i_gebaeudeparameter.dhw_system for member in members],
+                [member.i_gebaeudeparameter.heating_supply_system for member in members])
+        except Exception:
+            for member in members:
+                results[member.iteration] = failed(member.iteration, member.i_gebaeudeparameter)
+            members = []
+
+    # The hourly results of each building are added month by month to the accumulators, as in simulate_building()
+    month_ends = aggregation.MONTH_STARTS[1:].tolist() + [aggregation.HOURS]
+    for column_index, member in enumerate(members):
+        try:
+            results_building = aggregation.create_accumulator(context.granularity)
+            accumulators = [results_building]
+            load_profile = None
+            if context.load_profiles is not None:
+                load_profile = aggregation.HourlyAccumulator(PROFILE_VARIABLES)
+                accumulators.append(load_profile)
+
+            for month_start, month_end in zip(aggregation.MONTH_STARTS.tolist(), month_ends):
+                block = {column: values[month_start:month_end, column_index] for column, values in hourly.items()}
+                block['Daytime'] = np.arange(month_start, month_end) % 24
+                for accumulator in accumulators:
+                    accumulator.add(month_start, block)
+
+            results[member.iteration] = building_result(
+                member.i_gebaeudeparameter, context, member.iteration, results_building, load_profile,
+                energy_ref_area=member.building.energy_ref_area, schedule_name=member.schedule_name,
+                typ_norm=member.typ_norm, epw_filename=member.epw_filename)
+        except Exception:
+            results[member.iteration] = failed(member.iteration, member.i_gebaeudeparameter)
+
+    return [results[iteration] for iteration, i_gebaeudeparameter in group]
+
+
+# SimulationContext of a worker process, see init_worker()
+worker_context = None
+
+
+def init_worker(settings, profile=False):
+    """
+    Loads the SimulationContext once per worker process, enables the profiler of the process if profile is True
+    """
+    global worker_context
+    worker_context = SimulationContext(**settings)
+    if profile:
+        profiler.enable()
+
+
+def simulate_chunk(chunk):
+    """
+    Simulates a chunk of buildings in a worker process
+
+    :param chunk: (iteration, column names, values) of each building
+    :type chunk: list of tuple
+    :return: Results of the buildings in the order of the chunk, the measurements of the profiler of the worker
+             during the chunk (None if it is disabled) and the load profiles of the buildings of the chunk (None
+             without load profiles)
+    :rtype: tuple (list of Result, dict or None, dict or None)
+    """
+    group = [(iteration, namedtuple('Gebaeude', columns)(*values)) for iteration, columns, values in chunk]
+    if worker_context.engine == 'building_stock':
+        results = simulate_building_stock(group, worker_context)
+    else:
+        results = [simulate_building_safe(i_gebaeudeparameter, worker_context, iteration)
+                   for iteration, i_gebaeudeparameter in group]
+    load_profiles = worker_context.load_profiles
+    return (results, profiler.snapshot(reset=True) if profiler.enabled else None,
+            load_profiles.snapshot(reset=True) if load_profiles is not None else None)
+
+
+def station_key(i_gebaeudeparameter, context):
+    """
+    Returns the weather station and the occupancy schedule of a building, used to simulate buildings with the same
+    station one after another (empty strings if they can not be found, the simulation will report the error)
+
+    :param i_gebaeudeparameter: Parameters of the building
+    :type i_gebaeudeparameter: namedtuple
+    :param context: Data used by the simulation
+    :type context: SimulationContext
+    :return: epw file name of the station, schedule name
+    :rtype: tuple (str, str)
+    """
+    try:
+        epw_filename = context.station_locator.locate(i_gebaeudeparameter.plz)[0]
+    except (IndexError, KeyError, ValueError):
+        epw_filename = ''
+    try:
+        schedule_name = context.reference_data.getSchedule(i_gebaeudeparameter.hk_geb, i_gebaeudeparameter.uk_geb)[1]
+    except (OSError, ValueError):
+        schedule_name = ''
+    return epw_filename, schedule_name
+
+
+def group_by_station(buildings, context, station_window):
+    """
+    Yields the buildings of each window of station_window consecutive buildings in groups of the same weather station
+    and occupancy schedule, the groups of a window sorted by station and schedule
+
+    :param buildings: Parameters of the buildings
+    :type buildings: iterable of namedtuple
+    :param context: Data used by the simulation
+    :type context: SimulationContext
+    :param station_window: Number of consecutive buildings grouped at once
+    :type station_window: int
+    :return: (iteration, building) of the buildings of a group, iteration is the position of the building in buildings
+    :rtype: generator of list of tuple (int, namedtuple)
+    """
+    def window_groups(window):
+        groups = {}
+        for key, iteration, i_gebaeudeparameter in window:
+            groups.setdefault(key, []).append((iteration, i_gebaeudeparameter))
+        for key in sorted(groups):
+            yield groups[key]
+
+    window = []
+    for iteration, i_gebaeudeparameter in enumerate(buildings):
+        window.append((station_key(i_gebaeudeparameter, context), iteration, i_gebaeudeparameter))
+        if len(window) == station_window:
+            yield from window_groups(window)
+            window = []
+    yield from window_groups(window)
+
+
+def station_chunks(groups, chunk_size):
+    """
+    Yields the chunks sent to the worker processes (and simulated together by the engine 'building_stock'): a chunk
+    holds the buildings of one group only, groups larger than chunk_size are split into chunks of chunk_size buildings
+
+    :param groups: (iteration, building) of the buildings of each group, e.g. from group_by_station()
+    :type groups: iterable of iterable of tuple (int, namedtuple)
+    :param chunk_size: Maximum number of buildings per chunk
+    :type chunk_size: int
+    :rtype: generator of list of tuple (int, namedtuple)
+    """
+    for group in groups:
+        chunk = []
+        for iteration, i_gebaeudeparameter in group:
+            chunk.append((iteration, i_gebaeudeparameter))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def in_input_order(results):
+    """
+    Yields the results in the order of their iteration, results of later buildings are kept until the results
+    of all buildings before are yielded
+    """
+    waiting = {}
+    next_iteration = 0
+    for result in results:
+        waiting[result.iteration] = result
+        while next_iteration in waiting:
+            yield waiting.pop(next_iteration)
+            next_iteration += 1
+
+
+def run_parallel(buildings, context, workers=None, chunk_size=16, station_window=None):
+    """
+    Simulates the buildings of a stock in several processes and yields the results in the order of the buildings
+
+    Each worker process loads its own SimulationContext (with the settings of context) once. The buildings are sent to
+    the workers in chunks of chunk_size buildings, at most 2 chunks per worker are waiting at the same time. The results
+    are the same as for simulate_building() in one process. A building that raises an exception gives a Result with
+    status 'failed', the other buildings are simulated anyway.
+
+    With station_window the buildings of each window of station_window consecutive buildings are grouped by weather
+    station and occupancy schedule (see group_by_station). Each chunk holds the buildings of one group, only groups
+    larger than chunk_size are split, so that a worker loads the weather and solar data of a station once for the
+    whole chunk. The results of a window are kept until they can be yielded in the order of the buildings, so the
+    memory used grows with station_window.
+
+    With the engine 'building_stock' of the context the buildings of each chunk are simulated together (see
+    simulate_building_stock()), also with workers=1.
+
+    :param buildings: Parameters of the buildings, e.g. rows of SimulationData_Breitenerhebung.csv
+    :type buildings: iterable of namedtuple
+    :param context: Data used by the simulation (only its settings are passed to the workers)
+    :type context: SimulationContext
+    :param workers: Number of worker processes, None for the number of CPUs. With 1 the buildings are simulated
+                    in this process with context
+    :type workers: int or None
+    :param chunk_size: Maximum number of buildings per chunk
+    :type chunk_size: int
+    :param station_window: Number of consecutive buildings grouped by weather station (None: not grouped)
+    :type station_window: int or None
+    :return: Result of each building
+    :rtype: generator of Result
+    """
+    if station_window:
+        groups = group_by_station(buildings, context, station_window)
+        return in_input_order(simulate_groups(groups, context, workers, chunk_size))
+
+    # All buildings in one group, cut into chunks of chunk_size in their order
+    return simulate_groups([enumerate(buildings)], context, workers, chunk_size)
+
+
+def simulate_groups(groups, context, workers, chunk_size):
+    """
+    Simulates the groups of (iteration, building) in the given order, each chunk holds the buildings of one group,
+    see run_parallel() and station_chunks()
+    """
+    if workers == 1:
+        if context.engine == 'building_stock':
+            for chunk in station_chunks(groups, chunk_size):
+                yield from simulate_building_stock(chunk, context)
+            return
+        for group in groups:
+            for iteration, i_gebaeudeparameter in group:
+                yield simulate_building_safe(i_gebaeudeparameter, context, iteration)
+        return
+
+    def iterate_chunks():
+        for chunk in station_chunks(groups, chunk_size):
+            # namedtuples of the building data are created at runtime and can not be pickled, send fields and values
+            yield [(iteration, i_gebaeudeparameter._fields, tuple(i_gebaeudeparameter))
+                   for iteration, i_gebaeudeparameter in chunk]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def chunk_results(future):
+        # The measurements and load profiles of the workers are added to the profiler and the context of this process
+        results, profile, load_profiles = future.result()
+        if profile is not None:
+            profiler.merge(profile)
+        if load_profiles is not None:
+            context.load_profiles.merge(load_profiles)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(context.settings, profiler.enabled)) as executor:
+        max_waiting = 2 * workers
+        waiting = deque()
+        for chunk in iterate_chunks():
+            waiting.append(executor.submit(simulate_chunk, chunk))
+            if len(waiting) >= max_waiting:
+                yield from chunk_results(waiting.popleft())
+        while waiting:
+            yield from chunk_results(waiting.popleft())
+
+
+def simulate_stock(buildings, context, workers=1, chunk_size=16, result_cache=None, station_window=None):
+    """
+    Simulates the buildings of a stock and yields the results in the order of the buildings
+
+    With workers=1 all buildings are simulated in this process with the data already loaded in context, so that
+    several calls reuse it. With more workers the buildings are simulated by run_parallel(). With a result_cache only
+    the buildings that are not cached are simulated.
+
+    :param buildings: Parameters of the buildings, e.g. from read_buildings()
+    :type buildings: iterable of namedtuple
+    :param context: Data used by the simulation
+    :type context: SimulationContext
+    :param workers: Number of worker processes, None for the number of CPUs
+    :type workers: int or None
+    :param chunk_size: Number of buildings sent to a worker process at once (simulated together by the engine
+                       'building_stock')
+    :type chunk_size: int
+    :param result_cache: Cache of the results of unchanged buildings
+    :type result_cache: result_cache.ResultCache or None
+    :param station_window: Number of consecutive buildings simulated sorted by weather station, see run_parallel()
+    :type station_window: int or None
+    :return: Result of each building
+    :rtype: generator of Result
+    """
+    if result_cache is not None:
+        return result_cache.simulate_stock(buildings, context, workers=workers, chunk_size=chunk_size,
+                                           station_window=station_window)
+
+    return run_parallel(buildings, context, workers=workers, chunk_size=chunk_size, station_window=station_window)
+
+
+def read_buildings(building_data_file, chunksize=10000):
+    """
+    Reads the parameters of the buildings from a csv file (e.g. SimulationData_Breitenerhebung.csv), the file is read
+    in chunks of chunksize rows
+
+    :param building_data_file: Path of the csv file
+    :type building_data_file: str
+    :param chunksize: Number of rows read at once
+    :type chunksize: int
+    :return: Parameters of each building
+    :rtype: generator of namedtuple
+    """
+    Row = None
+    for building_data in pd.read_csv(building_data_file, sep=';', index_col=False, encoding='utf8',
+                                     chunksize=chunksize):
+        if Row is None:
+            Row = namedtuple('Gebaeude', building_data.columns)
+        for row in building_data.itertuples(index=False):
+            yield Row(*row)
@@ -3,6 +3,13 @@ Supply System Parameters for Heating and Cooling
 
 Model of different Supply systems. New Supply Systems can be introduced by adding new classes
 
+calc_loads() calculates the consumption of one time step, calc_loads_array() of many time steps at once. The default
+calc_loads_array() evaluates calc_loads() with arrays, which works for all systems that multiply or divide the load by
+constant factors. Systems with other calculations (e.g. the heat pumps) override calc_loads_array().
+
+energy_carrier of each class is the energy carrier used for the LCA of the electricity / fossil fuel consumption of
+the system (see lca.py).
+
 TODO: Have a look at CEA calculation methodology 
 https://github.com/architecture-building-systems/CEAforArcGIS/blob/master/cea/technologies/heatpumps.py
 
@@ -19,6 +26,10 @@ __author__ = "Simon Knoll, Julian Bischof, Michael Hörner "
 __copyright__ = "Copyright 2022, Institut Wohnen und Umwelt"
 __license__ = "MIT"
 
+import numpy as np
+
+from profiling import profiled
+from profiling import profiler
 
 
 class SupplyDirector:
@@ -29,11 +40,16 @@ class SupplyDirector:
 
     builder = None
 
+    def __init__(self):
+        if profiler.enabled:
+            profiler.count('SupplyDirector')
+
     # Sets what building system is used
     def set_builder(self, builder):
         self.builder = builder
 
     # Calcs the energy load of that system. This is the main() function
+    @profiled('supply')
     def calc_system(self):
 
         # Director asks the builder to produce the system body. self.builder
@@ -50,7 +66,12 @@ class SupplySystemBase:
      The base class in which Supply systems are built from 
     """
 
+    # Energy carrier of the system in Primary_energy_and_emission_factors.csv (column 'Energy Carrier'), see lca.py
+    energy_carrier = None
+
     def __init__(self, load, t_out, heating_supply_temperature, cooling_supply_temperature, has_heating_demand, has_cooling_demand):
+        if profiler.enabled:
+            profiler.count('SupplySystem')
         self.load = load  # Energy Demand of the building at that time step
         self.t_out = t_out  # Outdoor Air Temperature
         # Temperature required by the emission system
@@ -64,6 +85,37 @@ class SupplySystemBase:
     Caculates the electricty / fossil fuel consumption of the set supply system
     If the system also generates electricity, then this is stored as electricity_out
     """
+
+    @classmethod
+    def calc_loads_array(cls, load, t_out, heating_supply_temperature, cooling_supply_temperature,
+                         has_heating_demand, has_cooling_demand):
+        """
+        Calculates the electricity / fossil fuel consumption of the supply system for several time steps at once,
+        the results are the same as of calc_loads() for each time step
+
+        :param load: Energy Demand of the building in each time step
+        :type load: np.ndarray
+        :param t_out: Outdoor Air Temperature of each time step
+        :type t_out: np.ndarray
+        :param heating_supply_temperature: Heating supply temperature of the emission system of each time step
+        :type heating_supply_temperature: np.ndarray
+        :param cooling_supply_temperature: Cooling supply temperature of the emission system of each time step
+        :type cooling_supply_temperature: np.ndarray
+        :param has_heating_demand: Heating demand in each time step
+        :type has_heating_demand: np.ndarray (bool)
+        :param has_cooling_demand: Cooling demand in each time step
+        :type has_cooling_demand: np.ndarray (bool)
+
+        :return: fossils_in, electricity_in, electricity_out and cop as arrays of the shape of load
+        :rtype: SupplyOut
+        """
+        system = cls(load=load, t_out=t_out, heating_supply_temperature=heating_supply_temperature,
+                     cooling_supply_temperature=cooling_supply_temperature, has_heating_demand=has_heating_demand,
+                     has_cooling_demand=has_cooling_demand).calc_loads()
+
+        return SupplyOut.from_values(np.shape(load), fossils_in=system.fossils_in,
+                                     electricity_in=system.electricity_in,
+                                     electricity_out=system.electricity_out, cop=system.cop)
     
     
 ##############################################################################
@@ -75,6 +127,8 @@ class OilBoilerStandardBefore86(SupplySystemBase):
     Konstanttemperaturkessel 78-86 - Oil
     """
 
+    energy_carrier = 'Light fuel oil'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.114
@@ -88,6 +142,8 @@ class OilBoilerStandardFrom95(SupplySystemBase):
     Konstanttemperaturkessel ab 1995 - Oil
     """
 
+    energy_carrier = 'Light fuel oil'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.087
@@ -101,6 +157,8 @@ class OilBoilerLowTempBefore87(SupplySystemBase):
     Niedertemperaturkessel vor 1987 - Oil
     """
 
+    energy_carrier = 'Light fuel oil'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.112
@@ -114,6 +172,8 @@ class OilBoilerLowTempBefore95(SupplySystemBase):
     Niedertemperaturkessel vor 1995 - Oil
     """
 
+    energy_carrier = 'Light fuel oil'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.086
@@ -127,6 +187,8 @@ class OilBoilerLowTempFrom95(SupplySystemBase):
     Niedertemperaturkessel ab 1995 - Oil
     """
 
+    energy_carrier = 'Light fuel oil'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.067
@@ -140,6 +202,8 @@ class OilBoilerCondensingBefore95(SupplySystemBase):
     Brennwertkessel vor 1995 - Oil 
     """
 
+    energy_carrier = 'Light fuel oil'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.03
@@ -153,6 +217,8 @@ class OilBoilerCondensingFrom95(SupplySystemBase):
     Brennwertkessel ab 1995 - Oil 
     """
 
+    energy_carrier = 'Light fuel oil'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.028
@@ -166,6 +232,8 @@ class OilBoilerCondensingImproved(SupplySystemBase):
     Brennwertkessel verbessert 
     """
 
+    energy_carrier = 'Light fuel oil'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.004
@@ -183,6 +251,8 @@ class GasBoilerStandardBefore86(SupplySystemBase):
     Konstanttemperaturkessel vor 1986 - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.142
@@ -196,6 +266,8 @@ class GasBoilerStandardBefore95(SupplySystemBase):
     Konstanttemperaturkessel vor 1995 (87-94) - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.124
@@ -209,6 +281,8 @@ class GasBoilerStandardFrom95(SupplySystemBase):
     Konstanttemperaturkessel ab 1995 - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.114
@@ -222,6 +296,8 @@ class GasBoilerLowTempBefore87(SupplySystemBase):
     Niedertemperaturkessel vor 1987 - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.14
@@ -235,6 +311,8 @@ class LGasBoilerLowTempBefore87(SupplySystemBase):
     Niedertemperaturkessel vor 1987 - L-Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.129
@@ -248,6 +326,8 @@ class GasBoilerLowTempBefore95(SupplySystemBase):
     Niedertemperaturkessel vor 1995 - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.113
@@ -261,6 +341,8 @@ class LGasBoilerLowTempBefore95(SupplySystemBase):
     Niedertemperaturkessel vor 1995 - L-Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.102
@@ -274,6 +356,8 @@ class GasBoilerLowTempFrom95(SupplySystemBase):
     Niedertemperaturkessel ab 1995 - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.095
@@ -287,6 +371,8 @@ class LGasBoilerLowTempFrom95(SupplySystemBase):
     Niedertemperaturkessel ab 1995 - L-Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.083
@@ -300,6 +386,8 @@ class BiogasOilBoilerLowTempBefore95(SupplySystemBase):
     Niedertemperaturkessel vor 1995 - Biogas/Bioöl Mix
     """
 
+    energy_carrier = 'Biogas Bio-oil Mix (general)'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.0995
@@ -314,6 +402,8 @@ class GasBoilerLowTempSpecialFrom78(SupplySystemBase):
     Niedertemperaturkessel-Spezialkessel ab 1978 - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.113
@@ -327,6 +417,8 @@ class GasBoilerLowTempSpecialFrom95(SupplySystemBase):
     Niedertemperaturkessel-Spezialkessel ab 1995 - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.093
@@ -340,6 +432,8 @@ class GasBoilerCondensingBefore95(SupplySystemBase):
     Brennwertkessel vor 1995 - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.057
@@ -353,6 +447,8 @@ class LGasBoilerCondensingBefore95(SupplySystemBase):
     Brennwertkessel vor 1995 - L-Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.047
@@ -366,6 +462,8 @@ class BiogasBoilerCondensingBefore95(SupplySystemBase):
     Brennwertkessel vor 1995 - Biogas
     """
 
+    energy_carrier = 'Biogas (general)'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.057
@@ -379,6 +477,8 @@ class BiogasBoilerCondensingFrom95(SupplySystemBase):
     Brennwertkessel nach 1995 - Biogas
     """
 
+    energy_carrier = 'Biogas (general)'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.054
@@ -393,6 +493,8 @@ class GasBoilerCondensingFrom95(SupplySystemBase):
     Brennwertkessel ab 1995 - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.054
@@ -406,6 +508,8 @@ class LGasBoilerCondensingFrom95(SupplySystemBase):
     Brennwertkessel ab 1995 - L-Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.044
@@ -433,6 +537,8 @@ class BiogasOilBoilerCondensingFrom95(SupplySystemBase):
     Brennwertkessel ab 1995 - Biogas/Bioöl Mix 
     """
 
+    energy_carrier = 'Biogas Bio-oil Mix (general)'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.041
@@ -446,6 +552,8 @@ class GasBoilerCondensingImproved(SupplySystemBase):
     Brennwertkessel verbessert - Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.028
@@ -459,6 +567,8 @@ class LGasBoilerCondensingImproved(SupplySystemBase):
     Brennwertkessel verbessert - L-Gas
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.019
@@ -472,6 +582,8 @@ class BiogasOilBoilerCondensingImproved(SupplySystemBase):
     Brennwertkessel verbessert - Biogas/Bioöl Mix
     """
 
+    energy_carrier = 'Biogas Bio-oil Mix (general)'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.016
@@ -489,6 +601,8 @@ class WoodChipSolidFuelBoiler(SupplySystemBase):
     Feststoffkessel mit Pufferspeicher ab 95 (Holzhack)
     """
 
+    energy_carrier = 'Wood'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.056
@@ -502,6 +616,8 @@ class WoodPelletSolidFuelBoiler(SupplySystemBase):
     Feststoffkessel mit Pufferspeicher ab 95 (Holzpellet)
     """
 
+    energy_carrier = 'Wood'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.054
@@ -515,6 +631,8 @@ class WoodSolidFuelBoilerCentral(SupplySystemBase):
     Feststoffkessel ab (ohne Puffer) 95 (Holzhack/Pellets Mix)
     """
 
+    energy_carrier = 'Wood'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.123
@@ -529,6 +647,8 @@ class CoalSolidFuelBoiler(SupplySystemBase):
     and Feststoffkessel 78-94 (Kohle) - Braunkohle
     """
 
+    energy_carrier = 'Hard coal'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load * 1.123
@@ -544,6 +664,8 @@ class SolidFuelLiquidFuelFurnace(SupplySystemBase):
     Minimum efficiency according to '1. BImSchV, Anlage 4'
     """
 
+    energy_carrier = 'Hard coal'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load / 0.7
@@ -561,6 +683,8 @@ class HeatPumpAirSource(SupplySystemBase):
     Source: Staffell et al. (2012): A review of domestic heat pumps, In: Energy & Environmental Science, 2012, 5, p. 9291-9306
     """
 
+    energy_carrier = 'Electricity grid mix'
+
     def calc_loads(self):
         system = SupplyOut()
 
@@ -586,6 +710,22 @@ class HeatPumpAirSource(SupplySystemBase):
         system.electricity_out = 0
         return system
 
+    @classmethod
+    def calc_loads_array(cls, load, t_out, heating_supply_temperature, cooling_supply_temperature,
+                         has_heating_demand, has_cooling_demand):
+        if not np.all(has_heating_demand | has_cooling_demand):
+            raise ValueError(
+                'HeatPumpAir called although there is no heating/cooling demand')
+
+        # determine the temperature difference, if negative, set to 0
+        deltaT = np.where(has_heating_demand, np.maximum(0, heating_supply_temperature - t_out),
+                          np.maximum(0, t_out - cooling_supply_temperature))
+        # Eq (4) in Staggell et al.
+        cop = 6.81 - 0.121 * deltaT + 0.000630 * deltaT**2
+
+        return SupplyOut.from_values(np.shape(load), fossils_in=0, electricity_in=load / cop, electricity_out=0,
+                                     cop=cop)
+
 class HeatPumpGroundSource(SupplySystemBase):
     """"
     BETA Version
@@ -599,6 +739,8 @@ class HeatPumpGroundSource(SupplySystemBase):
     Source: Staffell et al. (2012): A review of domestic heat pumps, In: Energy & Environmental Science, 2012, 5, p. 9291-9306
     """
 
+    energy_carrier = 'Electricity grid mix'
+
 
     def calc_loads(self):
         system = SupplyOut()
@@ -617,6 +759,18 @@ class HeatPumpGroundSource(SupplySystemBase):
         system.fossils_in = 0
         system.electricity_out = 0
         return system
+
+    @classmethod
+    def calc_loads_array(cls, load, t_out, heating_supply_temperature, cooling_supply_temperature,
+                         has_heating_demand, has_cooling_demand):
+        deltaT = np.where(has_heating_demand, np.maximum(0, heating_supply_temperature - 7.0),
+                          np.maximum(0, 13.0 - cooling_supply_temperature))
+        # Eq (4) in Staggell et al., no COP without heating/cooling demand
+        cop = np.where(has_heating_demand | has_cooling_demand,
+                       8.77 - 0.150 * deltaT + 0.000734 * deltaT**2, float("nan"))
+
+        return SupplyOut.from_values(np.shape(load), fossils_in=0, electricity_in=load / cop, electricity_out=0,
+                                     cop=cop)
     
     
 ##############################################################################
@@ -628,6 +782,8 @@ class GasCHP(SupplySystemBase):
     electrical efficiency. Source: Arbeitsgemeinschaft für sparsamen und umwelfreundlichen Energieverbrauch e.V. (2011): BHKW-Kenndasten 2011
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.fossils_in = self.load / 0.49
@@ -645,6 +801,8 @@ class DistrictHeating(SupplySystemBase):
     expenditure factor (=Erzeugeraufwandszahl) from TEK-Tool 9.24
     District Heating with expenditure factor = 1.002
     """
+
+    energy_carrier = 'District heating (Combined Heat and Power) Gas or Liquid fuels'
     
     def calc_loads(self):
         system = SupplyOut()
@@ -662,6 +820,8 @@ class ElectricHeating(SupplySystemBase):
     Straight forward electric heating. 100 percent conversion to heat.
     """
 
+    energy_carrier = 'Electricity grid mix'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = self.load
@@ -678,6 +838,8 @@ class DirectHeater(SupplySystemBase):
     Created by PJ to check accuracy against previous simulation
     """
 
+    energy_carrier = 'District heating (Combined Heat and Power) Coal'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = self.load
@@ -699,6 +861,8 @@ class AirCooledPistonScroll(SupplySystemBase):
     EER (full load): 3,1
     """
 
+    energy_carrier = 'Electricity grid mix'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = self.load / 3.1
@@ -720,6 +884,8 @@ class AirCooledPistonScrollMulti(SupplySystemBase):
     EER (full load): 3,1
     """
 
+    energy_carrier = 'Electricity grid mix'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = self.load / 3.1
@@ -741,6 +907,8 @@ class WaterCooledPistonScroll(SupplySystemBase):
     EER (full load): 4,25
     """
 
+    energy_carrier = 'Electricity grid mix'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = self.load / 3.2
@@ -764,6 +932,8 @@ class AbsorptionRefrigerationSystem(SupplySystemBase):
     Furthermore: Electricity consumption for pumps etc. are not considered at this stage
     """
 
+    energy_carrier = 'Waste Heat generated close to building'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = 0
@@ -780,6 +950,8 @@ class DistrictCooling(SupplySystemBase):
     DistrictCooling assumed with efficiency 100%
     """
 
+    energy_carrier = 'District cooling'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = 0
@@ -799,6 +971,8 @@ class GasEnginePistonScroll(SupplySystemBase):
     der Otto-von-Guericke-Universitaet Magdeburg
     """
 
+    energy_carrier = 'Natural gas'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = 0
@@ -814,6 +988,8 @@ class DirectCooler(SupplySystemBase):
     Created by PJ to check accuracy against previous simulation
     """
 
+    energy_carrier = 'Electricity grid mix'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = self.load
@@ -829,6 +1005,8 @@ class NoHeating(SupplySystemBase):
     Dummyclass used for buildings with no heating supply system
     """
 
+    energy_carrier = 'None'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = 0
@@ -845,6 +1023,8 @@ class NoCooling(SupplySystemBase):
     Dummyclass used for buildings with no cooling supply system
     """
 
+    energy_carrier = 'None'
+
     def calc_loads(self):
         system = SupplyOut()
         system.electricity_in = 0
@@ -864,3 +1044,13 @@ class SupplyOut:
     electricity_in = float("nan")
     electricity_out = float("nan")
     cop = float("nan")
+
+    @classmethod
+    def from_values(cls, shape, **values):
+        """
+        Returns a SupplyOut with the values (numbers or arrays) as float arrays of the given shape
+        """
+        supplyOut = cls()
+        for name, value in values.items():
+            setattr(supplyOut, name, np.broadcast_to(value, shape).astype(float))
+        return supplyOut
@@ -0,0 +1,92 @@
+"""
+Tests of the chunks of buildings grouped by weather station and occupancy schedule (simulation.group_by_station and
+simulation.station_chunks)
+
+
+author: "Julian Bischof, Simon Knoll, Michael Hörner "
+copyright: "Copyright 2023, Institut Wohnen und Umwelt"
+license: "MIT"
+
+"""
+__author__ = "Julian Bischof, Simon Knoll, Michael Hörner "
+__copyright__ = "Copyright 2023, Institut Wohnen und Umwelt"
+__license__ = "MIT"
+
+import os
+import sys
+from collections import namedtuple
+
+mainPath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, mainPath)
+
+from simulation import group_by_station
+from simulation import station_chunks
+
+Gebaeude = namedtuple('Gebaeude', ['scr_gebaeude_id', 'plz', 'hk_geb', 'uk_geb'])
+
+
+class StationLocator(object):
+    # Weather station of a zip code: its first digit
+    def locate(self, plz):
+        return ('station_{}.epw'.format(str(plz)[0]),)
+
+
+class ReferenceData(object):
+    def getSchedule(self, hk_geb, uk_geb):
+        return None, 'schedule_' + str(hk_geb)
+
+
+class Context(object):
+    station_locator = StationLocator()
+    reference_data = ReferenceData()
+
+
+def key(i_gebaeudeparameter):
+    return str(i_gebaeudeparameter.plz)[0], i_gebaeudeparameter.hk_geb
+
+
+def buildings():
+    # Stations 1 and 2 interleaved, 7 buildings of (1, 'A'), 2 of (2, 'A'), 3 of (1, 'B')
+    keys = [(1, 'A'), (2, 'A'), (1, 'A'), (1, 'B'), (1, 'A'), (1, 'A'), (2, 'A'), (1, 'B'),
+            (1, 'A'), (1, 'A'), (1, 'B'), (1, 'A')]
+    return [Gebaeude(i, station * 10000 + i, hk_geb, '') for i, (station, hk_geb) in enumerate(keys)]
+
+
+def test_group_by_station():
+    groups = list(group_by_station(buildings(), Context(), station_window=100))
+
+    assert [[key(building) for iteration, building in group][0] for group in groups] == \
+        [('1', 'A'), ('1', 'B'), ('2', 'A')]
+    for group in groups:
+        assert len({key(building) for iteration, building in group}) == 1
+        assert [iteration for iteration, building in group] == sorted(iteration for iteration, building in group)
+    assert sorted(iteration for group in groups for iteration, building in group) == list(range(12))
+
+
+def test_group_by_station_window():
+    # Buildings are only grouped within a window
+    groups = list(group_by_station(buildings(), Context(), station_window=4))
+
+    assert [sorted(iteration for iteration, building in group) for group in groups] == \
+        [[0, 2], [3], [1], [4, 5], [7], [6], [8, 9, 11], [10]]
+
+
+def test_one_group_one_chunk():
+    groups = list(group_by_station(buildings(), Context(), station_window=100))
+    chunks = list(station_chunks(groups, chunk_size=4))
+
+    # Each chunk holds the buildings of one group only
+    for chunk in chunks:
+        assert len({key(building) for iteration, building in chunk}) == 1
+    # A group not larger than chunk_size is sent in one chunk
+    for group in groups:
+        if len(group) <= 4:
+            assert group in chunks
+    # Larger groups are split into chunks of chunk_size
+    assert [len(chunk) for chunk in chunks] == [4, 3, 3, 2]
+
+
+def test_chunks_without_groups():
+    chunks = list(station_chunks([enumerate('abcdefg')], chunk_size=3))
+
+    assert chunks == [[(0, 'a'), (1, 'b'), (2, 'c')], [(3, 'd'), (4, 'e'), (5, 'f')], [(6, 'g')]]